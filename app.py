@@ -19,17 +19,77 @@ import os
 # Infrastructure
 from infrastructure.config.settings import Settings
 from infrastructure.database.connection import db_connection
-from infrastructure.database.models.notification_model import NotificationModel
-from infrastructure.repositories.notification_repository_impl import NotificationRepositoryImpl
+from infrastructure.database.schema import initialize_database
+from infrastructure.repositories.sharded_notification_repository import create_notification_repository
+from infrastructure.repositories.alert_stats_repository_impl import AlertStatsRepositoryImpl
+from infrastructure.repositories.notification_archive_repository_impl import NotificationArchiveRepositoryImpl
+from infrastructure.repositories.cell_demand_repository_impl import CellDemandRepositoryImpl
+from infrastructure.repositories.observation_repository_impl import ObservationRepositoryImpl
+from infrastructure.repositories.subscription_repository_impl import SubscriptionRepositoryImpl
+from infrastructure.repositories.sweep_lease_repository_impl import SweepLeaseRepositoryImpl
 from infrastructure.external_services.weather_api_service import WeatherAPIService
 from infrastructure.external_services.email_service import EmailService
+from infrastructure.external_services.webhook_service import WebhookService
+from infrastructure.external_services.circuit_breaker import CircuitBreaker
+from infrastructure.external_services.resilient_weather_service import ResilientWeatherService
+from infrastructure.external_services.cached_weather_service import CachedWeatherService
+from infrastructure.external_services.quota_manager import QuotaManager, MeteredWeatherService
+from infrastructure.external_services.open_meteo_service import OpenMeteoService
+from infrastructure.external_services.weather_provider_router import WeatherProviderRouter
+from infrastructure.cache.forecast_cache import InMemoryForecastCache, TieredForecastCache
+from infrastructure.cache.sqlite_forecast_cache import SQLiteForecastCache
+from infrastructure.cache.idempotency_store import IdempotencyStore
+from infrastructure.cache.sqlite_idempotency_store import SQLiteIdempotencyStore
+from infrastructure.cache.recipient_filter import RecipientBloomFilter
+from infrastructure.monitoring.metrics import metrics
+from infrastructure.monitoring.memory_monitor import MemoryMonitor
+from infrastructure.monitoring.access_log import AccessLogger
+from infrastructure.runtime.lifecycle import register_after_fork, register_shutdown, run_shutdown_hooks, start_background
+from infrastructure.runtime.admission_controller import ConcurrencyLimiter
+from infrastructure.streaming.notification_broker import NotificationBroker
 
 # Application
+from application.services.alert_digest import AlertDigest
+from application.services.cache_prefetcher import CachePrefetcher
+from application.services.weather_sweeper import WeatherSweeper
+from application.use_cases.check_area_weather_use_case import CheckAreaWeatherUseCase
 from application.use_cases.check_weather_use_case import CheckWeatherUseCase
 from application.use_cases.get_notifications_use_case import GetNotificationsUseCase
+from application.use_cases.find_nearby_notifications_use_case import FindNearbyNotificationsUseCase
+from application.use_cases.get_alert_stats_use_case import GetAlertStatsUseCase
+from application.use_cases.get_cell_observations_use_case import GetCellObservationsUseCase
+from application.use_cases.get_notification_history_use_case import GetNotificationHistoryUseCase
+from application.use_cases.import_subscriptions_use_case import ImportSubscriptionsUseCase
+from application.use_cases.stream_notifications_use_case import StreamNotificationsUseCase
 
 # Presentation
 from presentation.routes.weather_routes import WeatherRoutes
+from presentation.routes.metrics_routes import MetricsRoutes
+from presentation.routes.notification_routes import NotificationRoutes
+from presentation.routes.stats_routes import StatsRoutes
+from presentation.routes.subscription_routes import SubscriptionRoutes
+from presentation.routes.admin_routes import AdminRoutes
+from presentation.middlewares.admission_middleware import AdmissionMiddleware
+from presentation.middlewares.auth_middleware import api_key_error
+from presentation.middlewares.access_log_middleware import AccessLogMiddleware
+
+
+def _create_weather_provider(name: str, settings: Settings, weather_quota: QuotaManager):
+    """Construye un proveedor del clima por nombre (ver WEATHER_PROVIDERS)"""
+    if name == WeatherAPIService.name:
+        # La cuota del plan solo aplica a WeatherAPI
+        return MeteredWeatherService(
+            weather_service=WeatherAPIService(
+                api_key=settings.WEATHER_API_KEY,
+                api_url=settings.WEATHER_API_URL,
+                days=settings.WEATHER_DAYS,
+                timeout=settings.WEATHER_API_TIMEOUT
+            ),
+            quota=weather_quota
+        )
+    if name == OpenMeteoService.name:
+        return OpenMeteoService(api_url=settings.OPENMETEO_API_URL, timeout=settings.WEATHER_API_TIMEOUT)
+    raise ValueError(f"Proveedor del clima desconocido: {name}")
 
 
 def create_app() -> Flask:
@@ -44,7 +104,9 @@ def create_app() -> Flask:
     settings = Settings.from_env()
     
     # Inicializar base de datos
-    db_connection.initialize_tables([NotificationModel])
+    archive_repository = NotificationArchiveRepositoryImpl(directory=settings.ARCHIVE_DIR)
+    initialize_database(settings.DATABASE_NAME, settings.STATS_CELL_SIZE, archive_repository.scan())
+    register_shutdown(db_connection.close)
     
     # Crear app Flask
     app = Flask(__name__)
@@ -54,7 +116,7 @@ def create_app() -> Flask:
         r"/*": {
             "origins": "*",  # En producción, especifica tu dominio
             "methods": ["GET", "POST", "OPTIONS"],
-            "allow_headers": ["Content-Type", "x-api-key"],
+            "allow_headers": ["Content-Type", "x-api-key", "X-Request-Timeout"],
             "expose_headers": ["Content-Type"],
             "supports_credentials": False
         }
@@ -86,47 +148,371 @@ def create_app() -> Flask:
     
     # ===== DEPENDENCY INJECTION =====
     # Infrastructure Layer
-    notification_repository = NotificationRepositoryImpl()
-    weather_service = WeatherAPIService(
-        api_key=settings.WEATHER_API_KEY,
-        api_url=settings.WEATHER_API_URL,
-        days=settings.WEATHER_DAYS
+    # Pub/sub de las notificaciones nuevas hacia los streams SSE
+    notification_broker = NotificationBroker(
+        max_connections=settings.SSE_MAX_CONNECTIONS,
+        max_per_recipient=settings.SSE_MAX_PER_RECIPIENT,
+        queue_size=settings.SSE_QUEUE_SIZE,
+        poll_seconds=settings.SSE_POLL_SECONDS
+    )
+    # Emails con notificaciones: GET /notifications de los demás no consulta la base
+    recipient_filter = None
+    if settings.RECIPIENT_FILTER_ENABLED:
+        recipient_filter = RecipientBloomFilter(
+            capacity=settings.RECIPIENT_FILTER_CAPACITY,
+            false_positive_rate=settings.RECIPIENT_FILTER_FALSE_POSITIVE_RATE,
+            refresh_seconds=settings.RECIPIENT_FILTER_REFRESH_SECONDS,
+            path=settings.RECIPIENT_FILTER_PATH or None
+        )
+    notification_repository = create_notification_repository(
+        settings, archive_repository.scan(), broker=notification_broker, recipient_filter=recipient_filter
+    )
+    # El broker sigue la tabla para ver lo que guardan los demás workers
+    notification_broker.repository = notification_repository
+    if recipient_filter is not None:
+        # Como el broker, el filtro lee de la tabla lo que guardan los demás workers
+        recipient_filter.repository = notification_repository
+        recipient_filter.load()
+        start_background(recipient_filter.start)
+        register_after_fork(recipient_filter.reset_after_fork)
+        register_shutdown(recipient_filter.save)
+        register_shutdown(recipient_filter.stop)
+    start_background(notification_broker.start)
+    register_after_fork(notification_broker.reset_after_fork)
+    register_shutdown(notification_broker.stop)
+    subscription_repository = SubscriptionRepositoryImpl()
+    alert_stats_repository = AlertStatsRepositoryImpl(
+        cell_size=settings.STATS_CELL_SIZE,
+        archive_repository=archive_repository,
+        databases=getattr(notification_repository, 'databases', None)
     )
+    local_forecast_cache = InMemoryForecastCache()
+    if settings.FORECAST_CACHE_ENABLED:
+        forecast_cache = TieredForecastCache(
+            local=local_forecast_cache,
+            shared=SQLiteForecastCache(settings.FORECAST_CACHE_PATH, max_stale=settings.WEATHER_STALE_TTL),
+            local_ttl=settings.FORECAST_CACHE_LOCAL_TTL
+        )
+    else:
+        forecast_cache = local_forecast_cache
+    
+    weather_quota = QuotaManager(
+        path=settings.WEATHER_QUOTA_PATH,
+        per_minute=settings.WEATHER_QUOTA_PER_MINUTE,
+        per_month=settings.WEATHER_QUOTA_PER_MONTH,
+        tight_ratio=settings.WEATHER_QUOTA_TIGHT_RATIO
+    )
+    weather_providers = [
+        _create_weather_provider(name, settings, weather_quota) for name in settings.weather_providers
+    ]
+    if len(weather_providers) == 1:
+        weather_provider = weather_providers[0]
+    else:
+        weather_provider = WeatherProviderRouter(
+            providers=weather_providers,
+            error_threshold=settings.WEATHER_ROUTER_ERROR_THRESHOLD,
+            cooldown_seconds=settings.WEATHER_ROUTER_COOLDOWN_SECONDS,
+            probe_seconds=settings.WEATHER_ROUTER_PROBE_SECONDS
+        )
+    # Historial de todo lo que se trae del upstream, por celda
+    observation_repository = None
+    if settings.OBSERVATIONS_ENABLED:
+        observation_repository = ObservationRepositoryImpl(flush_interval=settings.OBSERVATIONS_FLUSH_SECONDS)
+    weather_service = ResilientWeatherService(
+        weather_service=weather_provider,
+        breaker=CircuitBreaker(
+            failure_rate_threshold=settings.BREAKER_FAILURE_RATE,
+            slow_call_seconds=settings.BREAKER_SLOW_CALL_SECONDS,
+            slow_call_rate_threshold=settings.BREAKER_SLOW_CALL_RATE,
+            window_size=settings.BREAKER_WINDOW_SIZE,
+            min_calls=settings.BREAKER_MIN_CALLS,
+            open_seconds=settings.BREAKER_OPEN_SECONDS,
+            half_open_calls=settings.BREAKER_HALF_OPEN_CALLS
+        ),
+        fallback_cache=forecast_cache,
+        cell_size=settings.WEATHER_CELL_SIZE,
+        stale_ttl=settings.WEATHER_STALE_TTL,
+        hedge_enabled=settings.WEATHER_HEDGE_ENABLED,
+        hedge_min_delay=settings.WEATHER_HEDGE_MIN_DELAY,
+        populate_fallback=not settings.FORECAST_CACHE_ENABLED,
+        quota=weather_quota,
+        observation_repository=observation_repository
+    )
+    demand_repository = None
+    if settings.FORECAST_CACHE_ENABLED:
+        demand_repository = CellDemandRepositoryImpl(
+            cell_size=settings.WEATHER_CELL_SIZE,
+            databases=getattr(notification_repository, 'databases', None)
+        )
+        weather_service = CachedWeatherService(
+            weather_service=weather_service,
+            cache=forecast_cache,
+            ttl=settings.FORECAST_CACHE_TTL,
+            cell_size=settings.WEATHER_CELL_SIZE,
+            quota=weather_quota,
+            degraded_cell_size=settings.WEATHER_DEGRADED_CELL_SIZE,
+            degraded_ttl_factor=settings.WEATHER_DEGRADED_TTL_FACTOR,
+            demand_repository=demand_repository
+        )
     email_service = EmailService(
         server=settings.MAIL_SERVER,
         port=settings.MAIL_PORT,
         username=settings.MAIL_USERNAME,
         password=settings.MAIL_PASSWORD,
-        use_tls=settings.MAIL_USE_TLS
+        use_tls=settings.MAIL_USE_TLS,
+        pool_size=settings.MAIL_POOL_SIZE,
+        pool_idle_seconds=settings.MAIL_POOL_IDLE_SECONDS,
+        timeout=settings.MAIL_TIMEOUT
     )
     
+    # Canales de alerta además del correo
+    notification_channels = {}
+    webhook_service = None
+    if settings.WEBHOOK_ENABLED:
+        if not settings.WEBHOOK_SECRET:
+            raise ValueError("WEBHOOK_ENABLED requiere WEBHOOK_SECRET para firmar los lotes")
+        webhook_service = WebhookService(
+            secret=settings.WEBHOOK_SECRET,
+            batch_size=settings.WEBHOOK_BATCH_SIZE,
+            batch_wait_seconds=settings.WEBHOOK_BATCH_WAIT_SECONDS,
+            timeout=settings.WEBHOOK_TIMEOUT,
+            workers=settings.WEBHOOK_WORKERS,
+            max_attempts=settings.WEBHOOK_MAX_ATTEMPTS,
+            backoff_seconds=settings.WEBHOOK_BACKOFF_SECONDS,
+            allowed_hosts=settings.webhook_allowed_hosts,
+            allow_private_networks=settings.WEBHOOK_ALLOW_PRIVATE_NETWORKS
+        )
+        start_background(webhook_service.start)
+        notification_channels[WebhookService.name] = webhook_service
+    
+    # Application Layer - Services
+    alert_digest = None
+    if settings.DIGEST_ENABLED:
+        alert_digest = AlertDigest(
+            email_service=email_service,
+            window_seconds=settings.DIGEST_WINDOW_SECONDS,
+            urgent_codes=settings.digest_urgent_codes
+        )
+        start_background(alert_digest.start)
+        register_after_fork(alert_digest.reset_after_fork)
+        register_shutdown(alert_digest.stop)
+        metrics.register_gauge('alert_digest.pending', alert_digest.pending_count)
+    
+    if settings.PREFETCH_ENABLED and demand_repository is not None:
+        cache_prefetcher = CachePrefetcher(
+            weather_service=weather_service,
+            demand_repository=demand_repository,
+            cells_per_hour=settings.PREFETCH_CELLS,
+            lead_minutes=settings.PREFETCH_LEAD_MINUTES,
+            rate_per_second=settings.PREFETCH_RATE,
+            history_days=settings.PREFETCH_HISTORY_DAYS
+        )
+        start_background(cache_prefetcher.start)
+        register_after_fork(cache_prefetcher.reset_after_fork)
+        register_shutdown(cache_prefetcher.stop)
+        metrics.register_gauge('prefetch.last_run', cache_prefetcher.report)
+    
     # Application Layer - Use Cases
     check_weather_use_case = CheckWeatherUseCase(
         notification_repository=notification_repository,
         weather_service=weather_service,
-        email_service=email_service
+        email_service=email_service,
+        alert_digest=alert_digest,
+        channels=notification_channels
+    )
+    # Áreas: las celdas se piden al mismo servicio del clima (y su caché) que /check_weather
+    check_area_use_case = CheckAreaWeatherUseCase(
+        weather_service=weather_service,
+        email_service=email_service,
+        notification_repository=notification_repository,
+        cell_size=settings.WEATHER_CELL_SIZE,
+        max_samples=settings.AREA_MAX_SAMPLES,
+        max_workers=settings.AREA_MAX_WORKERS
     )
+    register_after_fork(check_area_use_case.reset_after_fork)
+    register_shutdown(check_area_use_case.close)
+    if settings.SWEEP_ENABLED:
+        # Cada worker (de este u otros hosts) barre las particiones que logre reclamar
+        weather_sweeper = WeatherSweeper(
+            check_weather_use_case=check_weather_use_case,
+            subscription_repository=subscription_repository,
+            lease_repository=SweepLeaseRepositoryImpl(),
+            cell_size=settings.WEATHER_CELL_SIZE,
+            partitions=settings.SWEEP_PARTITIONS,
+            interval_seconds=settings.SWEEP_INTERVAL_SECONDS,
+            lease_seconds=settings.SWEEP_LEASE_SECONDS,
+            rate_per_second=settings.SWEEP_RATE
+        )
+        start_background(weather_sweeper.start)
+        register_after_fork(weather_sweeper.reset_after_fork)
+        register_shutdown(weather_sweeper.stop)
+        metrics.register_gauge('sweep.progress', weather_sweeper.report)
     get_notifications_use_case = GetNotificationsUseCase(
+        notification_repository=notification_repository,
+        recipient_filter=recipient_filter
+    )
+    find_nearby_notifications_use_case = FindNearbyNotificationsUseCase(
         notification_repository=notification_repository
     )
+    get_notification_history_use_case = GetNotificationHistoryUseCase(
+        notification_repository=notification_repository,
+        archive_repository=archive_repository
+    )
+    stream_notifications_use_case = StreamNotificationsUseCase(
+        notification_repository=notification_repository,
+        broker=notification_broker,
+        heartbeat_seconds=settings.SSE_HEARTBEAT_SECONDS,
+        max_stream_seconds=settings.SSE_MAX_STREAM_SECONDS
+    )
+    import_subscriptions_use_case = ImportSubscriptionsUseCase(
+        subscription_repository=subscription_repository,
+        batch_size=settings.IMPORT_BATCH_SIZE
+    )
+    get_alert_stats_use_case = GetAlertStatsUseCase(
+        alert_stats_repository=alert_stats_repository,
+        cell_size=settings.STATS_CELL_SIZE
+    )
+    get_cell_observations_use_case = None
+    if observation_repository is not None:
+        get_cell_observations_use_case = GetCellObservationsUseCase(
+            observation_repository=observation_repository,
+            cell_size=settings.WEATHER_CELL_SIZE
+        )
+    
+    # Instrumentación de memoria: cachés, pools y buffers del proceso con sus presupuestos
+    memory_monitor = MemoryMonitor(
+        sample_seconds=settings.MEMORY_SAMPLE_SECONDS,
+        history_size=settings.MEMORY_HISTORY_SIZE,
+        rss_budget_bytes=int(settings.MEMORY_RSS_BUDGET_MB * 1024 * 1024)
+    )
     
     # Presentation Layer - Routes
+    idempotency_store = None
+    local_idempotency_store = None
+    if settings.IDEMPOTENCY_ENABLED and settings.IDEMPOTENCY_PATH:
+        # Compartido: el reintento suele llegar a otro worker
+        idempotency_store = SQLiteIdempotencyStore(
+            settings.IDEMPOTENCY_PATH,
+            ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+            max_entries=settings.IDEMPOTENCY_MAX_ENTRIES,
+            wait_timeout=settings.IDEMPOTENCY_WAIT_SECONDS
+        )
+    elif settings.IDEMPOTENCY_ENABLED:
+        idempotency_store = local_idempotency_store = IdempotencyStore(
+            ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+            max_entries=settings.IDEMPOTENCY_MAX_ENTRIES,
+            wait_timeout=settings.IDEMPOTENCY_WAIT_SECONDS
+        )
     weather_routes = WeatherRoutes(
         check_weather_use_case=check_weather_use_case,
-        get_notifications_use_case=get_notifications_use_case
+        get_notifications_use_case=get_notifications_use_case,
+        idempotency_store=idempotency_store,
+        deadline_seconds=settings.REQUEST_DEADLINE_SECONDS or None,
+        check_area_use_case=check_area_use_case
     )
     
+    notification_routes = NotificationRoutes(
+        find_nearby_notifications_use_case=find_nearby_notifications_use_case,
+        get_notification_history_use_case=get_notification_history_use_case,
+        stream_notifications_use_case=stream_notifications_use_case
+    )
+    stats_routes = StatsRoutes(
+        get_alert_stats_use_case=get_alert_stats_use_case,
+        get_cell_observations_use_case=get_cell_observations_use_case
+    )
+    subscription_routes = SubscriptionRoutes(import_subscriptions_use_case=import_subscriptions_use_case)
+    metrics_routes = MetricsRoutes(registry=metrics)
+    admin_routes = AdminRoutes(memory_monitor=memory_monitor)
+    
+    memory_budgets = settings.memory_budgets
+    for name, component in (
+        ('forecast_cache.local', local_forecast_cache),
+        ('idempotency', local_idempotency_store),
+        ('cell_demand.buffer', demand_repository),
+        ('observations.buffer', observation_repository),
+        ('alert_digest', alert_digest),
+        ('smtp_pool', email_service),
+        ('webhook.pending', webhook_service),
+        ('recipient_filter', recipient_filter),
+        ('notification_stream', notification_broker)
+    ):
+        if component is not None:
+            memory_monitor.register(name, component, memory_budgets.get(name))
+    if settings.MEMORY_TRACEMALLOC:
+        memory_monitor.start_tracing()
+    start_background(memory_monitor.start)
+    register_after_fork(memory_monitor.reset_after_fork)
+    register_shutdown(memory_monitor.stop)
+    
     # Registrar blueprints
     app.register_blueprint(weather_routes.get_blueprint())
+    app.register_blueprint(notification_routes.get_blueprint())
+    app.register_blueprint(stats_routes.get_blueprint())
+    app.register_blueprint(subscription_routes.get_blueprint())
+    app.register_blueprint(metrics_routes.get_blueprint())
+    app.register_blueprint(admin_routes.get_blueprint())
+    
+    # Log de acceso: va primero para registrar también lo que rechacen los demás middlewares
+    if settings.ACCESS_LOG_ENABLED:
+        access_logger = AccessLogger(
+            path=settings.ACCESS_LOG_PATH,
+            max_bytes=int(settings.ACCESS_LOG_MAX_MB * 1024 * 1024),
+            backup_count=settings.ACCESS_LOG_BACKUP_COUNT,
+            sample_rate=settings.ACCESS_LOG_SAMPLE_RATE,
+            slow_ms=settings.ACCESS_LOG_SLOW_MS,
+            queue_size=settings.ACCESS_LOG_QUEUE_SIZE
+        )
+        start_background(access_logger.start)
+        register_after_fork(access_logger.reset_after_fork)
+        register_shutdown(access_logger.stop)
+        memory_monitor.register('access_log.queue', access_logger, memory_budgets.get('access_log.queue'))
+        AccessLogMiddleware(access_logger).init_app(app)
+    
+    # Control de admisión: el camino de alertas no puede acaparar los hilos de las lecturas
+    if settings.ADMISSION_ENABLED:
+        queue_target = settings.ADMISSION_QUEUE_TARGET_MS / 1000.0
+        AdmissionMiddleware(
+            limiters={
+                'alerts': ConcurrencyLimiter(
+                    'alerts',
+                    max_limit=settings.ADMISSION_ALERTS_LIMIT,
+                    max_queue=settings.ADMISSION_ALERTS_QUEUE,
+                    queue_target=queue_target,
+                    adaptive=settings.ADMISSION_ADAPTIVE
+                ),
+                'reads': ConcurrencyLimiter(
+                    'reads',
+                    max_limit=settings.ADMISSION_READS_LIMIT,
+                    max_queue=settings.ADMISSION_READS_QUEUE,
+                    queue_target=queue_target,
+                    adaptive=settings.ADMISSION_ADAPTIVE
+                ),
+                # Las importaciones duran minutos: límite fijo y sin cola
+                'bulk': ConcurrencyLimiter('bulk', max_limit=settings.ADMISSION_BULK_LIMIT, adaptive=False)
+            },
+            route_classes={
+                'weather.check_weather': 'alerts',
+                'weather.check_area': 'alerts',
+                # Los streams SSE duran minutos: los acota SSE_MAX_CONNECTIONS, no esta clase
+                'notifications.stream_notifications': 'streams',
+                'subscriptions': 'bulk',
+                'weather': 'reads',
+                'notifications': 'reads',
+                'stats': 'reads'
+            },
+            # Todas las rutas limitadas exigen API key: sin ella no se toma turno
+            authenticate=api_key_error
+        ).init_app(app)
     
     return app
 
 
-# Crear aplicación
-app = create_app()
-
-
-# Correr la app
+# Correr la app con el servidor de desarrollo.
+# En producción usar: gunicorn -c gunicorn.conf.py wsgi:app
 if __name__ == "__main__":
+    app = create_app()
     port = int(os.environ.get("PORT", 5000))
-    app.run(host="0.0.0.0", port=port)
\ No newline at end of file
+    try:
+        app.run(host="0.0.0.0", port=port)
+    finally:
+        run_shutdown_hooks()
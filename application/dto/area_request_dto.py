@@ -0,0 +1,29 @@
+"""
+Area Request DTO - Capa de Aplicación
+Data Transfer Object para verificar el clima sobre un área
+"""
+from dataclasses import dataclass
+from typing import Optional
+from domain.entities.area import Area
+
+
+@dataclass
+class AreaRequestDTO:
+    """DTO para solicitudes de verificación de clima sobre una caja o un polígono"""
+    
+    area: Area
+    # Con email, las sub-áreas adversas se avisan en una sola alerta
+    email: Optional[str] = None
+    name: str = 'el área'
+    # Segundos que tiene la solicitud para completarse (None = sin plazo)
+    deadline_seconds: Optional[float] = None
+    
+    def validate(self) -> tuple[bool, str]:
+        """Valida los datos del DTO"""
+        if self.email is not None and '@' not in self.email:
+            return False, "Email inválido"
+        
+        if self.deadline_seconds is not None and not self.deadline_seconds > 0:
+            return False, "El plazo de la solicitud debe ser mayor que 0"
+        
+        return True, ""
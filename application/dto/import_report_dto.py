@@ -0,0 +1,46 @@
+"""
+Import Report DTO - Capa de Aplicación
+Data Transfer Object con el resultado de una importación masiva
+"""
+from dataclasses import dataclass, field
+from typing import List
+
+
+@dataclass
+class RejectedRowDTO:
+    """Fila rechazada y el motivo"""
+    
+    line: int
+    error: str
+
+
+@dataclass
+class ImportReportDTO:
+    """DTO con los totales de la importación y las filas rechazadas (acotadas)"""
+    
+    rows: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    rejected: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+    rejected_rows: List[RejectedRowDTO] = field(default_factory=list)
+    
+    @property
+    def rows_per_second(self) -> float:
+        """Filas procesadas por segundo"""
+        return round(self.rows / self.elapsed_seconds, 1) if self.elapsed_seconds else 0.0
+    
+    def to_dict(self) -> dict:
+        """Convierte el DTO a un diccionario"""
+        return {
+            'rows': self.rows,
+            'imported': self.imported,
+            'duplicates': self.duplicates,
+            'rejected': self.rejected,
+            'batches': self.batches,
+            'elapsed_seconds': self.elapsed_seconds,
+            'rows_per_second': self.rows_per_second,
+            'rejected_rows': [{'line': r.line, 'error': r.error} for r in self.rejected_rows],
+            'rejected_rows_truncated': self.rejected > len(self.rejected_rows)
+        }
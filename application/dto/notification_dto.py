@@ -4,6 +4,7 @@ Data Transfer Object para respuestas de notificaciones
 """
 from dataclasses import dataclass
 from typing import List
+from domain.entities.notification import Notification
 
 
 @dataclass
@@ -15,6 +16,17 @@ class NotificationDTO:
     longitude: float
     condition: str
     code: int
+    
+    @classmethod
+    def from_entity(cls, notification: Notification) -> 'NotificationDTO':
+        """Crea el DTO a partir de la entidad de dominio"""
+        return cls(
+            sent_at=notification.sent_at.strftime('%Y-%m-%d %H:%M:%S'),
+            latitude=notification.latitude,
+            longitude=notification.longitude,
+            condition=notification.condition,
+            code=notification.code
+        )
 
 
 @dataclass
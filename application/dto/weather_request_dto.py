@@ -2,7 +2,11 @@
 Weather Request DTO - Capa de Aplicación
 Data Transfer Object para solicitudes de clima
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+CHANNELS = ('email', 'webhook')
 
 
 @dataclass
@@ -12,12 +16,30 @@ class WeatherRequestDTO:
     latitude: float
     longitude: float
     email: str
+    channels: List[str] = field(default_factory=lambda: ['email'])
+    webhook_url: Optional[str] = None
+    # Segundos que tiene la solicitud para completarse (None = sin plazo)
+    deadline_seconds: Optional[float] = None
+    
+    def address_for(self, channel: str) -> str:
+        """Dirección del destinatario en un canal"""
+        return self.webhook_url if channel == 'webhook' else self.email
     
     def validate(self) -> tuple[bool, str]:
         """Valida los datos del DTO"""
         if not self.email or '@' not in self.email:
             return False, "Email inválido"
         
+        if not self.channels or len(set(self.channels)) != len(self.channels):
+            return False, "channels debe listar al menos un canal, sin repetir"
+        
+        unknown = [channel for channel in self.channels if channel not in CHANNELS]
+        if unknown:
+            return False, f"Canal desconocido: {unknown[0]}. Opciones: {', '.join(CHANNELS)}"
+        
+        if 'webhook' in self.channels and not self.webhook_url:
+            return False, "webhook_url es requerido para el canal webhook"
+        
         if not isinstance(self.latitude, (int, float)) or not isinstance(self.longitude, (int, float)):
             return False, "Latitud y longitud deben ser números"
         
@@ -27,4 +49,7 @@ class WeatherRequestDTO:
         if not (-180 <= self.longitude <= 180):
             return False, "Longitud debe estar entre -180 y 180"
         
+        if self.deadline_seconds is not None and not self.deadline_seconds > 0:
+            return False, "El plazo de la solicitud debe ser mayor que 0"
+        
         return True, ""
@@ -0,0 +1,156 @@
+"""
+Alert Digest - Capa de Aplicación
+Agrupa las alertas pendientes de cada destinatario en un único correo
+"""
+import logging
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List
+from domain.entities.forecast import Forecast
+from application.services.alert_messages import render_digest
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingDigest:
+    """Alertas acumuladas de un destinatario y el momento en que vence su ventana"""
+
+    due_at: float
+    forecasts: List[Forecast] = field(default_factory=list)
+    attempts: int = 0
+
+
+class AlertDigest:
+    """
+    Acumula alertas por destinatario durante una ventana y las envía juntas.
+    Las condiciones urgentes no se acumulan: el caso de uso las envía de inmediato.
+    El resumen vive en memoria del proceso; al apagar se envía lo pendiente.
+    """
+
+    MAX_ATTEMPTS = 3
+
+    def __init__(
+        self,
+        email_service,
+        window_seconds: float = 3600.0,
+        urgent_codes: Iterable[int] = (),
+        clock=time.monotonic
+    ):
+        self.email_service = email_service
+        self.window_seconds = window_seconds
+        self.urgent_codes = frozenset(urgent_codes)
+        self._clock = clock
+        self._pending: Dict[str, _PendingDigest] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def is_urgent(self, forecast: Forecast) -> bool:
+        """Indica si la condición debe saltarse la ventana del resumen"""
+        return forecast.condition_code in self.urgent_codes
+
+    def add(self, email: str, forecast: Forecast):
+        """Agrega una alerta al resumen pendiente del destinatario"""
+        with self._lock:
+            pending = self._pending.get(email)
+            if pending is None:
+                pending = self._pending[email] = _PendingDigest(due_at=self._clock() + self.window_seconds)
+            pending.forecasts.append(forecast)
+
+    def pending_count(self) -> int:
+        """Número de alertas aún no enviadas"""
+        with self._lock:
+            return sum(len(pending.forecasts) for pending in self._pending.values())
+
+    def memory_usage(self) -> int:
+        """Bytes aproximados de las alertas pendientes, medidos sobre una de ellas"""
+        with self._lock:
+            count = sum(len(pending.forecasts) for pending in self._pending.values())
+            sample = next((pending.forecasts[0] for pending in self._pending.values() if pending.forecasts), None)
+            container = sys.getsizeof(self._pending)
+        if sample is None:
+            return container
+        per_forecast = sys.getsizeof(sample) + sum(sys.getsizeof(value) for value in vars(sample).values())
+        return container + count * per_forecast
+
+    def shrink(self, max_bytes: int) -> int:
+        """Bajo presión de memoria, envía todos los resúmenes sin esperar su ventana"""
+        return self.flush_all()
+
+    def flush_due(self) -> int:
+        """Envía los resúmenes cuya ventana ya venció; retorna cuántos envió"""
+        now = self._clock()
+        with self._lock:
+            due = [email for email, pending in self._pending.items() if pending.due_at <= now]
+            batches = [(email, self._pending.pop(email)) for email in due]
+        return self._send(batches)
+
+    def flush_all(self) -> int:
+        """Envía todos los resúmenes pendientes sin esperar su ventana"""
+        with self._lock:
+            batches = list(self._pending.items())
+            self._pending.clear()
+        return self._send(batches)
+
+    def start(self, tick_seconds: float = 1.0) -> 'AlertDigest':
+        """Inicia el hilo que envía los resúmenes vencidos"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, args=(tick_seconds,), name='alert-digest', daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Detiene el hilo y envía lo pendiente"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush_all()
+
+    def reset_after_fork(self):
+        """El hilo no sobrevive al fork y lo acumulado pertenece al padre"""
+        self._lock = threading.Lock()
+        self._pending = {}
+        if self._thread is not None:
+            self._thread = None
+            self.start()
+
+    def _run(self, tick_seconds: float):
+        while not self._stop.wait(tick_seconds):
+            try:
+                self.flush_due()
+            except Exception:
+                logger.exception("Error al enviar resúmenes de alertas")
+
+    def _send(self, batches) -> int:
+        sent = 0
+        for email, pending in batches:
+            subject, body = render_digest(pending.forecasts)
+            try:
+                self.email_service.send_email(email, subject, body)
+                sent += 1
+            except Exception:
+                pending.attempts += 1
+                if pending.attempts >= self.MAX_ATTEMPTS:
+                    logger.exception("Se descarta el resumen para %s tras %d intentos", email, pending.attempts)
+                    continue
+                logger.warning("Falló el envío del resumen para %s; se reintentará", email)
+                self._requeue(email, pending)
+        return sent
+
+    def _requeue(self, email: str, pending: _PendingDigest):
+        with self._lock:
+            current = self._pending.get(email)
+            if current is not None:
+                current.forecasts[:0] = pending.forecasts
+                current.attempts = max(current.attempts, pending.attempts)
+            else:
+                pending.due_at = self._clock() + self.window_seconds
+                self._pending[email] = pending
@@ -0,0 +1,78 @@
+"""
+Alert Messages - Capa de Aplicación
+Redacción de los correos de alerta individuales y de resumen
+"""
+from typing import List, Tuple
+from domain.entities.forecast import Forecast
+
+
+def render_alert(forecast: Forecast) -> Tuple[str, str]:
+    """Retorna (asunto, cuerpo) de la alerta de un pronóstico adverso"""
+    subject = f"⚠️ Alerta Climática - {forecast.condition}"
+    body = f"""
+        Se ha detectado una condición climática adversa en tu ubicación:
+
+        📍 Ubicación: {forecast.location}
+        🌡️ Temperatura: {forecast.temperature_c}°C
+        ☁️ Condición: {forecast.condition}
+        💧 Humedad: {forecast.humidity}%
+        💨 Viento: {forecast.wind_kph} km/h
+
+        Por favor, toma las precauciones necesarias.
+
+        Fecha: {forecast.forecast_date.strftime('%Y-%m-%d %H:%M:%S')}
+        """
+    return subject, body
+
+
+def render_digest(forecasts: List[Forecast]) -> Tuple[str, str]:
+    """
+    Retorna (asunto, cuerpo) de un resumen con varias alertas.
+    Las alertas repetidas de una misma ubicación y condición se agrupan.
+    """
+    groups = {}
+    for forecast in forecasts:
+        key = (forecast.location, forecast.condition)
+        count, _ = groups.get(key, (0, None))
+        groups[key] = (count + 1, forecast)
+
+    lines = []
+    for (location, condition), (count, latest) in groups.items():
+        repeated = f" (x{count})" if count > 1 else ""
+        lines.append(
+            f"        • {latest.forecast_date.strftime('%Y-%m-%d %H:%M')} - 📍 {location}: "
+            f"{condition}{repeated}, {latest.temperature_c}°C, viento {latest.wind_kph} km/h"
+        )
+
+    subject = f"⚠️ Resumen de Alertas Climáticas ({len(forecasts)})"
+    body = (
+        "\n        Se detectaron condiciones climáticas adversas en tus ubicaciones:\n\n"
+        + "\n".join(lines)
+        + "\n\n        Por favor, toma las precauciones necesarias.\n        "
+    )
+    return subject, body
+
+
+def render_area_alert(area_name: str, forecasts: List[Forecast], sampled: int) -> Tuple[str, str]:
+    """
+    Retorna (asunto, cuerpo) de una sola alerta para un área: las celdas
+    adversas se agrupan por condición
+    """
+    groups = {}
+    for forecast in forecasts:
+        groups.setdefault(forecast.condition, []).append(forecast)
+
+    lines = []
+    for condition, matching in sorted(groups.items(), key=lambda item: -len(item[1])):
+        locations = ', '.join(sorted({forecast.location for forecast in matching})[:5])
+        hottest = max(forecast.temperature_c for forecast in matching)
+        lines.append(f"        • {condition}: {len(matching)} sub-área(s), hasta {hottest}°C - 📍 {locations}")
+
+    subject = f"⚠️ Alerta Climática en {area_name} ({len(forecasts)} de {sampled} sub-áreas)"
+    body = (
+        f"\n        Se detectaron condiciones climáticas adversas en {len(forecasts)} de las {sampled} "
+        f"sub-áreas revisadas de {area_name}:\n\n"
+        + "\n".join(lines)
+        + "\n\n        Por favor, toma las precauciones necesarias.\n        "
+    )
+    return subject, body
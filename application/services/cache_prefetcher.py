@@ -0,0 +1,161 @@
+"""
+Cache Prefetcher - Capa de Aplicación
+Precalienta la caché de pronósticos con las celdas más demandadas de la
+próxima hora, poco antes de que empiece
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+from domain.entities.geo_cell import GeoCell
+from domain.repositories.cell_demand_repository import CellDemandRepository
+from domain.services.request_priority import background
+
+
+logger = logging.getLogger(__name__)
+
+
+class CachePrefetcher:
+    """
+    Cada `tick` vuelca la demanda registrada y, si faltan menos de
+    `lead_minutes` para la próxima hora, reclama esa ejecución (solo un worker
+    la obtiene) y refresca las `cells_per_hour` celdas con más demanda en esa
+    hora del día durante los últimos `history_days` días. Las llamadas salen
+    como trabajo de fondo, a lo sumo `rate_per_second` por segundo.
+    """
+
+    MAX_CONSECUTIVE_ERRORS = 5
+
+    def __init__(
+        self,
+        weather_service,
+        demand_repository: CellDemandRepository,
+        cells_per_hour: int = 200,
+        lead_minutes: int = 10,
+        rate_per_second: float = 5.0,
+        history_days: int = 14,
+        clock=datetime.now
+    ):
+        self.weather_service = weather_service
+        self.demand_repository = demand_repository
+        self.cells_per_hour = cells_per_hour
+        self.lead_minutes = lead_minutes
+        self.rate_per_second = rate_per_second
+        self.history_days = history_days
+        self._clock = clock
+        self._last_target = None
+        self._last_run = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def plan(self, target: datetime) -> List[GeoCell]:
+        """Celdas a refrescar para la hora que empieza en `target`"""
+        since = (target - timedelta(days=self.history_days)).date()
+        hottest = self.demand_repository.hottest_cells(target.hour, since, self.cells_per_hour)
+        return [GeoCell.from_key(cell_key) for cell_key, _ in hottest]
+
+    def run(self, target: datetime) -> dict:
+        """Refresca las celdas planeadas para `target` respetando el ritmo configurado"""
+        cells = self.plan(target)
+        interval = 1.0 / self.rate_per_second if self.rate_per_second > 0 else 0.0
+        started = time.monotonic()
+        refreshed = 0
+        errors = 0
+        consecutive_errors = 0
+
+        with background():
+            for index, cell in enumerate(cells):
+                if index and self._stop.wait(interval):
+                    break
+                try:
+                    self.weather_service.refresh(*cell.center)
+                    refreshed += 1
+                    consecutive_errors = 0
+                except Exception as e:
+                    errors += 1
+                    consecutive_errors += 1
+                    logger.warning("No se pudo precalentar la celda %s: %s", cell.key, e)
+                    if consecutive_errors >= self.MAX_CONSECUTIVE_ERRORS:
+                        logger.warning("Se interrumpe el precalentamiento tras %d errores seguidos", errors)
+                        break
+
+        self.demand_repository.purge_before((target - timedelta(days=self.history_days)).date())
+        self._last_run = {
+            'target': target,
+            'cells': [cell.key for cell in cells],
+            'refreshed': refreshed,
+            'errors': errors,
+            'duration_seconds': round(time.monotonic() - started, 3)
+        }
+        logger.info("Precalentadas %d/%d celdas para las %s", refreshed, len(cells), target.strftime('%H:%M'))
+        return self.report()
+
+    def tick(self) -> Optional[dict]:
+        """Vuelca la demanda y ejecuta el precalentamiento si corresponde"""
+        self.demand_repository.flush()
+        now = self._clock()
+        target = (now + timedelta(minutes=self.lead_minutes)).replace(minute=0, second=0, microsecond=0)
+        if target <= now or target == self._last_target:
+            return None
+
+        self._last_target = target
+        if not self.demand_repository.claim_run(target.strftime('%Y-%m-%dT%H')):
+            return None
+        return self.run(target)
+
+    def report(self) -> dict:
+        """
+        Resultado de la última ejecución de este proceso. Una vez empezada la
+        hora precalentada incluye cuánta de su demanda cayó en celdas
+        precalentadas (consultas servidas en caliente desde el primer acceso)
+        """
+        if self._last_run is None:
+            return {}
+
+        target = self._last_run['target']
+        report = {key: value for key, value in self._last_run.items() if key not in ('target', 'cells')}
+        report['hour'] = target.strftime('%Y-%m-%d %H:00')
+        report['planned'] = len(self._last_run['cells'])
+
+        if self._clock() >= target:
+            demand = self.demand_repository.demand_by_cell(target.date(), target.hour)
+            total = sum(demand.values())
+            warmed = {key: demand[key] for key in self._last_run['cells'] if key in demand}
+            report['requests_in_hour'] = total
+            report['requests_on_prefetched_cells'] = sum(warmed.values())
+            report['prefetched_cells_requested'] = len(warmed)
+            report['coverage'] = round(sum(warmed.values()) / total, 4) if total else 0.0
+        return report
+
+    def start(self, tick_seconds: float = 30.0) -> 'CachePrefetcher':
+        """Inicia el hilo que ejecuta `tick` periódicamente"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run_loop, args=(tick_seconds,), name='cache-prefetcher', daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Detiene el hilo y vuelca la demanda pendiente"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.demand_repository.flush()
+
+    def reset_after_fork(self):
+        """El hilo no sobrevive al fork: cada worker arranca el suyo"""
+        self._stop = threading.Event()
+        if self._thread is not None:
+            self._thread = None
+            self.start()
+
+    def _run_loop(self, tick_seconds: float):
+        while not self._stop.wait(tick_seconds):
+            try:
+                self.tick()
+            except Exception:
+                logger.exception("Error en el precalentamiento de la caché")
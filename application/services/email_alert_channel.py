@@ -0,0 +1,29 @@
+"""
+Email Alert Channel - Capa de Aplicación
+Canal de alertas por correo, con el resumen periódico opcional
+"""
+from domain.entities.forecast import Forecast
+from domain.services.notification_channel import NotificationChannel
+from application.services.alert_messages import render_alert
+
+
+class EmailAlertChannel(NotificationChannel):
+    """
+    Envía la alerta por correo de inmediato o, si el modo resumen está activo
+    y la condición no es urgente, la agrega al resumen del destinatario
+    """
+
+    name = 'email'
+
+    def __init__(self, email_service, alert_digest=None):
+        self.email_service = email_service
+        self.alert_digest = alert_digest
+
+    def send_alert(self, address: str, forecast: Forecast) -> bool:
+        if self.alert_digest is not None and not self.alert_digest.is_urgent(forecast):
+            self.alert_digest.add(address, forecast)
+            return True
+
+        subject, body = render_alert(forecast)
+        self.email_service.send_email(address, subject, body)
+        return False
@@ -0,0 +1,250 @@
+"""
+Weather Sweeper - Capa de Aplicación
+Barrido periódico del clima de todas las ubicaciones suscritas, repartido
+entre los procesos que lo ejecuten mediante concesiones por partición
+"""
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+from itertools import groupby
+from typing import Optional
+from domain.entities.geo_cell import GeoCell
+from domain.entities.sweep_lease import SweepLease
+from domain.repositories.subscription_repository import SubscriptionRepository
+from domain.repositories.sweep_lease_repository import SweepLeaseRepository
+from domain.services.request_priority import background
+from application.dto.weather_request_dto import WeatherRequestDTO
+
+
+logger = logging.getLogger(__name__)
+
+
+def sweep_round_key(now: float, interval_seconds: float, partitions: int) -> str:
+    """Ronda que contiene `now`: su inicio en UTC y la cantidad de particiones"""
+    start = now - now % interval_seconds
+    started = datetime.fromtimestamp(start, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+    return f"{started}/{partitions}"
+
+
+class WeatherSweeper:
+    """
+    Cada `interval_seconds` empieza una ronda. Las celdas de `cell_size`
+    grados se reparten en `partitions` particiones (GeoCell.partition) y cada
+    `tick` reclama particiones pendientes de la ronda en curso, una a la vez,
+    con una concesión de `lease_seconds`; por cada suscripción de sus celdas
+    verifica el clima y alerta como POST /check_weather. Cualquier cantidad de
+    procesos, en uno o varios hosts, barre así particiones disjuntas.
+
+    Mientras barre, el worker renueva la concesión cada tercio de su duración
+    (se revisa tras cada suscripción, no solo al terminar la celda) y guarda
+    el avance (la última celda terminada). Cada verificación tiene un plazo de
+    `call_deadline_seconds` (por defecto un tercio de la concesión), así que
+    ni una celda densa ni un upstream o SMTP colgado la dejan vencer mientras
+    el worker sigue enviando alertas. Si muere, la concesión vence y otro
+    worker la retoma desde esa celda: a lo sumo se repiten las celdas barridas
+    desde la última renovación. Al detenerse la libera de
+    inmediato; tras MAX_CONSECUTIVE_ERRORS celdas fallidas seguidas la deja
+    vencer para reintentarla después.
+    """
+
+    MAX_CONSECUTIVE_ERRORS = 5
+
+    def __init__(
+        self,
+        check_weather_use_case,
+        subscription_repository: SubscriptionRepository,
+        lease_repository: SweepLeaseRepository,
+        cell_size: float,
+        partitions: int = 64,
+        interval_seconds: float = 3600.0,
+        lease_seconds: float = 120.0,
+        rate_per_second: float = 5.0,
+        call_deadline_seconds: Optional[float] = None,
+        owner: Optional[str] = None,
+        clock=time.time
+    ):
+        if partitions < 1:
+            raise ValueError("partitions debe ser al menos 1")
+        self.check_weather_use_case = check_weather_use_case
+        self.subscription_repository = subscription_repository
+        self.lease_repository = lease_repository
+        self.cell_size = cell_size
+        self.partitions = partitions
+        self.interval_seconds = interval_seconds
+        self.lease_seconds = lease_seconds
+        self.rate_per_second = rate_per_second
+        self.call_deadline_seconds = call_deadline_seconds or lease_seconds / 3.0
+        self._owner = owner
+        self._clock = clock
+        self._round = None
+        self._last_partition = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def owner(self) -> str:
+        """Identidad del worker en las concesiones (host:pid, se recalcula tras un fork)"""
+        return self._owner or f"{socket.gethostname()}:{os.getpid()}"
+
+    def round_key(self, now: float) -> str:
+        """Ronda de este barrido que contiene `now`"""
+        return sweep_round_key(now, self.interval_seconds, self.partitions)
+
+    def tick(self) -> int:
+        """Barre particiones pendientes de la ronda actual hasta que no quede ninguna; retorna cuántas"""
+        now = self._clock()
+        round_key = self.round_key(now)
+        if round_key != self._round:
+            self._round = round_key
+            # Se conserva la ronda anterior para el reporte
+            self.lease_repository.purge_before(self.round_key(now - self.interval_seconds))
+
+        swept = 0
+        while not self._stop.is_set():
+            lease = self.lease_repository.claim(round_key, self.partitions, self.owner, self.lease_seconds, self._clock())
+            if lease is None:
+                break
+            self.sweep_partition(lease)
+            swept += 1
+        return swept
+
+    def sweep_partition(self, lease: SweepLease) -> dict:
+        """Verifica las suscripciones de la partición desde su cursor, renovando la concesión"""
+        subscriptions = self.subscription_repository.find_in_partition(self.cell_size, lease.partition, self.partitions)
+        interval = 1.0 / self.rate_per_second if self.rate_per_second > 0 else 0.0
+        renew_every = self.lease_seconds / 3.0
+        started = time.monotonic()
+        last_renewal = self._clock()
+        cells = 0
+        errors = 0
+        consecutive_errors = 0
+        status = 'done'
+
+        with background():
+            groups = groupby(
+                subscriptions,
+                key=lambda s: GeoCell.from_coordinates(s.latitude, s.longitude, self.cell_size).index
+            )
+            for cell_index, group in groups:
+                if cell_index <= lease.cursor:
+                    continue
+                if cells and self._stop.wait(interval):
+                    status = 'stopped'
+                    break
+                group = list(group)
+                failed = 0
+                for subscription in group:
+                    try:
+                        self.check_weather_use_case.execute(WeatherRequestDTO(
+                            latitude=subscription.latitude,
+                            longitude=subscription.longitude,
+                            email=subscription.email,
+                            deadline_seconds=self.call_deadline_seconds
+                        ))
+                    except Exception as e:
+                        failed += 1
+                        logger.warning("No se pudo verificar %s en el barrido: %s", subscription.email, e)
+                    last_renewal = self._renew_if_due(lease, last_renewal, renew_every)
+                    if last_renewal is None:
+                        logger.warning("La partición %d pasó a otro worker", lease.partition)
+                        status = 'lost'
+                        break
+                if status == 'lost':
+                    break
+                cells += 1
+                errors += failed
+                consecutive_errors = consecutive_errors + 1 if failed == len(group) else 0
+                lease.cursor = cell_index
+                lease.processed += len(group)
+
+                if consecutive_errors >= self.MAX_CONSECUTIVE_ERRORS:
+                    logger.warning("Se libera la partición %d tras %d celdas fallidas seguidas", lease.partition, consecutive_errors)
+                    status = 'failed'
+                    break
+
+        if status == 'done':
+            if not self.lease_repository.complete(lease, self._clock()):
+                status = 'lost'
+        elif status == 'stopped':
+            # Guarda el avance y la deja disponible para cualquier worker
+            self.lease_repository.renew(lease, 0.0, self._clock())
+        elif status == 'failed':
+            # Guarda el avance; se reintenta cuando venza, sin repetir de inmediato contra un upstream caído
+            self.lease_repository.renew(lease, self.lease_seconds, self._clock())
+
+        self._last_partition = {
+            'partition': lease.partition,
+            'status': status,
+            'cells': cells,
+            'processed': lease.processed,
+            'errors': errors,
+            'resumed': lease.takeovers > 0,
+            'duration_seconds': round(time.monotonic() - started, 3)
+        }
+        logger.info("Barrido de la partición %d de %s: %s, %d celdas", lease.partition, lease.round_key, status, cells)
+        return self._last_partition
+
+    def _renew_if_due(self, lease: SweepLease, last_renewal: float, renew_every: float) -> Optional[float]:
+        """Renueva la concesión si toca; retorna la hora de la última renovación o None si se perdió"""
+        if self._clock() - last_renewal < renew_every:
+            return last_renewal
+        if not self.lease_repository.renew(lease, self.lease_seconds, self._clock()):
+            return None
+        return self._clock()
+
+    def report(self) -> dict:
+        """Avance de la ronda en curso entre todos los workers y la última partición de este proceso"""
+        if self._round is None:
+            return {}
+
+        leases = self.lease_repository.progress(self._round)
+        now = self._clock()
+        done = [lease for lease in leases if lease.done]
+        active = [lease for lease in leases if not lease.done and lease.expires_at > now]
+        report = {
+            'round': self._round,
+            'partitions': self.partitions,
+            'done': len(done),
+            'in_progress': len(active),
+            'pending': self.partitions - len(done) - len(active),
+            'processed': sum(lease.processed for lease in leases),
+            'takeovers': sum(lease.takeovers for lease in leases),
+            'owners': sorted({lease.owner for lease in active})
+        }
+        if self._last_partition is not None:
+            report['last_partition'] = self._last_partition
+        return report
+
+    def start(self, tick_seconds: float = 30.0) -> 'WeatherSweeper':
+        """Inicia el hilo que ejecuta `tick` periódicamente"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run_loop, args=(tick_seconds,), name='weather-sweeper', daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Detiene el hilo; la partición en curso queda liberada con su avance"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def reset_after_fork(self):
+        """El hilo no sobrevive al fork: cada worker arranca el suyo"""
+        self._stop = threading.Event()
+        if self._thread is not None:
+            self._thread = None
+            self.start()
+
+    def _run_loop(self, tick_seconds: float):
+        while not self._stop.wait(tick_seconds):
+            try:
+                self.tick()
+            except Exception:
+                logger.exception("Error en el barrido del clima")
@@ -0,0 +1,73 @@
+"""
+Archive Notifications Use Case - Capa de Aplicación
+Caso de uso que aplica la política de retención de la tabla de notificaciones
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Optional
+from domain.repositories.notification_repository import NotificationRepository
+from domain.repositories.notification_archive_repository import NotificationArchiveRepository
+
+
+class ArchiveNotificationsUseCase:
+    """
+    Mueve al archivo mensual las notificaciones más antiguas que la retención y
+    las elimina de la tabla en lotes. Cada lote se escribe en el archivo antes de
+    borrarse, así que una interrupción nunca pierde filas.
+    """
+    
+    def __init__(
+        self,
+        notification_repository: NotificationRepository,
+        archive_repository: NotificationArchiveRepository,
+        retention_days: int,
+        batch_size: int = 1000
+    ):
+        self.notification_repository = notification_repository
+        self.archive_repository = archive_repository
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+    
+    def execute(self, now: Optional[datetime] = None) -> dict:
+        """
+        Ejecuta el archivado
+        
+        Args:
+            now: Momento de referencia para la retención (por defecto, ahora)
+            
+        Returns:
+            dict: Fecha de corte, filas archivadas, lotes y meses tocados
+        """
+        if self.retention_days < 1:
+            raise ValueError("La retención debe ser de al menos 1 día")
+        
+        cutoff = (now or datetime.now()) - timedelta(days=self.retention_days)
+        archived = 0
+        batches = 0
+        months = set()
+        
+        while True:
+            batch = self.notification_repository.find_sent_before(cutoff, self.batch_size)
+            if not batch:
+                break
+            
+            by_month = defaultdict(list)
+            for notification in batch:
+                by_month[notification.sent_at.strftime('%Y-%m')].append(notification)
+            for month, notifications in sorted(by_month.items()):
+                self.archive_repository.append(month, notifications)
+            
+            deleted = self.notification_repository.delete_by_ids([n.id for n in batch])
+            archived += deleted
+            batches += 1
+            months.update(by_month)
+            
+            if deleted == 0 or len(batch) < self.batch_size:
+                break
+        
+        return {
+            'cutoff': cutoff.strftime('%Y-%m-%d %H:%M:%S'),
+            'archived': archived,
+            'batches': batches,
+            'months': sorted(months)
+        }
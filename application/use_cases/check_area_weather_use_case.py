@@ -0,0 +1,188 @@
+"""
+Check Area Weather Use Case - Capa de Aplicación
+Caso de uso para verificar el clima sobre un área (caja o polígono) y
+avisar las sub-áreas adversas en una sola alerta
+"""
+import contextvars
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Dict, List, Optional
+from domain.entities.forecast import Forecast
+from domain.entities.geo_cell import GeoCell
+from domain.entities.notification import Notification
+from domain.repositories.notification_repository import NotificationRepository
+from domain.services.area_sampling import cell_bounds, sample_area
+from domain.services.deadline import DeadlineExceededException, current_deadline, deadline
+from domain.services.weather_provider import WeatherProvider
+from application.dto.area_request_dto import AreaRequestDTO
+from application.services.alert_messages import render_area_alert
+
+
+class CheckAreaWeatherUseCase:
+    """
+    Muestrea el área con una grilla adaptativa (ver sample_area) y consulta
+    el pronóstico de cada celda en paralelo a través del servicio del clima,
+    que sirve de su caché las celdas ya consultadas. Las celdas de muestreo
+    son múltiplos de `cell_size`, la celda de la caché, así que dos muestras
+    nunca comparten entrada ni llamada al upstream.
+    """
+
+    def __init__(
+        self,
+        weather_service: WeatherProvider,
+        email_service=None,
+        notification_repository: Optional[NotificationRepository] = None,
+        cell_size: float = 0.1,
+        max_samples: int = 64,
+        max_workers: int = 8
+    ):
+        self.weather_service = weather_service
+        self.email_service = email_service
+        self.notification_repository = notification_repository
+        self.cell_size = cell_size
+        self.max_samples = max_samples
+        self.max_workers = max_workers
+        self._executor = self._create_executor()
+
+    def execute(self, request: AreaRequestDTO) -> dict:
+        """
+        Ejecuta el caso de uso de verificación de clima sobre un área
+
+        Args:
+            request: DTO con el área y, opcionalmente, el email a alertar
+
+        Returns:
+            dict: Sub-áreas adversas y la alerta agregada
+
+        Raises:
+            DeadlineExceededException: Si se agota `request.deadline_seconds`
+            Exception: El error del servicio del clima si ninguna celda pudo consultarse
+        """
+        is_valid, error_msg = request.validate()
+        if not is_valid:
+            raise ValueError(error_msg)
+
+        with deadline(request.deadline_seconds):
+            return self._check(request)
+
+    def close(self):
+        """Libera el pool de consultas"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def reset_after_fork(self):
+        """Los hilos del pool no sobreviven al fork: el hijo necesita uno propio"""
+        self._executor = self._create_executor()
+
+    def _check(self, request: AreaRequestDTO) -> dict:
+        size, cells = sample_area(request.area, self.cell_size, self.max_samples)
+        forecasts, failed = self._fetch(cells)
+
+        adverse = [(cell, forecast) for cell, forecast in forecasts.items() if forecast.requires_alert()]
+        result = {
+            'cell_size': size,
+            'sampled_cells': len(cells),
+            'failed_cells': failed,
+            'adverse_weather': bool(adverse),
+            'adverse_areas': [self._sub_area(cell, forecast) for cell, forecast in adverse],
+            'alert': None,
+            'alert_sent': False
+        }
+        if not adverse:
+            result['message'] = 'No se requiere alerta'
+            return result
+
+        adverse_forecasts = [forecast for _, forecast in adverse]
+        conditions = Counter(forecast.condition for forecast in adverse_forecasts)
+        result['alert'] = {
+            'condition': conditions.most_common(1)[0][0],
+            'conditions': dict(conditions),
+            'adverse_cells': len(adverse),
+            'coverage': round(len(adverse) / len(forecasts), 3)
+        }
+        if request.email and self.email_service is not None:
+            subject, body = render_area_alert(request.name, adverse_forecasts, len(forecasts))
+            self.email_service.send_email(request.email, subject, body)
+            self._save_notification(adverse_forecasts, request.email)
+            result['alert_sent'] = True
+            result['message'] = 'Alerta enviada debido a condiciones climáticas adversas en el área'
+        else:
+            result['message'] = 'Condiciones climáticas adversas en el área'
+        return result
+
+    def _fetch(self, cells: List[GeoCell]) -> tuple:
+        """
+        Pronóstico del centro de cada celda, en paralelo; cada consulta conserva
+        el contexto de la solicitud (plazo y prioridad)
+
+        Returns:
+            (pronósticos por celda, cantidad de celdas que fallaron)
+        """
+        if self._executor is None or len(cells) == 1:
+            outcomes = [self._outcome(self.weather_service.get_forecast, *cell.center) for cell in cells]
+        else:
+            futures = [
+                self._executor.submit(contextvars.copy_context().run, self.weather_service.get_forecast, *cell.center)
+                for cell in cells
+            ]
+            current = current_deadline()
+            _, pending = wait(futures, timeout=current.remaining() if current is not None else None)
+            if pending:
+                for future in pending:
+                    future.cancel()
+                raise DeadlineExceededException('weather')
+            outcomes = [self._outcome(future.result) for future in futures]
+
+        forecasts: Dict[GeoCell, Forecast] = {}
+        errors = []
+        for cell, (forecast, error) in zip(cells, outcomes):
+            if error is not None:
+                errors.append(error)
+            else:
+                forecasts[cell] = forecast
+        if errors and not forecasts:
+            raise errors[0]
+        return forecasts, len(errors)
+
+    def _outcome(self, call, *args) -> tuple:
+        """(pronóstico, None) o (None, error); el plazo agotado corta toda la solicitud"""
+        try:
+            return call(*args), None
+        except DeadlineExceededException:
+            raise
+        except Exception as e:
+            return None, e
+
+    def _sub_area(self, cell: GeoCell, forecast: Forecast) -> dict:
+        latitude, longitude = cell.center
+        return {
+            'cell': cell.key,
+            'bbox': list(cell_bounds(cell)),
+            'latitude': latitude,
+            'longitude': longitude,
+            'location': forecast.location,
+            'condition': forecast.condition,
+            'condition_code': forecast.condition_code,
+            'temperature_c': forecast.temperature_c
+        }
+
+    def _save_notification(self, forecasts: List[Forecast], email: str):
+        """Registra la alerta agregada con la condición más frecuente, en su primera sub-área"""
+        if self.notification_repository is None:
+            return
+        condition = Counter(forecast.condition for forecast in forecasts).most_common(1)[0][0]
+        forecast = next(forecast for forecast in forecasts if forecast.condition == condition)
+        self.notification_repository.save(Notification(
+            email=email,
+            latitude=forecast.latitude,
+            longitude=forecast.longitude,
+            condition=forecast.condition,
+            code=forecast.condition_code,
+            sent_at=datetime.now()
+        ))
+
+    def _create_executor(self) -> Optional[ThreadPoolExecutor]:
+        if self.max_workers <= 1:
+            return None
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='area-weather')
@@ -3,10 +3,15 @@ Check Weather Use Case - Capa de Aplicación
 Caso de uso para verificar el clima y enviar alertas
 """
 from datetime import datetime
+from typing import Dict, Optional
 from domain.repositories.notification_repository import NotificationRepository
 from domain.entities.notification import Notification
 from domain.entities.forecast import Forecast
+from domain.services.deadline import deadline
+from domain.services.notification_channel import NotificationChannel
+from domain.services.weather_provider import WeatherProvider
 from application.dto.weather_request_dto import WeatherRequestDTO
+from application.services.email_alert_channel import EmailAlertChannel
 
 
 class CheckWeatherUseCase:
@@ -15,12 +20,17 @@ class CheckWeatherUseCase:
     def __init__(
         self,
         notification_repository: NotificationRepository,
-        weather_service,
-        email_service
+        weather_service: WeatherProvider,
+        email_service,
+        alert_digest=None,
+        channels: Optional[Dict[str, NotificationChannel]] = None
     ):
         self.notification_repository = notification_repository
         self.weather_service = weather_service
         self.email_service = email_service
+        self.alert_digest = alert_digest
+        # El correo siempre está disponible; los demás canales (webhook) son opcionales
+        self.channels = {'email': EmailAlertChannel(email_service, alert_digest), **(channels or {})}
     
     def execute(self, request: WeatherRequestDTO) -> dict:
         """
@@ -31,12 +41,27 @@ class CheckWeatherUseCase:
             
         Returns:
             dict: Resultado de la verificación
+            
+        Raises:
+            DeadlineExceededException: Si se agota `request.deadline_seconds`; cada
+                etapa (clima, correo, base de datos) usa solo lo que queda del plazo
         """
         # Validar request
         is_valid, error_msg = request.validate()
         if not is_valid:
             raise ValueError(error_msg)
+        for name in request.channels:
+            if name not in self.channels:
+                raise ValueError(f"Canal no habilitado: {name}")
         
+        with deadline(request.deadline_seconds):
+            # Una sola validación por solicitud (puede resolver DNS): dentro del plazo
+            for name in request.channels:
+                self.channels[name].validate_address(request.address_for(name))
+            return self._check(request)
+    
+    def _check(self, request: WeatherRequestDTO) -> dict:
+        """Consulta el pronóstico y, si es adverso, alerta y registra la notificación"""
         # Obtener pronóstico del clima
         forecast = self.weather_service.get_forecast(
             request.latitude,
@@ -52,34 +77,37 @@ class CheckWeatherUseCase:
         
         # Si hay clima adverso, enviar alerta y guardar notificación
         if forecast.requires_alert():
-            self._send_alert(forecast, request.email)
+            digested = self._send_alert(forecast, request)
             self._save_notification(forecast, request.email)
             result['alert_sent'] = True
-            result['message'] = 'Alerta enviada debido a condiciones climáticas adversas'
+            result['channels'] = list(request.channels)
+            result['digest'] = digested
+            if digested:
+                result['message'] = 'Alerta agregada al resumen periódico debido a condiciones climáticas adversas'
+            else:
+                result['message'] = 'Alerta enviada debido a condiciones climáticas adversas'
         else:
             result['alert_sent'] = False
             result['message'] = 'No se requiere alerta'
         
         return result
     
-    def _send_alert(self, forecast: Forecast, email: str):
-        """Envía una alerta por correo electrónico"""
-        subject = f"⚠️ Alerta Climática - {forecast.condition}"
-        body = f"""
-        Se ha detectado una condición climática adversa en tu ubicación:
-        
-        📍 Ubicación: {forecast.location}
-        🌡️ Temperatura: {forecast.temperature_c}°C
-        ☁️ Condición: {forecast.condition}
-        💧 Humedad: {forecast.humidity}%
-        💨 Viento: {forecast.wind_kph} km/h
-        
-        Por favor, toma las precauciones necesarias.
-        
-        Fecha: {forecast.forecast_date.strftime('%Y-%m-%d %H:%M:%S')}
+    def _send_alert(self, forecast: Forecast, request: WeatherRequestDTO) -> bool:
         """
+        Entrega la alerta por cada canal elegido por el destinatario. Por correo
+        puede quedar en el resumen del destinatario si el modo resumen está
+        activo y la condición no es urgente; por webhook se agrega al lote del
+        endpoint.
         
-        self.email_service.send_email(email, subject, body)
+        Returns:
+            bool: True si la alerta por correo quedó en el resumen pendiente
+        """
+        digested = False
+        for name in request.channels:
+            deferred = self.channels[name].send_alert(request.address_for(name), forecast)
+            if name == 'email':
+                digested = deferred
+        return digested
     
     def _save_notification(self, forecast: Forecast, email: str):
         """Guarda la notificación en el repositorio"""
@@ -0,0 +1,53 @@
+"""
+Find Nearby Notifications Use Case - Capa de Aplicación
+Caso de uso para obtener las alertas emitidas cerca de un punto
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+from domain.repositories.notification_repository import NotificationRepository
+from application.dto.notification_dto import NotificationDTO, NotificationListDTO
+
+
+class FindNearbyNotificationsUseCase:
+    """Caso de uso para consultar alertas dentro de un radio y una ventana de tiempo"""
+    
+    MAX_RADIUS_KM = 500
+    
+    def __init__(self, notification_repository: NotificationRepository):
+        self.notification_repository = notification_repository
+    
+    def execute(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        since_hours: Optional[float] = None
+    ) -> NotificationListDTO:
+        """
+        Ejecuta el caso de uso de búsqueda por cercanía
+        
+        Args:
+            latitude: Latitud del punto
+            longitude: Longitud del punto
+            radius_km: Radio de búsqueda en kilómetros
+            since_hours: Solo alertas de las últimas N horas (opcional)
+            
+        Returns:
+            NotificationListDTO: Alertas encontradas, de la más reciente a la más antigua
+        """
+        if not (-90 <= latitude <= 90):
+            raise ValueError("Latitud debe estar entre -90 y 90")
+        
+        if not (-180 <= longitude <= 180):
+            raise ValueError("Longitud debe estar entre -180 y 180")
+        
+        if not (0 < radius_km <= self.MAX_RADIUS_KM):
+            raise ValueError(f"El radio debe estar entre 0 y {self.MAX_RADIUS_KM} km")
+        
+        if since_hours is not None and since_hours <= 0:
+            raise ValueError("since_hours debe ser mayor que 0")
+        
+        since = datetime.now() - timedelta(hours=since_hours) if since_hours else None
+        notifications = self.notification_repository.find_near(latitude, longitude, radius_km, since)
+        
+        return NotificationListDTO(notifications=[NotificationDTO.from_entity(n) for n in notifications])
@@ -0,0 +1,87 @@
+"""
+Get Alert Stats Use Case - Capa de Aplicación
+Caso de uso para consultar estadísticas de alertas desde los agregados
+"""
+from collections import Counter
+from datetime import date, timedelta
+from typing import Optional
+from domain.entities.geo_cell import GeoCell
+from domain.repositories.alert_stats_repository import AlertStatsRepository
+
+
+class GetAlertStatsUseCase:
+    """Caso de uso para obtener conteos por día, condición, región y destinatario"""
+    
+    MAX_DAYS = 366
+    TOP_CELLS = 10
+    
+    def __init__(self, alert_stats_repository: AlertStatsRepository, cell_size: float):
+        self.alert_stats_repository = alert_stats_repository
+        self.cell_size = cell_size
+    
+    def execute(
+        self,
+        days: int = 7,
+        code: Optional[int] = None,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        email: Optional[str] = None,
+        today: Optional[date] = None
+    ) -> dict:
+        """
+        Ejecuta el caso de uso de estadísticas
+        
+        Args:
+            days: Cantidad de días hacia atrás (incluye hoy)
+            code: Filtra por código de condición (opcional)
+            latitude, longitude: Filtra por la celda que contiene el punto (opcional)
+            email: Incluye el resumen de este destinatario (opcional)
+            
+        Returns:
+            dict: Totales por día, por código y celdas con más alertas
+        """
+        if not (1 <= days <= self.MAX_DAYS):
+            raise ValueError(f"days debe estar entre 1 y {self.MAX_DAYS}")
+        
+        if (latitude is None) != (longitude is None):
+            raise ValueError("latitude y longitude deben enviarse juntos")
+        
+        cell = None
+        if latitude is not None:
+            if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
+                raise ValueError("Coordenadas fuera de rango")
+            cell = GeoCell.from_coordinates(latitude, longitude, self.cell_size)
+        
+        if email is not None and '@' not in email:
+            raise ValueError("Email inválido")
+        
+        end_day = today or date.today()
+        start_day = end_day - timedelta(days=days - 1)
+        counts = self.alert_stats_repository.find_daily_counts(start_day, end_day, code=code, cell=cell)
+        
+        by_day = Counter()
+        by_code = Counter()
+        by_cell = Counter()
+        for item in counts:
+            by_day[item.day] += item.count
+            by_code[item.code] += item.count
+            by_cell[item.cell] += item.count
+        
+        result = {
+            'from': start_day.isoformat(),
+            'to': end_day.isoformat(),
+            'cell_size': self.cell_size,
+            'total': sum(by_day.values()),
+            'by_day': dict(sorted(by_day.items())),
+            'by_code': {str(code): count for code, count in by_code.most_common()},
+            'top_cells': [
+                {'cell': cell.key, 'center': list(cell.center), 'count': count}
+                for cell, count in by_cell.most_common(self.TOP_CELLS)
+            ]
+        }
+        
+        if email is not None:
+            recipient = self.alert_stats_repository.find_recipient_stats(email)
+            result['recipient'] = recipient.to_dict() if recipient else {'email': email, 'count': 0}
+        
+        return result
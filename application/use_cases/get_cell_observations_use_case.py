@@ -0,0 +1,50 @@
+"""
+Get Cell Observations Use Case - Capa de Aplicación
+Caso de uso para consultar el historial de pronósticos de una celda
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+from domain.entities.geo_cell import GeoCell
+from domain.repositories.observation_repository import ObservationRepository
+
+
+class GetCellObservationsUseCase:
+    """Caso de uso que retorna en columnas las observaciones de la celda de un punto"""
+
+    MAX_DAYS = 366
+
+    def __init__(self, observation_repository: ObservationRepository, cell_size: float):
+        self.observation_repository = observation_repository
+        self.cell_size = cell_size
+
+    def execute(self, latitude: float, longitude: float, days: int = 7, now: Optional[datetime] = None) -> dict:
+        """
+        Ejecuta el caso de uso del historial de la celda
+
+        Args:
+            latitude, longitude: Punto dentro de la celda
+            days: Cantidad de días hacia atrás desde ahora
+
+        Returns:
+            dict: La celda, el rango, el resumen y una lista por columna
+        """
+        if not (1 <= days <= self.MAX_DAYS):
+            raise ValueError(f"days debe estar entre 1 y {self.MAX_DAYS}")
+        if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
+            raise ValueError("Coordenadas fuera de rango")
+
+        cell = GeoCell.from_coordinates(latitude, longitude, self.cell_size)
+        end = now or datetime.now()
+        start = end - timedelta(days=days)
+        series = self.observation_repository.find_range(cell.key, start, end)
+
+        return {
+            'cell': cell.key,
+            'center': list(cell.center),
+            'from': start.isoformat(timespec='seconds'),
+            'to': end.isoformat(timespec='seconds'),
+            'points': len(series),
+            'samples': series.total_samples(),
+            'adverse_ratio': series.adverse_ratio(),
+            'series': series.to_dict()
+        }
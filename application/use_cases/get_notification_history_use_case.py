@@ -0,0 +1,91 @@
+"""
+Get Notification History Use Case - Capa de Aplicación
+Caso de uso para consultar el historial de un usuario, incluidos los meses archivados
+"""
+from datetime import date, datetime
+from typing import List, Optional
+from domain.repositories.notification_repository import NotificationRepository
+from domain.repositories.notification_archive_repository import NotificationArchiveRepository
+from application.dto.notification_dto import NotificationDTO, NotificationListDTO
+
+
+class GetNotificationHistoryUseCase:
+    """Caso de uso que combina la tabla de notificaciones con el archivo mensual"""
+    
+    MAX_MONTHS = 24
+    
+    def __init__(
+        self,
+        notification_repository: NotificationRepository,
+        archive_repository: NotificationArchiveRepository
+    ):
+        self.notification_repository = notification_repository
+        self.archive_repository = archive_repository
+    
+    def execute(
+        self,
+        email: str,
+        start_month: Optional[str] = None,
+        end_month: Optional[str] = None,
+        today: Optional[date] = None
+    ) -> NotificationListDTO:
+        """
+        Ejecuta el caso de uso de historial
+        
+        Args:
+            email: Email del usuario
+            start_month: Primer mes (YYYY-MM); por defecto, 11 meses antes de end_month
+            end_month: Último mes incluido (YYYY-MM); por defecto, el mes actual
+            
+        Returns:
+            NotificationListDTO: Notificaciones del rango, de la más reciente a la más antigua
+        """
+        if not email or '@' not in email:
+            raise ValueError("Email inválido")
+        
+        end = self._parse_month(end_month) if end_month else (today or date.today()).replace(day=1)
+        start = self._parse_month(start_month) if start_month else self._add_months(end, -11)
+        
+        if start > end:
+            raise ValueError("El mes inicial debe ser anterior o igual al final")
+        
+        months = self._months_between(start, end)
+        if len(months) > self.MAX_MONTHS:
+            raise ValueError(f"El rango no puede superar {self.MAX_MONTHS} meses")
+        
+        found = {}
+        archived_months = set(self.archive_repository.months())
+        for month in months:
+            if month in archived_months:
+                for notification in self.archive_repository.find_by_month(month, email=email):
+                    found[notification.id] = notification
+        
+        # La tabla tiene prioridad si una fila quedó en ambos lados por un archivado interrumpido
+        hot = self.notification_repository.find_by_email_between(
+            email,
+            datetime.combine(start, datetime.min.time()),
+            datetime.combine(self._add_months(end, 1), datetime.min.time())
+        )
+        for notification in hot:
+            found[notification.id] = notification
+        
+        notifications = sorted(found.values(), key=lambda n: n.sent_at, reverse=True)
+        return NotificationListDTO(notifications=[NotificationDTO.from_entity(n) for n in notifications])
+    
+    def _parse_month(self, value: str) -> date:
+        try:
+            return datetime.strptime(value, '%Y-%m').date()
+        except ValueError:
+            raise ValueError(f"Mes inválido: {value} (formato YYYY-MM)")
+    
+    def _add_months(self, month: date, delta: int) -> date:
+        index = month.year * 12 + month.month - 1 + delta
+        return date(index // 12, index % 12 + 1, 1)
+    
+    def _months_between(self, start: date, end: date) -> List[str]:
+        months = []
+        current = start
+        while current <= end and len(months) <= self.MAX_MONTHS:
+            months.append(current.strftime('%Y-%m'))
+            current = self._add_months(current, 1)
+        return months
@@ -2,16 +2,23 @@
 Get Notifications Use Case - Capa de Aplicación
 Caso de uso para obtener notificaciones por email
 """
-from typing import List
+from typing import List, Optional
 from domain.repositories.notification_repository import NotificationRepository
+from domain.services.recipient_filter import RecipientFilter
 from application.dto.notification_dto import NotificationDTO, NotificationListDTO
 
 
 class GetNotificationsUseCase:
     """Caso de uso para obtener notificaciones de un usuario"""
     
-    def __init__(self, notification_repository: NotificationRepository):
+    def __init__(
+        self,
+        notification_repository: NotificationRepository,
+        recipient_filter: Optional[RecipientFilter] = None
+    ):
         self.notification_repository = notification_repository
+        # Los emails que seguro no tienen notificaciones se responden sin consultar
+        self.recipient_filter = recipient_filter
     
     def execute(self, email: str) -> NotificationListDTO:
         """
@@ -26,19 +33,15 @@ class GetNotificationsUseCase:
         if not email or '@' not in email:
             raise ValueError("Email inválido")
         
+        if self.recipient_filter is not None and not self.recipient_filter.might_contain(email):
+            return NotificationListDTO(notifications=[])
+        
         # Obtener notificaciones del repositorio
         notifications = self.notification_repository.find_by_email(email)
+        if not notifications and self.recipient_filter is not None:
+            self.recipient_filter.report_false_positive(email)
         
         # Convertir a DTOs
-        notification_dtos = [
-            NotificationDTO(
-                sent_at=n.sent_at.strftime('%Y-%m-%d %H:%M:%S'),
-                latitude=n.latitude,
-                longitude=n.longitude,
-                condition=n.condition,
-                code=n.code
-            )
-            for n in notifications
-        ]
+        notification_dtos = [NotificationDTO.from_entity(n) for n in notifications]
         
         return NotificationListDTO(notifications=notification_dtos)
@@ -0,0 +1,118 @@
+"""
+Import Subscriptions Use Case - Capa de Aplicación
+Caso de uso para importar suscripciones (email, latitud, longitud) desde CSV
+"""
+import csv
+import time
+from datetime import datetime
+from typing import Iterable, Optional, Tuple
+from domain.entities.subscription import Subscription
+from domain.repositories.subscription_repository import SubscriptionRepository
+from application.dto.import_report_dto import ImportReportDTO, RejectedRowDTO
+from application.dto.weather_request_dto import WeatherRequestDTO
+
+
+class ImportSubscriptionsUseCase:
+    """
+    Lee el CSV como flujo y guarda las filas válidas en lotes de `batch_size`,
+    cada lote en una transacción. La memoria no depende del tamaño del archivo:
+    solo se retiene el lote actual y hasta `max_reported_rejects` rechazos.
+    """
+    
+    COLUMNS = ('email', 'latitude', 'longitude')
+    
+    def __init__(
+        self,
+        subscription_repository: SubscriptionRepository,
+        batch_size: int = 5000,
+        max_reported_rejects: int = 1000
+    ):
+        self.subscription_repository = subscription_repository
+        self.batch_size = batch_size
+        self.max_reported_rejects = max_reported_rejects
+    
+    def execute(self, lines: Iterable[str]) -> ImportReportDTO:
+        """
+        Ejecuta la importación
+        
+        Args:
+            lines: Líneas del CSV (un archivo de texto abierto con newline='' o
+                   cualquier iterable de líneas). La cabecera es opcional; sin
+                   ella las columnas son email, latitude, longitude.
+                   
+        Returns:
+            ImportReportDTO: Totales y filas rechazadas con su número de línea
+        """
+        report = ImportReportDTO()
+        started = time.monotonic()
+        created_at = datetime.now()
+        reader = csv.reader(lines)
+        positions = None
+        batch = []
+        
+        for row in reader:
+            if not row or (len(row) == 1 and not row[0].strip()):
+                continue
+            
+            if positions is None:
+                positions, is_header = self._columns(row)
+                if is_header:
+                    continue
+            
+            report.rows += 1
+            subscription, error = self._parse(row, positions, created_at)
+            if error:
+                self._reject(report, reader.line_num, error)
+                continue
+            
+            batch.append(subscription)
+            if len(batch) >= self.batch_size:
+                self._save(report, batch)
+                batch = []
+        
+        if batch:
+            self._save(report, batch)
+        
+        report.elapsed_seconds = round(time.monotonic() - started, 3)
+        return report
+    
+    def _columns(self, first_row: list) -> Tuple[Tuple[int, int, int], bool]:
+        """Posiciones de email, latitude y longitude según la cabecera, si la hay"""
+        names = [name.strip().lower() for name in first_row]
+        if 'email' not in names:
+            return (0, 1, 2), False
+        
+        missing = [column for column in self.COLUMNS if column not in names]
+        if missing:
+            raise ValueError(f"Faltan columnas en la cabecera: {', '.join(missing)}")
+        return tuple(names.index(column) for column in self.COLUMNS), True
+    
+    def _parse(self, row: list, positions, created_at: datetime) -> Tuple[Optional[Subscription], str]:
+        """Convierte la fila y la valida con las reglas de WeatherRequestDTO"""
+        email_at, latitude_at, longitude_at = positions
+        if len(row) <= max(positions):
+            return None, "Faltan columnas"
+        
+        email = row[email_at].strip()
+        try:
+            latitude = float(row[latitude_at])
+            longitude = float(row[longitude_at])
+        except ValueError:
+            return None, "Latitud y longitud deben ser números"
+        
+        is_valid, error = WeatherRequestDTO(latitude=latitude, longitude=longitude, email=email).validate()
+        if not is_valid:
+            return None, error
+        
+        return Subscription(email=email, latitude=latitude, longitude=longitude, created_at=created_at), ""
+    
+    def _save(self, report: ImportReportDTO, batch: list):
+        inserted = self.subscription_repository.save_batch(batch)
+        report.imported += inserted
+        report.duplicates += len(batch) - inserted
+        report.batches += 1
+    
+    def _reject(self, report: ImportReportDTO, line: int, error: str):
+        report.rejected += 1
+        if len(report.rejected_rows) < self.max_reported_rejects:
+            report.rejected_rows.append(RejectedRowDTO(line=line, error=error))
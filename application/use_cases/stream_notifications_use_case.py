@@ -0,0 +1,115 @@
+"""
+Stream Notifications Use Case - Capa de Aplicación
+Caso de uso para recibir en vivo las alertas de un destinatario
+"""
+import time
+from typing import Iterator, Optional
+from domain.entities.notification import Notification
+from domain.repositories.notification_repository import NotificationRepository
+
+
+class NotificationStream:
+    """
+    Stream de un destinatario: primero las notificaciones posteriores a
+    `last_event_id` (leídas de la tabla), luego las nuevas a medida que se
+    publican. Al iterar produce Notification, o None cuando pasan
+    `heartbeat_seconds` sin novedades, y termina a los `max_stream_seconds`
+    para que el cliente se reconecte (y se reparta entre workers).
+    """
+
+    def __init__(
+        self,
+        notification_repository: NotificationRepository,
+        broker,
+        subscription,
+        last_event_id: Optional[int],
+        heartbeat_seconds: float,
+        max_stream_seconds: float,
+        replay_limit: int,
+        clock=time.monotonic
+    ):
+        self.notification_repository = notification_repository
+        self.broker = broker
+        self.subscription = subscription
+        self.last_event_id = last_event_id
+        self.heartbeat_seconds = heartbeat_seconds
+        self.max_stream_seconds = max_stream_seconds
+        self.replay_limit = replay_limit
+        self._clock = clock
+
+    def __iter__(self) -> Iterator[Optional[Notification]]:
+        replayed = 0
+        if self.last_event_id is not None:
+            # La suscripción ya está abierta: lo que llegue mientras se lee la tabla queda en su cola
+            after = self.last_event_id
+            while True:
+                page = self.notification_repository.find_after(after, self.replay_limit, self.subscription.email)
+                yield from page
+                if page:
+                    after = replayed = page[-1].id
+                if len(page) < self.replay_limit:
+                    break
+
+        deadline = self._clock() + self.max_stream_seconds
+        while not self.subscription.closed:
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                return
+            notification = self.subscription.get(timeout=min(self.heartbeat_seconds, remaining))
+            if notification is None:
+                if not self.subscription.closed and self._clock() < deadline:
+                    yield None
+                continue
+            if notification.id <= replayed:
+                continue
+            yield notification
+
+    def close(self):
+        """Libera la suscripción (idempotente)"""
+        self.broker.unsubscribe(self.subscription)
+
+
+class StreamNotificationsUseCase:
+    """Caso de uso para abrir streams de alertas en vivo"""
+
+    def __init__(
+        self,
+        notification_repository: NotificationRepository,
+        broker,
+        heartbeat_seconds: float = 15.0,
+        max_stream_seconds: float = 300.0,
+        replay_limit: int = 500
+    ):
+        self.notification_repository = notification_repository
+        self.broker = broker
+        self.heartbeat_seconds = heartbeat_seconds
+        self.max_stream_seconds = max_stream_seconds
+        self.replay_limit = replay_limit
+
+    def execute(self, email: str, last_event_id: Optional[int] = None) -> NotificationStream:
+        """
+        Abre el stream de un destinatario
+
+        Args:
+            email: Email del destinatario
+            last_event_id: Último id recibido antes de reconectarse, para reanudar
+
+        Returns:
+            NotificationStream: Stream a iterar; debe cerrarse al terminar
+
+        Raises:
+            ValueError: Si el email es inválido
+        """
+        if not email or '@' not in email:
+            raise ValueError("Email inválido")
+
+        subscription = self.broker.subscribe(email)
+        return NotificationStream(
+            notification_repository=self.notification_repository,
+            broker=self.broker,
+            subscription=subscription,
+            last_event_id=last_event_id,
+            heartbeat_seconds=self.heartbeat_seconds,
+            max_stream_seconds=self.max_stream_seconds,
+            replay_limit=self.replay_limit
+        )
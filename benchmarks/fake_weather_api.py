@@ -0,0 +1,169 @@
+"""
+Fake WeatherAPI - Herramientas de Benchmark
+Servidor HTTP local que imita la respuesta de forecast.json de WeatherAPI
+(y la de /v1/forecast de Open-Meteo) con latencia y tasa de errores configurables
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+ADVERSE_CONDITIONS = [
+    (1195, 'Heavy rain'),
+    (1273, 'Patchy light rain with thunder'),
+    (1225, 'Heavy snow'),
+    (1135, 'Fog')
+]
+NORMAL_CONDITIONS = [
+    (1000, 'Sunny'),
+    (1003, 'Partly cloudy'),
+    (1006, 'Cloudy')
+]
+# Código WeatherAPI -> código WMO equivalente para las respuestas de Open-Meteo
+WMO_CODES = {1195: 65, 1273: 95, 1225: 75, 1135: 45, 1000: 0, 1003: 2, 1006: 3}
+
+
+class FakeWeatherAPIServer:
+    """Servidor WeatherAPI falso que corre en un hilo en segundo plano"""
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        adverse_rate: float = 0.2,
+        seed: int = None
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.adverse_rate = adverse_rate
+        self.requests_served = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """URL del endpoint forecast.json a configurar en WEATHER_API_URL"""
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/v1/forecast.json'
+
+    @property
+    def openmeteo_url(self) -> str:
+        """URL del endpoint con el formato de Open-Meteo, para OPENMETEO_API_URL"""
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/v1/forecast'
+
+    def start(self) -> 'FakeWeatherAPIServer':
+        """Inicia el servidor en un hilo daemon"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Detiene el servidor"""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _next_outcome(self) -> tuple[float, bool, tuple[int, str]]:
+        """Sortea latencia, error y condición para la siguiente respuesta"""
+        with self._lock:
+            self.requests_served += 1
+            delay = max(0.0, self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms))
+            failed = self._random.random() < self.error_rate
+            if self._random.random() < self.adverse_rate:
+                condition = self._random.choice(ADVERSE_CONDITIONS)
+            else:
+                condition = self._random.choice(NORMAL_CONDITIONS)
+        return delay / 1000.0, failed, condition
+
+    def _make_handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                query = parse_qs(parsed.query)
+                delay, failed, (code, text) = fake._next_outcome()
+                if delay:
+                    time.sleep(delay)
+
+                if failed:
+                    self._send(503, {'error': {'code': 9999, 'message': 'Internal application error.'}})
+                    return
+
+                if parsed.path == '/v1/forecast':
+                    self._send_openmeteo(query, code)
+                    return
+
+                try:
+                    lat, lon = (float(v) for v in query['q'][0].split(','))
+                except (KeyError, ValueError):
+                    self._send(400, {'error': {'code': 1006, 'message': 'No location found matching parameter q'}})
+                    return
+
+                self._send(200, {
+                    'location': {
+                        'name': f'Fake {lat:.2f},{lon:.2f}',
+                        'country': 'Localhost',
+                        'lat': lat,
+                        'lon': lon
+                    },
+                    'current': {
+                        'temp_c': 18.0,
+                        'humidity': 80,
+                        'wind_kph': 12.5,
+                        'condition': {'text': text, 'code': code}
+                    },
+                    'forecast': {'forecastday': []}
+                })
+
+            def _send_openmeteo(self, query: dict, code: int):
+                try:
+                    lat, lon = float(query['latitude'][0]), float(query['longitude'][0])
+                except (KeyError, ValueError):
+                    self._send(400, {'error': True, 'reason': 'Latitude and longitude are required'})
+                    return
+                self._send(200, {
+                    'latitude': lat,
+                    'longitude': lon,
+                    'current': {
+                        'temperature_2m': 18.0,
+                        'relative_humidity_2m': 80,
+                        'weather_code': WMO_CODES[code],
+                        'wind_speed_10m': 12.5
+                    }
+                })
+
+            def _send(self, status: int, payload: dict):
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                try:
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # El cliente se rindió (p. ej. agotó su plazo): no hay a quién responder
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
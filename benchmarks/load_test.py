@@ -0,0 +1,285 @@
+"""
+Load Test - Herramientas de Benchmark
+Prueba de carga de extremo a extremo que corre sin red externa:
+levanta un WeatherAPI falso y un sumidero SMTP locales, apunta Settings a
+ambos, sirve la app Flask y la golpea con clientes concurrentes.
+
+Uso:
+    python -m benchmarks.load_test --duration 30 --concurrency 16 \\
+        --mix check_weather=1,notifications=3 --weather-latency-ms 80
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import requests
+
+from benchmarks.fake_weather_api import FakeWeatherAPIServer
+from benchmarks.smtp_sink import SMTPSink
+
+
+ENDPOINTS = ('check_weather', 'notifications')
+
+
+@dataclass
+class LoadTestConfig:
+    """Parámetros de la prueba de carga"""
+
+    duration: float = 30.0
+    concurrency: int = 16
+    mix: Dict[str, float] = field(default_factory=lambda: {'check_weather': 1.0, 'notifications': 3.0})
+    locations: int = 50
+    recipients: int = 200
+    weather_latency_ms: float = 50.0
+    weather_jitter_ms: float = 20.0
+    weather_error_rate: float = 0.0
+    adverse_rate: float = 0.2
+    smtp_latency_ms: float = 0.0
+    target_url: Optional[str] = None
+    api_key: str = 'loadtest-key'
+    seed: int = 1
+
+
+@dataclass
+class EndpointStats:
+    """Latencias y códigos de estado observados para un endpoint"""
+
+    name: str
+    latencies_ms: List[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+
+    def record(self, latency_ms: float, status: int):
+        self.latencies_ms.append(latency_ms)
+        self.statuses[status] += 1
+
+    def summary(self, elapsed: float) -> dict:
+        """Resume throughput, errores y percentiles de latencia"""
+        ordered = sorted(self.latencies_ms)
+        errors = sum(count for status, count in self.statuses.items() if status == 0 or status >= 500)
+        return {
+            'requests': len(ordered),
+            'errors': errors,
+            'throughput_rps': round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+            'p50_ms': round(percentile(ordered, 50), 2),
+            'p95_ms': round(percentile(ordered, 95), 2),
+            'p99_ms': round(percentile(ordered, 99), 2),
+            'statuses': {str(status): count for status, count in sorted(self.statuses.items())}
+        }
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada"""
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Convierte 'check_weather=1,notifications=3' en un diccionario de pesos"""
+    mix = {}
+    for item in value.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Endpoint desconocido en el mix: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+@contextmanager
+def _point_settings_at(config: LoadTestConfig, weather: FakeWeatherAPIServer, smtp: SMTPSink, db_path: str):
+    """Configura las variables de entorno que lee Settings.from_env y al salir las restaura"""
+    overrides = {
+        'API_KEY': config.api_key,
+        'WEATHER_API_KEY': 'fake',
+        'WEATHER_API_URL': weather.url,
+        'MAIL_SERVER': smtp.host,
+        'MAIL_PORT': str(smtp.port),
+        'MAIL_USERNAME': 'loadtest@localhost',
+        'MAIL_PASSWORD': 'loadtest',
+        'MAIL_USE_TLS': 'False',
+        'DATABASE_NAME': db_path,
+        'FORECAST_CACHE_PATH': os.path.join(os.path.dirname(db_path), 'forecast_cache.db'),
+        'ARCHIVE_DIR': os.path.join(os.path.dirname(db_path), 'archive'),
+        'WEATHER_QUOTA_PATH': os.path.join(os.path.dirname(db_path), 'weather_quota.db'),
+        'IDEMPOTENCY_PATH': os.path.join(os.path.dirname(db_path), 'idempotency.db'),
+        'ACCESS_LOG_PATH': os.path.join(os.path.dirname(db_path), 'logs', 'access-{pid}.log')
+    }
+    previous = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _serve_app():
+    """Sirve la app con el servidor WSGI multihilo de Werkzeug en segundo plano"""
+    from werkzeug.serving import make_server
+    from app import create_app
+
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    server = make_server('127.0.0.1', 0, create_app(), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+def _client_loop(base_url: str, config: LoadTestConfig, worker: int, deadline: float) -> Dict[str, EndpointStats]:
+    """Bucle de un cliente: elige endpoints según el mix hasta el deadline"""
+    rng = random.Random(config.seed * 1000 + worker)
+    names = list(config.mix)
+    weights = [config.mix[name] for name in names]
+    stats = {name: EndpointStats(name) for name in names}
+    headers = {'x-api-key': config.api_key}
+    session = requests.Session()
+
+    while time.perf_counter() < deadline:
+        endpoint = rng.choices(names, weights)[0]
+        email = f'user{rng.randrange(config.recipients)}@loadtest.local'
+        started = time.perf_counter()
+        try:
+            if endpoint == 'check_weather':
+                location = rng.randrange(config.locations)
+                response = session.post(f'{base_url}/check_weather', headers=headers, timeout=60, json={
+                    'latitude': -60 + (location * 7.3) % 120,
+                    'longitude': -170 + (location * 13.7) % 340,
+                    'email': email
+                })
+            else:
+                response = session.get(f'{base_url}/notifications', headers=headers,
+                                       params={'email': email}, timeout=60)
+            status = response.status_code
+        except requests.RequestException:
+            status = 0
+        stats[endpoint].record((time.perf_counter() - started) * 1000.0, status)
+
+    session.close()
+    return stats
+
+
+def run_load_test(config: LoadTestConfig) -> dict:
+    """
+    Ejecuta la prueba de carga completa
+
+    Returns:
+        dict: Reporte con throughput y percentiles p50/p95/p99 por endpoint
+    """
+    with FakeWeatherAPIServer(
+        latency_ms=config.weather_latency_ms,
+        jitter_ms=config.weather_jitter_ms,
+        error_rate=config.weather_error_rate,
+        adverse_rate=config.adverse_rate,
+        seed=config.seed
+    ) as weather, SMTPSink(latency_ms=config.smtp_latency_ms) as smtp, \
+            tempfile.TemporaryDirectory(prefix='weather-loadtest-') as workdir:
+
+        server = None
+        base_url = config.target_url
+        with ExitStack() as stack:
+            if base_url is None:
+                # La autenticación relee Settings en cada solicitud: el entorno se restaura al terminar
+                stack.enter_context(_point_settings_at(config, weather, smtp, os.path.join(workdir, 'loadtest.db')))
+                server, base_url = _serve_app()
+                stack.callback(server.shutdown)
+
+            started = time.perf_counter()
+            deadline = started + config.duration
+            with ThreadPoolExecutor(max_workers=config.concurrency) as pool:
+                results = list(pool.map(
+                    lambda worker: _client_loop(base_url, config, worker, deadline),
+                    range(config.concurrency)
+                ))
+            elapsed = time.perf_counter() - started
+
+        merged = {name: EndpointStats(name) for name in config.mix}
+        for worker_stats in results:
+            for name, stats in worker_stats.items():
+                merged[name].latencies_ms.extend(stats.latencies_ms)
+                merged[name].statuses.update(stats.statuses)
+
+        total = sum(len(stats.latencies_ms) for stats in merged.values())
+        return {
+            'duration_s': round(elapsed, 2),
+            'concurrency': config.concurrency,
+            'total_requests': total,
+            'throughput_rps': round(total / elapsed, 2) if elapsed else 0.0,
+            'endpoints': {name: stats.summary(elapsed) for name, stats in merged.items()},
+            'upstream_calls': weather.requests_served,
+            'emails_sent': smtp.messages_received
+        }
+
+
+def format_report(report: dict) -> str:
+    """Formatea el reporte como tabla de texto"""
+    lines = [
+        f"Duración: {report['duration_s']}s  Concurrencia: {report['concurrency']}  "
+        f"Requests: {report['total_requests']}  Throughput: {report['throughput_rps']} req/s",
+        f"Llamadas upstream: {report['upstream_calls']}  Emails enviados: {report['emails_sent']}",
+        '',
+        f"{'endpoint':<16}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    ]
+    for name, summary in report['endpoints'].items():
+        lines.append(
+            f"{name:<16}{summary['requests']:>10}{summary['errors']:>8}{summary['throughput_rps']:>10}"
+            f"{summary['p50_ms']:>10}{summary['p95_ms']:>10}{summary['p99_ms']:>10}"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Prueba de carga offline de la Weather Alert API')
+    parser.add_argument('--duration', type=float, default=30.0, help='Duración en segundos')
+    parser.add_argument('--concurrency', type=int, default=16, help='Clientes concurrentes')
+    parser.add_argument('--mix', type=parse_mix, default='check_weather=1,notifications=3',
+                        help='Pesos por endpoint, ej: check_weather=1,notifications=3')
+    parser.add_argument('--locations', type=int, default=50, help='Ubicaciones distintas a consultar')
+    parser.add_argument('--recipients', type=int, default=200, help='Emails distintos a usar')
+    parser.add_argument('--weather-latency-ms', type=float, default=50.0)
+    parser.add_argument('--weather-jitter-ms', type=float, default=20.0)
+    parser.add_argument('--weather-error-rate', type=float, default=0.0)
+    parser.add_argument('--adverse-rate', type=float, default=0.2)
+    parser.add_argument('--smtp-latency-ms', type=float, default=0.0)
+    parser.add_argument('--target-url', default=None,
+                        help='Golpear un servidor ya levantado en vez de servir la app en proceso')
+    parser.add_argument('--api-key', default='loadtest-key')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', action='store_true', help='Imprime el reporte en JSON')
+    args = parser.parse_args(argv)
+
+    config = LoadTestConfig(
+        duration=args.duration,
+        concurrency=args.concurrency,
+        mix=args.mix,
+        locations=args.locations,
+        recipients=args.recipients,
+        weather_latency_ms=args.weather_latency_ms,
+        weather_jitter_ms=args.weather_jitter_ms,
+        weather_error_rate=args.weather_error_rate,
+        adverse_rate=args.adverse_rate,
+        smtp_latency_ms=args.smtp_latency_ms,
+        target_url=args.target_url,
+        api_key=args.api_key,
+        seed=args.seed
+    )
+    report = run_load_test(config)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+"""
+Repository Bench - Herramientas de Benchmark
+Compara las consultas calientes del repositorio de notificaciones (`save` y
+`find_by_email`) con Peewee y con sentencias preparadas de sqlite3, sobre la
+misma base temporal y la misma secuencia de operaciones.
+
+Uso:
+    python -m benchmarks.repository_bench --rows 20000 --recipients 500 --iterations 5000
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from benchmarks.load_test import percentile
+from domain.entities.notification import Notification
+from infrastructure.database.connection import db_connection
+from infrastructure.database.schema import initialize_database
+from infrastructure.repositories.notification_repository_impl import NotificationRepositoryImpl
+from infrastructure.repositories.prepared_notification_repository import PreparedNotificationRepository
+
+
+IMPLEMENTATIONS = {
+    'peewee': NotificationRepositoryImpl,
+    'prepared': PreparedNotificationRepository
+}
+
+
+@dataclass
+class RepositoryBenchConfig:
+    """Parámetros del benchmark"""
+
+    rows: int = 20000
+    recipients: int = 500
+    iterations: int = 5000
+    seed: int = 1
+
+
+def _recipient(index: int) -> str:
+    return f"user{index}@example.com"
+
+
+def _notification(rng: random.Random, recipients: int, sent_at: datetime) -> Notification:
+    return Notification(
+        email=_recipient(rng.randrange(recipients)),
+        latitude=round(rng.uniform(-60.0, 60.0), 4),
+        longitude=round(rng.uniform(-180.0, 180.0), 4),
+        condition='Heavy Rain',
+        code=1195,
+        sent_at=sent_at
+    )
+
+
+def _seed(config: RepositoryBenchConfig):
+    """Historial inicial, insertado en un solo lote"""
+    rng = random.Random(config.seed)
+    start = datetime(2025, 1, 1)
+    rows = []
+    for index in range(config.rows):
+        notification = _notification(rng, config.recipients, start + timedelta(minutes=index))
+        rows.append((
+            notification.email, notification.latitude, notification.longitude,
+            notification.condition, notification.code, notification.sent_at.isoformat(' ')
+        ))
+    with db_connection.db.atomic():
+        db_connection.db.cursor().executemany(
+            """INSERT INTO notifications (email, latitude, longitude, condition, code, sent_at)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            rows
+        )
+
+
+def _measure(operation: Callable[[int], object], iterations: int) -> dict:
+    """Ejecuta la operación `iterations` veces y resume su latencia"""
+    latencies_ms: List[float] = []
+    started = time.perf_counter()
+    for index in range(iterations):
+        call_started = time.perf_counter()
+        operation(index)
+        latencies_ms.append((time.perf_counter() - call_started) * 1000)
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies_ms)
+    return {
+        'operations': iterations,
+        'ops_per_second': round(iterations / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(percentile(ordered, 50), 4),
+        'p99_ms': round(percentile(ordered, 99), 4)
+    }
+
+
+def run_repository_bench(config: RepositoryBenchConfig) -> dict:
+    """Siembra una base temporal y mide cada implementación con la misma carga"""
+    with tempfile.TemporaryDirectory(prefix='repository-bench-') as workdir:
+        initialize_database(os.path.join(workdir, 'bench.db'), stats_cell_size=1.0)
+        try:
+            _seed(config)
+            lookups = random.Random(config.seed + 1)
+            emails = [_recipient(lookups.randrange(config.recipients)) for _ in range(config.iterations)]
+            sent_at = datetime(2026, 1, 1)
+
+            repositories = {name: implementation() for name, implementation in IMPLEMENTATIONS.items()}
+            results: Dict[str, dict] = {name: {} for name in repositories}
+            # Todas las lecturas antes de las escrituras: cada implementación lee las mismas filas
+            for name, repository in repositories.items():
+                found = []
+                results[name]['find_by_email'] = _measure(
+                    lambda index: found.append(len(repository.find_by_email(emails[index]))),
+                    config.iterations
+                )
+                results[name]['find_by_email']['rows_returned'] = sum(found)
+            for name, repository in repositories.items():
+                writes = random.Random(config.seed + 2)
+                results[name]['save'] = _measure(
+                    lambda index: repository.save(_notification(writes, config.recipients, sent_at)),
+                    config.iterations
+                )
+        finally:
+            db_connection.close()
+
+    speedup = {
+        operation: round(results['prepared'][operation]['ops_per_second'] / results['peewee'][operation]['ops_per_second'], 2)
+        for operation in ('find_by_email', 'save')
+        if results['peewee'][operation]['ops_per_second']
+    }
+    return {
+        'rows': config.rows,
+        'recipients': config.recipients,
+        'iterations': config.iterations,
+        'implementations': results,
+        'speedup': speedup
+    }
+
+
+def format_report(report: dict) -> str:
+    """Formatea el reporte como tabla de texto"""
+    lines = [
+        f"Filas: {report['rows']}  Destinatarios: {report['recipients']}  Iteraciones: {report['iterations']}",
+        '',
+        f"{'implementación':<16}{'operación':<16}{'ops/s':>12}{'p50 ms':>10}{'p99 ms':>10}"
+    ]
+    for name, operations in report['implementations'].items():
+        for operation, summary in operations.items():
+            lines.append(
+                f"{name:<16}{operation:<16}{summary['ops_per_second']:>12}"
+                f"{summary['p50_ms']:>10}{summary['p99_ms']:>10}"
+            )
+    lines.append('')
+    lines.append('  '.join(f"{operation}: x{ratio}" for operation, ratio in report['speedup'].items()))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Peewee vs. sentencias preparadas en el repositorio de notificaciones')
+    parser.add_argument('--rows', type=int, default=20000, help='Notificaciones sembradas antes de medir')
+    parser.add_argument('--recipients', type=int, default=500, help='Emails distintos')
+    parser.add_argument('--iterations', type=int, default=5000, help='Operaciones medidas por implementación')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', action='store_true', help='Imprime el reporte en JSON')
+    args = parser.parse_args(argv)
+
+    config = RepositoryBenchConfig(
+        rows=args.rows,
+        recipients=args.recipients,
+        iterations=args.iterations,
+        seed=args.seed
+    )
+    report = run_repository_bench(config)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+SMTP Sink - Herramientas de Benchmark
+Servidor SMTP local mínimo que acepta y descarta todos los mensajes
+"""
+import socketserver
+import threading
+import time
+
+
+class SMTPSink:
+    """
+    Servidor SMTP que acepta cualquier autenticación y descarta los mensajes.
+    Implementa lo justo para que smtplib (EHLO, AUTH, MAIL, RCPT, DATA, QUIT)
+    complete el envío sin TLS.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency_ms: float = 0.0, keep_messages: bool = False):
+        self.latency_ms = latency_ms
+        self.keep_messages = keep_messages
+        self.messages_received = 0
+        self.connections = 0
+        self.messages = []
+        self._lock = threading.Lock()
+        self._server = socketserver.ThreadingTCPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def host(self) -> str:
+        return self._server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> 'SMTPSink':
+        """Inicia el servidor en un hilo daemon"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Detiene el servidor"""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _record(self, data: bytes):
+        with self._lock:
+            self.messages_received += 1
+            if self.keep_messages:
+                self.messages.append(data)
+
+    def _make_handler(self):
+        sink = self
+
+        class Handler(socketserver.StreamRequestHandler):
+
+            def reply(self, line: str):
+                self.wfile.write(f'{line}\r\n'.encode('ascii'))
+
+            def handle(self):
+                with sink._lock:
+                    sink.connections += 1
+                self.reply('220 localhost SMTP sink')
+                while True:
+                    raw = self.rfile.readline()
+                    if not raw:
+                        return
+                    command = raw.decode('utf-8', 'replace').strip()
+                    verb = command.split(' ', 1)[0].upper()
+
+                    if verb == 'EHLO':
+                        self.wfile.write(b'250-localhost\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME\r\n')
+                    elif verb == 'HELO':
+                        self.reply('250 localhost')
+                    elif verb == 'AUTH':
+                        self._auth(command)
+                    elif verb == 'DATA':
+                        self.reply('354 End data with <CR><LF>.<CR><LF>')
+                        self._read_data()
+                    elif verb in ('MAIL', 'RCPT', 'RSET', 'NOOP'):
+                        self.reply('250 OK')
+                    elif verb == 'QUIT':
+                        self.reply('221 Bye')
+                        return
+                    else:
+                        self.reply('502 Command not implemented')
+
+            def _auth(self, command: str):
+                parts = command.split()
+                mechanism = parts[1].upper() if len(parts) > 1 else ''
+                if mechanism == 'PLAIN' and len(parts) == 2:
+                    self.reply('334 ')
+                    self.rfile.readline()
+                elif mechanism == 'LOGIN':
+                    if len(parts) == 2:
+                        self.reply('334 VXNlcm5hbWU6')
+                        self.rfile.readline()
+                    self.reply('334 UGFzc3dvcmQ6')
+                    self.rfile.readline()
+                self.reply('235 Authentication successful')
+
+            def _read_data(self):
+                chunks = []
+                while True:
+                    line = self.rfile.readline()
+                    if not line or line in (b'.\r\n', b'.\n'):
+                        break
+                    chunks.append(line)
+                if sink.latency_ms:
+                    time.sleep(sink.latency_ms / 1000.0)
+                sink._record(b''.join(chunks))
+                self.reply('250 OK: queued')
+
+        return Handler
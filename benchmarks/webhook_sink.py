@@ -0,0 +1,99 @@
+"""
+Webhook Sink - Herramientas de Benchmark
+Servidor HTTP local que recibe los lotes de alertas por webhook
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class WebhookSink:
+    """
+    Servidor HTTP/1.1 (keep-alive) que acepta los POST de webhooks y guarda
+    los lotes recibidos. `statuses` es una lista de códigos a responder en
+    orden antes de pasar a 200, para simular fallos y reintentos.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency_ms: float = 0.0, statuses=()):
+        self.latency_ms = latency_ms
+        self.statuses = list(statuses)
+        self.requests_received = 0
+        self.alerts_received = 0
+        self.connections = 0
+        self.batches = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """URL del endpoint a usar como webhook_url"""
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/alerts'
+
+    def start(self) -> 'WebhookSink':
+        """Inicia el servidor en un hilo daemon"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Detiene el servidor"""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def wait_for_alerts(self, count: int, timeout: float = 5.0) -> bool:
+        """Espera hasta recibir `count` alertas; retorna si se alcanzaron"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if self.alerts_received >= count:
+                    return True
+            time.sleep(0.01)
+        return False
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _next_status(self) -> int:
+        with self._lock:
+            self.requests_received += 1
+            return self.statuses.pop(0) if self.statuses else 200
+
+    def _record(self, headers: dict, body: bytes):
+        payload = json.loads(body)
+        with self._lock:
+            self.alerts_received += len(payload['alerts'])
+            self.batches.append({'headers': headers, 'body': body, 'alerts': payload['alerts']})
+
+    def _make_handler(self):
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                with sink._lock:
+                    sink.connections += 1
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if sink.latency_ms:
+                    time.sleep(sink.latency_ms / 1000.0)
+                status = sink._next_status()
+                if status < 300:
+                    sink._record(dict(self.headers), body)
+                self.send_response(status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
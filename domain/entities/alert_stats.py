@@ -0,0 +1,36 @@
+"""
+Entidades de estadísticas de alertas - Capa de Dominio
+Conteos agregados de notificaciones
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from domain.entities.geo_cell import GeoCell
+
+
+@dataclass
+class AlertCount:
+    """Cantidad de alertas de un código de condición en una celda durante un día"""
+    
+    day: str
+    code: int
+    cell: GeoCell
+    count: int
+
+
+@dataclass
+class RecipientAlertStats:
+    """Resumen de las alertas recibidas por un destinatario"""
+    
+    email: str
+    count: int
+    first_sent_at: datetime
+    last_sent_at: datetime
+    
+    def to_dict(self) -> dict:
+        """Convierte el resumen a un diccionario"""
+        return {
+            'email': self.email,
+            'count': self.count,
+            'first_sent_at': self.first_sent_at.strftime('%Y-%m-%d %H:%M:%S'),
+            'last_sent_at': self.last_sent_at.strftime('%Y-%m-%d %H:%M:%S')
+        }
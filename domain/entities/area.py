@@ -0,0 +1,145 @@
+"""
+Entidad Area - Capa de Dominio
+Zona geográfica (caja o polígono GeoJSON) sobre la que se verifica el clima
+"""
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+
+# (longitud, latitud), el orden de GeoJSON
+Point = Tuple[float, float]
+Ring = Tuple[Point, ...]
+
+
+@dataclass(frozen=True)
+class Area:
+    """
+    Uno o más polígonos, cada uno con su anillo exterior y sus huecos. La
+    pertenencia usa la regla par-impar sobre todos los anillos del polígono,
+    así que un hueco excluye lo que encierra. No cruza el antimeridiano.
+    """
+
+    polygons: Tuple[Tuple[Ring, ...], ...]
+
+    @classmethod
+    def from_bbox(cls, min_lon: float, min_lat: float, max_lon: float, max_lat: float) -> 'Area':
+        """Caja [min_lon, min_lat, max_lon, max_lat] (orden de `bbox` en GeoJSON)"""
+        _check_point(min_lon, min_lat)
+        _check_point(max_lon, max_lat)
+        if min_lon >= max_lon or min_lat >= max_lat:
+            raise ValueError("bbox debe ser [min_lon, min_lat, max_lon, max_lat] con mínimos menores que máximos")
+        ring = ((min_lon, min_lat), (max_lon, min_lat), (max_lon, max_lat), (min_lon, max_lat))
+        return cls(polygons=((ring,),))
+
+    @classmethod
+    def from_geojson(cls, geometry: dict) -> 'Area':
+        """
+        Geometría GeoJSON de tipo Polygon o MultiPolygon
+
+        Raises:
+            ValueError: Si la geometría no es válida
+        """
+        if not isinstance(geometry, dict):
+            raise ValueError("polygon debe ser una geometría GeoJSON")
+        kind = geometry.get('type')
+        coordinates = geometry.get('coordinates')
+        if kind == 'Polygon':
+            polygons = [coordinates]
+        elif kind == 'MultiPolygon' and isinstance(coordinates, list):
+            polygons = coordinates
+        else:
+            raise ValueError("polygon debe ser un Polygon o MultiPolygon de GeoJSON")
+        if not polygons:
+            raise ValueError("polygon no tiene coordenadas")
+        return cls(polygons=tuple(_parse_polygon(polygon) for polygon in polygons))
+
+    @property
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """Caja envolvente (min_lon, min_lat, max_lon, max_lat)"""
+        points = [point for polygon in self.polygons for ring in polygon for point in ring]
+        longitudes = [lon for lon, _ in points]
+        latitudes = [lat for _, lat in points]
+        return min(longitudes), min(latitudes), max(longitudes), max(latitudes)
+
+    def contains(self, latitude: float, longitude: float) -> bool:
+        """True si la coordenada cae dentro del área (fuera de los huecos)"""
+        return any(_inside(polygon, longitude, latitude) for polygon in self.polygons)
+
+    def intersects_box(self, min_lon: float, min_lat: float, max_lon: float, max_lat: float) -> bool:
+        """
+        True si el área toca la caja: una esquina de la caja cae dentro del
+        área, un vértice del área cae dentro de la caja o un borde del área
+        cruza un borde de la caja
+        """
+        corners = ((min_lon, min_lat), (max_lon, min_lat), (max_lon, max_lat), (min_lon, max_lat))
+        if any(self.contains(lat, lon) for lon, lat in corners):
+            return True
+        box_edges = list(zip(corners, corners[1:] + corners[:1]))
+        for polygon in self.polygons:
+            for ring in polygon:
+                for start, end in zip(ring, ring[1:] + ring[:1]):
+                    if min_lon <= start[0] <= max_lon and min_lat <= start[1] <= max_lat:
+                        return True
+                    if any(_segments_cross(start, end, a, b) for a, b in box_edges):
+                        return True
+        return False
+
+
+def _check_point(longitude, latitude):
+    if not isinstance(longitude, (int, float)) or not isinstance(latitude, (int, float)):
+        raise ValueError("Las coordenadas deben ser números")
+    if not (-90 <= latitude <= 90):
+        raise ValueError("Latitud debe estar entre -90 y 90")
+    if not (-180 <= longitude <= 180):
+        raise ValueError("Longitud debe estar entre -180 y 180")
+
+
+def _parse_polygon(rings: Sequence) -> Tuple[Ring, ...]:
+    """Anillos [[lon, lat], ...]; el punto de cierre repetido se descarta"""
+    if not isinstance(rings, list) or not rings:
+        raise ValueError("Cada polígono debe tener al menos un anillo")
+    parsed: List[Ring] = []
+    for ring in rings:
+        if not isinstance(ring, list) or not all(isinstance(point, list) and len(point) >= 2 for point in ring):
+            raise ValueError("Cada anillo debe ser una lista de posiciones [lon, lat]")
+        points = [(point[0], point[1]) for point in ring]
+        for longitude, latitude in points:
+            _check_point(longitude, latitude)
+        if len(points) > 1 and points[0] == points[-1]:
+            points = points[:-1]
+        if len(points) < 3:
+            raise ValueError("Cada anillo debe tener al menos 3 posiciones distintas")
+        parsed.append(tuple(points))
+    return tuple(parsed)
+
+
+def _inside(polygon: Tuple[Ring, ...], x: float, y: float) -> bool:
+    """Regla par-impar (ray casting) sobre todos los anillos del polígono"""
+    inside = False
+    for ring in polygon:
+        previous = ring[-1]
+        for current in ring:
+            (x1, y1), (x2, y2) = previous, current
+            if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+                inside = not inside
+            previous = current
+    return inside
+
+
+def _segments_cross(p1: Point, p2: Point, q1: Point, q2: Point) -> bool:
+    """True si los segmentos p1-p2 y q1-q2 se cortan (incluye tocarse)"""
+    def orientation(a, b, c):
+        value = (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+        return (value > 0) - (value < 0)
+
+    def on_segment(a, b, c):
+        return min(a[0], b[0]) <= c[0] <= max(a[0], b[0]) and min(a[1], b[1]) <= c[1] <= max(a[1], b[1])
+
+    o1, o2 = orientation(p1, p2, q1), orientation(p1, p2, q2)
+    o3, o4 = orientation(q1, q2, p1), orientation(q1, q2, p2)
+    if o1 != o2 and o3 != o4:
+        return True
+    return (
+        (o1 == 0 and on_segment(p1, p2, q1)) or (o2 == 0 and on_segment(p1, p2, q2))
+        or (o3 == 0 and on_segment(q1, q2, p1)) or (o4 == 0 and on_segment(q1, q2, p2))
+    )
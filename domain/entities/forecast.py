@@ -2,7 +2,7 @@
 Entidad Forecast - Capa de Dominio
 Representa el pronóstico del clima sin dependencias externas
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
@@ -21,6 +21,8 @@ class Forecast:
     forecast_date: datetime
     humidity: Optional[int] = None
     wind_kph: Optional[float] = None
+    # Último valor conocido servido como respaldo porque el upstream no respondió
+    is_stale: bool = field(default=False, compare=False)
     
     def requires_alert(self) -> bool:
         """Determina si el pronóstico requiere una alerta"""
@@ -0,0 +1,52 @@
+"""
+Entidad GeoCell - Capa de Dominio
+Celda de una grilla regular de latitud/longitud usada para agrupar ubicaciones
+"""
+import math
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class GeoCell:
+    """Celda de tamaño fijo (en grados) identificada por su fila y columna"""
+
+    row: int
+    col: int
+    size: float
+
+    @classmethod
+    def from_coordinates(cls, latitude: float, longitude: float, size: float) -> 'GeoCell':
+        """Retorna la celda que contiene la coordenada"""
+        rows = max(1, int(round(180.0 / size)))
+        cols = max(1, int(round(360.0 / size)))
+        row = min(int(math.floor((latitude + 90.0) / size)), rows - 1)
+        col = min(int(math.floor((longitude + 180.0) / size)), cols - 1)
+        return cls(row=row, col=col, size=size)
+
+    @classmethod
+    def from_key(cls, key: str) -> 'GeoCell':
+        """Reconstruye una celda a partir de su clave"""
+        size, row, col = key.split(':')
+        return cls(row=int(row), col=int(col), size=float(size))
+
+    @property
+    def key(self) -> str:
+        """Clave estable de la celda, ej: '0.1:950:1044'"""
+        return f"{self.size:g}:{self.row}:{self.col}"
+
+    @property
+    def index(self) -> int:
+        """Posición de la celda en la grilla recorrida por filas (estable entre procesos)"""
+        return self.row * max(1, int(round(360.0 / self.size))) + self.col
+    
+    def partition(self, partitions: int) -> int:
+        """Partición de la celda cuando la grilla se reparte en `partitions`"""
+        return self.index % partitions
+
+    @property
+    def center(self) -> tuple[float, float]:
+        """Coordenada (latitud, longitud) del centro de la celda"""
+        return (
+            round(-90.0 + (self.row + 0.5) * self.size, 6),
+            round(-180.0 + (self.col + 0.5) * self.size, 6)
+        )
@@ -0,0 +1,54 @@
+"""
+Entidad ObservationSeries - Capa de Dominio
+Serie temporal de los pronósticos observados en una celda, en columnas
+"""
+import math
+from array import array
+from dataclasses import dataclass, field
+
+
+@dataclass
+class ObservationSeries:
+    """
+    Observaciones de una celda ordenadas por tiempo, una columna por campo.
+    Las columnas son `array.array` de tipo fijo, así se pueden pasar sin copiar
+    a herramientas vectorizadas (p. ej. `numpy.frombuffer(serie.temperature_c,
+    dtype='float32')`).
+
+    Un punto reducido (downsampling) resume `samples` observaciones: la
+    temperatura y la humedad son promedios, el viento es el máximo y `adverse`
+    cuenta cuántas de ellas eran adversas. Sin dato: humedad -1, viento NaN.
+    """
+
+    cell_key: str
+    timestamps: array = field(default_factory=lambda: array('q'))
+    temperature_c: array = field(default_factory=lambda: array('f'))
+    condition_code: array = field(default_factory=lambda: array('H'))
+    adverse: array = field(default_factory=lambda: array('H'))
+    samples: array = field(default_factory=lambda: array('H'))
+    humidity: array = field(default_factory=lambda: array('b'))
+    wind_kph: array = field(default_factory=lambda: array('f'))
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def total_samples(self) -> int:
+        """Observaciones resumidas en la serie (cuenta las de los puntos reducidos)"""
+        return sum(self.samples)
+
+    def adverse_ratio(self) -> float:
+        """Fracción de las observaciones que fueron adversas"""
+        total = self.total_samples()
+        return round(sum(self.adverse) / total, 4) if total else 0.0
+
+    def to_dict(self) -> dict:
+        """Columnas como listas para JSON (sin dato = None)"""
+        return {
+            'timestamps': self.timestamps.tolist(),
+            'temperature_c': [round(value, 2) for value in self.temperature_c],
+            'condition_code': self.condition_code.tolist(),
+            'adverse': self.adverse.tolist(),
+            'samples': self.samples.tolist(),
+            'humidity': [None if value < 0 else value for value in self.humidity],
+            'wind_kph': [None if math.isnan(value) else round(value, 2) for value in self.wind_kph]
+        }
@@ -0,0 +1,27 @@
+"""
+Entidad Subscription - Capa de Dominio
+Representa un destinatario suscrito a las alertas de una ubicación
+"""
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass
+class Subscription:
+    """Entidad que representa la suscripción de un email a una ubicación"""
+    
+    email: str
+    latitude: float
+    longitude: float
+    created_at: datetime
+    id: int = None
+    
+    def to_dict(self) -> dict:
+        """Convierte la suscripción a un diccionario"""
+        return {
+            'id': self.id,
+            'email': self.email,
+            'latitude': self.latitude,
+            'longitude': self.longitude,
+            'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S')
+        }
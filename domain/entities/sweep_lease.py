@@ -0,0 +1,38 @@
+"""
+Entidad SweepLease - Capa de Dominio
+Concesión temporal de una partición del barrido periódico de celdas
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class SweepLease:
+    """
+    Una partición de una ronda del barrido, concedida a un worker hasta
+    `expires_at` (epoch). `token` identifica la concesión: renovarla o darla
+    por terminada solo funciona mientras nadie la haya tomado después.
+    `cursor` es el índice de la última celda barrida (-1 si ninguna).
+    """
+
+    round_key: str
+    partition: int
+    owner: Optional[str] = None
+    token: Optional[str] = None
+    expires_at: float = 0.0
+    cursor: int = -1
+    processed: int = 0
+    done: bool = False
+    takeovers: int = 0
+
+    def to_dict(self) -> dict:
+        """Convierte la concesión a un diccionario"""
+        return {
+            'partition': self.partition,
+            'owner': self.owner,
+            'expires_at': self.expires_at,
+            'cursor': self.cursor,
+            'processed': self.processed,
+            'done': self.done,
+            'takeovers': self.takeovers
+        }
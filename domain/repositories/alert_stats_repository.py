@@ -0,0 +1,34 @@
+"""
+Interfaz AlertStatsRepository - Capa de Dominio
+Define el contrato para consultar los agregados de alertas
+"""
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import List, Optional
+from domain.entities.alert_stats import AlertCount, RecipientAlertStats
+from domain.entities.geo_cell import GeoCell
+
+
+class AlertStatsRepository(ABC):
+    """Interfaz que define las operaciones sobre los agregados de alertas"""
+    
+    @abstractmethod
+    def find_daily_counts(
+        self,
+        start_day: date,
+        end_day: date,
+        code: Optional[int] = None,
+        cell: Optional[GeoCell] = None
+    ) -> List[AlertCount]:
+        """Obtiene los conteos por (día, código, celda) en un rango de días"""
+        pass
+    
+    @abstractmethod
+    def find_recipient_stats(self, email: str) -> Optional[RecipientAlertStats]:
+        """Obtiene el resumen de alertas de un destinatario"""
+        pass
+    
+    @abstractmethod
+    def rebuild(self) -> int:
+        """Regenera los agregados desde el historial; retorna las notificaciones procesadas"""
+        pass
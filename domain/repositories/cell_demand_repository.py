@@ -0,0 +1,41 @@
+"""
+Interfaz CellDemandRepository - Capa de Dominio
+Define el contrato para la demanda histórica de pronósticos por celda y hora
+"""
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from typing import Dict, List, Tuple
+
+
+class CellDemandRepository(ABC):
+    """Interfaz que define las operaciones sobre la demanda por celda"""
+    
+    @abstractmethod
+    def record(self, cell_key: str, at: datetime):
+        """Registra una consulta de la celda (puede quedar en un búfer hasta flush)"""
+        pass
+    
+    @abstractmethod
+    def flush(self) -> int:
+        """Persiste lo registrado; retorna cuántas celdas se escribieron"""
+        pass
+    
+    @abstractmethod
+    def hottest_cells(self, hour: int, since: date, limit: int) -> List[Tuple[str, int]]:
+        """Celdas con más demanda en esa hora del día desde una fecha, de mayor a menor"""
+        pass
+    
+    @abstractmethod
+    def demand_by_cell(self, day: date, hour: int) -> Dict[str, int]:
+        """Demanda registrada por celda en una hora concreta"""
+        pass
+    
+    @abstractmethod
+    def claim_run(self, run_key: str) -> bool:
+        """Reclama una ejecución del precalentamiento; solo el primero la obtiene"""
+        pass
+    
+    @abstractmethod
+    def purge_before(self, day: date) -> int:
+        """Elimina la demanda anterior a una fecha"""
+        pass
@@ -0,0 +1,31 @@
+"""
+Interfaz NotificationArchiveRepository - Capa de Dominio
+Define el contrato para el archivo histórico (frío) de notificaciones
+"""
+from abc import ABC, abstractmethod
+from typing import Iterator, List, Optional
+from domain.entities.notification import Notification
+
+
+class NotificationArchiveRepository(ABC):
+    """Interfaz del archivo de notificaciones, organizado por mes (YYYY-MM)"""
+    
+    @abstractmethod
+    def append(self, month: str, notifications: List[Notification]):
+        """Agrega notificaciones al archivo del mes; el archivo solo crece"""
+        pass
+    
+    @abstractmethod
+    def months(self) -> List[str]:
+        """Meses archivados, en orden ascendente"""
+        pass
+    
+    @abstractmethod
+    def find_by_month(self, month: str, email: Optional[str] = None) -> List[Notification]:
+        """Lee las notificaciones archivadas de un mes, opcionalmente de un email"""
+        pass
+    
+    @abstractmethod
+    def scan(self) -> Iterator[Notification]:
+        """Recorre todas las notificaciones archivadas"""
+        pass
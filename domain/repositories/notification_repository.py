@@ -3,7 +3,8 @@ Interfaz NotificationRepository - Capa de Dominio
 Define el contrato para el repositorio de notificaciones
 """
 from abc import ABC, abstractmethod
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 from domain.entities.notification import Notification
 
 
@@ -24,3 +25,39 @@ class NotificationRepository(ABC):
     def find_all(self) -> List[Notification]:
         """Obtiene todas las notificaciones"""
         pass
+    
+    @abstractmethod
+    def find_near(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        since: Optional[datetime] = None
+    ) -> List[Notification]:
+        """Encuentra las notificaciones dentro de un radio (km), opcionalmente desde una fecha"""
+        pass
+    
+    @abstractmethod
+    def find_sent_before(self, cutoff: datetime, limit: int) -> List[Notification]:
+        """Obtiene las notificaciones más antiguas enviadas antes de una fecha"""
+        pass
+    
+    @abstractmethod
+    def find_by_email_between(self, email: str, start: datetime, end: datetime) -> List[Notification]:
+        """Encuentra las notificaciones de un email enviadas en [start, end)"""
+        pass
+    
+    @abstractmethod
+    def find_after(self, after_id: int, limit: int, email: Optional[str] = None) -> List[Notification]:
+        """Obtiene, en orden de id, las notificaciones con id mayor a after_id (opcionalmente de un email)"""
+        pass
+    
+    @abstractmethod
+    def last_id(self) -> int:
+        """Id de la notificación más reciente (0 si no hay)"""
+        pass
+    
+    @abstractmethod
+    def delete_by_ids(self, ids: List[int]) -> int:
+        """Elimina notificaciones por id y retorna cuántas se eliminaron"""
+        pass
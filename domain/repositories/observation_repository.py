@@ -0,0 +1,37 @@
+"""
+Interfaz ObservationRepository - Capa de Dominio
+Define el contrato del historial de pronósticos observados por celda
+"""
+from abc import ABC, abstractmethod
+from datetime import datetime
+from domain.entities.forecast import Forecast
+from domain.entities.observation_series import ObservationSeries
+
+
+class ObservationRepository(ABC):
+    """Interfaz del almacén de observaciones: solo se agrega, se reduce o se purga"""
+
+    @abstractmethod
+    def record(self, cell_key: str, forecast: Forecast, at: datetime):
+        """Registra un pronóstico traído del upstream (puede quedar en un búfer hasta flush)"""
+        pass
+
+    @abstractmethod
+    def flush(self) -> int:
+        """Persiste lo registrado; retorna cuántas observaciones se escribieron"""
+        pass
+
+    @abstractmethod
+    def find_range(self, cell_key: str, start: datetime, end: datetime) -> ObservationSeries:
+        """Observaciones de la celda en [start, end), ordenadas por tiempo"""
+        pass
+
+    @abstractmethod
+    def downsample(self, before: datetime, resolution_seconds: int) -> int:
+        """Reduce a un punto por `resolution_seconds` lo anterior a una fecha; retorna los buckets reducidos"""
+        pass
+
+    @abstractmethod
+    def purge_before(self, before: datetime) -> int:
+        """Elimina las observaciones anteriores a una fecha"""
+        pass
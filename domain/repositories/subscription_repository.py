@@ -0,0 +1,37 @@
+"""
+Interfaz SubscriptionRepository - Capa de Dominio
+Define el contrato para el repositorio de suscripciones
+"""
+from abc import ABC, abstractmethod
+from typing import List
+from domain.entities.subscription import Subscription
+
+
+class SubscriptionRepository(ABC):
+    """Interfaz que define las operaciones del repositorio de suscripciones"""
+    
+    @abstractmethod
+    def save_batch(self, subscriptions: List[Subscription]) -> int:
+        """
+        Guarda un lote en una sola transacción. Las suscripciones repetidas
+        (mismo email y ubicación) se ignoran; retorna cuántas se insertaron
+        """
+        pass
+    
+    @abstractmethod
+    def find_by_email(self, email: str) -> List[Subscription]:
+        """Encuentra las suscripciones de un email"""
+        pass
+    
+    @abstractmethod
+    def find_in_partition(self, cell_size: float, partition: int, partitions: int) -> List[Subscription]:
+        """
+        Suscripciones cuyas celdas caen en la partición (GeoCell.partition),
+        ordenadas por índice de celda
+        """
+        pass
+    
+    @abstractmethod
+    def count(self) -> int:
+        """Número total de suscripciones"""
+        pass
@@ -0,0 +1,39 @@
+"""
+Interfaz SweepLeaseRepository - Capa de Dominio
+Define el contrato para las concesiones de particiones del barrido
+"""
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from domain.entities.sweep_lease import SweepLease
+
+
+class SweepLeaseRepository(ABC):
+    """Interfaz que define las operaciones sobre las concesiones del barrido"""
+    
+    @abstractmethod
+    def claim(self, round_key: str, partitions: int, owner: str, lease_seconds: float, now: float) -> Optional[SweepLease]:
+        """
+        Concede una partición pendiente de la ronda: libre, o cuya concesión
+        venció sin terminarla. None si no queda ninguna disponible
+        """
+        pass
+    
+    @abstractmethod
+    def renew(self, lease: SweepLease, lease_seconds: float, now: float) -> bool:
+        """Extiende la concesión y guarda su avance; False si otro worker la tomó"""
+        pass
+    
+    @abstractmethod
+    def complete(self, lease: SweepLease, now: float) -> bool:
+        """Marca la partición como barrida; False si otro worker la tomó"""
+        pass
+    
+    @abstractmethod
+    def progress(self, round_key: str) -> List[SweepLease]:
+        """Estado de las particiones de la ronda, ordenadas"""
+        pass
+    
+    @abstractmethod
+    def purge_before(self, round_key: str) -> int:
+        """Elimina las concesiones de rondas anteriores"""
+        pass
@@ -0,0 +1,77 @@
+"""
+Area Sampling - Capa de Dominio
+Grilla adaptativa para muestrear el clima de un área con una cantidad
+acotada de celdas
+"""
+from typing import List, Tuple
+from domain.entities.area import Area
+from domain.entities.geo_cell import GeoCell
+
+
+# Múltiplos del tamaño base (1-2-5): con base 0.1 dan celdas que dividen la grilla global
+STEPS = (1, 2, 5)
+
+# Más allá de esta cantidad de celdas en la caja envolvente no se recorre: se pasa a la siguiente escala
+ENUMERATION_FACTOR = 64
+
+
+def cell_bounds(cell: GeoCell) -> Tuple[float, float, float, float]:
+    """Caja (min_lon, min_lat, max_lon, max_lat) de una celda"""
+    min_lat = -90.0 + cell.row * cell.size
+    min_lon = -180.0 + cell.col * cell.size
+    return (
+        round(min_lon, 6),
+        round(min_lat, 6),
+        round(min(180.0, min_lon + cell.size), 6),
+        round(min(90.0, min_lat + cell.size), 6)
+    )
+
+
+def sample_area(area: Area, base_cell_size: float, max_samples: int) -> Tuple[float, List[GeoCell]]:
+    """
+    Celdas de la grilla que tocan el área, con el menor tamaño (base × 1, 2,
+    5, 10, 20, ...) que no supere `max_samples`: un barrio se muestrea con las
+    celdas de la caché y un departamento con celdas más gruesas, así las
+    llamadas al upstream quedan acotadas sea cual sea el tamaño del área.
+
+    Returns:
+        (tamaño de celda elegido, celdas que tocan el área en orden de fila y columna)
+    """
+    if max_samples < 1:
+        raise ValueError("max_samples debe ser al menos 1")
+    for size in _sizes(base_cell_size):
+        cells = _cells_touching(area, size, max_samples * ENUMERATION_FACTOR)
+        if cells is not None and len(cells) <= max_samples:
+            return size, cells
+    raise ValueError("No se pudo muestrear el área")  # pragma: no cover - a escala global queda una celda
+
+
+def _sizes(base: float):
+    """base × 1, 2, 5, 10, 20, 50, ... hasta cubrir el mundo con una celda"""
+    magnitude = 1
+    while True:
+        for step in STEPS:
+            size = round(base * step * magnitude, 10)
+            yield size
+            if size >= 360.0:
+                return
+        magnitude *= 10
+
+
+def _cells_touching(area: Area, size: float, limit: int):
+    """Celdas de tamaño `size` que tocan el área, o None si la caja envolvente tiene más de `limit`"""
+    min_lon, min_lat, max_lon, max_lat = area.bounds
+    low = GeoCell.from_coordinates(min_lat, min_lon, size)
+    high = GeoCell.from_coordinates(max_lat, max_lon, size)
+    if (high.row - low.row + 1) * (high.col - low.col + 1) > limit:
+        return None
+    # Se encoge apenas la celda: compartir solo un borde con el área no cuenta como tocarla
+    margin = size * 1e-6
+    cells = []
+    for row in range(low.row, high.row + 1):
+        for col in range(low.col, high.col + 1):
+            cell = GeoCell(row=row, col=col, size=size)
+            west, south, east, north = cell_bounds(cell)
+            if area.intersects_box(west + margin, south + margin, east - margin, north - margin):
+                cells.append(cell)
+    return cells
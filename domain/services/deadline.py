@@ -0,0 +1,100 @@
+"""
+Deadline - Capa de Dominio
+Plazo de la solicitud en curso. Como la prioridad, viaja en una variable de
+contexto hasta cada etapa (upstream del clima, SMTP, base de datos), que
+acota su propio timeout con lo que queda del plazo
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+
+class DeadlineExceededException(Exception):
+    """Se agotó el plazo de la solicitud; `stage` indica la etapa que lo agotó"""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        super().__init__(f"Se agotó el plazo de la solicitud en la etapa '{stage}'")
+
+
+class Deadline:
+    """Instante límite (reloj monotónico) y el presupuesto con que se fijó"""
+
+    __slots__ = ('budget', 'expires_at', '_clock')
+
+    def __init__(self, budget: float, clock=time.monotonic):
+        self.budget = budget
+        self.expires_at = clock() + budget
+        self._clock = clock
+
+    def remaining(self) -> float:
+        """Segundos que quedan (0 si ya venció)"""
+        return max(0.0, self.expires_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        return self._clock() >= self.expires_at
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar('request_deadline', default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Plazo del contexto actual, o None si no hay"""
+    return _current.get()
+
+
+@contextmanager
+def deadline(seconds: Optional[float], clock=time.monotonic):
+    """
+    Fija el plazo de todo lo que se ejecute dentro del bloque. Un plazo
+    anidado nunca extiende al exterior: rige el que venza primero
+    """
+    if seconds is None:
+        yield _current.get()
+        return
+
+    scoped = Deadline(seconds, clock)
+    outer = _current.get()
+    if outer is not None and outer.expires_at <= scoped.expires_at:
+        scoped = outer
+    token = _current.set(scoped)
+    try:
+        yield scoped
+    finally:
+        _current.reset(token)
+
+
+def time_budget(stage: str, default: float) -> float:
+    """
+    Timeout para la próxima llamada de la etapa: el suyo propio o lo que
+    queda del plazo, lo que sea menor
+
+    Raises:
+        DeadlineExceededException: Si el plazo ya venció
+    """
+    current = _current.get()
+    if current is None:
+        return default
+    remaining = current.remaining()
+    if remaining <= 0:
+        raise DeadlineExceededException(stage)
+    return min(default, remaining)
+
+
+def check_deadline(stage: str):
+    """
+    Corta el trabajo de la etapa si el plazo ya venció
+
+    Raises:
+        DeadlineExceededException: Si hay un plazo y ya venció
+    """
+    if deadline_expired():
+        raise DeadlineExceededException(stage)
+
+
+def deadline_expired() -> bool:
+    """True si hay un plazo y ya venció (p. ej. para interpretar un timeout)"""
+    current = _current.get()
+    return current is not None and current.expired
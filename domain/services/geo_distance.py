@@ -0,0 +1,51 @@
+"""
+Geo Distance - Capa de Dominio
+Cálculos de distancia y cajas envolventes sobre la esfera terrestre
+"""
+import math
+from typing import List, Tuple
+
+
+EARTH_RADIUS_KM = 6371.0088
+# Derivado del mismo radio que haversine_km: con otro valor la caja no contiene el círculo
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180.0
+# Holgura para el redondeo de punto flotante (~1 cm); haversine_km filtra lo que sobre
+BOX_EPSILON_DEGREES = 1e-7
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Distancia de círculo máximo en kilómetros entre dos coordenadas"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_boxes(latitude: float, longitude: float, radius_km: float) -> List[Tuple[float, float, float, float]]:
+    """
+    Cajas (min_lat, max_lat, min_lon, max_lon) que contienen el círculo dado.
+    Si el círculo cruza el antimeridiano se retornan dos cajas; si toca un
+    polo, la caja cubre todas las longitudes.
+    """
+    angular = radius_km / EARTH_RADIUS_KM
+    d_lat = math.degrees(angular) + BOX_EPSILON_DEGREES
+    min_lat = max(-90.0, latitude - d_lat)
+    max_lat = min(90.0, latitude + d_lat)
+
+    cos_lat = math.cos(math.radians(latitude))
+    if min_lat <= -90.0 or max_lat >= 90.0 or math.sin(angular) >= cos_lat:
+        return [(min_lat, max_lat, -180.0, 180.0)]
+
+    # Extensión exacta en longitud del casquete esférico (mayor que radio / cos(lat))
+    d_lon = math.degrees(math.asin(math.sin(angular) / cos_lat)) + BOX_EPSILON_DEGREES
+    if d_lon >= 180.0:
+        return [(min_lat, max_lat, -180.0, 180.0)]
+
+    min_lon = longitude - d_lon
+    max_lon = longitude + d_lon
+    if min_lon < -180.0:
+        return [(min_lat, max_lat, min_lon + 360.0, 180.0), (min_lat, max_lat, -180.0, max_lon)]
+    if max_lon > 180.0:
+        return [(min_lat, max_lat, min_lon, 180.0), (min_lat, max_lat, -180.0, max_lon - 360.0)]
+    return [(min_lat, max_lat, min_lon, max_lon)]
@@ -0,0 +1,35 @@
+"""
+Interfaz NotificationChannel - Capa de Dominio
+Define el contrato de los canales por los que se entregan las alertas
+"""
+from abc import ABC, abstractmethod
+from domain.entities.forecast import Forecast
+
+
+class NotificationChannel(ABC):
+    """
+    Canal de entrega de alertas (email, webhook...). Cada destinatario elige
+    por qué canales recibirlas; `address` es la dirección en ese canal (el
+    correo o la URL del webhook).
+    """
+
+    name = 'channel'
+
+    def validate_address(self, address: str):
+        """
+        Valida la dirección antes de procesar la solicitud
+
+        Raises:
+            ValueError: Si la dirección no es válida para el canal
+        """
+        pass
+
+    @abstractmethod
+    def send_alert(self, address: str, forecast: Forecast) -> bool:
+        """
+        Entrega, o deja programada, la alerta de un pronóstico adverso
+
+        Returns:
+            bool: True si la entrega quedó diferida (resumen o lote pendiente)
+        """
+        pass
@@ -0,0 +1,22 @@
+"""
+Interfaz RecipientFilter - Capa de Dominio
+Filtro compacto de los destinatarios que tienen notificaciones: responde
+"seguro que no" sin consultar el repositorio
+"""
+from abc import ABC, abstractmethod
+
+
+class RecipientFilter(ABC):
+    """
+    Conjunto aproximado de los emails con notificaciones: sin falsos negativos
+    para lo ya incorporado; lo que guardan otros procesos puede tardar en entrar
+    """
+
+    @abstractmethod
+    def might_contain(self, email: str) -> bool:
+        """False si el email seguro no tiene notificaciones; True si puede tenerlas"""
+        pass
+
+    def report_false_positive(self, email: str):
+        """El filtro dijo que sí y el repositorio no encontró nada (para medir la tasa real)"""
+        pass
@@ -0,0 +1,29 @@
+"""
+Request Priority - Capa de Dominio
+Prioridad del trabajo en curso frente a recursos compartidos (p. ej. la cuota
+del upstream del clima). Por defecto todo es interactivo; las tareas de fondo
+se marcan explícitamente.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+INTERACTIVE = 'interactive'
+BACKGROUND = 'background'
+
+_current = ContextVar('request_priority', default=INTERACTIVE)
+
+
+def current_priority() -> str:
+    """Prioridad del contexto actual"""
+    return _current.get()
+
+
+@contextmanager
+def background():
+    """Marca como trabajo de fondo todo lo que se ejecute dentro del bloque"""
+    token = _current.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        _current.reset(token)
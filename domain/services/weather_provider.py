@@ -0,0 +1,26 @@
+"""
+Interfaz WeatherProvider - Capa de Dominio
+Define el contrato de los proveedores de pronósticos del clima
+"""
+from abc import ABC, abstractmethod
+from domain.entities.forecast import Forecast
+
+
+class WeatherProvider(ABC):
+    """
+    Fuente de pronósticos. Las implementaciones traducen la respuesta de su
+    API a Forecast usando los códigos de condición de WeatherAPI, que son los
+    que usan las alertas, los agregados y los códigos urgentes.
+    """
+    
+    name = 'provider'
+    
+    @abstractmethod
+    def get_forecast(self, latitude: float, longitude: float) -> Forecast:
+        """
+        Obtiene el pronóstico actual de una ubicación
+        
+        Raises:
+            WeatherAPIException: Si el proveedor falla o su respuesta no es válida
+        """
+        pass
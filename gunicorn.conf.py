@@ -0,0 +1,54 @@
+"""
+Configuración de Gunicorn para producción
+Modelo multi-proceso (WEB_CONCURRENCY workers) y multi-hilo (WEB_THREADS hilos
+por worker) con la app precargada en el maestro y drenado ordenado al apagar.
+"""
+import multiprocessing
+import os
+
+from infrastructure.runtime.lifecycle import defer_background_start, run_background_starts, run_shutdown_hooks
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Workers y hilos. Los hilos deben superar lo que el control de admisión deja
+# ocupar a alertas e importaciones (ADMISSION_ALERTS_LIMIT + ADMISSION_ALERTS_QUEUE
+# + ADMISSION_BULK_LIMIT) más los streams SSE (SSE_MAX_CONNECTIONS, un hilo cada
+# uno) para que siempre queden hilos libres para las lecturas
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('WEB_THREADS', 12))
+worker_class = 'gthread'
+
+# Precarga: create_app() corre una vez en el maestro y se comparte copy-on-write.
+# Los hilos de fondo (barrido, broker, precalentamiento, resúmenes, monitores)
+# no arrancan en el maestro sino en cada worker, en post_fork
+preload_app = True
+defer_background_start()
+
+# Timeouts y drenado: ante SIGTERM los workers dejan de aceptar conexiones y
+# tienen graceful_timeout segundos para terminar las peticiones en curso
+timeout = int(os.environ.get('WEB_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('WEB_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('WEB_KEEPALIVE', 5))
+
+# Reciclaje de workers para acotar fugas de memoria
+max_requests = int(os.environ.get('WEB_MAX_REQUESTS', 0))
+max_requests_jitter = int(os.environ.get('WEB_MAX_REQUESTS_JITTER', 0))
+
+accesslog = os.environ.get('WEB_ACCESS_LOG') or None
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    """Arranca en el worker los hilos de fondo que la precarga dejó pendientes"""
+    run_background_starts()
+
+
+def worker_exit(server, worker):
+    """Cierra pools y conexiones del worker cuando termina de drenar"""
+    run_shutdown_hooks()
+
+
+def on_exit(server):
+    """Libera los recursos que el maestro abrió durante la precarga"""
+    run_shutdown_hooks()
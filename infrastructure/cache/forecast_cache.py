@@ -0,0 +1,112 @@
+"""
+Forecast Cache - Capa de Infraestructura
+Caché de pronósticos por celda geográfica con expiración (TTL)
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from itertools import islice
+from typing import Optional
+from domain.entities.forecast import Forecast
+from infrastructure.monitoring.memory_monitor import estimate_size
+
+
+class ForecastCache(ABC):
+    """Interfaz de las cachés de pronósticos"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Forecast]:
+        """Retorna el pronóstico si existe y no ha expirado"""
+        pass
+
+    @abstractmethod
+    def get_stale(self, key: str, max_stale: float) -> Optional[Forecast]:
+        """Retorna el pronóstico aunque haya expirado hace menos de max_stale segundos"""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, forecast: Forecast, ttl: float):
+        """Guarda un pronóstico con un TTL en segundos"""
+        pass
+
+
+class InMemoryForecastCache(ForecastCache):
+    """Caché LRU acotada en memoria del proceso"""
+
+    def __init__(self, max_entries: int = 10000, clock=time.time):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Forecast]:
+        return self.get_stale(key, 0.0)
+
+    def get_stale(self, key: str, max_stale: float) -> Optional[Forecast]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, forecast = entry
+            if self._clock() >= expires_at + max_stale:
+                return None
+            self._entries.move_to_end(key)
+            return forecast
+
+    def set(self, key: str, forecast: Forecast, ttl: float):
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, forecast)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def memory_usage(self) -> int:
+        """Bytes aproximados que ocupan las entradas"""
+        with self._lock:
+            sample = list(islice(self._entries.items(), 32))
+            count = len(self._entries)
+        return estimate_size(self._entries, sample, count)
+
+    def shrink(self, max_bytes: int) -> int:
+        """Desaloja las entradas menos usadas hasta ocupar ~max_bytes; retorna cuántas"""
+        usage = self.memory_usage()
+        with self._lock:
+            if usage <= max_bytes or not self._entries:
+                return 0
+            keep = int(len(self._entries) * max_bytes / usage)
+            evicted = 0
+            while len(self._entries) > keep:
+                self._entries.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TieredForecastCache(ForecastCache):
+    """
+    Caché de dos niveles: una caché local del proceso delante de una
+    compartida, para no leer el disco en cada acierto
+    """
+
+    def __init__(self, local: ForecastCache, shared: ForecastCache, local_ttl: float = 30.0):
+        self.local = local
+        self.shared = shared
+        self.local_ttl = local_ttl
+
+    def get(self, key: str) -> Optional[Forecast]:
+        forecast = self.local.get(key)
+        if forecast is None:
+            forecast = self.shared.get(key)
+            if forecast is not None:
+                self.local.set(key, forecast, self.local_ttl)
+        return forecast
+
+    def get_stale(self, key: str, max_stale: float) -> Optional[Forecast]:
+        return self.local.get(key) or self.shared.get_stale(key, max_stale)
+
+    def set(self, key: str, forecast: Forecast, ttl: float):
+        self.shared.set(key, forecast, ttl)
+        self.local.set(key, forecast, min(ttl, self.local_ttl))
@@ -0,0 +1,169 @@
+"""
+Idempotency Store - Capa de Infraestructura
+Almacén acotado y con expiración de las respuestas asociadas a una Idempotency-Key
+"""
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Callable, Tuple
+from infrastructure.monitoring.memory_monitor import estimate_size
+from infrastructure.monitoring.metrics import metrics
+
+
+class IdempotencyKeyConflictException(Exception):
+    """La clave ya se usó con una solicitud distinta"""
+    pass
+
+
+class IdempotencyKeyInProgressException(Exception):
+    """La ejecución original sigue en curso y se agotó la espera"""
+    pass
+
+
+class _Entry:
+    """Ejecución asociada a una clave: en curso hasta que `done` se activa"""
+
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.done = threading.Event()
+        self.result = None
+        self.stored = False
+        self.expires_at = None
+
+
+class IdempotencyStore:
+    """
+    Ejecuta cada clave una sola vez por proceso (entre workers se usa
+    SQLiteIdempotencyStore). Un duplicado concurrente espera
+    a la ejecución en curso y recibe su resultado; los posteriores reciben el
+    resultado guardado hasta que expira. Las ejecuciones que fallan o cuyo
+    resultado no debe guardarse liberan la clave para que el reintento corra.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 86400.0,
+        max_entries: int = 10000,
+        wait_timeout: float = 30.0,
+        clock=time.monotonic
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.wait_timeout = wait_timeout
+        self._clock = clock
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        metrics.register_gauge('idempotency.entries', self.__len__)
+
+    def execute(
+        self,
+        key: str,
+        fingerprint: str,
+        func: Callable[[], Any],
+        should_store: Callable[[Any], bool] = lambda result: True
+    ) -> Tuple[Any, bool]:
+        """
+        Ejecuta `func` o reutiliza el resultado de la clave
+
+        Args:
+            key: Idempotency-Key de la solicitud
+            fingerprint: Huella del contenido de la solicitud
+            func: Ejecución original
+            should_store: Decide si el resultado se guarda para los duplicados
+
+        Returns:
+            tuple: (resultado, True si se reutilizó un resultado previo)
+        """
+        while True:
+            with self._lock:
+                entry = self._lookup(key)
+                if entry is None:
+                    entry = self._entries[key] = _Entry(fingerprint)
+                    owner = True
+                else:
+                    owner = False
+
+            if entry.fingerprint != fingerprint:
+                raise IdempotencyKeyConflictException(
+                    "La Idempotency-Key ya se usó con una solicitud distinta"
+                )
+
+            if owner:
+                return self._run(key, entry, func, should_store), False
+
+            if not entry.done.is_set():
+                metrics.increment('idempotency.waited')
+                if not entry.done.wait(self.wait_timeout):
+                    raise IdempotencyKeyInProgressException(
+                        "Hay una solicitud con la misma Idempotency-Key en curso"
+                    )
+
+            if entry.stored:
+                metrics.increment('idempotency.replayed')
+                return entry.result, True
+            # La ejecución original falló: se vuelve a intentar con una entrada nueva
+
+    def _run(self, key: str, entry: _Entry, func, should_store):
+        try:
+            result = func()
+        except BaseException:
+            self._release(key, entry)
+            raise
+
+        if not should_store(result):
+            self._release(key, entry)
+            return result
+
+        with self._lock:
+            entry.result = result
+            entry.stored = True
+            entry.expires_at = self._clock() + self.ttl
+            self._entries.move_to_end(key)
+            self._evict()
+        entry.done.set()
+        return result
+
+    def _release(self, key: str, entry: _Entry):
+        with self._lock:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+        entry.done.set()
+
+    def _lookup(self, key: str):
+        entry = self._entries.get(key)
+        if entry is not None and entry.stored and self._clock() >= entry.expires_at:
+            del self._entries[key]
+            return None
+        return entry
+
+    def memory_usage(self) -> int:
+        """Bytes aproximados que ocupan las claves y las respuestas guardadas"""
+        with self._lock:
+            sample = list(islice(self._entries.items(), 32))
+            count = len(self._entries)
+        return estimate_size(self._entries, sample, count)
+
+    def shrink(self, max_bytes: int) -> int:
+        """Descarta respuestas guardadas (las más viejas primero) hasta ocupar ~max_bytes"""
+        usage = self.memory_usage()
+        with self._lock:
+            if usage <= max_bytes or not self._entries:
+                return 0
+            before = len(self._entries)
+            self._evict(int(before * max_bytes / usage))
+            return before - len(self._entries)
+
+    def _evict(self, max_entries: int = None):
+        """Descarta las entradas terminadas más antiguas; las en curso nunca se descartan"""
+        max_entries = self.max_entries if max_entries is None else max_entries
+        if len(self._entries) <= max_entries:
+            return
+        for key in list(self._entries):
+            if len(self._entries) <= max_entries:
+                break
+            if self._entries[key].stored:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,296 @@
+"""
+Recipient Filter - Capa de Infraestructura
+Filtro de Bloom de los emails con notificaciones: GET /notifications de un
+email que nunca recibió una alerta se responde sin consultar la base
+"""
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+from typing import List, Optional
+from domain.repositories.notification_repository import NotificationRepository
+from domain.services.recipient_filter import RecipientFilter
+from infrastructure.monitoring.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom dimensionado para `capacity` claves con una tasa de falsos
+    positivos `false_positive_rate`: m = -n·ln(p)/ln(2)² bits y k = (m/n)·ln(2)
+    funciones hash, derivadas por doble hashing de un solo blake2b (estable
+    entre procesos, así que los bits se pueden persistir)
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float, bits: Optional[bytearray] = None, count: int = 0):
+        if capacity <= 0:
+            raise ValueError("La capacidad debe ser mayor que 0")
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("La tasa de falsos positivos debe estar entre 0 y 1")
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.size = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        if bits is not None and len(bits) != (self.size + 7) // 8:
+            raise ValueError("Los bits no corresponden a la capacidad y la tasa indicadas")
+        self.bits = bits if bits is not None else bytearray((self.size + 7) // 8)
+        self.count = count
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self.bits)
+
+    def add(self, key: str) -> bool:
+        """Agrega la clave; True si no estaba (no es seguro entre hilos: ver RecipientBloomFilter)"""
+        added = False
+        bits = self.bits
+        for position in self._positions(key):
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, key: str) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def estimated_false_positive_rate(self) -> float:
+        """Tasa esperada con las claves actuales: (1 - e^(-k·n/m))^k"""
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** self.hashes
+
+    def _positions(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + index * second) % self.size for index in range(self.hashes)]
+
+
+class RecipientBloomFilter(RecipientFilter):
+    """
+    Emails con notificaciones, en un filtro de Bloom por worker.
+
+    - `load` lo arma recorriendo la tabla por id (o desde `path`, si se
+      persistió con la misma capacidad y tasa, leyendo solo lo nuevo).
+    - El repositorio llama a `add` en cada `save` de este proceso.
+    - Lo que guardan otros workers lo lee un hilo cada `refresh_seconds`, por
+      id creciente (cada shard con su propio último id, como el broker de los
+      streams; los ids son AUTOINCREMENT y no se reutilizan al archivar).
+    - `might_contain` solo mira los bits: sin lock y sin consultar la base.
+      A cambio, durante hasta `refresh_seconds` un email al que otro worker
+      acaba de guardar su primera notificación puede recibir un "no".
+    - Un filtro no olvida: los emails archivados o borrados siguen como
+      "quizás" y solo cuestan la consulta, hasta el próximo `rebuild`.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(
+        self,
+        repository: Optional[NotificationRepository] = None,
+        capacity: int = 1000000,
+        false_positive_rate: float = 0.01,
+        refresh_seconds: float = 5.0,
+        path: Optional[str] = None,
+        batch_size: int = 5000
+    ):
+        self.repository = repository
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.refresh_seconds = refresh_seconds
+        self.path = path
+        self.batch_size = batch_size
+        self._filter = BloomFilter(capacity, false_positive_rate)
+        self._high_water: Optional[list] = None
+        self._negatives = 0
+        self._false_positives = 0
+        self._over_capacity_logged = False
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        metrics.register_gauge('recipient_filter', self.snapshot)
+
+    def load(self) -> 'RecipientBloomFilter':
+        """Arma el filtro: desde el archivo si es compatible, o recorriendo la tabla"""
+        if self.path and self._restore():
+            self.refresh()
+        else:
+            self.rebuild()
+        return self
+
+    def rebuild(self) -> int:
+        """Vuelve a armar el filtro desde cero con la tabla actual; retorna las filas leídas"""
+        with self._lock:
+            self._filter = BloomFilter(self.capacity, self.false_positive_rate)
+            self._high_water = [0] * len(self._sources())
+            return self._catch_up()
+
+    def refresh(self) -> int:
+        """Agrega lo guardado por otros procesos desde la última lectura; retorna las filas leídas"""
+        with self._lock:
+            return self._catch_up()
+
+    def add(self, email: str):
+        """Registra un destinatario con una notificación recién guardada"""
+        with self._lock:
+            self._filter.add(email)
+            self._check_capacity()
+
+    def might_contain(self, email: str) -> bool:
+        # Solo lectura de bits: `add` y el hilo de refresco no lo bloquean
+        if email in self._filter:
+            return True
+        with self._stats_lock:
+            self._negatives += 1
+        return False
+
+    def report_false_positive(self, email: str):
+        with self._stats_lock:
+            self._false_positives += 1
+
+    def snapshot(self) -> dict:
+        """Tamaño, tasa esperada con las claves actuales y tasa medida en las consultas"""
+        with self._stats_lock:
+            negatives, false_positives = self._negatives, self._false_positives
+        bloom = self._filter
+        absent = negatives + false_positives
+        return {
+            'items': bloom.count,
+            'capacity': bloom.capacity,
+            'bits': bloom.size,
+            'hashes': bloom.hashes,
+            'memory_bytes': bloom.memory_bytes,
+            'target_false_positive_rate': bloom.false_positive_rate,
+            'estimated_false_positive_rate': round(bloom.estimated_false_positive_rate(), 6),
+            'negatives': negatives,
+            'false_positives': false_positives,
+            # Sobre las consultas de emails sin notificaciones: las que igual llegaron a la base
+            'measured_false_positive_rate': round(false_positives / absent, 6) if absent else None
+        }
+
+    def memory_usage(self) -> int:
+        """Bytes del arreglo de bits (~1.2 MB para un millón de emails al 1 %)"""
+        return self._filter.memory_bytes
+
+    def start(self) -> 'RecipientBloomFilter':
+        """Inicia el hilo que lee lo guardado por otros workers"""
+        if self._thread is None and self.repository is not None and self.refresh_seconds > 0:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='recipient-filter', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Detiene el hilo de refresco"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def save(self):
+        """Persiste los bits y el último id leído en `path` (reemplazo atómico)"""
+        if not self.path or self._high_water is None:
+            return
+        with self._lock:
+            header = {
+                'version': self.FORMAT_VERSION,
+                'capacity': self._filter.capacity,
+                'false_positive_rate': self._filter.false_positive_rate,
+                'count': self._filter.count,
+                'high_water': list(self._high_water)
+            }
+            bits = bytes(self._filter.bits)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, 'wb') as filter_file:
+            filter_file.write(json.dumps(header).encode('utf-8') + b'\n')
+            filter_file.write(bits)
+        os.replace(temporary, self.path)
+
+    def reset_after_fork(self):
+        """El filtro heredado sirve; los locks pudieron quedar tomados por hilos del padre"""
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        if self._thread is not None:
+            self._thread = None
+            self.start()
+
+    def _restore(self) -> bool:
+        """Carga el archivo si existe, coincide la configuración y la tabla no retrocedió"""
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, 'rb') as filter_file:
+                header = json.loads(filter_file.readline())
+                bits = bytearray(filter_file.read())
+            if (header.get('version') != self.FORMAT_VERSION
+                    or header['capacity'] != self.capacity
+                    or header['false_positive_rate'] != self.false_positive_rate):
+                logger.info("Filtro de destinatarios persistido con otra configuración: se rearma")
+                return False
+            bloom = BloomFilter(self.capacity, self.false_positive_rate, bits=bits, count=header['count'])
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("No se pudo leer el filtro de destinatarios de %s: %s", self.path, e)
+            return False
+
+        high_water = header['high_water']
+        last_ids = [source.last_id() for source in self._sources()] if self.repository is not None else []
+        if len(high_water) != len(last_ids) or any(seen > last for seen, last in zip(high_water, last_ids)):
+            # Otra base u otros shards: los ids persistidos no corresponden a esta tabla
+            logger.info("El filtro de destinatarios persistido no corresponde a la base: se rearma")
+            return False
+
+        with self._lock:
+            self._filter = bloom
+            self._high_water = high_water
+        return True
+
+    def _catch_up(self) -> int:
+        """Lee por id lo que falte de cada fuente (con el lock tomado)"""
+        sources = self._sources()
+        if self._high_water is None:
+            self._high_water = [0] * len(sources)
+        total = 0
+        for index, source in enumerate(sources):
+            while True:
+                rows = source.find_after(self._high_water[index], self.batch_size)
+                for notification in rows:
+                    self._filter.add(notification.email)
+                total += len(rows)
+                if rows:
+                    self._high_water[index] = rows[-1].id
+                if len(rows) < self.batch_size:
+                    break
+        self._check_capacity()
+        return total
+
+    def _run(self):
+        while not self._stop.wait(self.refresh_seconds):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("No se pudo actualizar el filtro de destinatarios")
+
+    def _check_capacity(self):
+        if self._filter.count > self._filter.capacity and not self._over_capacity_logged:
+            self._over_capacity_logged = True
+            logger.warning(
+                "El filtro de destinatarios superó su capacidad (%d): la tasa de falsos positivos "
+                "crece; aumentar RECIPIENT_FILTER_CAPACITY", self._filter.capacity
+            )
+
+    def _sources(self) -> list:
+        """Lo que se sigue por id creciente: cada shard, o el repositorio entero"""
+        if self.repository is None:
+            return []
+        return getattr(self.repository, 'shards', None) or [self.repository]
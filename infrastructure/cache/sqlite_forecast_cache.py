@@ -0,0 +1,147 @@
+"""
+SQLite Forecast Cache - Capa de Infraestructura
+Caché de pronósticos compartida entre procesos y persistente en disco
+"""
+import os
+import sqlite3
+import struct
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+from domain.entities.forecast import Forecast
+from infrastructure.cache.forecast_cache import ForecastCache
+
+
+_FORMAT_VERSION = 1
+# versión, lat, lon, temperatura, código, adverso, humedad, viento, fecha
+_HEADER = struct.Struct('<BddfHBhfd')
+_LENGTH = struct.Struct('<H')
+
+
+def encode_forecast(forecast: Forecast) -> bytes:
+    """Serializa un Forecast en un registro binario compacto"""
+    location = forecast.location.encode('utf-8')
+    condition = forecast.condition.encode('utf-8')
+    return b''.join((
+        _HEADER.pack(
+            _FORMAT_VERSION,
+            forecast.latitude,
+            forecast.longitude,
+            forecast.temperature_c,
+            forecast.condition_code,
+            1 if forecast.is_adverse else 0,
+            -1 if forecast.humidity is None else forecast.humidity,
+            float('nan') if forecast.wind_kph is None else forecast.wind_kph,
+            forecast.forecast_date.timestamp()
+        ),
+        _LENGTH.pack(len(location)), location,
+        _LENGTH.pack(len(condition)), condition
+    ))
+
+
+def decode_forecast(payload: bytes) -> Forecast:
+    """Reconstruye un Forecast desde su registro binario"""
+    version, latitude, longitude, temperature, code, adverse, humidity, wind, date = \
+        _HEADER.unpack_from(payload, 0)
+    if version != _FORMAT_VERSION:
+        raise ValueError(f"Versión de registro desconocida: {version}")
+
+    offset = _HEADER.size
+    (length,) = _LENGTH.unpack_from(payload, offset)
+    offset += _LENGTH.size
+    location = payload[offset:offset + length].decode('utf-8')
+    offset += length
+    (length,) = _LENGTH.unpack_from(payload, offset)
+    offset += _LENGTH.size
+    condition = payload[offset:offset + length].decode('utf-8')
+
+    return Forecast(
+        location=location,
+        latitude=latitude,
+        longitude=longitude,
+        temperature_c=round(temperature, 2),
+        condition=condition,
+        condition_code=code,
+        is_adverse=bool(adverse),
+        forecast_date=datetime.fromtimestamp(date),
+        humidity=None if humidity < 0 else humidity,
+        wind_kph=None if wind != wind else round(wind, 2)
+    )
+
+
+class SQLiteForecastCache(ForecastCache):
+    """
+    Caché en un archivo SQLite (modo WAL) que comparten todos los workers.
+    Sobrevive a reinicios y despliegues, así un arranque en frío no golpea
+    al upstream por cada celda.
+    """
+
+    def __init__(self, path: str, max_stale: float = 3600.0, purge_every: int = 1000, clock=time.time):
+        self.path = path
+        self.max_stale = max_stale
+        self.purge_every = purge_every
+        self._clock = clock
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        self._create_schema()
+
+    def get(self, key: str) -> Optional[Forecast]:
+        return self.get_stale(key, 0.0)
+
+    def get_stale(self, key: str, max_stale: float) -> Optional[Forecast]:
+        row = self._connection().execute(
+            'SELECT payload FROM forecast_cache WHERE cell_key = ? AND expires_at > ?',
+            (key, self._clock() - max_stale)
+        ).fetchone()
+        return decode_forecast(row[0]) if row else None
+
+    def set(self, key: str, forecast: Forecast, ttl: float):
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO forecast_cache (cell_key, expires_at, payload) VALUES (?, ?, ?)',
+                (key, self._clock() + ttl, encode_forecast(forecast))
+            )
+
+        with self._writes_lock:
+            self._writes += 1
+            purge = self._writes % self.purge_every == 0
+        if purge:
+            self.purge_expired()
+
+    def purge_expired(self) -> int:
+        """Elimina las entradas que ya no sirven ni como respaldo"""
+        connection = self._connection()
+        with connection:
+            cursor = connection.execute(
+                'DELETE FROM forecast_cache WHERE expires_at <= ?',
+                (self._clock() - self.max_stale,)
+            )
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        return self._connection().execute('SELECT COUNT(*) FROM forecast_cache').fetchone()[0]
+
+    def _create_schema(self):
+        connection = self._connection()
+        connection.execute('PRAGMA journal_mode=WAL')
+        with connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS forecast_cache ('
+                ' cell_key TEXT PRIMARY KEY,'
+                ' expires_at REAL NOT NULL,'
+                ' payload BLOB NOT NULL'
+                ') WITHOUT ROWID'
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Conexión por hilo; se recrea si el proceso fue bifurcado (fork)"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
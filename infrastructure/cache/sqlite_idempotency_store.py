@@ -0,0 +1,193 @@
+"""
+SQLite Idempotency Store - Capa de Infraestructura
+Respuestas por Idempotency-Key compartidas por todos los workers mediante un archivo SQLite
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Tuple
+from infrastructure.cache.idempotency_store import (
+    IdempotencyKeyConflictException,
+    IdempotencyKeyInProgressException
+)
+from infrastructure.monitoring.metrics import metrics
+
+
+class SQLiteIdempotencyStore:
+    """
+    Misma interfaz que IdempotencyStore, pero la clave se reclama con una fila
+    en un archivo SQLite (modo WAL) común a todos los workers: un reintento que
+    llega a otro worker espera a la ejecución en curso o recibe su resultado.
+
+    La fila en curso lleva el dueño y vence a los `lease_seconds`, así un worker
+    que muere a mitad de la ejecución no bloquea la clave para siempre. Los
+    resultados se guardan como JSON.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 86400.0,
+        max_entries: int = 10000,
+        wait_timeout: float = 30.0,
+        lease_seconds: float = 300.0,
+        poll_interval: float = 0.05,
+        purge_every: int = 100,
+        clock=time.time
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.wait_timeout = wait_timeout
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.purge_every = purge_every
+        self._clock = clock
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        self._create_schema()
+        metrics.register_gauge('idempotency.entries', self.__len__)
+
+    def execute(
+        self,
+        key: str,
+        fingerprint: str,
+        func: Callable[[], Any],
+        should_store: Callable[[Any], bool] = lambda result: True
+    ) -> Tuple[Any, bool]:
+        """
+        Ejecuta `func` o reutiliza el resultado de la clave
+
+        Args:
+            key: Idempotency-Key de la solicitud
+            fingerprint: Huella del contenido de la solicitud
+            func: Ejecución original
+            should_store: Decide si el resultado se guarda para los duplicados
+
+        Returns:
+            tuple: (resultado, True si se reutilizó un resultado previo)
+        """
+        owner = uuid.uuid4().hex
+        give_up_at = None
+        while True:
+            row = self._claim(key, fingerprint, owner)
+            if row is None:
+                return self._run(key, owner, func, should_store), False
+
+            stored_fingerprint, result = row
+            if stored_fingerprint != fingerprint:
+                raise IdempotencyKeyConflictException(
+                    "La Idempotency-Key ya se usó con una solicitud distinta"
+                )
+
+            if result is not None:
+                metrics.increment('idempotency.replayed')
+                return json.loads(result), True
+
+            # En curso en este u otro worker: se espera a que guarde o libere la clave
+            if give_up_at is None:
+                metrics.increment('idempotency.waited')
+                give_up_at = time.monotonic() + self.wait_timeout
+            if time.monotonic() >= give_up_at:
+                raise IdempotencyKeyInProgressException(
+                    "Hay una solicitud con la misma Idempotency-Key en curso"
+                )
+            time.sleep(self.poll_interval)
+
+    def purge_expired(self) -> int:
+        """Elimina las filas vencidas y, sobre `max_entries`, los resultados más viejos"""
+        connection = self._connection()
+        with connection:
+            removed = connection.execute(
+                'DELETE FROM idempotency_keys WHERE expires_at <= ?', (self._clock(),)
+            ).rowcount
+            removed += connection.execute(
+                'DELETE FROM idempotency_keys WHERE key IN ('
+                ' SELECT key FROM idempotency_keys WHERE result IS NOT NULL'
+                ' ORDER BY expires_at LIMIT max(0, (SELECT COUNT(*) FROM idempotency_keys) - ?)'
+                ')',
+                (self.max_entries,)
+            ).rowcount
+        return removed
+
+    def _claim(self, key: str, fingerprint: str, owner: str):
+        """Reclama la clave; retorna None si quedó a nombre de `owner` o (huella, resultado) de la fila existente"""
+        now = self._clock()
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                'DELETE FROM idempotency_keys WHERE key = ? AND expires_at <= ?', (key, now)
+            )
+            claimed = connection.execute(
+                'INSERT OR IGNORE INTO idempotency_keys (key, fingerprint, owner, result, expires_at)'
+                ' VALUES (?, ?, ?, NULL, ?)',
+                (key, fingerprint, owner, now + self.lease_seconds)
+            ).rowcount
+            if claimed:
+                return None
+            return connection.execute(
+                'SELECT fingerprint, result FROM idempotency_keys WHERE key = ?', (key,)
+            ).fetchone()
+
+    def _run(self, key: str, owner: str, func, should_store):
+        try:
+            result = func()
+        except BaseException:
+            self._release(key, owner)
+            raise
+
+        if not should_store(result):
+            self._release(key, owner)
+            return result
+
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                'UPDATE idempotency_keys SET result = ?, owner = NULL, expires_at = ?'
+                ' WHERE key = ? AND owner = ?',
+                (json.dumps(result), self._clock() + self.ttl, key, owner)
+            )
+
+        with self._writes_lock:
+            self._writes += 1
+            purge = self._writes % self.purge_every == 0
+        if purge:
+            self.purge_expired()
+        return result
+
+    def _release(self, key: str, owner: str):
+        """Borra la fila en curso solo si sigue siendo de este dueño"""
+        connection = self._connection()
+        with connection:
+            connection.execute('DELETE FROM idempotency_keys WHERE key = ? AND owner = ?', (key, owner))
+
+    def __len__(self) -> int:
+        return self._connection().execute('SELECT COUNT(*) FROM idempotency_keys').fetchone()[0]
+
+    def _create_schema(self):
+        connection = self._connection()
+        connection.execute('PRAGMA journal_mode=WAL')
+        with connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS idempotency_keys ('
+                ' key TEXT PRIMARY KEY,'
+                ' fingerprint TEXT NOT NULL,'
+                ' owner TEXT,'
+                ' result TEXT,'
+                ' expires_at REAL NOT NULL'
+                ') WITHOUT ROWID'
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Conexión por hilo; se recrea si el proceso fue bifurcado (fork)"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
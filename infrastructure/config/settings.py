@@ -28,6 +28,189 @@ class Settings:
     # Database
     DATABASE_NAME: str
     
+    # Plazo de POST /check_weather (0 = sin plazo); debe ser menor que el del balanceador
+    REQUEST_DEADLINE_SECONDS: float = 14.0
+    
+    # Resiliencia del upstream del clima
+    WEATHER_API_TIMEOUT: float = 10.0
+    WEATHER_CELL_SIZE: float = 0.1
+    WEATHER_STALE_TTL: float = 1800.0
+    BREAKER_FAILURE_RATE: float = 0.5
+    BREAKER_SLOW_CALL_SECONDS: float = 3.0
+    BREAKER_SLOW_CALL_RATE: float = 0.5
+    BREAKER_WINDOW_SIZE: int = 20
+    BREAKER_MIN_CALLS: int = 10
+    BREAKER_OPEN_SECONDS: float = 30.0
+    BREAKER_HALF_OPEN_CALLS: int = 3
+    WEATHER_HEDGE_ENABLED: bool = False
+    WEATHER_HEDGE_MIN_DELAY: float = 0.2
+    
+    # Cuota del plan de WeatherAPI (0 = sin límite, solo se contabiliza)
+    WEATHER_QUOTA_PER_MINUTE: int = 0
+    WEATHER_QUOTA_PER_MONTH: int = 0
+    WEATHER_QUOTA_PATH: str = 'weather_quota.db'
+    WEATHER_QUOTA_TIGHT_RATIO: float = 0.8
+    WEATHER_DEGRADED_CELL_SIZE: float = 0.5
+    WEATHER_DEGRADED_TTL_FACTOR: float = 4.0
+    
+    # Proveedores del clima (en orden de preferencia inicial) y enrutamiento entre ellos
+    WEATHER_PROVIDERS: str = 'weatherapi'
+    OPENMETEO_API_URL: str = 'https://api.open-meteo.com/v1/forecast'
+    WEATHER_ROUTER_ERROR_THRESHOLD: float = 0.5
+    WEATHER_ROUTER_COOLDOWN_SECONDS: float = 30.0
+    WEATHER_ROUTER_PROBE_SECONDS: float = 60.0
+    
+    # Pool de conexiones SMTP
+    MAIL_POOL_SIZE: int = 4
+    MAIL_POOL_IDLE_SECONDS: float = 60.0
+    MAIL_TIMEOUT: float = 20.0
+    
+    # Modo resumen de alertas
+    DIGEST_ENABLED: bool = False
+    DIGEST_WINDOW_SECONDS: float = 3600.0
+    DIGEST_URGENT_CODES: str = '1087,1117,1273,1276,1279,1282'
+    
+    # Canal de alertas por webhook
+    WEBHOOK_ENABLED: bool = False
+    WEBHOOK_SECRET: str = ''
+    WEBHOOK_BATCH_SIZE: int = 100
+    WEBHOOK_BATCH_WAIT_SECONDS: float = 1.0
+    WEBHOOK_TIMEOUT: float = 5.0
+    WEBHOOK_WORKERS: int = 4
+    WEBHOOK_MAX_ATTEMPTS: int = 5
+    WEBHOOK_BACKOFF_SECONDS: float = 0.5
+    WEBHOOK_ALLOWED_HOSTS: str = ''
+    WEBHOOK_ALLOW_PRIVATE_NETWORKS: bool = False
+    
+    # Caché compartida de pronósticos
+    FORECAST_CACHE_ENABLED: bool = True
+    FORECAST_CACHE_PATH: str = 'forecast_cache.db'
+    FORECAST_CACHE_TTL: float = 600.0
+    FORECAST_CACHE_LOCAL_TTL: float = 30.0
+    
+    # Precalentamiento de la caché según la demanda histórica
+    PREFETCH_ENABLED: bool = False
+    PREFETCH_CELLS: int = 200
+    PREFETCH_LEAD_MINUTES: int = 10
+    PREFETCH_RATE: float = 5.0
+    PREFETCH_HISTORY_DAYS: int = 14
+    
+    # Barrido periódico de las suscripciones, repartido por particiones de celdas
+    SWEEP_ENABLED: bool = False
+    SWEEP_INTERVAL_SECONDS: float = 3600.0
+    SWEEP_PARTITIONS: int = 64
+    SWEEP_LEASE_SECONDS: float = 120.0
+    SWEEP_RATE: float = 5.0
+    
+    # Agregados de alertas
+    STATS_CELL_SIZE: float = 1.0
+    
+    # Retención y archivo de notificaciones
+    RETENTION_DAYS: int = 90
+    ARCHIVE_DIR: str = 'archive'
+    ARCHIVE_BATCH_SIZE: int = 1000
+    
+    # Notificaciones repartidas por hash del email (1 = solo DATABASE_NAME)
+    NOTIFICATION_SHARDS: int = 1
+    NOTIFICATION_SHARD_PATH: str = 'notifications-{shard}.db'
+    # save/find_by_email con sentencias preparadas de sqlite3 en vez de Peewee (una sola base)
+    NOTIFICATION_PREPARED_STATEMENTS: bool = False
+    
+    # POST /check_area: celdas consultadas como máximo por área y consultas en paralelo
+    AREA_MAX_SAMPLES: int = 64
+    AREA_MAX_WORKERS: int = 8
+    
+    # Filtro de Bloom de los emails con notificaciones (GET /notifications sin consulta si no hay)
+    RECIPIENT_FILTER_ENABLED: bool = True
+    RECIPIENT_FILTER_CAPACITY: int = 1000000
+    RECIPIENT_FILTER_FALSE_POSITIVE_RATE: float = 0.01
+    RECIPIENT_FILTER_REFRESH_SECONDS: float = 5.0
+    RECIPIENT_FILTER_PATH: str = ''
+    
+    # Historial de pronósticos por celda (WEATHER_CELL_SIZE)
+    OBSERVATIONS_ENABLED: bool = True
+    OBSERVATIONS_FLUSH_SECONDS: float = 60.0
+    OBSERVATIONS_RAW_DAYS: int = 7
+    OBSERVATIONS_RESOLUTION_SECONDS: int = 3600
+    OBSERVATIONS_RETENTION_DAYS: int = 400
+    
+    # Importación masiva de suscripciones
+    IMPORT_BATCH_SIZE: int = 5000
+    
+    # Idempotency-Key en POST /check_weather
+    IDEMPOTENCY_ENABLED: bool = True
+    IDEMPOTENCY_TTL_SECONDS: float = 86400.0
+    IDEMPOTENCY_MAX_ENTRIES: int = 10000
+    IDEMPOTENCY_WAIT_SECONDS: float = 30.0
+    IDEMPOTENCY_PATH: str = 'idempotency.db'
+    
+    # Stream SSE de notificaciones (cada stream ocupa un hilo del worker)
+    SSE_MAX_CONNECTIONS: int = 4
+    SSE_MAX_PER_RECIPIENT: int = 2
+    SSE_HEARTBEAT_SECONDS: float = 15.0
+    SSE_MAX_STREAM_SECONDS: float = 300.0
+    SSE_POLL_SECONDS: float = 1.0
+    SSE_QUEUE_SIZE: int = 100
+    
+    # Control de admisión por clase de ruta (límites por worker)
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_ADAPTIVE: bool = True
+    ADMISSION_QUEUE_TARGET_MS: float = 200.0
+    ADMISSION_ALERTS_LIMIT: int = 4
+    ADMISSION_ALERTS_QUEUE: int = 2
+    ADMISSION_READS_LIMIT: int = 16
+    ADMISSION_READS_QUEUE: int = 16
+    ADMISSION_BULK_LIMIT: int = 1
+    
+    # Administración e instrumentación de memoria
+    ADMIN_API_KEY: str = ''
+    MEMORY_SAMPLE_SECONDS: float = 30.0
+    MEMORY_HISTORY_SIZE: int = 120
+    MEMORY_TRACEMALLOC: bool = False
+    MEMORY_RSS_BUDGET_MB: float = 0.0
+    MEMORY_BUDGETS_MB: str = ''
+    
+    # Log de acceso estructurado ('{pid}' separa el archivo de cada worker; '-' es stdout)
+    ACCESS_LOG_ENABLED: bool = True
+    ACCESS_LOG_PATH: str = 'logs/access-{pid}.log'
+    ACCESS_LOG_MAX_MB: float = 10.0
+    ACCESS_LOG_BACKUP_COUNT: int = 5
+    ACCESS_LOG_SAMPLE_RATE: float = 1.0
+    ACCESS_LOG_SLOW_MS: float = 1000.0
+    ACCESS_LOG_QUEUE_SIZE: int = 10000
+    
+    @property
+    def weather_providers(self) -> list:
+        """Nombres de los proveedores del clima habilitados"""
+        return [name.strip().lower() for name in self.WEATHER_PROVIDERS.split(',') if name.strip()]
+    
+    @property
+    def memory_budgets(self) -> dict:
+        """Presupuesto en bytes por componente, de 'nombre=MB,nombre=MB'"""
+        budgets = {}
+        for item in self.MEMORY_BUDGETS_MB.split(','):
+            if '=' in item:
+                name, megabytes = item.split('=', 1)
+                budgets[name.strip()] = int(float(megabytes) * 1024 * 1024)
+        return budgets
+    
+    @property
+    def notification_shard_paths(self) -> list:
+        """Archivos de los shards de notificaciones; con un solo shard, la base principal"""
+        if self.NOTIFICATION_SHARDS <= 1:
+            return [self.DATABASE_NAME]
+        return [self.NOTIFICATION_SHARD_PATH.format(shard=index) for index in range(self.NOTIFICATION_SHARDS)]
+    
+    @property
+    def webhook_allowed_hosts(self) -> list:
+        """Hosts a los que se permite enviar webhooks (vacío = cualquiera)"""
+        return [host.strip() for host in self.WEBHOOK_ALLOWED_HOSTS.split(',') if host.strip()]
+    
+    @property
+    def digest_urgent_codes(self) -> list:
+        """Códigos de condición que se envían sin esperar la ventana del resumen"""
+        return [int(code) for code in self.DIGEST_URGENT_CODES.split(',') if code.strip()]
+    
     @classmethod
     def from_env(cls) -> 'Settings':
         """Carga la configuración desde las variables de entorno"""
@@ -41,5 +224,111 @@ class Settings:
             MAIL_USERNAME=os.getenv('MAIL_USERNAME', ''),
             MAIL_PASSWORD=os.getenv('MAIL_PASSWORD', ''),
             MAIL_USE_TLS=os.getenv('MAIL_USE_TLS', 'True').lower() == 'true',
-            DATABASE_NAME=os.getenv('DATABASE_NAME', 'weather_alerts.db')
+            DATABASE_NAME=os.getenv('DATABASE_NAME', 'weather_alerts.db'),
+            REQUEST_DEADLINE_SECONDS=float(os.getenv('REQUEST_DEADLINE_SECONDS', 14.0)),
+            WEATHER_API_TIMEOUT=float(os.getenv('WEATHER_API_TIMEOUT', 10.0)),
+            WEATHER_CELL_SIZE=float(os.getenv('WEATHER_CELL_SIZE', 0.1)),
+            WEATHER_STALE_TTL=float(os.getenv('WEATHER_STALE_TTL', 1800.0)),
+            BREAKER_FAILURE_RATE=float(os.getenv('BREAKER_FAILURE_RATE', 0.5)),
+            BREAKER_SLOW_CALL_SECONDS=float(os.getenv('BREAKER_SLOW_CALL_SECONDS', 3.0)),
+            BREAKER_SLOW_CALL_RATE=float(os.getenv('BREAKER_SLOW_CALL_RATE', 0.5)),
+            BREAKER_WINDOW_SIZE=int(os.getenv('BREAKER_WINDOW_SIZE', 20)),
+            BREAKER_MIN_CALLS=int(os.getenv('BREAKER_MIN_CALLS', 10)),
+            BREAKER_OPEN_SECONDS=float(os.getenv('BREAKER_OPEN_SECONDS', 30.0)),
+            BREAKER_HALF_OPEN_CALLS=int(os.getenv('BREAKER_HALF_OPEN_CALLS', 3)),
+            WEATHER_HEDGE_ENABLED=os.getenv('WEATHER_HEDGE_ENABLED', 'False').lower() == 'true',
+            WEATHER_HEDGE_MIN_DELAY=float(os.getenv('WEATHER_HEDGE_MIN_DELAY', 0.2)),
+            WEATHER_QUOTA_PER_MINUTE=int(os.getenv('WEATHER_QUOTA_PER_MINUTE', 0)),
+            WEATHER_QUOTA_PER_MONTH=int(os.getenv('WEATHER_QUOTA_PER_MONTH', 0)),
+            WEATHER_QUOTA_PATH=os.getenv('WEATHER_QUOTA_PATH', 'weather_quota.db'),
+            WEATHER_QUOTA_TIGHT_RATIO=float(os.getenv('WEATHER_QUOTA_TIGHT_RATIO', 0.8)),
+            WEATHER_DEGRADED_CELL_SIZE=float(os.getenv('WEATHER_DEGRADED_CELL_SIZE', 0.5)),
+            WEATHER_DEGRADED_TTL_FACTOR=float(os.getenv('WEATHER_DEGRADED_TTL_FACTOR', 4.0)),
+            WEATHER_PROVIDERS=os.getenv('WEATHER_PROVIDERS', 'weatherapi'),
+            OPENMETEO_API_URL=os.getenv('OPENMETEO_API_URL', 'https://api.open-meteo.com/v1/forecast'),
+            WEATHER_ROUTER_ERROR_THRESHOLD=float(os.getenv('WEATHER_ROUTER_ERROR_THRESHOLD', 0.5)),
+            WEATHER_ROUTER_COOLDOWN_SECONDS=float(os.getenv('WEATHER_ROUTER_COOLDOWN_SECONDS', 30.0)),
+            WEATHER_ROUTER_PROBE_SECONDS=float(os.getenv('WEATHER_ROUTER_PROBE_SECONDS', 60.0)),
+            MAIL_POOL_SIZE=int(os.getenv('MAIL_POOL_SIZE', 4)),
+            MAIL_POOL_IDLE_SECONDS=float(os.getenv('MAIL_POOL_IDLE_SECONDS', 60.0)),
+            MAIL_TIMEOUT=float(os.getenv('MAIL_TIMEOUT', 20.0)),
+            DIGEST_ENABLED=os.getenv('DIGEST_ENABLED', 'False').lower() == 'true',
+            DIGEST_WINDOW_SECONDS=float(os.getenv('DIGEST_WINDOW_SECONDS', 3600.0)),
+            DIGEST_URGENT_CODES=os.getenv('DIGEST_URGENT_CODES', '1087,1117,1273,1276,1279,1282'),
+            WEBHOOK_ENABLED=os.getenv('WEBHOOK_ENABLED', 'False').lower() == 'true',
+            WEBHOOK_SECRET=os.getenv('WEBHOOK_SECRET', ''),
+            WEBHOOK_BATCH_SIZE=int(os.getenv('WEBHOOK_BATCH_SIZE', 100)),
+            WEBHOOK_BATCH_WAIT_SECONDS=float(os.getenv('WEBHOOK_BATCH_WAIT_SECONDS', 1.0)),
+            WEBHOOK_TIMEOUT=float(os.getenv('WEBHOOK_TIMEOUT', 5.0)),
+            WEBHOOK_WORKERS=int(os.getenv('WEBHOOK_WORKERS', 4)),
+            WEBHOOK_MAX_ATTEMPTS=int(os.getenv('WEBHOOK_MAX_ATTEMPTS', 5)),
+            WEBHOOK_BACKOFF_SECONDS=float(os.getenv('WEBHOOK_BACKOFF_SECONDS', 0.5)),
+            WEBHOOK_ALLOWED_HOSTS=os.getenv('WEBHOOK_ALLOWED_HOSTS', ''),
+            WEBHOOK_ALLOW_PRIVATE_NETWORKS=os.getenv('WEBHOOK_ALLOW_PRIVATE_NETWORKS', 'False').lower() == 'true',
+            FORECAST_CACHE_ENABLED=os.getenv('FORECAST_CACHE_ENABLED', 'True').lower() == 'true',
+            FORECAST_CACHE_PATH=os.getenv('FORECAST_CACHE_PATH', 'forecast_cache.db'),
+            FORECAST_CACHE_TTL=float(os.getenv('FORECAST_CACHE_TTL', 600.0)),
+            FORECAST_CACHE_LOCAL_TTL=float(os.getenv('FORECAST_CACHE_LOCAL_TTL', 30.0)),
+            PREFETCH_ENABLED=os.getenv('PREFETCH_ENABLED', 'False').lower() == 'true',
+            PREFETCH_CELLS=int(os.getenv('PREFETCH_CELLS', 200)),
+            PREFETCH_LEAD_MINUTES=int(os.getenv('PREFETCH_LEAD_MINUTES', 10)),
+            PREFETCH_RATE=float(os.getenv('PREFETCH_RATE', 5.0)),
+            PREFETCH_HISTORY_DAYS=int(os.getenv('PREFETCH_HISTORY_DAYS', 14)),
+            SWEEP_ENABLED=os.getenv('SWEEP_ENABLED', 'False').lower() == 'true',
+            SWEEP_INTERVAL_SECONDS=float(os.getenv('SWEEP_INTERVAL_SECONDS', 3600.0)),
+            SWEEP_PARTITIONS=int(os.getenv('SWEEP_PARTITIONS', 64)),
+            SWEEP_LEASE_SECONDS=float(os.getenv('SWEEP_LEASE_SECONDS', 120.0)),
+            SWEEP_RATE=float(os.getenv('SWEEP_RATE', 5.0)),
+            STATS_CELL_SIZE=float(os.getenv('STATS_CELL_SIZE', 1.0)),
+            RETENTION_DAYS=int(os.getenv('RETENTION_DAYS', 90)),
+            ARCHIVE_DIR=os.getenv('ARCHIVE_DIR', 'archive'),
+            ARCHIVE_BATCH_SIZE=int(os.getenv('ARCHIVE_BATCH_SIZE', 1000)),
+            NOTIFICATION_SHARDS=int(os.getenv('NOTIFICATION_SHARDS', 1)),
+            NOTIFICATION_SHARD_PATH=os.getenv('NOTIFICATION_SHARD_PATH', 'notifications-{shard}.db'),
+            NOTIFICATION_PREPARED_STATEMENTS=os.getenv('NOTIFICATION_PREPARED_STATEMENTS', 'False').lower() == 'true',
+            AREA_MAX_SAMPLES=int(os.getenv('AREA_MAX_SAMPLES', 64)),
+            AREA_MAX_WORKERS=int(os.getenv('AREA_MAX_WORKERS', 8)),
+            RECIPIENT_FILTER_ENABLED=os.getenv('RECIPIENT_FILTER_ENABLED', 'True').lower() == 'true',
+            RECIPIENT_FILTER_CAPACITY=int(os.getenv('RECIPIENT_FILTER_CAPACITY', 1000000)),
+            RECIPIENT_FILTER_FALSE_POSITIVE_RATE=float(os.getenv('RECIPIENT_FILTER_FALSE_POSITIVE_RATE', 0.01)),
+            RECIPIENT_FILTER_REFRESH_SECONDS=float(os.getenv('RECIPIENT_FILTER_REFRESH_SECONDS', 5.0)),
+            RECIPIENT_FILTER_PATH=os.getenv('RECIPIENT_FILTER_PATH', ''),
+            OBSERVATIONS_ENABLED=os.getenv('OBSERVATIONS_ENABLED', 'True').lower() == 'true',
+            OBSERVATIONS_FLUSH_SECONDS=float(os.getenv('OBSERVATIONS_FLUSH_SECONDS', 60.0)),
+            OBSERVATIONS_RAW_DAYS=int(os.getenv('OBSERVATIONS_RAW_DAYS', 7)),
+            OBSERVATIONS_RESOLUTION_SECONDS=int(os.getenv('OBSERVATIONS_RESOLUTION_SECONDS', 3600)),
+            OBSERVATIONS_RETENTION_DAYS=int(os.getenv('OBSERVATIONS_RETENTION_DAYS', 400)),
+            IMPORT_BATCH_SIZE=int(os.getenv('IMPORT_BATCH_SIZE', 5000)),
+            IDEMPOTENCY_ENABLED=os.getenv('IDEMPOTENCY_ENABLED', 'True').lower() == 'true',
+            IDEMPOTENCY_TTL_SECONDS=float(os.getenv('IDEMPOTENCY_TTL_SECONDS', 86400.0)),
+            IDEMPOTENCY_MAX_ENTRIES=int(os.getenv('IDEMPOTENCY_MAX_ENTRIES', 10000)),
+            IDEMPOTENCY_WAIT_SECONDS=float(os.getenv('IDEMPOTENCY_WAIT_SECONDS', 30.0)),
+            IDEMPOTENCY_PATH=os.getenv('IDEMPOTENCY_PATH', 'idempotency.db'),
+            SSE_MAX_CONNECTIONS=int(os.getenv('SSE_MAX_CONNECTIONS', 4)),
+            SSE_MAX_PER_RECIPIENT=int(os.getenv('SSE_MAX_PER_RECIPIENT', 2)),
+            SSE_HEARTBEAT_SECONDS=float(os.getenv('SSE_HEARTBEAT_SECONDS', 15.0)),
+            SSE_MAX_STREAM_SECONDS=float(os.getenv('SSE_MAX_STREAM_SECONDS', 300.0)),
+            SSE_POLL_SECONDS=float(os.getenv('SSE_POLL_SECONDS', 1.0)),
+            SSE_QUEUE_SIZE=int(os.getenv('SSE_QUEUE_SIZE', 100)),
+            ADMISSION_ENABLED=os.getenv('ADMISSION_ENABLED', 'True').lower() == 'true',
+            ADMISSION_ADAPTIVE=os.getenv('ADMISSION_ADAPTIVE', 'True').lower() == 'true',
+            ADMISSION_QUEUE_TARGET_MS=float(os.getenv('ADMISSION_QUEUE_TARGET_MS', 200.0)),
+            ADMISSION_ALERTS_LIMIT=int(os.getenv('ADMISSION_ALERTS_LIMIT', 4)),
+            ADMISSION_ALERTS_QUEUE=int(os.getenv('ADMISSION_ALERTS_QUEUE', 2)),
+            ADMISSION_READS_LIMIT=int(os.getenv('ADMISSION_READS_LIMIT', 16)),
+            ADMISSION_READS_QUEUE=int(os.getenv('ADMISSION_READS_QUEUE', 16)),
+            ADMISSION_BULK_LIMIT=int(os.getenv('ADMISSION_BULK_LIMIT', 1)),
+            ADMIN_API_KEY=os.getenv('ADMIN_API_KEY', ''),
+            MEMORY_SAMPLE_SECONDS=float(os.getenv('MEMORY_SAMPLE_SECONDS', 30.0)),
+            MEMORY_HISTORY_SIZE=int(os.getenv('MEMORY_HISTORY_SIZE', 120)),
+            MEMORY_TRACEMALLOC=os.getenv('MEMORY_TRACEMALLOC', 'False').lower() == 'true',
+            MEMORY_RSS_BUDGET_MB=float(os.getenv('MEMORY_RSS_BUDGET_MB', 0.0)),
+            MEMORY_BUDGETS_MB=os.getenv('MEMORY_BUDGETS_MB', ''),
+            ACCESS_LOG_ENABLED=os.getenv('ACCESS_LOG_ENABLED', 'True').lower() == 'true',
+            ACCESS_LOG_PATH=os.getenv('ACCESS_LOG_PATH', 'logs/access-{pid}.log'),
+            ACCESS_LOG_MAX_MB=float(os.getenv('ACCESS_LOG_MAX_MB', 10.0)),
+            ACCESS_LOG_BACKUP_COUNT=int(os.getenv('ACCESS_LOG_BACKUP_COUNT', 5)),
+            ACCESS_LOG_SAMPLE_RATE=float(os.getenv('ACCESS_LOG_SAMPLE_RATE', 1.0)),
+            ACCESS_LOG_SLOW_MS=float(os.getenv('ACCESS_LOG_SLOW_MS', 1000.0)),
+            ACCESS_LOG_QUEUE_SIZE=int(os.getenv('ACCESS_LOG_QUEUE_SIZE', 10000))
         )
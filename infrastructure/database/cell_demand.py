@@ -0,0 +1,31 @@
+"""
+Cell Demand - Capa de Infraestructura
+Tablas de demanda de pronósticos por celda y hora del día, y de las
+ejecuciones del precalentamiento de caché ya reclamadas por algún worker
+"""
+from peewee import SqliteDatabase
+
+
+DEMAND_TABLE = 'cell_demand'
+PREFETCH_RUNS_TABLE = 'prefetch_runs'
+
+_STATEMENTS = [
+    f"""CREATE TABLE IF NOT EXISTS {DEMAND_TABLE} (
+        day TEXT NOT NULL,
+        hour INTEGER NOT NULL,
+        cell_key TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (hour, day, cell_key)
+    ) WITHOUT ROWID""",
+    f"""CREATE TABLE IF NOT EXISTS {PREFETCH_RUNS_TABLE} (
+        run_key TEXT PRIMARY KEY,
+        claimed_at TEXT NOT NULL
+    ) WITHOUT ROWID"""
+]
+
+
+def ensure_cell_demand(db: SqliteDatabase):
+    """Crea las tablas de demanda si no existen (idempotente)"""
+    with db.atomic():
+        for statement in _STATEMENTS:
+            db.execute_sql(statement)
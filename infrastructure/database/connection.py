@@ -2,7 +2,53 @@
 Database Connection - Capa de Infraestructura
 Manejo de la conexión a la base de datos SQLite
 """
-from peewee import SqliteDatabase
+import sqlite3
+from contextlib import contextmanager
+from peewee import OperationalError, SqliteDatabase
+from domain.services.deadline import DeadlineExceededException, current_deadline
+from infrastructure.monitoring import request_timing
+from infrastructure.runtime.lifecycle import register_after_fork
+
+
+class TimedSqliteDatabase(SqliteDatabase):
+    """
+    SqliteDatabase que suma el tiempo de cada sentencia a la etapa 'db' de la
+    petición en curso (ver request_timing). Mide la ejecución, no la lectura
+    posterior de las filas del cursor.
+    """
+
+    def execute_sql(self, sql, params=None, *args, **kwargs):
+        with request_timing.stage('db'):
+            return super().execute_sql(sql, params, *args, **kwargs)
+
+    @contextmanager
+    def deadline_bounded(self):
+        """
+        Dentro del bloque, la espera por el lock de escritura (busy_timeout)
+        queda acotada por lo que quede del plazo de la solicitud. No rechaza
+        de antemano: con el plazo vencido la escritura aún se hace si la base
+        está libre (p. ej. registrar una alerta que ya se envió), pero no
+        espera a otro escritor.
+
+        Raises:
+            DeadlineExceededException: Si la base siguió bloqueada hasta agotar el plazo
+        """
+        current = current_deadline()
+        if current is None:
+            yield
+            return
+
+        self.execute_sql(f'PRAGMA busy_timeout = {int(min(self._timeout, current.remaining()) * 1000)}')
+        try:
+            yield
+        except (OperationalError, sqlite3.OperationalError) as e:
+            # sqlite3 directo (ver PreparedNotificationRepository) no pasa por el envoltorio de Peewee
+            if 'locked' in str(e) and current.expired:
+                raise DeadlineExceededException('db') from e
+            raise
+        finally:
+            # La conexión es del hilo y la reutilizan las solicitudes siguientes
+            self.execute_sql(f'PRAGMA busy_timeout = {int(self._timeout * 1000)}')
 
 
 class DatabaseConnection:
@@ -14,7 +60,8 @@ class DatabaseConnection:
     def __new__(cls, db_name: str = 'weather_alerts.db'):
         if cls._instance is None:
             cls._instance = super(DatabaseConnection, cls).__new__(cls)
-            cls._db = SqliteDatabase(db_name)
+            cls._db = TimedSqliteDatabase(db_name)
+            register_after_fork(cls._instance.reset_after_fork)
         return cls._instance
     
     @property
@@ -22,11 +69,27 @@ class DatabaseConnection:
         """Retorna la instancia de la base de datos"""
         return self._db
     
+    def configure(self, db_name: str):
+        """
+        Apunta la conexión a otro archivo de base de datos.
+        Los modelos conservan la referencia a la misma instancia de Peewee,
+        por lo que no es necesario volver a enlazarlos.
+        """
+        self.close()
+        self._db.init(db_name)
+    
     def initialize_tables(self, models: list):
         """Inicializa las tablas en la base de datos"""
         with self._db:
             self._db.create_tables(models, safe=True)
     
+    def reset_after_fork(self):
+        """
+        Olvida la conexión heredada del proceso padre sin cerrarla:
+        cerrarla desde el hijo afectaría al padre. Cada worker abre la suya.
+        """
+        self._db._state.reset()
+    
     def close(self):
         """Cierra la conexión a la base de datos"""
         if self._db and not self._db.is_closed():
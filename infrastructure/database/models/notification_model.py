@@ -3,12 +3,19 @@ Notification Model - Capa de Infraestructura
 Modelo de base de datos para notificaciones usando Peewee ORM
 """
 from peewee import Model, CharField, FloatField, IntegerField, DateTimeField
+from playhouse.sqlite_ext import AutoIncrementField
 from infrastructure.database.connection import db_connection
 
 
 class NotificationModel(Model):
-    """Modelo de base de datos para notificaciones"""
+    """
+    Modelo de base de datos para notificaciones. El id es AUTOINCREMENT: el
+    stream (Last-Event-ID), el broker y el filtro de destinatarios siguen la
+    tabla por id, y sin él SQLite reutiliza los ids más altos cuando el
+    archivado los borra.
+    """
     
+    id = AutoIncrementField()
     email = CharField()
     latitude = FloatField()
     longitude = FloatField()
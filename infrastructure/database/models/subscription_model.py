@@ -0,0 +1,22 @@
+"""
+Subscription Model - Capa de Infraestructura
+Modelo de base de datos para suscripciones usando Peewee ORM
+"""
+from peewee import Model, CharField, FloatField, DateTimeField
+from infrastructure.database.connection import db_connection
+
+
+class SubscriptionModel(Model):
+    """Modelo de base de datos para suscripciones"""
+    
+    email = CharField()
+    latitude = FloatField()
+    longitude = FloatField()
+    created_at = DateTimeField()
+    
+    class Meta:
+        database = db_connection.db
+        table_name = 'subscriptions'
+        indexes = (
+            (('email', 'latitude', 'longitude'), True),
+        )
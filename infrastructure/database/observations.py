@@ -0,0 +1,90 @@
+"""
+Observations - Capa de Infraestructura
+Tabla del historial de pronósticos por celda y su codificación binaria:
+un blob por celda y bucket de tiempo con registros de ancho fijo
+"""
+import math
+import struct
+from collections import Counter, defaultdict
+from typing import Iterable, List, Tuple
+from peewee import SqliteDatabase
+from domain.entities.forecast import Forecast
+
+
+OBSERVATIONS_TABLE = 'observations'
+
+# segundos desde el inicio del bucket, temperatura, viento, código, muestras, adversas, humedad
+RECORD = struct.Struct('<IffHHHb')
+MAX_SAMPLES = 0xFFFF
+
+# resolution = 0 son las observaciones crudas; > 0, puntos reducidos a esa resolución.
+# No es WITHOUT ROWID: los blobs de un día superan con holgura el tamaño recomendado
+_STATEMENTS = [
+    f"""CREATE TABLE IF NOT EXISTS {OBSERVATIONS_TABLE} (
+        cell_key TEXT NOT NULL,
+        bucket INTEGER NOT NULL,
+        resolution INTEGER NOT NULL,
+        payload BLOB NOT NULL,
+        PRIMARY KEY (cell_key, bucket, resolution)
+    )""",
+    f"CREATE INDEX IF NOT EXISTS idx_{OBSERVATIONS_TABLE}_bucket ON {OBSERVATIONS_TABLE} (bucket, resolution)"
+]
+
+
+def ensure_observations(db: SqliteDatabase):
+    """Crea la tabla de observaciones si no existe (idempotente)"""
+    with db.atomic():
+        for statement in _STATEMENTS:
+            db.execute_sql(statement)
+
+
+def encode_observation(offset: int, forecast: Forecast) -> bytes:
+    """Registro de ancho fijo de una observación cruda"""
+    return RECORD.pack(
+        offset,
+        forecast.temperature_c,
+        float('nan') if forecast.wind_kph is None else forecast.wind_kph,
+        forecast.condition_code,
+        1,
+        1 if forecast.is_adverse else 0,
+        -1 if forecast.humidity is None else forecast.humidity
+    )
+
+
+def downsample_records(records: Iterable[Tuple], resolution: int) -> bytes:
+    """
+    Resume los registros en uno por ventana de `resolution` segundos, ponderando
+    por las muestras de cada uno (sirve también sobre puntos ya reducidos).
+    El código es el más frecuente entre las muestras adversas, o entre todas
+    si la ventana no tuvo ninguna.
+    """
+    windows = defaultdict(list)
+    for record in records:
+        windows[record[0] // resolution * resolution].append(record)
+
+    chunks = []
+    for offset in sorted(windows):
+        group = windows[offset]
+        samples = sum(record[4] for record in group)
+        adverse = sum(record[5] for record in group)
+        codes = Counter()
+        for record in group:
+            codes[record[3]] += record[5] if adverse else record[4]
+        humidity = [(record[6], record[4]) for record in group if record[6] >= 0]
+        winds = [record[2] for record in group if not math.isnan(record[2])]
+        chunks.append(RECORD.pack(
+            offset,
+            sum(record[1] * record[4] for record in group) / samples,
+            max(winds) if winds else float('nan'),
+            codes.most_common(1)[0][0],
+            min(samples, MAX_SAMPLES),
+            min(adverse, MAX_SAMPLES),
+            round(sum(value * weight for value, weight in humidity) / sum(weight for _, weight in humidity))
+            if humidity else -1
+        ))
+    return b''.join(chunks)
+
+
+def decode_records(payload: bytes) -> List[Tuple]:
+    """Registros de un blob, en el orden en que se agregaron"""
+    return list(RECORD.iter_unpack(payload))
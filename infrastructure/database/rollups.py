@@ -0,0 +1,165 @@
+"""
+Rollups - Capa de Infraestructura
+Tablas de agregados de alertas mantenidas incrementalmente por triggers:
+conteos por (día, código de condición, celda geográfica) y por email
+"""
+from typing import Iterable
+from peewee import SqliteDatabase
+from domain.entities.notification import Notification
+
+
+DAILY_TABLE = 'alert_rollup_daily'
+EMAIL_TABLE = 'alert_rollup_email'
+META_TABLE = 'alert_rollup_meta'
+
+_TABLES = [
+    f"""CREATE TABLE IF NOT EXISTS {DAILY_TABLE} (
+        day TEXT NOT NULL,
+        code INTEGER NOT NULL,
+        cell_row INTEGER NOT NULL,
+        cell_col INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (day, code, cell_row, cell_col)
+    ) WITHOUT ROWID""",
+    f"""CREATE TABLE IF NOT EXISTS {EMAIL_TABLE} (
+        email TEXT PRIMARY KEY,
+        count INTEGER NOT NULL,
+        first_sent_at TEXT NOT NULL,
+        last_sent_at TEXT NOT NULL
+    ) WITHOUT ROWID""",
+    f"""CREATE TABLE IF NOT EXISTS {META_TABLE} (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    ) WITHOUT ROWID"""
+]
+
+
+def cell_expressions(cell_size: float, prefix: str) -> tuple[str, str]:
+    """
+    Expresiones SQL de fila y columna de la celda; equivalen a
+    GeoCell.from_coordinates (lat + 90 y lon + 180 nunca son negativos,
+    así que CAST trunca igual que floor)
+    """
+    rows = max(1, int(round(180.0 / cell_size))) - 1
+    cols = max(1, int(round(360.0 / cell_size))) - 1
+    row = f"MIN(CAST(({prefix}latitude + 90.0) / {cell_size!r} AS INTEGER), {rows})"
+    col = f"MIN(CAST(({prefix}longitude + 180.0) / {cell_size!r} AS INTEGER), {cols})"
+    return row, col
+
+
+def _trigger(cell_size: float) -> str:
+    row, col = cell_expressions(cell_size, 'NEW.')
+    return f"""CREATE TRIGGER IF NOT EXISTS alert_rollups_insert
+        AFTER INSERT ON notifications BEGIN
+            INSERT INTO {DAILY_TABLE} (day, code, cell_row, cell_col, count)
+            VALUES (substr(NEW.sent_at, 1, 10), NEW.code, {row}, {col}, 1)
+            ON CONFLICT (day, code, cell_row, cell_col) DO UPDATE SET count = count + 1;
+            INSERT INTO {EMAIL_TABLE} (email, count, first_sent_at, last_sent_at)
+            VALUES (NEW.email, 1, NEW.sent_at, NEW.sent_at)
+            ON CONFLICT (email) DO UPDATE SET
+                count = count + 1,
+                first_sent_at = MIN(first_sent_at, excluded.first_sent_at),
+                last_sent_at = MAX(last_sent_at, excluded.last_sent_at);
+        END"""
+
+
+def ensure_rollups(db: SqliteDatabase, cell_size: float, archived: Iterable[Notification] = ()):
+    """
+    Crea las tablas de agregados y su trigger (idempotente). Si las tablas son
+    nuevas o cambió el tamaño de celda, las regenera desde el historial; en ese
+    caso también se recorre `archived` (las notificaciones ya archivadas).
+    """
+    with db.atomic():
+        for statement in _TABLES:
+            db.execute_sql(statement)
+        row = db.execute_sql(f"SELECT value FROM {META_TABLE} WHERE key = 'cell_size'").fetchone()
+        current = float(row[0]) if row else None
+
+        if current != cell_size:
+            db.execute_sql('DROP TRIGGER IF EXISTS alert_rollups_insert')
+        db.execute_sql(_trigger(cell_size))
+
+    if current != cell_size:
+        rebuild_rollups(db, cell_size, archived)
+
+
+def rebuild_rollups(db: SqliteDatabase, cell_size: float, archived: Iterable[Notification] = ()) -> int:
+    """
+    Regenera los agregados desde la tabla notifications y, si se indican, desde
+    las notificaciones archivadas (que ya no están en la tabla)
+
+    Returns:
+        int: Número de notificaciones agregadas
+    """
+    row, col = cell_expressions(cell_size, '')
+    with db.atomic():
+        db.execute_sql(f'DELETE FROM {DAILY_TABLE}')
+        db.execute_sql(f'DELETE FROM {EMAIL_TABLE}')
+        db.execute_sql(
+            f"""INSERT INTO {DAILY_TABLE} (day, code, cell_row, cell_col, count)
+                SELECT substr(sent_at, 1, 10), code, {row}, {col}, COUNT(*)
+                FROM notifications GROUP BY 1, 2, 3, 4"""
+        )
+        db.execute_sql(
+            f"""INSERT INTO {EMAIL_TABLE} (email, count, first_sent_at, last_sent_at)
+                SELECT email, COUNT(*), MIN(sent_at), MAX(sent_at)
+                FROM notifications GROUP BY email"""
+        )
+        total = db.execute_sql('SELECT COUNT(*) FROM notifications').fetchone()[0]
+        total += _accumulate(db, cell_size, archived)
+        db.execute_sql(
+            f"INSERT OR REPLACE INTO {META_TABLE} (key, value) VALUES ('cell_size', ?)",
+            (repr(cell_size),)
+        )
+    return total
+
+
+def _accumulate(db: SqliteDatabase, cell_size: float, notifications: Iterable[Notification], chunk_size: int = 5000) -> int:
+    """Suma notificaciones que no están en la tabla a los agregados existentes"""
+    row, col = cell_expressions(cell_size, '')
+    db.execute_sql(
+        """CREATE TEMP TABLE IF NOT EXISTS rollup_staging (
+            email TEXT, latitude REAL, longitude REAL, code INTEGER, sent_at TEXT
+        )"""
+    )
+    db.execute_sql('DELETE FROM rollup_staging')
+
+    total = 0
+    chunk = []
+    cursor = db.cursor()
+    for notification in notifications:
+        chunk.append((
+            notification.email,
+            notification.latitude,
+            notification.longitude,
+            notification.code,
+            notification.sent_at.strftime('%Y-%m-%d %H:%M:%S')
+        ))
+        if len(chunk) >= chunk_size:
+            cursor.executemany('INSERT INTO rollup_staging VALUES (?, ?, ?, ?, ?)', chunk)
+            total += len(chunk)
+            chunk = []
+    if chunk:
+        cursor.executemany('INSERT INTO rollup_staging VALUES (?, ?, ?, ?, ?)', chunk)
+        total += len(chunk)
+    if not total:
+        return 0
+
+    # "WHERE true" evita la ambigüedad de INSERT ... SELECT ... ON CONFLICT en SQLite
+    db.execute_sql(
+        f"""INSERT INTO {DAILY_TABLE} (day, code, cell_row, cell_col, count)
+            SELECT substr(sent_at, 1, 10), code, {row}, {col}, COUNT(*)
+            FROM rollup_staging WHERE true GROUP BY 1, 2, 3, 4
+            ON CONFLICT (day, code, cell_row, cell_col) DO UPDATE SET count = count + excluded.count"""
+    )
+    db.execute_sql(
+        f"""INSERT INTO {EMAIL_TABLE} (email, count, first_sent_at, last_sent_at)
+            SELECT email, COUNT(*), MIN(sent_at), MAX(sent_at)
+            FROM rollup_staging WHERE true GROUP BY email
+            ON CONFLICT (email) DO UPDATE SET
+                count = count + excluded.count,
+                first_sent_at = MIN(first_sent_at, excluded.first_sent_at),
+                last_sent_at = MAX(last_sent_at, excluded.last_sent_at)"""
+    )
+    db.execute_sql('DELETE FROM rollup_staging')
+    return total
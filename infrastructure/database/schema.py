@@ -0,0 +1,63 @@
+"""
+Schema - Capa de Infraestructura
+Inicialización completa de la base de datos: tablas, índices y agregados
+"""
+from typing import Iterable
+from peewee import SqliteDatabase
+from domain.entities.notification import Notification
+from infrastructure.database.connection import db_connection
+from infrastructure.database.models.notification_model import NotificationModel
+from infrastructure.database.models.subscription_model import SubscriptionModel
+from infrastructure.database.spatial_index import ensure_spatial_index
+from infrastructure.database.rollups import ensure_rollups
+from infrastructure.database.cell_demand import ensure_cell_demand
+from infrastructure.database.observations import ensure_observations
+from infrastructure.database.sweep_leases import ensure_sweep_leases
+
+
+def initialize_database(database_name: str, stats_cell_size: float, archived: Iterable[Notification] = ()):
+    """
+    Apunta la conexión global a la base indicada y crea el esquema completo.
+    `archived` solo se recorre si hay que regenerar los agregados.
+    """
+    db_connection.configure(database_name)
+    db_connection.initialize_tables([NotificationModel, SubscriptionModel])
+    ensure_monotonic_ids(db_connection.db, NotificationModel)
+    ensure_spatial_index(db_connection.db)
+    ensure_rollups(db_connection.db, stats_cell_size, archived)
+    ensure_cell_demand(db_connection.db)
+    ensure_observations(db_connection.db)
+    ensure_sweep_leases(db_connection.db)
+
+
+def initialize_notification_shard(db: SqliteDatabase, model, stats_cell_size: float, archived: Iterable[Notification] = ()):
+    """
+    Crea en un shard la tabla de notificaciones con su índice espacial y sus
+    agregados (cada shard agrega sus propias filas; ver AlertStatsRepositoryImpl)
+    """
+    with db.connection_context():
+        db.create_tables([model], safe=True)
+    ensure_monotonic_ids(db, model)
+    ensure_spatial_index(db)
+    ensure_rollups(db, stats_cell_size, archived)
+
+
+def ensure_monotonic_ids(db: SqliteDatabase, model):
+    """
+    Migra una tabla de notificaciones creada sin AUTOINCREMENT (idempotente).
+    Se reconstruye conservando los ids; los índices y triggers que caen con la
+    tabla vieja los recrean ensure_spatial_index y ensure_rollups, así que
+    debe llamarse antes que ellos.
+    """
+    table = model._meta.table_name
+    columns = ', '.join(f'"{field.column_name}"' for field in model._meta.sorted_fields)
+    legacy = f'{table}_legacy'
+    # IMMEDIATE: otro proceso que inicializa a la vez espera y luego ve la tabla ya migrada
+    with db.atomic('IMMEDIATE'):
+        row = db.execute_sql("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+        if row is None or 'AUTOINCREMENT' in row[0].upper():
+            return
+        db.execute_sql(f'ALTER TABLE "{table}" RENAME TO "{legacy}"')
+        db.create_tables([model])
+        db.execute_sql(f'INSERT INTO "{table}" ({columns}) SELECT {columns} FROM "{legacy}" ORDER BY id')
+        db.execute_sql(f'DROP TABLE "{legacy}"')
@@ -0,0 +1,44 @@
+"""
+Spatial Index - Capa de Infraestructura
+Índice R*Tree de SQLite sobre las coordenadas de las notificaciones,
+sincronizado con la tabla notifications mediante triggers
+"""
+from peewee import SqliteDatabase
+
+
+SPATIAL_INDEX_TABLE = 'notifications_rtree'
+
+_STATEMENTS = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {SPATIAL_INDEX_TABLE}
+        USING rtree(id, min_lat, max_lat, min_lon, max_lon)""",
+    f"""CREATE TRIGGER IF NOT EXISTS notifications_rtree_insert
+        AFTER INSERT ON notifications BEGIN
+            INSERT INTO {SPATIAL_INDEX_TABLE} (id, min_lat, max_lat, min_lon, max_lon)
+            VALUES (NEW.id, NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude);
+        END""",
+    f"""CREATE TRIGGER IF NOT EXISTS notifications_rtree_update
+        AFTER UPDATE OF latitude, longitude ON notifications BEGIN
+            UPDATE {SPATIAL_INDEX_TABLE}
+            SET min_lat = NEW.latitude, max_lat = NEW.latitude,
+                min_lon = NEW.longitude, max_lon = NEW.longitude
+            WHERE id = NEW.id;
+        END""",
+    f"""CREATE TRIGGER IF NOT EXISTS notifications_rtree_delete
+        AFTER DELETE ON notifications BEGIN
+            DELETE FROM {SPATIAL_INDEX_TABLE} WHERE id = OLD.id;
+        END""",
+    # Indexa las filas que existían antes de crear el índice
+    f"""INSERT INTO {SPATIAL_INDEX_TABLE} (id, min_lat, max_lat, min_lon, max_lon)
+        SELECT id, latitude, latitude, longitude, longitude FROM notifications
+        WHERE id NOT IN (SELECT id FROM {SPATIAL_INDEX_TABLE})""",
+    "CREATE INDEX IF NOT EXISTS notifications_sent_at ON notifications (sent_at)",
+    # find_by_email: filtra por email y ya sale ordenado por fecha, sin recorrer la tabla
+    "CREATE INDEX IF NOT EXISTS notifications_email_sent_at ON notifications (email, sent_at)"
+]
+
+
+def ensure_spatial_index(db: SqliteDatabase):
+    """Crea el índice espacial y sus triggers si no existen (idempotente)"""
+    with db.atomic():
+        for statement in _STATEMENTS:
+            db.execute_sql(statement)
@@ -0,0 +1,31 @@
+"""
+Sweep Leases - Capa de Infraestructura
+Tabla de concesiones del barrido periódico: una fila por partición y ronda
+"""
+from peewee import SqliteDatabase
+
+
+SWEEP_LEASES_TABLE = 'sweep_leases'
+
+_STATEMENTS = [
+    f"""CREATE TABLE IF NOT EXISTS {SWEEP_LEASES_TABLE} (
+        round_key TEXT NOT NULL,
+        partition_id INTEGER NOT NULL,
+        owner TEXT,
+        token TEXT,
+        expires_at REAL NOT NULL DEFAULT 0,
+        cursor INTEGER NOT NULL DEFAULT -1,
+        processed INTEGER NOT NULL DEFAULT 0,
+        done INTEGER NOT NULL DEFAULT 0,
+        takeovers INTEGER NOT NULL DEFAULT 0,
+        updated_at REAL,
+        PRIMARY KEY (round_key, partition_id)
+    ) WITHOUT ROWID"""
+]
+
+
+def ensure_sweep_leases(db: SqliteDatabase):
+    """Crea la tabla de concesiones si no existe (idempotente)"""
+    with db.atomic():
+        for statement in _STATEMENTS:
+            db.execute_sql(statement)
@@ -0,0 +1,172 @@
+"""
+Cached Weather Service - Capa de Infraestructura
+Decorador que sirve pronósticos desde caché por celda geográfica
+"""
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import replace
+from datetime import datetime
+from typing import Callable, Dict, Optional
+from domain.entities.forecast import Forecast
+from domain.entities.geo_cell import GeoCell
+from domain.repositories.cell_demand_repository import CellDemandRepository
+from domain.services.deadline import DeadlineExceededException, check_deadline, current_deadline
+from domain.services.request_priority import BACKGROUND, current_priority
+from domain.services.weather_provider import WeatherProvider
+from infrastructure.cache.forecast_cache import ForecastCache
+from infrastructure.external_services.quota_manager import QuotaManager
+from infrastructure.external_services.weather_api_service import WeatherAPIException
+from infrastructure.monitoring.metrics import metrics
+
+
+class CachedWeatherService(WeatherProvider):
+    """
+    Consulta primero la caché de la celda que contiene la coordenada.
+    En un fallo, solo un hilo por celda va al upstream (single-flight); los
+    demás esperan su resultado como mucho lo que les queda de plazo, sin
+    bloquear otras celdas. Si la llamada en curso falla, el que esperaba
+    vuelve a intentar por su cuenta.
+
+    Con una cuota limitada, lo que se trae del upstream se guarda también en la
+    celda gruesa que contiene la coordenada. Si la cuota está presionada, un
+    fallo acepta entradas hasta `degraded_ttl_factor` veces más viejas, de la
+    celda o de la celda gruesa, antes de llamar al upstream.
+
+    Un respaldo (`is_stale`) del servicio envuelto se devuelve pero no se
+    guarda: su antigüedad la controla quien lo sirvió.
+    """
+
+    def __init__(
+        self,
+        weather_service,
+        cache: ForecastCache,
+        ttl: float = 600.0,
+        cell_size: float = 0.1,
+        quota: Optional[QuotaManager] = None,
+        degraded_cell_size: float = 0.5,
+        degraded_ttl_factor: float = 4.0,
+        demand_repository: Optional[CellDemandRepository] = None
+    ):
+        self.weather_service = weather_service
+        self.cache = cache
+        self.ttl = ttl
+        self.cell_size = cell_size
+        self.quota = quota
+        self.degraded_cell_size = degraded_cell_size
+        self.degraded_ttl_factor = degraded_ttl_factor
+        self.demand_repository = demand_repository
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+        # Llamada en curso por celda: los demás hilos esperan su Future
+        self._in_flight: Dict[str, Future] = {}
+        self._in_flight_lock = threading.Lock()
+
+        metrics.register_gauge('forecast_cache.hit_rate', self.hit_rate)
+
+    def get_forecast(self, latitude: float, longitude: float) -> Forecast:
+        """Obtiene el pronóstico de la caché o del servicio envuelto"""
+        key = GeoCell.from_coordinates(latitude, longitude, self.cell_size).key
+        if self.demand_repository is not None and current_priority() != BACKGROUND:
+            self.demand_repository.record(key, datetime.now())
+
+        forecast = self.cache.get(key)
+        coarse_key = None
+        if forecast is None:
+            coarse_key = self._coarse_key(latitude, longitude)
+            if coarse_key is not None and self.quota.level() != QuotaManager.NORMAL:
+                forecast = self._get_degraded(key, coarse_key)
+        if forecast is None:
+            self._record(hit=False)
+            forecast = self._single_flight(key, lambda: self._fetch(latitude, longitude, key, coarse_key))
+        else:
+            self._record(hit=True)
+        return replace(forecast, latitude=latitude, longitude=longitude)
+
+    def refresh(self, latitude: float, longitude: float) -> Forecast:
+        """
+        Trae el pronóstico del upstream y lo guarda aunque la entrada siga vigente
+
+        Raises:
+            WeatherAPIException: Si el upstream no respondió y solo hubo un respaldo
+        """
+        key = GeoCell.from_coordinates(latitude, longitude, self.cell_size).key
+        coarse_key = self._coarse_key(latitude, longitude)
+        forecast = self._single_flight(key, lambda: self._fetch(latitude, longitude, key, coarse_key))
+        if forecast.is_stale:
+            raise WeatherAPIException(f"Sin pronóstico nuevo para la celda {key}: el upstream no respondió")
+        return forecast
+
+    def hit_rate(self) -> float:
+        """Fracción de consultas resueltas desde la caché"""
+        with self._stats_lock:
+            total = self.hits + self.misses
+            return round(self.hits / total, 4) if total else 0.0
+
+    def _coarse_key(self, latitude: float, longitude: float) -> Optional[str]:
+        """Celda gruesa donde también se guarda lo traído, solo si la cuota tiene límite"""
+        if self.quota is None or not self.quota.limited:
+            return None
+        return GeoCell.from_coordinates(latitude, longitude, self.degraded_cell_size).key
+
+    def _single_flight(self, key: str, fetch: Callable[[], Forecast]) -> Forecast:
+        """
+        Ejecuta `fetch` si nadie trae ya la celda; si no, espera ese resultado
+
+        Raises:
+            DeadlineExceededException: Si el plazo se agota esperando la llamada de otro hilo
+        """
+        while True:
+            with self._in_flight_lock:
+                future = self._in_flight.get(key)
+                leader = future is None
+                if leader:
+                    future = self._in_flight[key] = Future()
+
+            if leader:
+                try:
+                    forecast = fetch()
+                except BaseException as e:
+                    future.set_exception(e)
+                    raise
+                else:
+                    future.set_result(forecast)
+                    return forecast
+                finally:
+                    with self._in_flight_lock:
+                        del self._in_flight[key]
+
+            current = current_deadline()
+            try:
+                return future.result(timeout=None if current is None else current.remaining())
+            except FutureTimeoutError:
+                raise DeadlineExceededException('weather')
+            except Exception:
+                # El error (o el plazo agotado) fue de la otra solicitud: se reintenta con el plazo propio
+                check_deadline('weather')
+
+    def _fetch(self, latitude: float, longitude: float, key: str, coarse_key: Optional[str]) -> Forecast:
+        forecast = self.weather_service.get_forecast(latitude, longitude)
+        if forecast.is_stale:
+            metrics.increment('forecast_cache.stale_not_cached')
+            return forecast
+        self.cache.set(key, forecast, self.ttl)
+        if coarse_key is not None:
+            self.cache.set(coarse_key, forecast, self.ttl)
+        return forecast
+
+    def _get_degraded(self, key: str, coarse_key: str) -> Optional[Forecast]:
+        """Busca una entrada más vieja de la celda o una de la celda gruesa"""
+        extra = self.ttl * (self.degraded_ttl_factor - 1)
+        forecast = self.cache.get_stale(key, extra) or self.cache.get_stale(coarse_key, extra)
+        if forecast is not None:
+            metrics.increment('forecast_cache.degraded_hits')
+        return forecast
+
+    def _record(self, hit: bool):
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        metrics.increment('forecast_cache.hits' if hit else 'forecast_cache.misses')
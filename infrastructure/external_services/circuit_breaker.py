@@ -0,0 +1,136 @@
+"""
+Circuit Breaker - Capa de Infraestructura
+Corta las llamadas a un servicio externo degradado para fallar rápido
+"""
+import threading
+import time
+from collections import deque
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker con ventana deslizante de las últimas llamadas.
+
+    - CLOSED: deja pasar todo; se abre si la tasa de errores o de llamadas
+      lentas en la ventana supera su umbral.
+    - OPEN: rechaza todo durante open_seconds.
+    - HALF_OPEN: deja pasar hasta half_open_calls sondas; si todas salen bien
+      se cierra, si alguna falla se vuelve a abrir.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 3.0,
+        slow_call_rate_threshold: float = 0.5,
+        window_size: int = 20,
+        min_calls: int = 10,
+        open_seconds: float = 30.0,
+        half_open_calls: int = 3,
+        clock=time.monotonic
+    ):
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._window = deque(maxlen=window_size)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probes_succeeded = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        """Estado actual, pasando a HALF_OPEN si ya venció el tiempo abierto"""
+        with self._lock:
+            self._refresh_state()
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Indica si se puede hacer una llamada; en HALF_OPEN reserva una sonda"""
+        with self._lock:
+            self._refresh_state()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and self._probes_in_flight < self.half_open_calls:
+                self._probes_in_flight += 1
+                return True
+            return False
+
+    def record_success(self, latency: float):
+        """Registra una llamada exitosa; las lentas cuentan contra el umbral de latencia"""
+        slow = latency >= self.slow_call_seconds
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if slow:
+                    self._open()
+                    return
+                self._probes_succeeded += 1
+                if self._probes_succeeded >= self.half_open_calls:
+                    self._close()
+                return
+            self._window.append((False, slow))
+            self._evaluate()
+
+    def record_failure(self):
+        """Registra una llamada fallida"""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._open()
+                return
+            self._window.append((True, False))
+            self._evaluate()
+
+    def release(self):
+        """Devuelve la sonda reservada de una llamada abandonada sin resultado (p. ej. por plazo)"""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def snapshot(self) -> dict:
+        """Resumen del estado para métricas"""
+        with self._lock:
+            self._refresh_state()
+            calls = len(self._window)
+            return {
+                'state': self._state,
+                'window_calls': calls,
+                'failure_rate': self._rate(0) if calls else 0.0,
+                'slow_call_rate': self._rate(1) if calls else 0.0,
+                'times_opened': self.times_opened
+            }
+
+    def _refresh_state(self):
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._state = self.HALF_OPEN
+            self._probes_in_flight = 0
+            self._probes_succeeded = 0
+
+    def _rate(self, index: int) -> float:
+        return sum(1 for call in self._window if call[index]) / len(self._window)
+
+    def _evaluate(self):
+        if self._state != self.CLOSED or len(self._window) < self.min_calls:
+            return
+        if self._rate(0) >= self.failure_rate_threshold or self._rate(1) >= self.slow_call_rate_threshold:
+            self._open()
+
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        self._window.clear()
+        self.times_opened += 1
+
+    def _close(self):
+        self._state = self.CLOSED
+        self._window.clear()
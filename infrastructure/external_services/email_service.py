@@ -5,8 +5,15 @@ Servicio para enviar correos electrónicos
 import os
 import socket
 import smtplib
+import sys
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from domain.services.deadline import DeadlineExceededException, check_deadline, deadline_expired, time_budget
+from infrastructure.monitoring import request_timing
+from infrastructure.monitoring.memory_monitor import estimate_size
+from infrastructure.runtime.lifecycle import register_after_fork, register_shutdown
 
 
 class EmailException(Exception):
@@ -38,13 +45,25 @@ class EmailService:
         port: int,
         username: str,
         password: str,
-        use_tls: bool = True
+        use_tls: bool = True,
+        pool_size: int = 0,
+        pool_idle_seconds: float = 60.0,
+        timeout: float = 20.0
     ):
         self.server = server
         self.port = port
         self.username = username
         self.password = password
         self.use_tls = use_tls
+        self.pool_size = pool_size
+        self.pool_idle_seconds = pool_idle_seconds
+        self.timeout = timeout
+
+        # Pool de conexiones SMTP ya autenticadas: (conexión, último uso)
+        self._pool = []
+        self._pool_lock = threading.Lock()
+        register_after_fork(self._reset_pool)
+        register_shutdown(self.close)
 
         # 🔴 IMPORTANTE:
         # Forzamos IPv4 solo cuando estamos en Render
@@ -53,7 +72,12 @@ class EmailService:
 
     def send_email(self, to_email: str, subject: str, body: str):
         """
-        Envía un correo electrónico
+        Envía un correo electrónico. Cada operación SMTP espera a lo sumo
+        `timeout` segundos o lo que quede del plazo de la solicitud
+
+        Raises:
+            EmailException: Si el envío falla
+            DeadlineExceededException: Si el plazo se agota antes o durante el envío
         """
         try:
             message = MIMEMultipart()
@@ -62,19 +86,134 @@ class EmailService:
             message["Subject"] = subject
             message.attach(MIMEText(body, "plain", "utf-8"))
 
-            with smtplib.SMTP(self.server, self.port, timeout=20) as server:
-                server.ehlo()
-
-                if self.use_tls:
-                    server.starttls()
-                    server.ehlo()
+            with request_timing.stage('email'):
+                self._deliver(message)
 
-                server.login(self.username, self.password)
-                server.send_message(message)
+        except DeadlineExceededException:
+            raise
 
         except (smtplib.SMTPException, OSError) as e:
+            if deadline_expired():
+                # La conexión ya se cerró en _deliver: no vuelve al pool a medio usar
+                raise DeadlineExceededException('email') from e
             # OSError captura errores de red como: [Errno 101] Network is unreachable
             raise EmailException(f"Error al enviar el correo: {e}")
 
         except Exception as e:
             raise EmailException(f"Error inesperado al enviar el correo: {e}")
+
+    def close(self):
+        """Cierra las conexiones del pool"""
+        with self._pool_lock:
+            pooled, self._pool = self._pool, []
+        for connection, _ in pooled:
+            self._quit(connection)
+
+    def memory_usage(self) -> int:
+        """Bytes aproximados de las conexiones en el pool (sin los buffers del kernel)"""
+        with self._pool_lock:
+            pooled = list(self._pool)
+        return estimate_size(self._pool, pooled, len(pooled))
+
+    def shrink(self, max_bytes: int) -> int:
+        """
+        Bajo presión de memoria, cierra las conexiones ociosas que llevan más
+        tiempo sin usarse hasta ocupar ~max_bytes; las demás siguen abiertas
+        para que las próximas alertas no paguen conexión, TLS y login
+        """
+        usage = self.memory_usage()
+        with self._pool_lock:
+            if usage <= max_bytes or not self._pool:
+                return 0
+            base = sys.getsizeof(self._pool)
+            per_connection = (usage - base) / len(self._pool)
+            keep = max(0, int((max_bytes - base) // per_connection)) if per_connection else len(self._pool)
+            # El pool es una pila: al principio quedan las de uso más antiguo
+            closing = self._pool[:len(self._pool) - keep]
+            self._pool = self._pool[len(closing):]
+        for connection, _ in closing:
+            self._quit(connection)
+        return len(closing)
+
+    def _deliver(self, message: MIMEMultipart):
+        """Envía el mensaje por una conexión del pool, reintentando si estaba caída"""
+        # Sin plazo no se toma (ni se descarta) una conexión del pool
+        check_deadline('email')
+        connection, reused = self._acquire()
+        try:
+            self._bound(connection)
+            connection.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            connection.close()
+            if not reused:
+                raise
+            # El servidor cerró la conexión ociosa: se reintenta con una nueva
+            connection = self._connect()
+            try:
+                self._bound(connection)
+                connection.send_message(message)
+            except Exception:
+                connection.close()
+                raise
+        except Exception:
+            connection.close()
+            raise
+        self._release(connection)
+
+    def _connect(self) -> smtplib.SMTP:
+        """Abre y autentica una conexión SMTP nueva"""
+        connection = smtplib.SMTP(self.server, self.port, timeout=time_budget('email', self.timeout))
+        try:
+            connection.ehlo()
+
+            if self.use_tls:
+                self._bound(connection)
+                connection.starttls()
+                connection.ehlo()
+
+            self._bound(connection)
+            connection.login(self.username, self.password)
+        except Exception:
+            connection.close()
+            raise
+        return connection
+
+    def _bound(self, connection: smtplib.SMTP):
+        """Acota el timeout del socket a lo que queda del plazo antes de la próxima operación"""
+        if connection.sock is not None:
+            connection.sock.settimeout(time_budget('email', self.timeout))
+
+    def _acquire(self) -> tuple:
+        """Toma una conexión del pool o abre una nueva; indica si fue reutilizada"""
+        now = time.monotonic()
+        while True:
+            with self._pool_lock:
+                if not self._pool:
+                    break
+                connection, last_used = self._pool.pop()
+            if now - last_used < self.pool_idle_seconds:
+                return connection, True
+            self._quit(connection)
+        return self._connect(), False
+
+    def _release(self, connection: smtplib.SMTP):
+        """Devuelve la conexión al pool o la cierra si está lleno"""
+        with self._pool_lock:
+            if len(self._pool) < self.pool_size:
+                if connection.sock is not None:
+                    # El próximo uso no hereda el plazo de esta solicitud
+                    connection.sock.settimeout(self.timeout)
+                self._pool.append((connection, time.monotonic()))
+                return
+        self._quit(connection)
+
+    def _quit(self, connection: smtplib.SMTP):
+        try:
+            connection.quit()
+        except (smtplib.SMTPException, OSError):
+            connection.close()
+
+    def _reset_pool(self):
+        """Descarta (sin QUIT) las conexiones heredadas del proceso padre"""
+        self._pool = []
+        self._pool_lock = threading.Lock()
@@ -0,0 +1,131 @@
+"""
+Open-Meteo Service - Capa de Infraestructura
+Proveedor de pronósticos alternativo basado en la API pública de Open-Meteo
+"""
+import requests
+from datetime import datetime
+from requests.adapters import HTTPAdapter
+from domain.entities.forecast import Forecast
+from domain.services.deadline import DeadlineExceededException, deadline_expired, time_budget
+from domain.services.weather_provider import WeatherProvider
+from infrastructure.external_services.weather_api_service import WeatherAPIException, WeatherAPIService
+from infrastructure.runtime.lifecycle import register_after_fork, register_shutdown
+
+
+class OpenMeteoService(WeatherProvider):
+    """
+    Servicio para consultar Open-Meteo (no requiere API key).
+    Open-Meteo reporta códigos WMO; se traducen al código y texto de WeatherAPI
+    equivalentes para que alertas y agregados no dependan del proveedor.
+    """
+
+    name = 'openmeteo'
+
+    # Código WMO -> (código WeatherAPI, condición)
+    WMO_CONDITIONS = {
+        0: (1000, 'Sunny'),
+        1: (1003, 'Partly cloudy'),
+        2: (1003, 'Partly cloudy'),
+        3: (1009, 'Overcast'),
+        45: (1135, 'Fog'),
+        48: (1147, 'Freezing fog'),
+        51: (1153, 'Light drizzle'),
+        53: (1153, 'Light drizzle'),
+        55: (1153, 'Light drizzle'),
+        56: (1168, 'Freezing drizzle'),
+        57: (1171, 'Heavy freezing drizzle'),
+        61: (1183, 'Light rain'),
+        63: (1189, 'Moderate rain'),
+        65: (1195, 'Heavy rain'),
+        66: (1198, 'Light freezing rain'),
+        67: (1201, 'Moderate or heavy freezing rain'),
+        71: (1213, 'Light snow'),
+        73: (1219, 'Moderate snow'),
+        75: (1225, 'Heavy snow'),
+        77: (1237, 'Ice pellets'),
+        80: (1240, 'Light rain shower'),
+        81: (1243, 'Moderate or heavy rain shower'),
+        82: (1246, 'Torrential rain shower'),
+        85: (1255, 'Light snow showers'),
+        86: (1258, 'Moderate or heavy snow showers'),
+        95: (1276, 'Moderate or heavy rain with thunder'),
+        96: (1276, 'Moderate or heavy rain with thunder'),
+        99: (1276, 'Moderate or heavy rain with thunder')
+    }
+
+    CURRENT_FIELDS = 'temperature_2m,relative_humidity_2m,weather_code,wind_speed_10m'
+
+    def __init__(self, api_url: str, timeout: float = 10.0, pool_size: int = 32):
+        self.api_url = api_url
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._session = self._create_session()
+
+        register_after_fork(self._reset_session)
+        register_shutdown(self.close)
+
+    def close(self):
+        """Cierra las conexiones keep-alive del pool HTTP"""
+        self._session.close()
+
+    def get_forecast(self, latitude: float, longitude: float) -> Forecast:
+        """
+        Obtiene el pronóstico del clima para una ubicación
+
+        Raises:
+            WeatherAPIException: Si hay un error al consultar la API
+        """
+        try:
+            params = {
+                'latitude': latitude,
+                'longitude': longitude,
+                'current': self.CURRENT_FIELDS,
+                'wind_speed_unit': 'kmh'
+            }
+
+            response = self._session.get(self.api_url, params=params, timeout=time_budget('weather', self.timeout))
+            response.raise_for_status()
+            data = response.json()
+
+            return self._parse_forecast(data, latitude, longitude)
+
+        except requests.exceptions.RequestException as e:
+            if deadline_expired():
+                raise DeadlineExceededException('weather') from e
+            raise WeatherAPIException(f"Error al consultar Open-Meteo: {str(e)}")
+        except (KeyError, ValueError) as e:
+            raise WeatherAPIException(f"Error al procesar la respuesta de Open-Meteo: {str(e)}")
+
+    def _create_session(self) -> requests.Session:
+        """Sesión HTTP con pool de conexiones keep-alive hacia el upstream"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _reset_session(self):
+        """Descarta la sesión heredada tras un fork y crea una nueva"""
+        self._session = self._create_session()
+
+    def _parse_forecast(self, data: dict, latitude: float, longitude: float) -> Forecast:
+        """Parsea la respuesta de la API a una entidad Forecast"""
+        current = data['current']
+        wmo_code = int(current['weather_code'])
+        if wmo_code not in self.WMO_CONDITIONS:
+            raise ValueError(f"Código WMO desconocido: {wmo_code}")
+        condition_code, condition = self.WMO_CONDITIONS[wmo_code]
+
+        return Forecast(
+            # Open-Meteo no resuelve nombres de lugar
+            location=f"{latitude:.2f}, {longitude:.2f}",
+            latitude=latitude,
+            longitude=longitude,
+            temperature_c=current['temperature_2m'],
+            condition=condition,
+            condition_code=condition_code,
+            is_adverse=condition_code in WeatherAPIService.ADVERSE_CODES,
+            forecast_date=datetime.now(),
+            humidity=current['relative_humidity_2m'],
+            wind_kph=current['wind_speed_10m']
+        )
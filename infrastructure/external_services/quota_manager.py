@@ -0,0 +1,198 @@
+"""
+Quota Manager - Capa de Infraestructura
+Contabiliza las llamadas a WeatherAPI contra los presupuestos por minuto y por
+mes del plan, compartidos por todos los workers mediante un archivo SQLite
+"""
+import calendar
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from domain.entities.forecast import Forecast
+from domain.services.weather_provider import WeatherProvider
+from domain.services.deadline import check_deadline
+from domain.services.request_priority import BACKGROUND, current_priority
+from infrastructure.external_services.weather_api_service import WeatherAPIException
+from infrastructure.monitoring.metrics import metrics
+
+
+class QuotaExceededException(WeatherAPIException):
+    """No queda presupuesto para la prioridad de la llamada"""
+    pass
+
+
+class QuotaManager:
+    """
+    Mide el consumo de la cuota del upstream y decide si una llamada puede salir.
+
+    Niveles:
+    - normal: se atiende todo.
+    - tight: el minuto supera `tight_ratio` de su presupuesto o el mes va por
+      delante del ritmo uniforme (más `pace_slack`). Solo sale el tráfico
+      interactivo; el de fondo se rechaza y los consumidores degradan
+      (celdas más gruesas, TTL más largos).
+    - exhausted: se agotó el presupuesto del minuto o del mes; no sale nada.
+
+    Un presupuesto en 0 significa sin límite (solo se contabiliza).
+    """
+
+    NORMAL = 'normal'
+    TIGHT = 'tight'
+    EXHAUSTED = 'exhausted'
+
+    def __init__(
+        self,
+        path: str,
+        per_minute: int = 0,
+        per_month: int = 0,
+        tight_ratio: float = 0.8,
+        pace_slack: float = 0.05,
+        clock=time.time
+    ):
+        self.path = path
+        self.per_minute = per_minute
+        self.per_month = per_month
+        self.tight_ratio = tight_ratio
+        self.pace_slack = pace_slack
+        self._clock = clock
+        self._local = threading.local()
+        self._create_schema()
+
+        metrics.register_gauge('weather_quota.snapshot', self.snapshot)
+
+    @property
+    def limited(self) -> bool:
+        """Indica si hay algún presupuesto configurado"""
+        return bool(self.per_minute or self.per_month)
+
+    def acquire(self, priority: str = None):
+        """
+        Reserva una llamada para la prioridad indicada (por defecto, la del contexto)
+
+        Raises:
+            QuotaExceededException: Si el nivel actual no admite la prioridad
+        """
+        priority = priority or current_priority()
+        minute_key, month_key = self._window_keys()
+        connection = self._connection()
+        with connection:
+            # BEGIN IMMEDIATE serializa la lectura y el incremento entre procesos
+            connection.execute('BEGIN IMMEDIATE')
+            minute_used, month_used = self._read(connection, minute_key, month_key)
+            level = self._level(minute_used, month_used)
+            if level == self.EXHAUSTED or (level == self.TIGHT and priority == BACKGROUND):
+                metrics.increment(f'weather_quota.rejected.{priority}')
+                raise QuotaExceededException(
+                    f"Cuota de WeatherAPI {'agotada' if level == self.EXHAUSTED else 'reservada al tráfico interactivo'}"
+                )
+            connection.executemany(
+                'INSERT INTO weather_quota (bucket, used) VALUES (?, 1)'
+                ' ON CONFLICT (bucket) DO UPDATE SET used = used + 1',
+                [(minute_key,), (month_key,)]
+            )
+        metrics.increment(f'weather_quota.calls.{priority}')
+
+    def level(self) -> str:
+        """Nivel de presión actual sobre la cuota"""
+        minute_key, month_key = self._window_keys()
+        return self._level(*self._read(self._connection(), minute_key, month_key))
+
+    def snapshot(self) -> dict:
+        """Consumo y presupuesto restante de cada ventana"""
+        minute_key, month_key = self._window_keys()
+        minute_used, month_used = self._read(self._connection(), minute_key, month_key)
+        return {
+            'level': self._level(minute_used, month_used),
+            'minute_used': minute_used,
+            'minute_remaining': max(0, self.per_minute - minute_used) if self.per_minute else None,
+            'month_used': month_used,
+            'month_remaining': max(0, self.per_month - month_used) if self.per_month else None
+        }
+
+    def purge_old_windows(self) -> int:
+        """Elimina los contadores de minutos anteriores al actual"""
+        minute_key, _ = self._window_keys()
+        connection = self._connection()
+        with connection:
+            cursor = connection.execute(
+                "DELETE FROM weather_quota WHERE bucket LIKE 'minute:%' AND bucket < ?",
+                (minute_key,)
+            )
+        return cursor.rowcount
+
+    def _level(self, minute_used: int, month_used: int) -> str:
+        if (self.per_minute and minute_used >= self.per_minute) or (self.per_month and month_used >= self.per_month):
+            return self.EXHAUSTED
+        if self.per_minute and minute_used >= self.per_minute * self.tight_ratio:
+            return self.TIGHT
+        if self.per_month and month_used >= self.per_month * min(1.0, self._month_elapsed() + self.pace_slack):
+            return self.TIGHT
+        return self.NORMAL
+
+    def _month_elapsed(self) -> float:
+        """Fracción transcurrida del mes (UTC)"""
+        now = datetime.fromtimestamp(self._clock(), tz=timezone.utc)
+        days = calendar.monthrange(now.year, now.month)[1]
+        start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        return (now - start).total_seconds() / (days * 86400)
+
+    def _window_keys(self):
+        now = datetime.fromtimestamp(self._clock(), tz=timezone.utc)
+        return f"minute:{now:%Y%m%d%H%M}", f"month:{now:%Y%m}"
+
+    def _read(self, connection: sqlite3.Connection, minute_key: str, month_key: str):
+        rows = dict(connection.execute(
+            'SELECT bucket, used FROM weather_quota WHERE bucket IN (?, ?)',
+            (minute_key, month_key)
+        ).fetchall())
+        return rows.get(minute_key, 0), rows.get(month_key, 0)
+
+    def _create_schema(self):
+        connection = self._connection()
+        connection.execute('PRAGMA journal_mode=WAL')
+        with connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS weather_quota ('
+                ' bucket TEXT PRIMARY KEY,'
+                ' used INTEGER NOT NULL'
+                ') WITHOUT ROWID'
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Conexión por hilo; se recrea si el proceso fue bifurcado (fork)"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            # isolation_level=None: las transacciones se controlan con BEGIN explícito
+            connection = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False, isolation_level=None)
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+
+class MeteredWeatherService(WeatherProvider):
+    """Decorador que reserva cuota antes de cada llamada real al upstream"""
+
+    def __init__(self, weather_service, quota: QuotaManager, purge_every: int = 500):
+        self.weather_service = weather_service
+        self.quota = quota
+        self.purge_every = purge_every
+        self._calls = 0
+        self._calls_lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self.weather_service.name
+
+    def get_forecast(self, latitude: float, longitude: float) -> Forecast:
+        """Obtiene el pronóstico si la cuota lo permite"""
+        # Una llamada que ya no cabe en el plazo no gasta cuota
+        check_deadline('weather')
+        self.quota.acquire()
+        with self._calls_lock:
+            self._calls += 1
+            purge = self._calls % self.purge_every == 0
+        if purge:
+            self.quota.purge_old_windows()
+        return self.weather_service.get_forecast(latitude, longitude)
@@ -0,0 +1,213 @@
+"""
+Resilient Weather Service - Capa de Infraestructura
+Envuelve el servicio de clima con circuit breaker, respaldo en caché y
+solicitudes de cobertura (hedged requests) para acotar la latencia de cola
+"""
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import replace
+from datetime import datetime
+from typing import Optional
+from domain.entities.forecast import Forecast
+from domain.entities.geo_cell import GeoCell
+from domain.repositories.observation_repository import ObservationRepository
+from domain.services.deadline import DeadlineExceededException, check_deadline, current_deadline
+from domain.services.weather_provider import WeatherProvider
+from infrastructure.cache.forecast_cache import ForecastCache
+from infrastructure.external_services.circuit_breaker import CircuitBreaker
+from infrastructure.external_services.weather_api_service import WeatherAPIException
+from infrastructure.external_services.quota_manager import QuotaExceededException, QuotaManager
+from infrastructure.monitoring import request_timing
+from infrastructure.monitoring.metrics import metrics
+from infrastructure.runtime.lifecycle import register_after_fork, register_shutdown
+
+
+class WeatherServiceUnavailableException(WeatherAPIException):
+    """El circuito está abierto y no hay un pronóstico en caché para responder"""
+    pass
+
+
+class ResilientWeatherService(WeatherProvider):
+    """Decorador de un WeatherProvider con circuit breaker y hedging"""
+
+    def __init__(
+        self,
+        weather_service,
+        breaker: CircuitBreaker,
+        fallback_cache: Optional[ForecastCache] = None,
+        cell_size: float = 0.1,
+        stale_ttl: float = 1800.0,
+        hedge_enabled: bool = False,
+        hedge_min_delay: float = 0.2,
+        hedge_quantile: float = 0.95,
+        hedge_min_samples: int = 20,
+        max_workers: int = 32,
+        populate_fallback: bool = True,
+        quota: Optional[QuotaManager] = None,
+        observation_repository: Optional[ObservationRepository] = None
+    ):
+        self.weather_service = weather_service
+        self.breaker = breaker
+        self.fallback_cache = fallback_cache
+        self.cell_size = cell_size
+        self.stale_ttl = stale_ttl
+        self.hedge_enabled = hedge_enabled
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.populate_fallback = populate_fallback
+        self.quota = quota
+        self.observation_repository = observation_repository
+        self._latencies = deque(maxlen=500)
+        self._latencies_lock = threading.Lock()
+        self.max_workers = max_workers
+        self._executor = self._create_executor()
+        register_after_fork(self._reset_executor)
+        register_shutdown(self.close)
+
+        metrics.register_gauge('weather_breaker.state', lambda: self.breaker.state)
+        metrics.register_gauge('weather_breaker.snapshot', self.breaker.snapshot)
+        metrics.register_gauge('weather_upstream.hedge_delay_ms', lambda: round(self.hedge_delay() * 1000, 1))
+
+    def close(self):
+        """Espera a las llamadas de cobertura en curso y libera el pool de hilos"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def get_forecast(self, latitude: float, longitude: float) -> Forecast:
+        """
+        Obtiene el pronóstico protegiendo al proceso de un upstream degradado
+
+        Raises:
+            WeatherServiceUnavailableException: Si el circuito está abierto y no hay caché
+            WeatherAPIException: Si la llamada falla y no hay caché
+            DeadlineExceededException: Si se agota el plazo de la solicitud (no cuenta
+                como falla del upstream para el breaker)
+        """
+        key = GeoCell.from_coordinates(latitude, longitude, self.cell_size).key
+
+        if not self.breaker.allow_request():
+            metrics.increment('weather_breaker.rejected')
+            return self._fallback(key, latitude, longitude, WeatherServiceUnavailableException(
+                "Servicio del clima temporalmente no disponible (circuito abierto)"
+            ))
+
+        started = time.monotonic()
+        # allow_request() pudo reservar una sonda (HALF_OPEN): toda salida registra
+        # el resultado o la libera, si no el circuito queda sin sondas para siempre
+        recorded = False
+        try:
+            try:
+                with request_timing.stage('weather'):
+                    forecast = self._call(latitude, longitude)
+            except DeadlineExceededException:
+                # El plazo es de la solicitud, no una falla del upstream
+                metrics.increment('weather_upstream.deadline_exceeded')
+                raise
+            except QuotaExceededException as e:
+                # Sin presupuesto no es una falla del upstream: no cuenta para el breaker
+                return self._fallback(key, latitude, longitude, WeatherServiceUnavailableException(str(e)))
+            except WeatherAPIException as e:
+                self.breaker.record_failure()
+                recorded = True
+                metrics.increment('weather_upstream.errors')
+                return self._fallback(key, latitude, longitude, e)
+
+            latency = time.monotonic() - started
+            self.breaker.record_success(latency)
+            recorded = True
+        finally:
+            if not recorded:
+                self.breaker.release()
+
+        with self._latencies_lock:
+            self._latencies.append(latency)
+
+        if self.fallback_cache is not None and self.populate_fallback:
+            # Solo se guarda como último valor conocido: expira de inmediato y se lee con get_stale
+            self.fallback_cache.set(key, forecast, 0.0)
+        if self.observation_repository is not None:
+            # Solo lo traído del upstream: los respaldos servidos desde caché no son observaciones
+            self.observation_repository.record(key, forecast, datetime.now())
+        return forecast
+
+    def hedge_delay(self) -> float:
+        """Espera antes de enviar la solicitud de cobertura: el percentil configurado de la latencia"""
+        with self._latencies_lock:
+            samples = sorted(self._latencies)
+        if len(samples) < self.hedge_min_samples:
+            return self.hedge_min_delay
+        index = min(len(samples) - 1, int(self.hedge_quantile * len(samples)))
+        return max(self.hedge_min_delay, samples[index])
+
+    def _call(self, latitude: float, longitude: float) -> Forecast:
+        """Llama al upstream; si está habilitado, cubre la llamada lenta con una segunda"""
+        if self._executor is None or self.breaker.state != CircuitBreaker.CLOSED or not self._quota_allows_hedging():
+            return self.weather_service.get_forecast(latitude, longitude)
+
+        primary = self._submit(latitude, longitude)
+        done, _ = wait([primary], timeout=self._remaining(self.hedge_delay()))
+        if done:
+            return primary.result()
+        # Sin plazo no se envía la cobertura; la llamada en curso termina sola con su timeout acotado
+        check_deadline('weather')
+
+        metrics.increment('weather_upstream.hedges_sent')
+        hedge = self._submit(latitude, longitude)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, timeout=self._remaining(), return_when=FIRST_COMPLETED)
+            if not done:
+                raise DeadlineExceededException('weather')
+            for future in done:
+                try:
+                    forecast = future.result()
+                except WeatherAPIException as e:
+                    error = e
+                    continue
+                if future is hedge:
+                    metrics.increment('weather_upstream.hedges_won')
+                return forecast
+        raise error
+
+    def _remaining(self, limit: Optional[float] = None) -> Optional[float]:
+        """Espera máxima: `limit` acotado por lo que queda del plazo de la solicitud"""
+        current = current_deadline()
+        if current is None:
+            return limit
+        return current.remaining() if limit is None else min(limit, current.remaining())
+
+    def _submit(self, latitude: float, longitude: float):
+        """Envía la llamada al pool conservando el contexto (p. ej. la prioridad de la solicitud)"""
+        context = contextvars.copy_context()
+        return self._executor.submit(context.run, self.weather_service.get_forecast, latitude, longitude)
+
+    def _quota_allows_hedging(self) -> bool:
+        """Las llamadas de cobertura solo se gastan si la cuota no está presionada"""
+        return self.quota is None or self.quota.level() == QuotaManager.NORMAL
+
+    def _create_executor(self) -> Optional[ThreadPoolExecutor]:
+        if not self.hedge_enabled:
+            return None
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='weather-hedge')
+
+    def _reset_executor(self):
+        """Los hilos del pool no sobreviven al fork: el hijo necesita uno propio"""
+        self._executor = self._create_executor()
+
+    def _fallback(self, key: str, latitude: float, longitude: float, error: WeatherAPIException) -> Forecast:
+        """
+        Sirve el último pronóstico conocido de la celda o propaga el error. El
+        respaldo va marcado con `is_stale` para que ninguna caché lo guarde
+        como nuevo: renovarlo lo haría vivir más allá de `stale_ttl`.
+        """
+        if self.fallback_cache is not None:
+            cached = self.fallback_cache.get_stale(key, self.stale_ttl)
+            if cached is not None:
+                metrics.increment('weather_upstream.stale_served')
+                return replace(cached, latitude=latitude, longitude=longitude, is_stale=True)
+        raise error
@@ -4,7 +4,11 @@ Servicio para interactuar con la API externa de clima
 """
 import requests
 from datetime import datetime
+from requests.adapters import HTTPAdapter
 from domain.entities.forecast import Forecast
+from domain.services.deadline import DeadlineExceededException, deadline_expired, time_budget
+from domain.services.weather_provider import WeatherProvider
+from infrastructure.runtime.lifecycle import register_after_fork, register_shutdown
 
 
 class WeatherAPIException(Exception):
@@ -12,9 +16,11 @@ class WeatherAPIException(Exception):
     pass
 
 
-class WeatherAPIService:
+class WeatherAPIService(WeatherProvider):
     """Servicio para consultar la API de WeatherAPI.com"""
     
+    name = 'weatherapi'
+    
     # Códigos de condiciones adversas según WeatherAPI
     ADVERSE_CODES = [
         1063, 1066, 1069, 1072, 1087, 1114, 1117,  # Lluvia, nieve, hielo
@@ -25,10 +31,21 @@ class WeatherAPIService:
         1273, 1276, 1279, 1282  # Tormentas
     ]
     
-    def __init__(self, api_key: str, api_url: str, days: int = 2):
+    def __init__(self, api_key: str, api_url: str, days: int = 2, timeout: float = 10.0, pool_size: int = 32):
         self.api_key = api_key
         self.api_url = api_url
         self.days = days
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._session = self._create_session()
+        
+        # Las conexiones keep-alive heredadas del proceso padre no se pueden compartir
+        register_after_fork(self._reset_session)
+        register_shutdown(self.close)
+    
+    def close(self):
+        """Cierra las conexiones keep-alive del pool HTTP"""
+        self._session.close()
     
     def get_forecast(self, latitude: float, longitude: float) -> Forecast:
         """
@@ -43,6 +60,7 @@ class WeatherAPIService:
             
         Raises:
             WeatherAPIException: Si hay un error al consultar la API
+            DeadlineExceededException: Si el plazo de la solicitud se agota antes o durante la llamada
         """
         try:
             params = {
@@ -53,17 +71,33 @@ class WeatherAPIService:
                 'alerts': 'no'
             }
             
-            response = requests.get(self.api_url, params=params, timeout=10)
+            # El timeout propio, acotado por lo que queda del plazo de la solicitud
+            timeout = time_budget('weather', self.timeout)
+            response = self._session.get(self.api_url, params=params, timeout=timeout)
             response.raise_for_status()
             data = response.json()
             
             return self._parse_forecast(data, latitude, longitude)
             
         except requests.exceptions.RequestException as e:
+            if deadline_expired():
+                raise DeadlineExceededException('weather') from e
             raise WeatherAPIException(f"Error al consultar la API del clima: {str(e)}")
         except (KeyError, ValueError) as e:
             raise WeatherAPIException(f"Error al procesar la respuesta de la API: {str(e)}")
     
+    def _create_session(self) -> requests.Session:
+        """Sesión HTTP con pool de conexiones keep-alive hacia el upstream"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+    
+    def _reset_session(self):
+        """Descarta la sesión heredada tras un fork y crea una nueva"""
+        self._session = self._create_session()
+    
     def _parse_forecast(self, data: dict, latitude: float, longitude: float) -> Forecast:
         """Parsea la respuesta de la API a una entidad Forecast"""
         current = data['current']
@@ -0,0 +1,143 @@
+"""
+Weather Provider Router - Capa de Infraestructura
+Reparte las consultas entre varios proveedores del clima según su latencia
+y su tasa de errores, con conmutación automática ante fallos
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+from domain.entities.forecast import Forecast
+from domain.services.weather_provider import WeatherProvider
+from infrastructure.external_services.quota_manager import QuotaExceededException
+from infrastructure.external_services.weather_api_service import WeatherAPIException
+from infrastructure.monitoring.metrics import metrics
+
+
+@dataclass
+class _ProviderStats:
+    """Medias móviles exponenciales de un proveedor"""
+
+    latency: Optional[float] = None
+    error_rate: float = 0.0
+    down_until: float = 0.0
+    last_used: float = 0.0
+    calls: int = 0
+    failures: int = 0
+
+
+class WeatherProviderRouter(WeatherProvider):
+    """
+    Envía cada consulta al proveedor sano más rápido y, si falla, prueba el
+    siguiente. La latencia y la tasa de errores de cada proveedor se siguen
+    con medias exponenciales (`smoothing`).
+
+    - Un proveedor cuya tasa de errores supera `error_threshold` queda fuera
+      durante `cooldown_seconds`; pasado ese tiempo vuelve a recibir tráfico
+      y, si sigue fallando, se vuelve a apartar.
+    - Un proveedor que no recibe tráfico en `probe_seconds` recibe la siguiente
+      consulta, y esa muestra reemplaza su latencia media, para que no quede
+      congelada en un valor viejo.
+    - Los proveedores apartados se prueban al final si todos los demás fallan.
+    - QuotaExceededException pasa al siguiente proveedor sin contar como error:
+      agotar el presupuesto no dice nada de la salud del proveedor.
+    """
+
+    name = 'router'
+
+    def __init__(
+        self,
+        providers: List[WeatherProvider],
+        smoothing: float = 0.2,
+        error_threshold: float = 0.5,
+        cooldown_seconds: float = 30.0,
+        probe_seconds: float = 60.0,
+        clock=time.monotonic
+    ):
+        if not providers:
+            raise ValueError("Se requiere al menos un proveedor del clima")
+        self.providers = list(providers)
+        self.smoothing = smoothing
+        self.error_threshold = error_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.probe_seconds = probe_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stats = {id(provider): _ProviderStats() for provider in self.providers}
+
+        metrics.register_gauge('weather_providers.snapshot', self.snapshot)
+
+    def get_forecast(self, latitude: float, longitude: float) -> Forecast:
+        """
+        Obtiene el pronóstico del mejor proveedor disponible
+
+        Raises:
+            WeatherAPIException: El error del último proveedor si fallan todos
+        """
+        last_error = None
+        for provider in self.ranked():
+            started = self._clock()
+            try:
+                forecast = provider.get_forecast(latitude, longitude)
+            except QuotaExceededException as e:
+                last_error = e
+                continue
+            except WeatherAPIException as e:
+                self._record(provider, self._clock() - started, failed=True)
+                metrics.increment(f'weather_providers.failover.{provider.name}')
+                last_error = e
+                continue
+            self._record(provider, self._clock() - started, failed=False)
+            return forecast
+        raise last_error
+
+    def ranked(self) -> List[WeatherProvider]:
+        """Orden en que se probarán los proveedores para la próxima consulta"""
+        now = self._clock()
+        with self._lock:
+            healthy, down = [], []
+            for position, provider in enumerate(self.providers):
+                stats = self._stats[id(provider)]
+                if stats.down_until > now:
+                    down.append((stats.down_until, position, provider))
+                    continue
+                # Sin muestras o sin tráfico reciente: va primero para medirlo
+                stale = stats.latency is None or now - stats.last_used >= self.probe_seconds
+                healthy.append((not stale, stats.latency or 0.0, position, provider))
+        healthy.sort(key=lambda entry: entry[:3])
+        down.sort(key=lambda entry: entry[:2])
+        return [entry[-1] for entry in healthy] + [entry[-1] for entry in down]
+
+    def snapshot(self) -> dict:
+        """Estado de cada proveedor para /metrics"""
+        now = self._clock()
+        with self._lock:
+            return {
+                provider.name: {
+                    'healthy': stats.down_until <= now,
+                    'latency_ms': round(stats.latency * 1000, 1) if stats.latency is not None else None,
+                    'error_rate': round(stats.error_rate, 3),
+                    'calls': stats.calls,
+                    'failures': stats.failures
+                }
+                for provider, stats in ((p, self._stats[id(p)]) for p in self.providers)
+            }
+
+    def _record(self, provider: WeatherProvider, latency: float, failed: bool):
+        now = self._clock()
+        with self._lock:
+            stats = self._stats[id(provider)]
+            stale = now - stats.last_used >= self.probe_seconds
+            stats.calls += 1
+            stats.last_used = now
+            stats.error_rate += ((1.0 if failed else 0.0) - stats.error_rate) * self.smoothing
+            # Los fallos también cuentan su latencia: un timeout hunde al proveedor en el orden.
+            # Tras un periodo sin tráfico, la media vieja ya no informa y se reemplaza
+            if stats.latency is None or stale:
+                stats.latency = latency
+            else:
+                stats.latency += (latency - stats.latency) * self.smoothing
+            if failed:
+                stats.failures += 1
+                if stats.error_rate >= self.error_threshold:
+                    stats.down_until = now + self.cooldown_seconds
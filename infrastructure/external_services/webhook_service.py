@@ -0,0 +1,479 @@
+"""
+Webhook Service - Capa de Infraestructura
+Canal de alertas por HTTP: agrupa las alertas por endpoint, firma cada lote
+con HMAC y lo entrega por conexiones keep-alive, reintentando con backoff
+"""
+import hashlib
+import hmac
+import ipaddress
+import json
+import logging
+import random
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from domain.entities.forecast import Forecast
+from domain.services.deadline import DeadlineExceededException, deadline_expired, time_budget
+from domain.services.notification_channel import NotificationChannel
+from infrastructure.monitoring.memory_monitor import estimate_size
+from infrastructure.monitoring.metrics import metrics
+from infrastructure.runtime.lifecycle import register_after_fork, register_shutdown
+
+
+logger = logging.getLogger(__name__)
+
+
+class NonPublicAddressError(ValueError):
+    """El destino del webhook es (o se conectó a) una dirección no pública"""
+    pass
+
+
+def check_public_ip(address: str, host: str):
+    """
+    Rechaza loopback, redes privadas, link-local (metadatos de la nube),
+    reservadas y multicast, también como IPv4 mapeada en IPv6
+
+    Raises:
+        NonPublicAddressError: Si la dirección no es pública
+    """
+    ip = ipaddress.ip_address(address.split('%', 1)[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    if not ip.is_global or ip.is_multicast:
+        raise NonPublicAddressError(f"Host de webhook no permitido: {host} resuelve a una dirección no pública ({ip})")
+
+
+class _PublicPeerMixin:
+    """
+    Verifica la dirección a la que realmente se conectó el socket, antes de
+    TLS y de enviar un byte: un DNS que cambia entre la validación y la
+    conexión (DNS rebinding) no puede llevar el POST a una red interna
+    """
+
+    def _new_conn(self):
+        sock = super()._new_conn()
+        try:
+            check_public_ip(sock.getpeername()[0], self.host)
+        except NonPublicAddressError:
+            sock.close()
+            raise
+        return sock
+
+
+class _PublicHTTPConnection(_PublicPeerMixin, HTTPConnection):
+    pass
+
+
+class _PublicHTTPSConnection(_PublicPeerMixin, HTTPSConnection):
+    pass
+
+
+class _PublicHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _PublicHTTPConnection
+
+
+class _PublicHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _PublicHTTPSConnection
+
+
+class _PublicOnlyAdapter(HTTPAdapter):
+    """Adaptador cuyas conexiones solo pueden terminar en direcciones públicas"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _PublicHTTPConnectionPool,
+            'https': _PublicHTTPSConnectionPool
+        }
+
+
+@dataclass
+class _Batch:
+    """Alertas pendientes de un endpoint"""
+
+    created_at: float
+    alerts: List[dict] = field(default_factory=list)
+    attempts: int = 0
+    next_attempt_at: float = 0.0
+
+
+class WebhookService(NotificationChannel):
+    """
+    Entrega alertas como POST JSON a la URL que eligió cada destinatario.
+
+    - `send_alert` solo agrega la alerta al lote del endpoint; un hilo de
+      fondo envía el lote cuando junta `batch_size` alertas o cuando la más
+      vieja lleva `batch_wait_seconds` esperando. Los lotes de endpoints
+      distintos se envían en paralelo (`workers`), y los de un mismo endpoint
+      en orden, uno a la vez.
+    - Cada lote lleva `X-Webhook-Timestamp` y `X-Webhook-Signature`
+      (`sha256=` + HMAC-SHA256 de "<timestamp>.<cuerpo>" con `secret`), y cada
+      alerta un `id` estable entre reintentos para que el receptor deduplique.
+    - Los errores de red, 429 y 5xx se reintentan con backoff exponencial con
+      jitter (respetando Retry-After) hasta `max_attempts`; los demás 4xx
+      descartan el lote. Un endpoint caído acumula como mucho `max_pending`
+      alertas; las más viejas se descartan.
+    - `validate_address` resuelve el destino una vez por solicitud, esperando
+      al DNS como mucho `timeout` o lo que quede del plazo: una dirección que no sea
+      pública (loopback, privada, link-local como la de metadatos de la nube,
+      reservada) se rechaza salvo con `allow_private_networks`. Al enviar se
+      verifica además la dirección a la que se conectó el socket, así que un
+      DNS que cambia después (DNS rebinding) no sirve para saltar el control;
+      por lo mismo, sin `allow_private_networks` no se usan los proxies del
+      entorno. Las redirecciones no se siguen.
+    """
+
+    name = 'webhook'
+    RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        secret: str,
+        batch_size: int = 100,
+        batch_wait_seconds: float = 1.0,
+        timeout: float = 5.0,
+        workers: int = 4,
+        pool_size: int = 32,
+        max_attempts: int = 5,
+        backoff_seconds: float = 0.5,
+        max_backoff_seconds: float = 30.0,
+        max_pending: int = 10000,
+        allowed_hosts: Iterable[str] = (),
+        allow_private_networks: bool = False,
+        clock=time.monotonic,
+        resolver=socket.getaddrinfo
+    ):
+        self.secret = secret.encode('utf-8')
+        self.batch_size = batch_size
+        self.batch_wait_seconds = batch_wait_seconds
+        self.timeout = timeout
+        self.workers = workers
+        self.pool_size = pool_size
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.max_pending = max_pending
+        self.allowed_hosts = frozenset(host.lower() for host in allowed_hosts)
+        self.allow_private_networks = allow_private_networks
+        self._clock = clock
+        self._resolver = resolver
+        self._batches: Dict[str, _Batch] = {}
+        self._in_flight = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._closed = False
+        self._session = self._create_session()
+        self._executor = self._create_executor()
+        self._dns_executor = self._create_dns_executor()
+
+        # Las conexiones keep-alive y los hilos no sobreviven al fork
+        register_after_fork(self.reset_after_fork)
+        register_shutdown(self.stop)
+        metrics.register_gauge('webhook.pending', self.pending_count)
+
+    def validate_address(self, address: str):
+        """
+        La URL debe ser http(s), estar en la lista de hosts permitidos (si la
+        hay) y resolver solo a direcciones públicas
+
+        Raises:
+            ValueError: Si el destino no está permitido
+            DeadlineExceededException: Si el plazo se agota esperando al DNS
+        """
+        parsed = self._parse(address)
+        if not self.allow_private_networks:
+            self._check_public(parsed.hostname, parsed.port or (443 if parsed.scheme == 'https' else 80))
+
+    def send_alert(self, address: str, forecast: Forecast) -> bool:
+        """
+        Agrega la alerta al lote del endpoint; el envío ocurre en segundo plano.
+        No vuelve a resolver el destino: ya lo hizo validate_address y la
+        conexión verifica la dirección real al enviar.
+        """
+        self._parse(address)
+        alert = self._to_payload(forecast)
+        with self._lock:
+            batch = self._batches.get(address)
+            if batch is None:
+                batch = self._batches[address] = _Batch(created_at=self._clock())
+            batch.alerts.append(alert)
+            overflow = len(batch.alerts) - self.max_pending
+            if overflow > 0:
+                del batch.alerts[:overflow]
+            full = len(batch.alerts) >= self.batch_size
+        if overflow > 0:
+            metrics.increment('webhook.dropped', overflow)
+        if full:
+            self._wake.set()
+        return True
+
+    def pending_count(self) -> int:
+        """Alertas aún no entregadas (incluye las que esperan reintento)"""
+        with self._lock:
+            return sum(len(batch.alerts) for batch in self._batches.values())
+
+    def memory_usage(self) -> int:
+        """Bytes aproximados de las alertas pendientes"""
+        with self._lock:
+            alerts = [alert for batch in self._batches.values() for alert in batch.alerts[:1]]
+            count = sum(len(batch.alerts) for batch in self._batches.values())
+        return estimate_size(self._batches, alerts, count)
+
+    def flush(self, force: bool = False) -> int:
+        """
+        Despacha los lotes listos: llenos, vencidos o, con `force`, todos los
+        que no esperan un reintento. Retorna cuántos lotes se despacharon.
+        """
+        deliveries = self._take_ready(force)
+        for url, alerts, attempts in deliveries:
+            self._executor.submit(self._deliver, url, alerts, attempts)
+        return len(deliveries)
+
+    def start(self, tick_seconds: float = 0.1) -> 'WebhookService':
+        """Inicia el hilo que despacha los lotes"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, args=(tick_seconds,), name='webhook-batcher', daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Detiene el hilo, intenta una vez lo pendiente y cierra las conexiones"""
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._executor.shutdown(wait=True)
+        self._dns_executor.shutdown(wait=False)
+        # Lo pendiente se intenta una vez en este hilo; lo que deba reintentarse se pierde
+        while True:
+            deliveries = self._take_ready(force=True)
+            if not deliveries:
+                break
+            for url, alerts, attempts in deliveries:
+                self._deliver(url, alerts, attempts)
+        self._session.close()
+        with self._lock:
+            pending = sum(len(batch.alerts) for batch in self._batches.values())
+            self._batches.clear()
+        if pending:
+            logger.warning("Se descartan %d alertas por webhook pendientes de reintento al apagar", pending)
+            metrics.increment('webhook.dropped', pending)
+
+    def reset_after_fork(self):
+        """Lo pendiente pertenece al padre; el hilo, el pool y las conexiones se recrean"""
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._batches = {}
+        self._in_flight = set()
+        self._closed = False
+        self._session = self._create_session()
+        self._executor = self._create_executor()
+        self._dns_executor = self._create_dns_executor()
+        if self._thread is not None:
+            self._thread = None
+            self.start()
+
+    def sign(self, timestamp: str, body: bytes) -> str:
+        """Firma HMAC-SHA256 de "<timestamp>.<cuerpo>" para X-Webhook-Signature"""
+        digest = hmac.new(self.secret, timestamp.encode('ascii') + b'.' + body, hashlib.sha256).hexdigest()
+        return f'sha256={digest}'
+
+    def _run(self, tick_seconds: float):
+        while not self._stop.is_set():
+            self._wake.wait(tick_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Error al despachar lotes de webhooks")
+
+    def _take_ready(self, force: bool) -> list:
+        """Saca de la cola hasta `batch_size` alertas de cada endpoint listo y libre"""
+        now = self._clock()
+        deliveries = []
+        with self._lock:
+            for url, batch in list(self._batches.items()):
+                if url in self._in_flight or batch.next_attempt_at > now:
+                    continue
+                ready = (
+                    force
+                    or len(batch.alerts) >= self.batch_size
+                    or now - batch.created_at >= self.batch_wait_seconds
+                )
+                if not ready:
+                    continue
+                alerts = batch.alerts[:self.batch_size]
+                del batch.alerts[:self.batch_size]
+                if not batch.alerts:
+                    del self._batches[url]
+                else:
+                    batch.created_at = now
+                self._in_flight.add(url)
+                deliveries.append((url, alerts, batch.attempts))
+        return deliveries
+
+    def _deliver(self, url: str, alerts: List[dict], attempts: int):
+        retry_after = None
+        try:
+            body = json.dumps({'alerts': alerts, 'count': len(alerts)}, separators=(',', ':')).encode('utf-8')
+            timestamp = str(int(time.time()))
+            try:
+                # La dirección se verifica en la conexión misma (ver _PublicPeerMixin)
+                self._parse(url)
+                response = self._session.post(url, data=body, timeout=self.timeout, allow_redirects=False, headers={
+                    'Content-Type': 'application/json',
+                    'X-Webhook-Timestamp': timestamp,
+                    'X-Webhook-Signature': self.sign(timestamp, body)
+                })
+                status = response.status_code
+                retry_after = self._retry_after(response)
+                response.close()
+            except ValueError as e:
+                logger.error("Se descartan %d alertas para %s: %s", len(alerts), url, e)
+                metrics.increment('webhook.dropped', len(alerts))
+                self._settle(url, None, attempts=0)
+                return
+            except requests.exceptions.RequestException as e:
+                status, error = None, str(e)
+            else:
+                error = f"HTTP {status}"
+
+            if status is not None and 200 <= status < 300:
+                metrics.increment('webhook.batches')
+                metrics.increment('webhook.sent', len(alerts))
+                self._settle(url, None, attempts=0)
+            elif status is not None and status not in self.RETRYABLE_STATUS:
+                logger.error("Webhook %s rechazó un lote de %d alertas (%s); se descarta", url, len(alerts), error)
+                metrics.increment('webhook.dropped', len(alerts))
+                self._settle(url, None, attempts=0)
+            elif attempts + 1 >= self.max_attempts:
+                logger.error("Se descartan %d alertas para %s tras %d intentos (%s)", len(alerts), url, attempts + 1, error)
+                metrics.increment('webhook.dropped', len(alerts))
+                self._settle(url, None, attempts=0)
+            else:
+                logger.warning("Falló el webhook %s (%s); se reintentará", url, error)
+                metrics.increment('webhook.retries')
+                self._settle(url, alerts, attempts + 1, self._backoff(attempts + 1, retry_after))
+        except Exception:
+            logger.exception("Error inesperado al entregar el webhook %s", url)
+            with self._lock:
+                self._in_flight.discard(url)
+
+    def _settle(self, url: str, retry: Optional[List[dict]], attempts: int, delay: float = 0.0):
+        """Libera el endpoint y, si hay que reintentar, devuelve el lote al frente de la cola"""
+        with self._lock:
+            self._in_flight.discard(url)
+            batch = self._batches.get(url)
+            if retry is None:
+                if batch is not None:
+                    batch.attempts = 0
+                    batch.next_attempt_at = 0.0
+                    if len(batch.alerts) >= self.batch_size:
+                        self._wake.set()
+                return
+            if batch is None:
+                batch = self._batches[url] = _Batch(created_at=self._clock())
+            batch.alerts[:0] = retry
+            overflow = len(batch.alerts) - self.max_pending
+            if overflow > 0:
+                del batch.alerts[:overflow]
+            batch.attempts = attempts
+            batch.next_attempt_at = self._clock() + delay
+        if overflow > 0:
+            metrics.increment('webhook.dropped', overflow)
+
+    def _check_public(self, host: str, port: int):
+        """Rechaza hosts que resuelven a direcciones no públicas (SSRF)"""
+        # getaddrinfo no tiene timeout: se espera en otro hilo con el plazo de la solicitud
+        lookup = self._dns_executor.submit(self._resolver, host, port, proto=socket.IPPROTO_TCP)
+        try:
+            addresses = {info[4][0] for info in lookup.result(timeout=time_budget('webhook', self.timeout))}
+        except FutureTimeoutError:
+            if deadline_expired():
+                raise DeadlineExceededException('webhook')
+            raise ValueError(f"No se pudo resolver el host de webhook {host} a tiempo")
+        except (socket.gaierror, UnicodeError) as e:
+            raise ValueError(f"No se pudo resolver el host de webhook {host}: {e}")
+        for address in addresses:
+            check_public_ip(address, host)
+
+    def _parse(self, address: str):
+        """
+        Solo la forma: URL http(s) hacia un host permitido (sin resolver)
+
+        Raises:
+            ValueError: Si el destino no está permitido
+        """
+        parsed = urlparse(address or '')
+        if parsed.scheme not in ('http', 'https') or not parsed.hostname:
+            raise ValueError("webhook_url debe ser una URL http(s)")
+        if self.allowed_hosts and parsed.hostname.lower() not in self.allowed_hosts:
+            raise ValueError(f"Host de webhook no permitido: {parsed.hostname}")
+        return parsed
+
+    def _backoff(self, attempts: int, retry_after: Optional[float]) -> float:
+        delay = min(self.max_backoff_seconds, self.backoff_seconds * (2 ** (attempts - 1)))
+        delay *= random.uniform(0.5, 1.0)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_backoff_seconds))
+        return delay
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        try:
+            return float(response.headers['Retry-After'])
+        except (KeyError, ValueError):
+            return None
+
+    @staticmethod
+    def _to_payload(forecast: Forecast) -> dict:
+        return {
+            'id': uuid.uuid4().hex,
+            'location': forecast.location,
+            'latitude': forecast.latitude,
+            'longitude': forecast.longitude,
+            'condition': forecast.condition,
+            'condition_code': forecast.condition_code,
+            'temperature_c': forecast.temperature_c,
+            'humidity': forecast.humidity,
+            'wind_kph': forecast.wind_kph,
+            'forecast_date': forecast.forecast_date.isoformat()
+        }
+
+    def _create_session(self) -> requests.Session:
+        """Sesión HTTP con un pool keep-alive por host de endpoint"""
+        session = requests.Session()
+        if self.allow_private_networks:
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.workers)
+        else:
+            # Un proxy ocultaría el destino real a la verificación del socket
+            session.trust_env = False
+            adapter = _PublicOnlyAdapter(pool_connections=self.pool_size, pool_maxsize=self.workers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _create_executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='webhook')
+
+    def _create_dns_executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='webhook-dns')
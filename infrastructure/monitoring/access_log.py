@@ -0,0 +1,201 @@
+"""
+Access Log - Capa de Infraestructura
+Log de acceso estructurado (una línea JSON por petición) que se escribe desde
+un hilo de fondo: la petición solo encola el registro
+"""
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+from itertools import islice
+from logging.handlers import QueueHandler, RotatingFileHandler
+from infrastructure.monitoring.memory_monitor import estimate_size
+from infrastructure.monitoring.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class JsonFormatter(logging.Formatter):
+    """Serializa el diccionario del registro como una línea JSON con su marca de tiempo"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds')}
+        entry.update(record.msg)
+        return json.dumps(entry, ensure_ascii=False, separators=(',', ':'))
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler que no formatea en el hilo de la petición (lo hace el hilo
+    de escritura) y que, con la cola llena, descarta el registro en lugar de
+    bloquear o imprimir el error
+    """
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            metrics.increment('access_log.dropped')
+
+
+class AccessLogger:
+    """
+    Encola registros de acceso con un QueueHandler y los escribe en un archivo
+    rotado por tamaño desde un hilo de fondo. Registrar en la petición cuesta
+    microsegundos: armar el LogRecord y un put_nowait a una cola acotada; el
+    JSON y la escritura a disco ocurren en el hilo de escritura, por lotes.
+
+    - `path` admite '{pid}' para que cada worker tenga su archivo (la rotación
+      de RotatingFileHandler no es segura entre procesos); '-' escribe a stdout.
+    - `sample_rate` muestrea las peticiones exitosas y rápidas; los errores
+      (status >= 500) y las peticiones de al menos `slow_ms` siempre se registran.
+    """
+
+    LOGGER_NAME = 'weather_alerts.access'
+    BATCH_SIZE = 256
+
+    def __init__(
+        self,
+        path: str = 'logs/access-{pid}.log',
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        sample_rate: float = 1.0,
+        slow_ms: float = 1000.0,
+        queue_size: int = 10000
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.queue_size = queue_size
+        self._queue = None
+        self._handler = None
+        self._target = None
+        self._thread = None
+
+        metrics.register_gauge('access_log.queue_depth', lambda: self._queue.qsize() if self._queue else 0)
+
+    def start(self) -> 'AccessLogger':
+        """Abre el destino (de forma diferida) e inicia el hilo de escritura"""
+        if self._thread is not None:
+            return self
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._handler = _DroppingQueueHandler(self._queue)
+        self._target = self._create_target()
+        self._thread = threading.Thread(target=self._run, name='access-log', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Escribe lo pendiente, detiene el hilo y cierra el archivo"""
+        if self._thread is None:
+            return
+        self._handler = None
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        self._target.close()
+
+    def reset_after_fork(self):
+        """El hilo no sobrevive al fork y '{pid}' cambia: se abre el archivo del worker"""
+        if self._thread is None:
+            return
+        self._thread = None
+        self.start()
+
+    def should_log(self, status: int, duration_ms: float) -> bool:
+        """Decide si la petición se registra según el muestreo"""
+        if status >= 500 or duration_ms >= self.slow_ms:
+            return True
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def log(self, entry: dict):
+        """Encola un registro de acceso ya decidido; nunca bloquea"""
+        handler = self._handler
+        if handler is None:
+            return
+        handler.handle(logging.LogRecord(self.LOGGER_NAME, logging.INFO, '', 0, entry, None, None))
+
+    def memory_usage(self) -> int:
+        """Bytes aproximados de los registros encolados que aún no se escriben"""
+        pending = self._queue
+        if pending is None:
+            return 0
+        with pending.mutex:
+            sample = [record for record in islice(pending.queue, 32) if record is not _STOP]
+            count = len(pending.queue)
+        return estimate_size(pending.queue, sample, count)
+
+    def _run(self):
+        # Escribe por lotes: un write y un flush por lote, no por registro, para
+        # que el hilo compita lo menos posible por el GIL con las peticiones
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = batch[-1] is _STOP
+            if stopping:
+                batch.pop()
+            if batch:
+                try:
+                    self._write(batch)
+                except Exception:
+                    logger.exception("No se pudo escribir el log de acceso")
+            if stopping:
+                return
+
+    def _write(self, records: list):
+        target = self._target
+        lines = [target.format(record) + '\n' for record in records]
+        if not isinstance(target, RotatingFileHandler) or not target.maxBytes:
+            self._flush(target, lines)
+            return
+        # Rota en el límite de la línea que haría pasar el archivo de maxBytes
+        if target.stream is None:
+            target.stream = target._open()
+        size, pending = target.stream.tell(), []
+        for line in lines:
+            length = len(line.encode('utf-8'))
+            if size and size + length > target.maxBytes:
+                self._flush(target, pending)
+                target.doRollover()
+                if target.stream is None:
+                    target.stream = target._open()
+                size, pending = 0, []
+            pending.append(line)
+            size += length
+        self._flush(target, pending)
+
+    @staticmethod
+    def _flush(target: logging.StreamHandler, lines: list):
+        if lines:
+            target.stream.write(''.join(lines))
+            target.stream.flush()
+
+    def _create_target(self) -> logging.Handler:
+        if self.path == '-':
+            target = logging.StreamHandler(sys.stdout)
+        else:
+            path = self.path.format(pid=os.getpid())
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            target = RotatingFileHandler(
+                path, maxBytes=self.max_bytes, backupCount=self.backup_count, encoding='utf-8', delay=True
+            )
+        target.setFormatter(JsonFormatter())
+        return target
@@ -0,0 +1,314 @@
+"""
+Memory Monitor - Capa de Infraestructura
+Muestreo del RSS, diferencias de tracemalloc por módulo y contabilidad del
+tamaño de las cachés, pools y buffers del proceso, con presupuestos que
+disparan advertencias y desalojo
+"""
+import gc
+import logging
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+from infrastructure.monitoring.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PROJECT_PACKAGES = ('domain', 'application', 'infrastructure', 'presentation', 'benchmarks')
+
+
+def deep_sizeof(obj, max_depth: int = 6) -> int:
+    """
+    Bytes aproximados de un objeto y lo que referencia (contenedores, atributos
+    de instancias y dataclasses). Cada objeto se cuenta una sola vez; no sigue
+    módulos, clases ni funciones.
+    """
+    seen = set()
+    total = 0
+    stack = [(obj, 0)]
+    while stack:
+        current, depth = stack.pop()
+        if id(current) in seen or isinstance(current, (type, type(sys), type(deep_sizeof))):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current, 0)
+        if depth >= max_depth:
+            continue
+        if isinstance(current, dict):
+            children = [*current.keys(), *current.values()]
+        elif isinstance(current, (list, tuple, set, frozenset, deque)):
+            children = list(current)
+        elif hasattr(current, '__dict__'):
+            children = [vars(current)]
+        elif hasattr(current, '__slots__'):
+            children = [getattr(current, slot) for slot in current.__slots__ if hasattr(current, slot)]
+        else:
+            children = []
+        stack.extend((child, depth + 1) for child in children)
+    return total
+
+
+def estimate_size(container, entries: Iterable, count: int, sample: int = 32) -> int:
+    """
+    Bytes aproximados de un contenedor grande: su tamaño propio más el tamaño
+    medio de hasta `sample` entradas multiplicado por `count`
+    """
+    sizes = []
+    for entry in entries:
+        sizes.append(deep_sizeof(entry))
+        if len(sizes) >= sample:
+            break
+    average = sum(sizes) / len(sizes) if sizes else 0
+    return sys.getsizeof(container) + int(average * count)
+
+
+def read_rss() -> int:
+    """RSS actual del proceso en bytes (pico de RSS si /proc no está disponible)"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def module_group(filename: str) -> str:
+    """Agrupa un archivo por paquete: capa del proyecto, librería (flask, peewee...) o stdlib"""
+    if filename.startswith('<'):
+        return 'other'
+    path = os.path.abspath(filename)
+    if path.startswith(PROJECT_ROOT + os.sep):
+        top = os.path.relpath(path, PROJECT_ROOT).split(os.sep)[0]
+        if top in PROJECT_PACKAGES:
+            return top
+        if 'site-packages' not in path:
+            return 'app'
+    for marker in ('site-packages', 'dist-packages'):
+        if marker in path:
+            package = path.split(marker + os.sep, 1)[1].split(os.sep)[0]
+            return package.split('.')[0].split('-')[0].lower().lstrip('_')
+    return 'stdlib' if path.startswith(sys.prefix) or path.startswith(sys.base_prefix) else 'other'
+
+
+@dataclass
+class _Component:
+    """Caché, pool o buffer registrado y su presupuesto opcional"""
+
+    component: object
+    budget_bytes: Optional[int] = None
+    last_bytes: int = 0
+    evictions: int = 0
+
+
+class MemoryMonitor:
+    """
+    Cada `sample_seconds` toma el RSS (se guardan las últimas `history_size`
+    muestras) y mide los componentes registrados. Un componente expone
+    `memory_usage() -> int` (bytes aproximados) y, si puede liberar memoria,
+    `shrink(max_bytes) -> int` (entradas desalojadas).
+
+    - Si un componente supera su presupuesto, se registra una advertencia y se
+      le pide reducirse hasta el presupuesto.
+    - Si el RSS supera `rss_budget_bytes`, se advierte y se pide a todos los
+      componentes que puedan reducirse que liberen la mitad de lo que ocupan.
+
+    tracemalloc es opcional por su costo: con `start_tracing` se toma una línea
+    base y `tracemalloc_diff` reporta el crecimiento agrupado por módulo.
+    """
+
+    def __init__(
+        self,
+        sample_seconds: float = 30.0,
+        history_size: int = 120,
+        rss_budget_bytes: int = 0,
+        tracemalloc_frames: int = 1,
+        clock=time.time
+    ):
+        self.sample_seconds = sample_seconds
+        self.rss_budget_bytes = rss_budget_bytes
+        self.tracemalloc_frames = tracemalloc_frames
+        self._clock = clock
+        self._components: Dict[str, _Component] = {}
+        self._history = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+        self._baseline = None
+        self._stop = threading.Event()
+        self._thread = None
+
+        metrics.register_gauge('memory.rss_bytes', lambda: self._history[-1][1] if self._history else read_rss())
+
+    def register(self, name: str, component, budget_bytes: Optional[int] = None):
+        """Registra un componente a medir; `budget_bytes` activa el desalojo"""
+        with self._lock:
+            self._components[name] = _Component(component, budget_bytes or None)
+
+    def sample(self) -> dict:
+        """Toma una muestra, aplica los presupuestos y retorna el uso por componente"""
+        rss = read_rss()
+        with self._lock:
+            self._history.append((self._clock(), rss))
+            components = list(self._components.items())
+
+        usage = {}
+        for name, entry in components:
+            entry.last_bytes = self._measure(name, entry)
+            if entry.budget_bytes and entry.last_bytes > entry.budget_bytes:
+                logger.warning(
+                    "Memoria: %s ocupa ~%d bytes, sobre su presupuesto de %d; se desaloja",
+                    name, entry.last_bytes, entry.budget_bytes
+                )
+                metrics.increment(f'memory.budget_exceeded.{name}')
+                entry.last_bytes = self._shrink(name, entry, entry.budget_bytes)
+            usage[name] = entry.last_bytes
+
+        if self.rss_budget_bytes and rss > self.rss_budget_bytes:
+            logger.warning("Memoria: RSS de %d bytes sobre el presupuesto de %d", rss, self.rss_budget_bytes)
+            metrics.increment('memory.budget_exceeded.rss')
+            for name, entry in components:
+                if hasattr(entry.component, 'shrink') and entry.last_bytes:
+                    usage[name] = entry.last_bytes = self._shrink(name, entry, entry.last_bytes // 2)
+            gc.collect()
+        return usage
+
+    def components(self) -> dict:
+        """Tamaño aproximado, presupuesto y desalojos de cada componente registrado"""
+        with self._lock:
+            components = list(self._components.items())
+        report = {}
+        for name, entry in components:
+            component = entry.component
+            report[name] = {
+                'bytes': self._measure(name, entry),
+                'entries': len(component) if hasattr(component, '__len__') else None,
+                'budget_bytes': entry.budget_bytes,
+                'evictions': entry.evictions
+            }
+        return report
+
+    def rss_history(self) -> list:
+        """Muestras de RSS como (timestamp, bytes), de la más vieja a la más reciente"""
+        with self._lock:
+            return [{'at': round(at, 3), 'rss_bytes': rss} for at, rss in self._history]
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start_tracing(self):
+        """Activa tracemalloc (si hace falta) y toma una nueva línea base"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.tracemalloc_frames)
+        self._baseline = tracemalloc.take_snapshot()
+
+    def stop_tracing(self):
+        """Desactiva tracemalloc y descarta la línea base"""
+        self._baseline = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def tracemalloc_diff(self, top: int = 10) -> Optional[dict]:
+        """
+        Crecimiento de memoria por módulo desde la línea base
+
+        Returns:
+            dict: Totales y los `top` módulos y archivos que más crecieron, o
+                  None si tracemalloc no está activo
+        """
+        if not tracemalloc.is_tracing() or self._baseline is None:
+            return None
+        current = tracemalloc.take_snapshot()
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        stats = current.filter_traces(ignore).compare_to(self._baseline.filter_traces(ignore), 'filename')
+
+        groups = {}
+        for stat in stats:
+            group = groups.setdefault(module_group(stat.traceback[0].filename), {
+                'size_bytes': 0, 'size_diff_bytes': 0, 'count_diff': 0
+            })
+            group['size_bytes'] += stat.size
+            group['size_diff_bytes'] += stat.size_diff
+            group['count_diff'] += stat.count_diff
+
+        by_module = sorted(groups.items(), key=lambda item: item[1]['size_diff_bytes'], reverse=True)
+        traced, peak = tracemalloc.get_traced_memory()
+        return {
+            'traced_bytes': traced,
+            'peak_traced_bytes': peak,
+            'by_module': [{'module': name, **values} for name, values in by_module[:top]],
+            'top_files': [
+                {
+                    'file': os.path.relpath(stat.traceback[0].filename, PROJECT_ROOT)
+                    if stat.traceback[0].filename.startswith(PROJECT_ROOT) else stat.traceback[0].filename,
+                    'size_diff_bytes': stat.size_diff,
+                    'count_diff': stat.count_diff
+                }
+                for stat in stats[:top]
+            ]
+        }
+
+    def report(self, top: int = 10) -> dict:
+        """Estado completo para el endpoint de administración"""
+        return {
+            'rss_bytes': read_rss(),
+            'rss_budget_bytes': self.rss_budget_bytes or None,
+            'rss_history': self.rss_history(),
+            'components': self.components(),
+            'tracemalloc': self.tracemalloc_diff(top)
+        }
+
+    def start(self) -> 'MemoryMonitor':
+        """Inicia el hilo de muestreo"""
+        if self._thread is None and self.sample_seconds > 0:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='memory-monitor', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Detiene el hilo de muestreo"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def reset_after_fork(self):
+        """El hilo no sobrevive al fork y el historial de RSS es del padre"""
+        self._lock = threading.Lock()
+        self._history.clear()
+        if self._thread is not None:
+            self._thread = None
+            self.start()
+
+    def _run(self):
+        self.sample()
+        while not self._stop.wait(self.sample_seconds):
+            try:
+                self.sample()
+            except Exception:
+                logger.exception("Error al muestrear la memoria")
+
+    def _measure(self, name: str, entry: _Component) -> int:
+        try:
+            return int(entry.component.memory_usage())
+        except Exception:
+            logger.exception("No se pudo medir la memoria de %s", name)
+            return 0
+
+    def _shrink(self, name: str, entry: _Component, max_bytes: int) -> int:
+        if not hasattr(entry.component, 'shrink'):
+            return entry.last_bytes
+        try:
+            evicted = entry.component.shrink(max_bytes)
+        except Exception:
+            logger.exception("No se pudo reducir %s", name)
+            return entry.last_bytes
+        entry.evictions += evicted
+        metrics.increment(f'memory.evicted.{name}', evicted)
+        return self._measure(name, entry)
@@ -0,0 +1,60 @@
+"""
+Metrics - Capa de Infraestructura
+Registro en memoria de contadores y gauges expuestos por /metrics
+"""
+import threading
+from typing import Callable, Dict
+
+
+class MetricsRegistry:
+    """Registro thread-safe de contadores, gauges fijos y gauges calculados"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._callbacks: Dict[str, Callable[[], object]] = {}
+
+    def increment(self, name: str, value: float = 1):
+        """Incrementa un contador"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value):
+        """Fija el valor actual de un gauge"""
+        with self._lock:
+            self._gauges[name] = value
+
+    def register_gauge(self, name: str, callback: Callable[[], object]):
+        """Registra un gauge cuyo valor se calcula al tomar el snapshot"""
+        with self._lock:
+            self._callbacks[name] = callback
+
+    def snapshot(self) -> dict:
+        """Retorna el estado actual de todas las métricas"""
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            callbacks = list(self._callbacks.items())
+
+        for name, callback in callbacks:
+            try:
+                gauges[name] = callback()
+            except Exception as e:
+                gauges[name] = f"error: {e}"
+
+        return {
+            'counters': dict(sorted(counters.items())),
+            'gauges': dict(sorted(gauges.items()))
+        }
+
+    def reset(self):
+        """Elimina todas las métricas registradas"""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._callbacks.clear()
+
+
+# Instancia global del registro de métricas
+metrics = MetricsRegistry()
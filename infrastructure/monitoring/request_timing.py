@@ -0,0 +1,64 @@
+"""
+Request Timing - Capa de Infraestructura
+Acumula por petición el tiempo gastado en cada etapa (clima, email, base de
+datos) mediante una variable de contexto, sin pasar nada por los parámetros
+"""
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+
+class RequestTimings:
+    """Segundos y llamadas por etapa de una petición"""
+
+    __slots__ = ('seconds', 'calls', 'active')
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.active = set()
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar('request_timings', default=None)
+
+
+def begin():
+    """Empieza a medir la petición en curso; retorna el token para `end`"""
+    return _current.set(RequestTimings())
+
+
+def end(token):
+    """Deja de medir; retorna lo acumulado"""
+    timings = _current.get()
+    _current.reset(token)
+    return timings
+
+
+def current() -> Optional[RequestTimings]:
+    """Mediciones de la petición en curso, o None fuera de una petición"""
+    return _current.get()
+
+
+@contextmanager
+def stage(name: str):
+    """
+    Mide el bloque como parte de la etapa `name`. Las etapas anidadas del mismo
+    nombre (p. ej. los decoradores del servicio del clima, o las solicitudes de
+    cobertura que corren en otros hilos con una copia del contexto) solo
+    cuentan una vez: la medición exterior ya incluye su tiempo.
+    """
+    timings = _current.get()
+    if timings is None or name in timings.active:
+        yield
+        return
+
+    timings.active.add(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.active.discard(name)
+        timings.seconds[name] += time.perf_counter() - started
+        timings.calls[name] += 1
@@ -0,0 +1,84 @@
+"""
+Alert Stats Repository Implementation - Capa de Infraestructura
+Lectura de las tablas de agregados mantenidas por triggers
+"""
+from collections import Counter
+from datetime import date, datetime
+from typing import List, Optional
+from domain.entities.alert_stats import AlertCount, RecipientAlertStats
+from domain.entities.geo_cell import GeoCell
+from domain.repositories.alert_stats_repository import AlertStatsRepository
+from domain.repositories.notification_archive_repository import NotificationArchiveRepository
+from infrastructure.database.connection import db_connection
+from infrastructure.database.rollups import DAILY_TABLE, EMAIL_TABLE, rebuild_rollups
+
+
+class AlertStatsRepositoryImpl(AlertStatsRepository):
+    """
+    Implementación del repositorio de agregados sobre SQLite. Con las
+    notificaciones repartidas en shards, cada shard mantiene los agregados de
+    sus filas (`databases`) y aquí se suman.
+    """
+    
+    def __init__(
+        self,
+        cell_size: float,
+        archive_repository: Optional[NotificationArchiveRepository] = None,
+        databases: Optional[list] = None
+    ):
+        self.cell_size = cell_size
+        self.archive_repository = archive_repository
+        self.databases = databases or [db_connection.db]
+    
+    def find_daily_counts(
+        self,
+        start_day: date,
+        end_day: date,
+        code: Optional[int] = None,
+        cell: Optional[GeoCell] = None
+    ) -> List[AlertCount]:
+        """Obtiene los conteos por (día, código, celda) usando la clave primaria"""
+        sql = f'SELECT day, code, cell_row, cell_col, count FROM {DAILY_TABLE} WHERE day BETWEEN ? AND ?'
+        params = [start_day.isoformat(), end_day.isoformat()]
+        if code is not None:
+            sql += ' AND code = ?'
+            params.append(code)
+        if cell is not None:
+            sql += ' AND cell_row = ? AND cell_col = ?'
+            params.extend([cell.row, cell.col])
+        
+        counts = Counter()
+        for db in self.databases:
+            for day, code, row, col, count in db.execute_sql(sql, params).fetchall():
+                counts[(day, code, row, col)] += count
+        return [
+            AlertCount(day=day, code=code, cell=GeoCell(row=row, col=col, size=self.cell_size), count=count)
+            for (day, code, row, col), count in counts.items()
+        ]
+    
+    def find_recipient_stats(self, email: str) -> Optional[RecipientAlertStats]:
+        """Obtiene el resumen de un destinatario (las archivadas pueden estar en otro shard)"""
+        rows = [
+            row for db in self.databases
+            for row in db.execute_sql(
+                f'SELECT count, first_sent_at, last_sent_at FROM {EMAIL_TABLE} WHERE email = ?',
+                (email,)
+            ).fetchall()
+        ]
+        if not rows:
+            return None
+        
+        return RecipientAlertStats(
+            email=email,
+            count=sum(row[0] for row in rows),
+            first_sent_at=datetime.fromisoformat(min(row[1] for row in rows)),
+            last_sent_at=datetime.fromisoformat(max(row[2] for row in rows))
+        )
+    
+    def rebuild(self) -> int:
+        """Regenera los agregados desde la tabla notifications y el archivo (que suma en la primera base)"""
+        archived = self.archive_repository.scan() if self.archive_repository else ()
+        total = 0
+        for index, db in enumerate(self.databases):
+            total += rebuild_rollups(db, self.cell_size, archived if index == 0 else ())
+        return total
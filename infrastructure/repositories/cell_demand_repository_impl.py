@@ -0,0 +1,120 @@
+"""
+Cell Demand Repository Implementation - Capa de Infraestructura
+Demanda por celda acumulada en memoria y volcada a SQLite por lotes
+"""
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+from domain.repositories.cell_demand_repository import CellDemandRepository
+from infrastructure.database.cell_demand import DEMAND_TABLE, PREFETCH_RUNS_TABLE
+from infrastructure.database.connection import db_connection
+from infrastructure.database.rollups import cell_expressions
+from infrastructure.monitoring.memory_monitor import estimate_size
+from infrastructure.runtime.lifecycle import register_after_fork, register_shutdown
+
+
+class CellDemandRepositoryImpl(CellDemandRepository):
+    """
+    `record` solo incrementa un contador en memoria (está en la ruta de cada
+    consulta) y como mucho cada `flush_interval` segundos lo vuelca con UPSERT.
+    La demanda se combina con el historial de notificaciones, que cuenta como
+    demanda de su celda. Con las notificaciones repartidas en shards, el
+    historial se lee de cada base de `databases` y se suma.
+    """
+    
+    def __init__(
+        self,
+        cell_size: float,
+        flush_interval: float = 60.0,
+        clock=time.monotonic,
+        databases: Optional[list] = None
+    ):
+        self.cell_size = cell_size
+        self.databases = databases or [db_connection.db]
+        self.flush_interval = flush_interval
+        self._clock = clock
+        self._pending = Counter()
+        self._lock = threading.Lock()
+        self._last_flush = clock()
+        register_after_fork(self._reset_buffer)
+        register_shutdown(self.flush)
+    
+    def record(self, cell_key: str, at: datetime):
+        with self._lock:
+            self._pending[(at.strftime('%Y-%m-%d'), at.hour, cell_key)] += 1
+            due = self._clock() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+    
+    def flush(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._last_flush = self._clock()
+        if not pending:
+            return 0
+        
+        db = db_connection.db
+        with db.atomic():
+            db.cursor().executemany(
+                f"""INSERT INTO {DEMAND_TABLE} (day, hour, cell_key, count) VALUES (?, ?, ?, ?)
+                    ON CONFLICT (hour, day, cell_key) DO UPDATE SET count = count + excluded.count""",
+                [(day, hour, cell_key, count) for (day, hour, cell_key), count in pending.items()]
+            )
+        return len(pending)
+    
+    def hottest_cells(self, hour: int, since: date, limit: int) -> List[Tuple[str, int]]:
+        demand = Counter(dict(db_connection.db.execute_sql(
+            f"""SELECT cell_key, SUM(count) FROM {DEMAND_TABLE} WHERE hour = ? AND day >= ?
+                GROUP BY cell_key""",
+            (hour, since.isoformat())
+        ).fetchall()))
+        
+        row, col = cell_expressions(self.cell_size, '')
+        history = f"""SELECT '{self.cell_size:g}:' || {row} || ':' || {col} AS cell_key, COUNT(*)
+                      FROM notifications
+                      WHERE sent_at >= ? AND CAST(strftime('%H', sent_at) AS INTEGER) = ?
+                      GROUP BY cell_key"""
+        for db in self.databases:
+            for cell_key, count in db.execute_sql(history, (since.isoformat(), hour)).fetchall():
+                demand[cell_key] += count
+        
+        return sorted(demand.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    
+    def demand_by_cell(self, day: date, hour: int) -> Dict[str, int]:
+        rows = db_connection.db.execute_sql(
+            f'SELECT cell_key, count FROM {DEMAND_TABLE} WHERE hour = ? AND day = ?',
+            (hour, day.isoformat())
+        ).fetchall()
+        return dict(rows)
+    
+    def claim_run(self, run_key: str) -> bool:
+        cursor = db_connection.db.execute_sql(
+            f'INSERT OR IGNORE INTO {PREFETCH_RUNS_TABLE} (run_key, claimed_at) VALUES (?, ?)',
+            (run_key, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        )
+        return cursor.rowcount == 1
+    
+    def purge_before(self, day: date) -> int:
+        db = db_connection.db
+        with db.atomic():
+            cursor = db.execute_sql(f'DELETE FROM {DEMAND_TABLE} WHERE day < ?', (day.isoformat(),))
+            db.execute_sql(f'DELETE FROM {PREFETCH_RUNS_TABLE} WHERE run_key < ?', (day.isoformat(),))
+        return cursor.rowcount
+    
+    def memory_usage(self) -> int:
+        """Bytes aproximados del buffer de demanda aún no volcado"""
+        with self._lock:
+            sample = list(self._pending.items())[:32]
+            count = len(self._pending)
+        return estimate_size(self._pending, sample, count)
+    
+    def shrink(self, max_bytes: int) -> int:
+        """Bajo presión de memoria, vuelca el buffer antes de tiempo"""
+        return self.flush()
+    
+    def _reset_buffer(self):
+        """Lo acumulado antes del fork pertenece al padre"""
+        self._lock = threading.Lock()
+        self._pending = Counter()
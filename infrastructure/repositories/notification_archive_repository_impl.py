@@ -0,0 +1,106 @@
+"""
+Notification Archive Repository Implementation - Capa de Infraestructura
+Archivo de notificaciones en ficheros mensuales NDJSON comprimidos con gzip
+"""
+import gzip
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Iterator, List, Optional
+from domain.entities.notification import Notification
+from domain.repositories.notification_archive_repository import NotificationArchiveRepository
+
+
+class NotificationArchiveRepositoryImpl(NotificationArchiveRepository):
+    """
+    Un fichero `notifications-YYYY-MM.ndjson.gz` por mes. Cada `append` escribe
+    un miembro gzip completo al final del fichero (gzip admite miembros
+    concatenados), así que nunca se reescribe lo ya archivado. Si un archivado se
+    interrumpe después de escribir y antes de borrar de la tabla, la siguiente
+    ejecución vuelve a escribir esas filas: la lectura descarta ids repetidos.
+    """
+    
+    FILE_PATTERN = re.compile(r'^notifications-(\d{4}-\d{2})\.ndjson\.gz$')
+    DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+    
+    def __init__(self, directory: str, compresslevel: int = 6):
+        self.directory = directory
+        self.compresslevel = compresslevel
+        self._lock = threading.Lock()
+    
+    def append(self, month: str, notifications: List[Notification]):
+        """Agrega un miembro gzip con las notificaciones al fichero del mes"""
+        if not notifications:
+            return
+        
+        lines = ''.join(json.dumps(self._to_record(n), ensure_ascii=False) + '\n' for n in notifications)
+        member = gzip.compress(lines.encode('utf-8'), compresslevel=self.compresslevel)
+        
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock, open(self._path(month), 'ab') as archive_file:
+            archive_file.write(member)
+            archive_file.flush()
+            os.fsync(archive_file.fileno())
+    
+    def months(self) -> List[str]:
+        """Meses con fichero de archivo"""
+        if not os.path.isdir(self.directory):
+            return []
+        
+        found = (self.FILE_PATTERN.match(name) for name in os.listdir(self.directory))
+        return sorted(match.group(1) for match in found if match)
+    
+    def find_by_month(self, month: str, email: Optional[str] = None) -> List[Notification]:
+        """Lee el fichero del mes, de la notificación más reciente a la más antigua"""
+        path = self._path(month)
+        if not os.path.exists(path):
+            return []
+        
+        found = {}
+        for notification in self._read(path):
+            if email is None or notification.email == email:
+                found[notification.id] = notification
+        
+        return sorted(found.values(), key=lambda n: n.sent_at, reverse=True)
+    
+    def scan(self) -> Iterator[Notification]:
+        """Recorre todos los meses archivados sin ids repetidos"""
+        for month in self.months():
+            seen = set()
+            for notification in self._read(self._path(month)):
+                if notification.id not in seen:
+                    seen.add(notification.id)
+                    yield notification
+    
+    def _path(self, month: str) -> str:
+        return os.path.join(self.directory, f'notifications-{month}.ndjson.gz')
+    
+    def _read(self, path: str) -> Iterator[Notification]:
+        with gzip.open(path, 'rt', encoding='utf-8') as archive_file:
+            for line in archive_file:
+                if line.strip():
+                    yield self._to_entity(json.loads(line))
+    
+    def _to_record(self, notification: Notification) -> dict:
+        return {
+            'id': notification.id,
+            'email': notification.email,
+            'latitude': notification.latitude,
+            'longitude': notification.longitude,
+            'condition': notification.condition,
+            'code': notification.code,
+            'sent_at': notification.sent_at.strftime(self.DATE_FORMAT)
+        }
+    
+    def _to_entity(self, record: dict) -> Notification:
+        return Notification(
+            id=record['id'],
+            email=record['email'],
+            latitude=record['latitude'],
+            longitude=record['longitude'],
+            condition=record['condition'],
+            code=record['code'],
+            sent_at=datetime.strptime(record['sent_at'], self.DATE_FORMAT)
+        )
@@ -2,49 +2,150 @@
 Notification Repository Implementation - Capa de Infraestructura
 Implementación concreta del repositorio de notificaciones
 """
-from typing import List
+from datetime import datetime
+from typing import List, Optional
+from peewee import fn
 from domain.repositories.notification_repository import NotificationRepository
 from domain.entities.notification import Notification
+from domain.services.geo_distance import bounding_boxes, haversine_km
 from infrastructure.database.models.notification_model import NotificationModel
+from infrastructure.database.spatial_index import SPATIAL_INDEX_TABLE
 
 
 class NotificationRepositoryImpl(NotificationRepository):
-    """Implementación del repositorio de notificaciones usando Peewee"""
+    """
+    Implementación del repositorio de notificaciones usando Peewee. Con un
+    broker, cada notificación guardada se publica a los streams en vivo; con
+    un filtro de destinatarios, su email se agrega al filtro.
+    `model` permite apuntar a otra base con la misma tabla (ver los shards).
+    """
+    
+    def __init__(self, broker=None, model=NotificationModel, recipient_filter=None):
+        self.broker = broker
+        self.model = model
+        self.recipient_filter = recipient_filter
     
     def save(self, notification: Notification) -> Notification:
-        """Guarda una notificación en la base de datos"""
-        model = NotificationModel.create(
-            email=notification.email,
-            latitude=notification.latitude,
-            longitude=notification.longitude,
-            condition=notification.condition,
-            code=notification.code,
-            sent_at=notification.sent_at
-        )
+        """
+        Guarda una notificación en la base de datos y la publica si hay broker.
+        La espera por el lock de escritura se acota al plazo de la solicitud
+        """
+        with self.model._meta.database.deadline_bounded():
+            model = self.model.create(
+                email=notification.email,
+                latitude=notification.latitude,
+                longitude=notification.longitude,
+                condition=notification.condition,
+                code=notification.code,
+                sent_at=notification.sent_at
+            )
         
-        notification.id = model.id
+        notification.id = self._global_id(model.id)
+        if self.recipient_filter is not None:
+            self.recipient_filter.add(notification.email)
+        if self.broker is not None:
+            self.broker.publish(notification)
         return notification
     
     def find_by_email(self, email: str) -> List[Notification]:
         """Encuentra todas las notificaciones para un email"""
-        models = NotificationModel.select().where(
-            NotificationModel.email == email
-        ).order_by(NotificationModel.sent_at.desc())
+        models = self.model.select().where(
+            self.model.email == email
+        ).order_by(self.model.sent_at.desc())
         
         return [self._to_entity(model) for model in models]
     
     def find_all(self) -> List[Notification]:
         """Obtiene todas las notificaciones"""
-        models = NotificationModel.select().order_by(
-            NotificationModel.sent_at.desc()
+        models = self.model.select().order_by(
+            self.model.sent_at.desc()
         )
         
         return [self._to_entity(model) for model in models]
     
+    def find_near(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        since: Optional[datetime] = None
+    ) -> List[Notification]:
+        """
+        Encuentra las notificaciones dentro de un radio usando el índice R*Tree:
+        el índice filtra por caja envolvente y luego se aplica la distancia exacta
+        """
+        since_value = since.strftime('%Y-%m-%d %H:%M:%S') if since else ''
+        found = {}
+        for min_lat, max_lat, min_lon, max_lon in bounding_boxes(latitude, longitude, radius_km):
+            models = self.model.raw(
+                f"""SELECT n.* FROM {SPATIAL_INDEX_TABLE} r
+                    JOIN notifications n ON n.id = r.id
+                    WHERE r.max_lat >= ? AND r.min_lat <= ?
+                      AND r.max_lon >= ? AND r.min_lon <= ?
+                      AND n.sent_at >= ?""",
+                min_lat, max_lat, min_lon, max_lon, since_value
+            )
+            for model in models:
+                if haversine_km(latitude, longitude, model.latitude, model.longitude) <= radius_km:
+                    found[model.id] = self._to_entity(model)
+        
+        return sorted(found.values(), key=lambda n: n.sent_at, reverse=True)
+    
+    def find_sent_before(self, cutoff: datetime, limit: int) -> List[Notification]:
+        """Obtiene las notificaciones más antiguas (usa el índice sobre sent_at)"""
+        models = self.model.select().where(
+            self.model.sent_at < cutoff
+        ).order_by(self.model.sent_at, self.model.id).limit(limit)
+        
+        return [self._to_entity(model) for model in models]
+    
+    def find_by_email_between(self, email: str, start: datetime, end: datetime) -> List[Notification]:
+        """Encuentra las notificaciones de un email enviadas en [start, end)"""
+        models = self.model.select().where(
+            (self.model.email == email) &
+            (self.model.sent_at >= start) &
+            (self.model.sent_at < end)
+        ).order_by(self.model.sent_at.desc())
+        
+        return [self._to_entity(model) for model in models]
+    
+    def find_after(self, after_id: int, limit: int, email: Optional[str] = None) -> List[Notification]:
+        """Notificaciones con id mayor a after_id, en orden de id (usa la clave primaria)"""
+        query = self.model.select().where(self.model.id > self._local_after(after_id))
+        if email is not None:
+            query = query.where(self.model.email == email)
+        models = query.order_by(self.model.id).limit(limit)
+        
+        return [self._to_entity(model) for model in models]
+    
+    def last_id(self) -> int:
+        """Id más alto de la tabla (0 si está vacía)"""
+        last = self.model.select(fn.MAX(self.model.id)).scalar()
+        return self._global_id(last) if last else 0
+    
+    def delete_by_ids(self, ids: List[int]) -> int:
+        """Elimina notificaciones por id (los triggers limpian el índice espacial)"""
+        local_ids = [local for local in map(self._local_id, ids) if local is not None]
+        if not local_ids:
+            return 0
+        return self.model.delete().where(self.model.id.in_(local_ids)).execute()
+    
+    def _global_id(self, local_id: int) -> int:
+        """Id expuesto de una fila de esta tabla"""
+        return local_id
+    
+    def _local_id(self, global_id: int) -> Optional[int]:
+        """Id de la fila en esta tabla, o None si el id no le pertenece"""
+        return global_id
+    
+    def _local_after(self, after_id: int) -> int:
+        """Mayor id local cuyo id expuesto no supera after_id"""
+        return after_id
+    
     def _to_entity(self, model: NotificationModel) -> Notification:
         """Convierte un modelo de base de datos a una entidad"""
         return Notification(
-            id=model.id,
+            id=self._global_id(model.id),
             email=model.email,
             latitude=model.latitude,
             longitude=model.longitude,
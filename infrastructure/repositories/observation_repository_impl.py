@@ -0,0 +1,177 @@
+"""
+Observation Repository Implementation - Capa de Infraestructura
+Historial de pronósticos por celda en buckets de tiempo, acumulado en
+memoria y agregado a SQLite por lotes
+"""
+import threading
+import time
+from array import array
+from collections import defaultdict
+from datetime import datetime
+from domain.entities.forecast import Forecast
+from domain.entities.observation_series import ObservationSeries
+from domain.repositories.observation_repository import ObservationRepository
+from infrastructure.database.connection import db_connection
+from infrastructure.database.observations import (
+    OBSERVATIONS_TABLE, decode_records, downsample_records, encode_observation
+)
+from infrastructure.monitoring.memory_monitor import estimate_size
+from infrastructure.monitoring.metrics import metrics
+from infrastructure.runtime.lifecycle import register_after_fork, register_shutdown
+
+
+class ObservationRepositoryImpl(ObservationRepository):
+    """
+    Cada (celda, bucket de `bucket_seconds`) es una fila con un blob de registros
+    de ancho fijo. `record` solo agrega bytes a un búfer en memoria; `flush`
+    concatena cada búfer al blob de su fila con un UPSERT, así una celda
+    consultada cada pocos minutos cuesta una escritura por lote y no una por
+    pronóstico. Lo que aún no se volcó no aparece en las consultas.
+
+    `downsample` reemplaza los buckets viejos por un punto por ventana y
+    `purge_before` borra buckets completos.
+    """
+
+    def __init__(
+        self,
+        bucket_seconds: int = 86400,
+        flush_interval: float = 60.0,
+        max_pending: int = 5000,
+        batch_size: int = 500,
+        clock=time.monotonic
+    ):
+        self.bucket_seconds = bucket_seconds
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self._clock = clock
+        self._pending = defaultdict(bytearray)
+        self._pending_count = 0
+        self._lock = threading.Lock()
+        self._last_flush = clock()
+        register_after_fork(self._reset_buffer)
+        register_shutdown(self.flush)
+
+    def record(self, cell_key: str, forecast: Forecast, at: datetime):
+        timestamp = int(at.timestamp())
+        bucket = timestamp - timestamp % self.bucket_seconds
+        payload = encode_observation(timestamp - bucket, forecast)
+        with self._lock:
+            self._pending[(cell_key, bucket)] += payload
+            self._pending_count += 1
+            due = (
+                self._pending_count >= self.max_pending
+                or self._clock() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(bytearray)
+            count, self._pending_count = self._pending_count, 0
+            self._last_flush = self._clock()
+        if not pending:
+            return 0
+
+        db = db_connection.db
+        with db.atomic():
+            # || sobre blobs produce TEXT: el CAST conserva los bytes como BLOB
+            db.cursor().executemany(
+                f"""INSERT INTO {OBSERVATIONS_TABLE} (cell_key, bucket, resolution, payload) VALUES (?, ?, 0, ?)
+                    ON CONFLICT (cell_key, bucket, resolution)
+                    DO UPDATE SET payload = CAST(payload || excluded.payload AS BLOB)""",
+                [(cell_key, bucket, bytes(payload)) for (cell_key, bucket), payload in pending.items()]
+            )
+        metrics.increment('observations.flushed', count)
+        return count
+
+    def find_range(self, cell_key: str, start: datetime, end: datetime) -> ObservationSeries:
+        start_ts, end_ts = int(start.timestamp()), int(end.timestamp())
+        rows = db_connection.db.execute_sql(
+            f"""SELECT bucket, payload FROM {OBSERVATIONS_TABLE}
+                WHERE cell_key = ? AND bucket > ? AND bucket < ?""",
+            (cell_key, start_ts - self.bucket_seconds, end_ts)
+        ).fetchall()
+
+        points = []
+        for bucket, payload in rows:
+            for offset, *values in decode_records(payload):
+                timestamp = bucket + offset
+                if start_ts <= timestamp < end_ts:
+                    points.append((timestamp, *values))
+        points.sort(key=lambda point: point[0])
+
+        series = ObservationSeries(cell_key=cell_key)
+        if points:
+            timestamps, temperatures, winds, codes, samples, adverse, humidity = zip(*points)
+            series.timestamps = array('q', timestamps)
+            series.temperature_c = array('f', temperatures)
+            series.wind_kph = array('f', winds)
+            series.condition_code = array('H', codes)
+            series.samples = array('H', samples)
+            series.adverse = array('H', adverse)
+            series.humidity = array('b', humidity)
+        return series
+
+    def downsample(self, before: datetime, resolution_seconds: int) -> int:
+        if not (0 < resolution_seconds <= self.bucket_seconds):
+            raise ValueError(f"La resolución debe estar entre 1 y {self.bucket_seconds} segundos")
+
+        limit = int(before.timestamp()) - self.bucket_seconds
+        db = db_connection.db
+        total = 0
+        while True:
+            with db.atomic():
+                buckets = db.execute_sql(
+                    f"""SELECT DISTINCT cell_key, bucket FROM {OBSERVATIONS_TABLE}
+                        WHERE bucket <= ? AND resolution < ? LIMIT ?""",
+                    (limit, resolution_seconds, self.batch_size)
+                ).fetchall()
+                for cell_key, bucket in buckets:
+                    self._downsample_bucket(cell_key, bucket, resolution_seconds)
+            total += len(buckets)
+            if len(buckets) < self.batch_size:
+                return total
+
+    def purge_before(self, before: datetime) -> int:
+        cursor = db_connection.db.execute_sql(
+            f'DELETE FROM {OBSERVATIONS_TABLE} WHERE bucket <= ?',
+            (int(before.timestamp()) - self.bucket_seconds,)
+        )
+        return cursor.rowcount
+
+    def memory_usage(self) -> int:
+        """Bytes aproximados del búfer de observaciones aún no volcado"""
+        with self._lock:
+            sample = list(self._pending.items())[:32]
+            count = len(self._pending)
+        return estimate_size(self._pending, sample, count)
+
+    def shrink(self, max_bytes: int) -> int:
+        """Bajo presión de memoria, vuelca el búfer antes de tiempo"""
+        return self.flush()
+
+    def _downsample_bucket(self, cell_key: str, bucket: int, resolution: int):
+        """Funde en una fila las crudas y las ya reducidas del bucket (dentro de la transacción del lote)"""
+        db = db_connection.db
+        rows = db.execute_sql(
+            f"""SELECT payload FROM {OBSERVATIONS_TABLE}
+                WHERE cell_key = ? AND bucket = ? AND resolution <= ?""",
+            (cell_key, bucket, resolution)
+        ).fetchall()
+        records = [record for (payload,) in rows for record in decode_records(payload)]
+        db.execute_sql(
+            f'DELETE FROM {OBSERVATIONS_TABLE} WHERE cell_key = ? AND bucket = ? AND resolution <= ?',
+            (cell_key, bucket, resolution)
+        )
+        db.execute_sql(
+            f'INSERT INTO {OBSERVATIONS_TABLE} (cell_key, bucket, resolution, payload) VALUES (?, ?, ?, ?)',
+            (cell_key, bucket, resolution, downsample_records(records, resolution))
+        )
+
+    def _reset_buffer(self):
+        """Lo acumulado antes del fork pertenece al padre"""
+        self._lock = threading.Lock()
+        self._pending = defaultdict(bytearray)
+        self._pending_count = 0
@@ -0,0 +1,92 @@
+"""
+Prepared Notification Repository - Capa de Infraestructura
+Ruta rápida para las consultas calientes del repositorio de notificaciones:
+`save` y `find_by_email` van directo al módulo sqlite3, sin construir la
+consulta de Peewee ni hidratar modelos
+"""
+import threading
+from datetime import datetime
+from typing import List
+from domain.entities.notification import Notification
+from infrastructure.database.models.notification_model import NotificationModel
+from infrastructure.monitoring import request_timing
+from infrastructure.repositories.notification_repository_impl import NotificationRepositoryImpl
+
+
+class PreparedNotificationRepository(NotificationRepositoryImpl):
+    """
+    NotificationRepositoryImpl cuyas consultas calientes usan sentencias
+    preparadas de sqlite3 sobre la misma conexión de Peewee (la del hilo):
+
+    - El SQL es fijo, así que la caché de sentencias de la conexión
+      (`cached_statements`) prepara cada una una sola vez.
+    - Cada hilo reutiliza su cursor mientras no cambie la conexión
+      (reconexión, `configure` o fork).
+    - sent_at se escribe y se lee en el formato de Peewee
+      ('YYYY-MM-DD HH:MM:SS[.ffffff]') con isoformat/fromisoformat, sin
+      probar formatos con strptime.
+
+    El resto de las consultas, menos frecuentes, siguen en Peewee.
+    """
+
+    def __init__(self, broker=None, model=NotificationModel, recipient_filter=None):
+        super().__init__(broker=broker, model=model, recipient_filter=recipient_filter)
+        table = model._meta.table_name
+        self._insert_sql = (
+            f"INSERT INTO {table} (email, latitude, longitude, condition, code, sent_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)"
+        )
+        # Mismo orden que los campos de Notification: la fila se pasa tal cual
+        self._find_by_email_sql = (
+            f"SELECT email, latitude, longitude, condition, code, sent_at, id FROM {table} "
+            "WHERE email = ? ORDER BY sent_at DESC"
+        )
+        self._local = threading.local()
+
+    def save(self, notification: Notification) -> Notification:
+        """
+        Guarda una notificación y la publica si hay broker. La espera por el
+        lock de escritura se acota al plazo de la solicitud, como en Peewee
+        """
+        database = self.model._meta.database
+        with database.deadline_bounded():
+            cursor = self._cursor()
+            with request_timing.stage('db'):
+                cursor.execute(self._insert_sql, (
+                    notification.email,
+                    notification.latitude,
+                    notification.longitude,
+                    notification.condition,
+                    notification.code,
+                    notification.sent_at.isoformat(' ')
+                ))
+            local_id = cursor.lastrowid
+
+        notification.id = self._global_id(local_id)
+        if self.recipient_filter is not None:
+            self.recipient_filter.add(notification.email)
+        if self.broker is not None:
+            self.broker.publish(notification)
+        return notification
+
+    def find_by_email(self, email: str) -> List[Notification]:
+        """Encuentra todas las notificaciones para un email (índice email, sent_at)"""
+        cursor = self._cursor()
+        with request_timing.stage('db'):
+            rows = cursor.execute(self._find_by_email_sql, (email,)).fetchall()
+
+        parse = datetime.fromisoformat
+        global_id = self._global_id
+        return [
+            Notification(row[0], row[1], row[2], row[3], row[4], parse(row[5]), global_id(row[6]))
+            for row in rows
+        ]
+
+    def _cursor(self):
+        """Cursor del hilo sobre la conexión actual de Peewee (la abre si hace falta)"""
+        connection = self.model._meta.database.connection()
+        local = self._local
+        if getattr(local, 'connection', None) is not connection:
+            local.connection = connection
+            local.cursor = connection.cursor()
+        return local.cursor
@@ -0,0 +1,282 @@
+"""
+Sharded Notification Repository - Capa de Infraestructura
+Notificaciones repartidas por hash del email entre varios archivos SQLite,
+cada uno con su propia conexión y su propio lock de escritura
+"""
+import heapq
+import logging
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional
+from domain.entities.notification import Notification
+from domain.repositories.notification_repository import NotificationRepository
+from infrastructure.config.settings import Settings
+from infrastructure.database.connection import TimedSqliteDatabase
+from infrastructure.database.models.notification_model import NotificationModel
+from infrastructure.database.schema import initialize_notification_shard
+from infrastructure.repositories.notification_repository_impl import NotificationRepositoryImpl
+from infrastructure.repositories.prepared_notification_repository import PreparedNotificationRepository
+from infrastructure.runtime.lifecycle import register_after_fork, register_shutdown
+
+
+logger = logging.getLogger(__name__)
+
+
+def shard_index(email: str, shard_count: int) -> int:
+    """Shard de un destinatario: estable entre procesos y reinicios (no usa hash())"""
+    return zlib.crc32(email.encode('utf-8')) % shard_count
+
+
+def open_shard_database(path: str) -> TimedSqliteDatabase:
+    """Base de un shard en modo WAL: las lecturas no esperan al escritor del shard"""
+    return TimedSqliteDatabase(path, pragmas={'journal_mode': 'wal'})
+
+
+class NotificationShard(NotificationRepositoryImpl):
+    """
+    Un archivo del conjunto. Los ids expuestos son `id_local * shard_count + index`:
+    únicos entre shards, crecientes dentro de cada uno, y el shard de un id se
+    obtiene sin consultar (`id % shard_count`).
+    """
+
+    def __init__(self, path: str, index: int, shard_count: int):
+        self.path = path
+        self.index = index
+        self.shard_count = shard_count
+        self.db = open_shard_database(path)
+
+        class ShardNotificationModel(NotificationModel):
+            class Meta:
+                database = self.db
+                table_name = 'notifications'
+
+        super().__init__(model=ShardNotificationModel)
+
+    def initialize(self, stats_cell_size: float, archived: Iterable[Notification] = ()):
+        """Crea el esquema del shard (idempotente)"""
+        initialize_notification_shard(self.db, self.model, stats_cell_size, archived)
+
+    def reset_after_fork(self):
+        """Olvida la conexión heredada del padre sin cerrarla"""
+        self.db._state.reset()
+
+    def close(self):
+        if not self.db.is_closed():
+            self.db.close()
+
+    def _global_id(self, local_id: int) -> int:
+        return local_id * self.shard_count + self.index
+
+    def _local_id(self, global_id: int) -> Optional[int]:
+        if global_id % self.shard_count != self.index:
+            return None
+        return global_id // self.shard_count
+
+    def _local_after(self, after_id: int) -> int:
+        return (after_id - self.index) // self.shard_count
+
+
+class ShardedNotificationRepository(NotificationRepository):
+    """
+    Reparte las notificaciones entre `len(paths)` shards por hash del email.
+
+    - Lo que es de un destinatario (`find_by_email`, el historial, la
+      reanudación del stream) consulta un solo shard.
+    - `find_all`, `find_near` y `find_sent_before` (la exportación al archivo)
+      consultan todos los shards en paralelo y mezclan los resultados, ya
+      ordenados por sent_at en cada shard.
+    - El broker del stream sigue cada shard por separado (`shards`): los ids
+      solo son crecientes dentro de un shard.
+
+    Cambiar la cantidad de shards cambia el shard de cada email: las filas se
+    mueven con `rebalance` (python manage.py rebalance-shards) y reciben ids nuevos.
+    """
+
+    def __init__(self, paths: List[str], broker=None, recipient_filter=None):
+        if not paths:
+            raise ValueError("Se requiere al menos un shard")
+        self.broker = broker
+        self.recipient_filter = recipient_filter
+        self.shards = [NotificationShard(path, index, len(paths)) for index, path in enumerate(paths)]
+        self._executor = self._create_executor()
+        register_after_fork(self.reset_after_fork)
+        register_shutdown(self.close)
+
+    @property
+    def databases(self) -> list:
+        """Bases de los shards, en orden (para los agregados de /stats)"""
+        return [shard.db for shard in self.shards]
+
+    def initialize(self, stats_cell_size: float, archived: Iterable[Notification] = ()):
+        """Crea el esquema de cada shard; las notificaciones archivadas se agregan en el primero"""
+        for shard in self.shards:
+            shard.initialize(stats_cell_size, archived if shard.index == 0 else ())
+
+    def shard_for(self, email: str) -> NotificationShard:
+        return self.shards[shard_index(email, len(self.shards))]
+
+    def save(self, notification: Notification) -> Notification:
+        """Guarda en el shard del destinatario y la publica si hay broker"""
+        self.shard_for(notification.email).save(notification)
+        if self.recipient_filter is not None:
+            self.recipient_filter.add(notification.email)
+        if self.broker is not None:
+            self.broker.publish(notification)
+        return notification
+
+    def find_by_email(self, email: str) -> List[Notification]:
+        return self.shard_for(email).find_by_email(email)
+
+    def find_all(self) -> List[Notification]:
+        """Todas las notificaciones, de todos los shards, de la más reciente a la más antigua"""
+        results = self._map(lambda shard: shard.find_all())
+        return list(heapq.merge(*results, key=lambda n: n.sent_at, reverse=True))
+
+    def find_near(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        since: Optional[datetime] = None
+    ) -> List[Notification]:
+        results = self._map(lambda shard: shard.find_near(latitude, longitude, radius_km, since))
+        return list(heapq.merge(*results, key=lambda n: n.sent_at, reverse=True))
+
+    def find_sent_before(self, cutoff: datetime, limit: int) -> List[Notification]:
+        """Las `limit` más antiguas del conjunto: cada shard aporta sus `limit` más antiguas"""
+        results = self._map(lambda shard: shard.find_sent_before(cutoff, limit))
+        merged = heapq.merge(*results, key=lambda n: (n.sent_at, n.id))
+        return [notification for _, notification in zip(range(limit), merged)]
+
+    def find_by_email_between(self, email: str, start: datetime, end: datetime) -> List[Notification]:
+        return self.shard_for(email).find_by_email_between(email, start, end)
+
+    def find_after(self, after_id: int, limit: int, email: Optional[str] = None) -> List[Notification]:
+        if email is not None:
+            return self.shard_for(email).find_after(after_id, limit, email)
+        results = self._map(lambda shard: shard.find_after(after_id, limit))
+        merged = heapq.merge(*results, key=lambda n: n.id)
+        return [notification for _, notification in zip(range(limit), merged)]
+
+    def last_id(self) -> int:
+        return max(shard.last_id() for shard in self.shards)
+
+    def delete_by_ids(self, ids: List[int]) -> int:
+        """Cada shard borra los ids que le pertenecen"""
+        return sum(shard.delete_by_ids(ids) for shard in self.shards)
+
+    def rebalance(self, source_paths: List[str], batch_size: int = 1000) -> dict:
+        """
+        Mueve a su shard las filas de `source_paths` (los shards de la configuración
+        anterior, o la base única) que no estén ya en el shard que les corresponde.
+        Cada lote se inserta en su destino antes de borrarse del origen: si el
+        proceso se interrumpe, puede quedar un lote duplicado, nunca uno perdido.
+        Pensado para ejecutarse con los workers detenidos; los agregados deben
+        regenerarse al terminar (los borrados no descuentan de ellos).
+
+        Returns:
+            dict: Filas revisadas y movidas
+        """
+        targets = {os.path.abspath(shard.path): shard for shard in self.shards}
+        scanned = 0
+        moved = 0
+        for path in source_paths:
+            if not os.path.exists(path):
+                continue
+            shard = targets.get(os.path.abspath(path))
+            source = shard.db if shard is not None else open_shard_database(path)
+            try:
+                if not source.table_exists('notifications'):
+                    continue
+                source_scanned, source_moved = self._drain(source, shard, batch_size)
+            finally:
+                if shard is None:
+                    source.close()
+            scanned += source_scanned
+            moved += source_moved
+            logger.info("Rebalanceo de %s: %d filas revisadas, %d movidas", path, source_scanned, source_moved)
+        return {'scanned': scanned, 'moved': moved}
+
+    def close(self):
+        """Libera el pool de consultas y las conexiones de este hilo"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        for shard in self.shards:
+            shard.close()
+
+    def reset_after_fork(self):
+        """Conexiones y pool son del padre: el worker abre los suyos"""
+        for shard in self.shards:
+            shard.reset_after_fork()
+        self._executor = self._create_executor()
+
+    def _drain(self, source, source_shard: Optional[NotificationShard], batch_size: int) -> tuple:
+        """Recorre el origen por id y mueve, lote a lote, las filas de otro shard"""
+        scanned = 0
+        moved = 0
+        last = 0
+        while True:
+            rows = source.execute_sql(
+                """SELECT id, email, latitude, longitude, condition, code, sent_at
+                   FROM notifications WHERE id > ? ORDER BY id LIMIT ?""",
+                (last, batch_size)
+            ).fetchall()
+            if not rows:
+                return scanned, moved
+            scanned += len(rows)
+            last = rows[-1][0]
+
+            by_target = {}
+            for row in rows:
+                target = self.shard_for(row[1])
+                if target is not source_shard:
+                    by_target.setdefault(target, []).append(row)
+            for target, target_rows in by_target.items():
+                with target.db.atomic():
+                    target.db.cursor().executemany(
+                        """INSERT INTO notifications (email, latitude, longitude, condition, code, sent_at)
+                           VALUES (?, ?, ?, ?, ?, ?)""",
+                        [row[1:] for row in target_rows]
+                    )
+            ids = [row[0] for target_rows in by_target.values() for row in target_rows]
+            if ids:
+                with source.atomic():
+                    source.execute_sql(
+                        f"DELETE FROM notifications WHERE id IN ({', '.join('?' * len(ids))})", ids
+                    )
+                moved += len(ids)
+
+    def _map(self, query: Callable[[NotificationShard], List[Notification]]) -> List[List[Notification]]:
+        """Ejecuta la consulta en todos los shards a la vez"""
+        if self._executor is None:
+            return [query(shard) for shard in self.shards]
+        return list(self._executor.map(query, self.shards))
+
+    def _create_executor(self) -> Optional[ThreadPoolExecutor]:
+        if len(self.shards) == 1:
+            return None
+        return ThreadPoolExecutor(max_workers=len(self.shards), thread_name_prefix='notification-shards')
+
+
+def create_notification_repository(
+    settings: Settings,
+    archived: Iterable[Notification] = (),
+    broker=None,
+    recipient_filter=None
+) -> NotificationRepository:
+    """
+    Repositorio de notificaciones: la base principal (con Peewee o, con
+    NOTIFICATION_PREPARED_STATEMENTS, con sentencias preparadas) o, con
+    NOTIFICATION_SHARDS > 1, los shards
+    """
+    if settings.NOTIFICATION_SHARDS <= 1:
+        if settings.NOTIFICATION_PREPARED_STATEMENTS:
+            return PreparedNotificationRepository(broker=broker, recipient_filter=recipient_filter)
+        return NotificationRepositoryImpl(broker=broker, recipient_filter=recipient_filter)
+    repository = ShardedNotificationRepository(
+        settings.notification_shard_paths, broker=broker, recipient_filter=recipient_filter
+    )
+    repository.initialize(settings.STATS_CELL_SIZE, archived)
+    return repository
@@ -0,0 +1,81 @@
+"""
+Subscription Repository Implementation - Capa de Infraestructura
+Implementación concreta del repositorio de suscripciones
+"""
+from datetime import datetime
+from typing import List
+from domain.entities.subscription import Subscription
+from domain.repositories.subscription_repository import SubscriptionRepository
+from infrastructure.database.connection import db_connection
+from infrastructure.database.models.subscription_model import SubscriptionModel
+from infrastructure.database.rollups import cell_expressions
+
+
+class SubscriptionRepositoryImpl(SubscriptionRepository):
+    """Implementación del repositorio de suscripciones usando Peewee"""
+    
+    def save_batch(self, subscriptions: List[Subscription]) -> int:
+        """
+        Inserta el lote con executemany dentro de una transacción: evita
+        construir un modelo por fila y un commit por fila
+        """
+        if not subscriptions:
+            return 0
+        
+        db = db_connection.db
+        with db.atomic():
+            cursor = db.cursor()
+            cursor.executemany(
+                'INSERT OR IGNORE INTO subscriptions (email, latitude, longitude, created_at) VALUES (?, ?, ?, ?)',
+                [
+                    (s.email, s.latitude, s.longitude, s.created_at.strftime('%Y-%m-%d %H:%M:%S.%f'))
+                    for s in subscriptions
+                ]
+            )
+            return cursor.rowcount
+    
+    def find_by_email(self, email: str) -> List[Subscription]:
+        """Encuentra las suscripciones de un email"""
+        models = SubscriptionModel.select().where(
+            SubscriptionModel.email == email
+        ).order_by(SubscriptionModel.id)
+        
+        return [self._to_entity(model) for model in models]
+    
+    def find_in_partition(self, cell_size: float, partition: int, partitions: int) -> List[Subscription]:
+        """
+        Calcula la celda en SQL (mismas expresiones que los agregados): una
+        lectura de la tabla por partición, sin traer las demás filas a Python
+        """
+        row, col = cell_expressions(cell_size, '')
+        cols = max(1, int(round(360.0 / cell_size)))
+        cursor = db_connection.db.execute_sql(
+            f"""SELECT id, email, latitude, longitude, created_at FROM (
+                    SELECT *, {row} * {cols} + {col} AS cell_index FROM subscriptions
+                ) WHERE cell_index % ? = ? ORDER BY cell_index, id""",
+            (partitions, partition)
+        )
+        return [
+            Subscription(
+                id=row_id,
+                email=email,
+                latitude=latitude,
+                longitude=longitude,
+                created_at=datetime.fromisoformat(created_at)
+            )
+            for row_id, email, latitude, longitude, created_at in cursor.fetchall()
+        ]
+    
+    def count(self) -> int:
+        """Número total de suscripciones"""
+        return SubscriptionModel.select().count()
+    
+    def _to_entity(self, model: SubscriptionModel) -> Subscription:
+        """Convierte un modelo de base de datos a una entidad"""
+        return Subscription(
+            id=model.id,
+            email=model.email,
+            latitude=model.latitude,
+            longitude=model.longitude,
+            created_at=model.created_at
+        )
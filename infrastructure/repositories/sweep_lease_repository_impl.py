@@ -0,0 +1,112 @@
+"""
+Sweep Lease Repository Implementation - Capa de Infraestructura
+Concesiones del barrido en la base principal, compartida por todos los workers
+"""
+import uuid
+from typing import List, Optional
+from domain.entities.sweep_lease import SweepLease
+from domain.repositories.sweep_lease_repository import SweepLeaseRepository
+from infrastructure.database.connection import db_connection
+from infrastructure.database.sweep_leases import SWEEP_LEASES_TABLE
+
+
+_COLUMNS = 'round_key, partition_id, owner, token, expires_at, cursor, processed, done, takeovers'
+
+
+class SweepLeaseRepositoryImpl(SweepLeaseRepository):
+    """
+    `claim` corre en una transacción IMMEDIATE: toma el lock de escritura de
+    SQLite antes de leer, así dos procesos nunca eligen la misma partición.
+    Cada concesión recibe un token nuevo y `renew`/`complete` solo actualizan
+    la fila si el token sigue siendo el suyo: un worker que se quedó sin
+    concesión (pausado más de lo que dura) no pisa el avance de quien la tomó.
+    Los vencimientos se comparan con la hora de cada proceso; entre hosts se
+    asume el reloj sincronizado con un desfase muy inferior a la concesión.
+    """
+    
+    def claim(self, round_key: str, partitions: int, owner: str, lease_seconds: float, now: float) -> Optional[SweepLease]:
+        db = db_connection.db
+        with db.atomic('IMMEDIATE'):
+            (existing,) = db.execute_sql(
+                f'SELECT COUNT(*) FROM {SWEEP_LEASES_TABLE} WHERE round_key = ?', (round_key,)
+            ).fetchone()
+            if existing < partitions:
+                # El primer worker de la ronda crea las particiones
+                db.cursor().executemany(
+                    f'INSERT OR IGNORE INTO {SWEEP_LEASES_TABLE} (round_key, partition_id) VALUES (?, ?)',
+                    [(round_key, partition) for partition in range(partitions)]
+                )
+            row = db.execute_sql(
+                f"""SELECT {_COLUMNS} FROM {SWEEP_LEASES_TABLE}
+                    WHERE round_key = ? AND done = 0 AND expires_at <= ?
+                    ORDER BY partition_id LIMIT 1""",
+                (round_key, now)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            lease = self._to_entity(row)
+            if lease.owner is not None:
+                # Concesión vencida: se retoma desde su cursor
+                lease.takeovers += 1
+            lease.owner = owner
+            lease.token = uuid.uuid4().hex
+            lease.expires_at = now + lease_seconds
+            db.execute_sql(
+                f"""UPDATE {SWEEP_LEASES_TABLE}
+                    SET owner = ?, token = ?, expires_at = ?, takeovers = ?, updated_at = ?
+                    WHERE round_key = ? AND partition_id = ?""",
+                (owner, lease.token, lease.expires_at, lease.takeovers, now, round_key, lease.partition)
+            )
+        return lease
+    
+    def renew(self, lease: SweepLease, lease_seconds: float, now: float) -> bool:
+        cursor = db_connection.db.execute_sql(
+            f"""UPDATE {SWEEP_LEASES_TABLE}
+                SET expires_at = ?, cursor = ?, processed = ?, updated_at = ?
+                WHERE round_key = ? AND partition_id = ? AND token = ? AND done = 0""",
+            (now + lease_seconds, lease.cursor, lease.processed, now, lease.round_key, lease.partition, lease.token)
+        )
+        if cursor.rowcount != 1:
+            return False
+        lease.expires_at = now + lease_seconds
+        return True
+    
+    def complete(self, lease: SweepLease, now: float) -> bool:
+        cursor = db_connection.db.execute_sql(
+            f"""UPDATE {SWEEP_LEASES_TABLE}
+                SET done = 1, expires_at = ?, cursor = ?, processed = ?, updated_at = ?
+                WHERE round_key = ? AND partition_id = ? AND token = ? AND done = 0""",
+            (now, lease.cursor, lease.processed, now, lease.round_key, lease.partition, lease.token)
+        )
+        if cursor.rowcount != 1:
+            return False
+        lease.done = True
+        return True
+    
+    def progress(self, round_key: str) -> List[SweepLease]:
+        rows = db_connection.db.execute_sql(
+            f'SELECT {_COLUMNS} FROM {SWEEP_LEASES_TABLE} WHERE round_key = ? ORDER BY partition_id',
+            (round_key,)
+        ).fetchall()
+        return [self._to_entity(row) for row in rows]
+    
+    def purge_before(self, round_key: str) -> int:
+        cursor = db_connection.db.execute_sql(
+            f'DELETE FROM {SWEEP_LEASES_TABLE} WHERE round_key < ?', (round_key,)
+        )
+        return cursor.rowcount
+    
+    def _to_entity(self, row) -> SweepLease:
+        round_key, partition, owner, token, expires_at, cursor, processed, done, takeovers = row
+        return SweepLease(
+            round_key=round_key,
+            partition=partition,
+            owner=owner,
+            token=token,
+            expires_at=expires_at,
+            cursor=cursor,
+            processed=processed,
+            done=bool(done),
+            takeovers=takeovers
+        )
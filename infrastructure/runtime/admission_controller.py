@@ -0,0 +1,151 @@
+"""
+Admission Controller - Capa de Infraestructura
+Límite de concurrencia con cola acotada y descarte de carga por clase de ruta
+"""
+import math
+import threading
+import time
+
+
+class LoadShedException(Exception):
+    """La petición se descarta: la cola está llena o la espera superó el objetivo"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimiter:
+    """
+    Limita las peticiones simultáneas de una clase de rutas.
+
+    Cuando el límite está ocupado, hasta `max_queue` peticiones esperan turno;
+    las que no entran en la cola, o esperan más de `queue_target` segundos,
+    se descartan con LoadShedException.
+
+    Con `adaptive`, el límite se ajusta con la latencia observada (gradiente al
+    estilo de Netflix concurrency-limits): se compara una media corta de la
+    latencia con una media larga que hace de referencia; si la corta supera
+    `tolerance` veces la larga el límite baja en proporción, y si no, sube de
+    a poco hacia `max_limit`.
+    El límite solo crece cuando se usa al menos la mitad, para que la falta
+    de tráfico no lo infle.
+    """
+
+    SHORT_SMOOTHING = 0.2
+    LONG_SMOOTHING = 0.02
+    LIMIT_SMOOTHING = 0.2
+    MAX_RETRY_AFTER = 30
+
+    def __init__(
+        self,
+        name: str,
+        max_limit: int,
+        max_queue: int = 0,
+        queue_target: float = 0.2,
+        adaptive: bool = True,
+        min_limit: int = 1,
+        initial_limit: int = None,
+        tolerance: float = 1.5,
+        clock=time.monotonic
+    ):
+        self.name = name
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.max_queue = max(0, max_queue)
+        self.queue_target = queue_target
+        self.adaptive = adaptive
+        self.tolerance = tolerance
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._limit = float(initial_limit or self.max_limit)
+        self._in_flight = 0
+        self._queued = 0
+        self._short_rtt = None
+        self._long_rtt = None
+        self.shed = 0
+
+    @property
+    def limit(self) -> int:
+        """Límite de concurrencia vigente"""
+        return max(self.min_limit, min(self.max_limit, int(self._limit)))
+
+    def acquire(self):
+        """
+        Reserva un turno, esperando como máximo `queue_target` segundos
+
+        Raises:
+            LoadShedException: Si la cola está llena o la espera vence
+        """
+        with self._condition:
+            if self._in_flight < self.limit and not self._queued:
+                self._in_flight += 1
+                return
+
+            if self._queued >= self.max_queue:
+                self.shed += 1
+                raise LoadShedException(
+                    f"Servicio saturado ({self.name}): cola llena", self._retry_after()
+                )
+
+            self._queued += 1
+            deadline = self._clock() + self.queue_target
+            try:
+                while self._in_flight >= self.limit:
+                    remaining = deadline - self._clock()
+                    if remaining <= 0:
+                        self.shed += 1
+                        # Si este hilo consumió un aviso, lo pasa al siguiente en la cola
+                        self._condition.notify()
+                        raise LoadShedException(
+                            f"Servicio saturado ({self.name}): espera en cola excedida", self._retry_after()
+                        )
+                    self._condition.wait(remaining)
+            finally:
+                self._queued -= 1
+            self._in_flight += 1
+
+    def release(self, latency: float = None):
+        """Libera el turno; `latency` (segundos de servicio) alimenta el límite adaptativo"""
+        with self._condition:
+            in_flight = self._in_flight
+            self._in_flight = max(0, self._in_flight - 1)
+            if latency is not None:
+                self._observe(latency, in_flight)
+            self._condition.notify()
+
+    def snapshot(self) -> dict:
+        """Estado actual para /metrics"""
+        with self._condition:
+            return {
+                'limit': self.limit,
+                'in_flight': self._in_flight,
+                'queued': self._queued,
+                'shed': self.shed,
+                'latency_ms': round(self._short_rtt * 1000, 1) if self._short_rtt is not None else None
+            }
+
+    def _observe(self, latency: float, in_flight: int):
+        if self._short_rtt is None:
+            self._short_rtt = self._long_rtt = latency
+            return
+        self._short_rtt += (latency - self._short_rtt) * self.SHORT_SMOOTHING
+        self._long_rtt += (latency - self._long_rtt) * self.LONG_SMOOTHING
+        # Tras un pico, la referencia vuelve rápido a la latencia normal
+        if self._long_rtt > 2 * self._short_rtt:
+            self._long_rtt *= 0.95
+
+        if not self.adaptive or in_flight < self._limit / 2:
+            return
+
+        gradient = max(0.5, min(1.0, self.tolerance * self._long_rtt / max(self._short_rtt, 1e-6)))
+        # Con latencia sana se sondea un turno más; con latencia alta se reduce en proporción
+        target = self._limit + 1 if gradient >= 1.0 else self._limit * gradient
+        self._limit += (target - self._limit) * self.LIMIT_SMOOTHING
+        self._limit = max(self.min_limit, min(self.max_limit, self._limit))
+
+    def _retry_after(self) -> int:
+        """Segundos estimados hasta que se vacíe la cola actual"""
+        latency = self._short_rtt or self.queue_target
+        seconds = latency * (self._queued + 1) / self.limit
+        return max(1, min(self.MAX_RETRY_AFTER, math.ceil(seconds)))
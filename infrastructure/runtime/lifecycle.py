@@ -0,0 +1,99 @@
+"""
+Lifecycle - Capa de Infraestructura
+Ganchos de ciclo de vida del proceso: reinicialización tras fork y drenado al apagar
+"""
+import logging
+import os
+import threading
+import weakref
+from typing import Callable, List
+
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_after_fork: List[Callable[[], Callable]] = []
+_shutdown: List[Callable[[], Callable]] = []
+_background: List[Callable[[], Callable]] = []
+_defer_background = False
+
+
+def _reference(callback: Callable) -> Callable[[], Callable]:
+    """Referencia débil a métodos ligados para no mantener vivos sus objetos"""
+    if hasattr(callback, '__self__'):
+        return weakref.WeakMethod(callback)
+    return lambda: callback
+
+
+def register_after_fork(callback: Callable) -> Callable:
+    """
+    Registra una función a ejecutar en el proceso hijo después de un fork.
+    Sirve para descartar conexiones, sesiones HTTP y pools heredados del
+    proceso maestro, que no se pueden compartir entre procesos.
+    """
+    with _lock:
+        _after_fork.append(_reference(callback))
+    return callback
+
+
+def register_shutdown(callback: Callable) -> Callable:
+    """Registra una función a ejecutar al apagar el proceso (en orden inverso)"""
+    with _lock:
+        _shutdown.append(_reference(callback))
+    return callback
+
+
+def defer_background_start():
+    """
+    Los hilos de fondo (`start_background`) dejan de arrancar al crearse y
+    arrancan en cada worker con `run_background_starts`. Lo usa gunicorn con
+    preload_app: así el maestro no barre, no precalienta ni envía alertas, y
+    no hace fork con hilos que podrían tener locks tomados.
+    """
+    global _defer_background
+    _defer_background = True
+
+
+def start_background(start: Callable) -> Callable:
+    """Arranca un hilo de fondo ahora o, si el arranque se difirió, en cada worker"""
+    if not _defer_background:
+        start()
+        return start
+    with _lock:
+        _background.append(_reference(start))
+    return start
+
+
+def run_background_starts():
+    """Arranca los hilos de fondo diferidos; se invoca en cada worker después del fork"""
+    _run(list(_background), 'arranque')
+
+
+def _run(references: List[Callable[[], Callable]], label: str):
+    for reference in references:
+        callback = reference()
+        if callback is None:
+            continue
+        try:
+            callback()
+        except Exception:
+            logger.exception("Error en gancho de %s: %r", label, callback)
+
+
+def reinitialize_after_fork():
+    """Ejecuta los ganchos post-fork; se invoca automáticamente en cada hijo"""
+    global _lock
+    # El lock pudo quedar tomado por otro hilo del padre en el momento del fork
+    _lock = threading.Lock()
+    _run(list(_after_fork), 'post-fork')
+
+
+def run_shutdown_hooks():
+    """Drena y cierra los recursos registrados"""
+    with _lock:
+        references = list(reversed(_shutdown))
+        _shutdown.clear()
+    _run(references, 'apagado')
+
+
+os.register_at_fork(after_in_child=reinitialize_after_fork)
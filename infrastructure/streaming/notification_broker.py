@@ -0,0 +1,255 @@
+"""
+Notification Broker - Capa de Infraestructura
+Pub/sub en memoria del proceso que reparte las notificaciones nuevas a los
+streams SSE suscritos a cada destinatario
+"""
+import logging
+import queue
+import sys
+import threading
+from collections import deque
+from itertools import islice
+from typing import Dict, Optional, Set
+from domain.entities.notification import Notification
+from domain.repositories.notification_repository import NotificationRepository
+from infrastructure.monitoring.memory_monitor import estimate_size
+from infrastructure.monitoring.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+# Marca que despierta a una suscripción cuando el broker se detiene
+CLOSED = object()
+
+
+class StreamLimitException(Exception):
+    """Se alcanzó el límite de streams del worker o del destinatario"""
+    pass
+
+
+class Subscription:
+    """
+    Cola de notificaciones de un stream. Si el cliente no consume a tiempo y la
+    cola se llena, la suscripción se marca como desbordada y el stream termina:
+    el cliente se reconecta con Last-Event-ID y recupera lo perdido de la tabla.
+    """
+
+    def __init__(self, email: str, queue_size: int):
+        self.email = email
+        self.overflowed = False
+        self._queue = queue.Queue(maxsize=queue_size)
+
+    @property
+    def closed(self) -> bool:
+        """El stream debe terminar: el broker se detuvo o la cola se desbordó"""
+        return self.overflowed
+
+    def get(self, timeout: float) -> Optional[Notification]:
+        """Siguiente notificación, o None si venció el timeout o la suscripción se cerró"""
+        if self.overflowed:
+            return None
+        try:
+            item = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        return None if item is CLOSED else item
+
+    def offer(self, item) -> bool:
+        """Encola sin bloquear; retorna False (y marca el desborde) si la cola está llena"""
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            self.overflowed = True
+            return False
+
+    def pending(self) -> list:
+        """Copia de lo encolado que el stream aún no consume"""
+        with self._queue.mutex:
+            return [item for item in self._queue.queue if item is not CLOSED]
+
+    def close(self):
+        """Despierta al stream para que termine"""
+        self.overflowed = True
+        try:
+            self._queue.put_nowait(CLOSED)
+        except queue.Full:
+            pass
+
+
+class NotificationBroker:
+    """
+    Reparte cada notificación a las suscripciones de su destinatario.
+
+    - Las notificaciones que guarda este proceso se publican al confirmarse
+      (NotificationRepositoryImpl.save llama a `publish`).
+    - Las que guardan otros workers se descubren con un hilo que, mientras haya
+      suscriptores, lee cada `poll_seconds` las filas con id mayor al último
+      visto: una consulta por proceso, no una por cliente. Los ids ya
+      publicados se recuerdan para no repetirlos. Con un repositorio
+      repartido en shards se sigue cada shard con su propio último id.
+    - `max_connections` acota los streams del proceso (cada uno ocupa un hilo
+      del worker) y `max_per_recipient` los de un mismo destinatario.
+    """
+
+    SEEN_IDS = 10000
+
+    def __init__(
+        self,
+        repository: Optional[NotificationRepository] = None,
+        max_connections: int = 4,
+        max_per_recipient: int = 2,
+        queue_size: int = 100,
+        poll_seconds: float = 1.0,
+        poll_batch: int = 500
+    ):
+        self.repository = repository
+        self.max_connections = max_connections
+        self.max_per_recipient = max_per_recipient
+        self.queue_size = queue_size
+        self.poll_seconds = poll_seconds
+        self.poll_batch = poll_batch
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        self._count = 0
+        self._seen = set()
+        self._seen_order = deque()
+        self._high_water = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        metrics.register_gauge('notification_stream.connections', lambda: self._count)
+
+    def subscribe(self, email: str) -> Subscription:
+        """
+        Abre una suscripción a las notificaciones de un destinatario
+
+        Raises:
+            StreamLimitException: Si el worker o el destinatario no admiten más streams
+        """
+        with self._lock:
+            if self._count >= self.max_connections:
+                metrics.increment('notification_stream.rejected')
+                raise StreamLimitException("Se alcanzó el máximo de streams de este servidor")
+            subscriptions = self._subscriptions.setdefault(email, set())
+            if len(subscriptions) >= self.max_per_recipient:
+                metrics.increment('notification_stream.rejected')
+                raise StreamLimitException(f"Se alcanzó el máximo de {self.max_per_recipient} streams por destinatario")
+            subscription = Subscription(email, self.queue_size)
+            subscriptions.add(subscription)
+            self._count += 1
+        if self._high_water is None and self.repository is not None:
+            # Primer suscriptor: lo que otros workers guarden desde ahora se sigue desde aquí
+            self._high_water = self._last_ids()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Cierra una suscripción (idempotente)"""
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.email)
+            if subscriptions is None or subscription not in subscriptions:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.email]
+            self._count -= 1
+
+    def publish(self, notification: Notification):
+        """Entrega la notificación a los streams de su destinatario (una sola vez por id)"""
+        with self._lock:
+            if not self._mark_seen(notification.id):
+                return
+            subscriptions = list(self._subscriptions.get(notification.email, ()))
+        for subscription in subscriptions:
+            if not subscription.offer(notification):
+                metrics.increment('notification_stream.overflow')
+
+    def connection_count(self) -> int:
+        with self._lock:
+            return self._count
+
+    def memory_usage(self) -> int:
+        """Bytes aproximados de las colas de los streams y de los ids ya publicados"""
+        with self._lock:
+            subscriptions = [s for group in self._subscriptions.values() for s in group]
+            seen = sys.getsizeof(self._seen) + estimate_size(
+                self._seen_order, list(islice(self._seen_order, 32)), len(self._seen_order)
+            )
+        pending = [item for subscription in subscriptions for item in subscription.pending()]
+        return seen + estimate_size(subscriptions, pending, len(pending))
+
+    def poll(self) -> int:
+        """Publica lo que otros procesos guardaron desde la última lectura; retorna cuántas filas leyó"""
+        if self.repository is None:
+            return 0
+        with self._lock:
+            idle = self._count == 0
+        if idle:
+            # Sin suscriptores no hay a quién entregar: se retoma desde el final al volver a haberlos
+            self._high_water = None
+            return 0
+        if self._high_water is None:
+            self._high_water = self._last_ids()
+            return 0
+        total = 0
+        for index, source in enumerate(self._sources()):
+            rows = source.find_after(self._high_water[index], self.poll_batch)
+            for notification in rows:
+                self.publish(notification)
+            if rows:
+                self._high_water[index] = rows[-1].id
+            total += len(rows)
+        return total
+
+    def start(self) -> 'NotificationBroker':
+        """Inicia el hilo que sigue la tabla de notificaciones"""
+        if self._thread is None and self.repository is not None and self.poll_seconds > 0:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='notification-broker', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Detiene el hilo y termina los streams abiertos"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            subscriptions = [s for group in self._subscriptions.values() for s in group]
+        for subscription in subscriptions:
+            subscription.close()
+
+    def reset_after_fork(self):
+        """Los streams y el hilo son del padre: cada worker empieza vacío"""
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+        self._count = 0
+        self._high_water = None
+        if self._thread is not None:
+            self._thread = None
+            self.start()
+
+    def _run(self):
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Error al seguir la tabla de notificaciones")
+
+    def _sources(self) -> list:
+        """Lo que se sigue por id creciente: cada shard, o el repositorio entero"""
+        return getattr(self.repository, 'shards', None) or [self.repository]
+
+    def _last_ids(self) -> list:
+        return [source.last_id() for source in self._sources()]
+
+    def _mark_seen(self, notification_id: int) -> bool:
+        """Recuerda el id; False si ya se había publicado"""
+        if notification_id in self._seen:
+            return False
+        self._seen.add(notification_id)
+        self._seen_order.append(notification_id)
+        if len(self._seen_order) > self.SEEN_IDS:
+            self._seen.discard(self._seen_order.popleft())
+        return True
@@ -0,0 +1,207 @@
+"""
+Comandos de mantenimiento de la aplicación
+
+Uso:
+    python manage.py rebuild-rollups
+    python manage.py archive [--days N] [--vacuum]
+    python manage.py import-csv ARCHIVO.csv [--batch-size N]
+    python manage.py compact-observations [--raw-days N] [--retention-days N] [--vacuum]
+    python manage.py rebalance-shards --from-shards N
+    python manage.py sweep-status
+"""
+import argparse
+import io
+import sys
+import time
+from dataclasses import replace
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+
+from infrastructure.config.settings import Settings
+from infrastructure.database.connection import db_connection
+from infrastructure.database.schema import initialize_database
+from infrastructure.repositories.alert_stats_repository_impl import AlertStatsRepositoryImpl
+from infrastructure.repositories.notification_archive_repository_impl import NotificationArchiveRepositoryImpl
+from infrastructure.repositories.observation_repository_impl import ObservationRepositoryImpl
+from infrastructure.repositories.sharded_notification_repository import (
+    ShardedNotificationRepository, create_notification_repository
+)
+from infrastructure.repositories.subscription_repository_impl import SubscriptionRepositoryImpl
+from infrastructure.repositories.sweep_lease_repository_impl import SweepLeaseRepositoryImpl
+from application.services.weather_sweeper import sweep_round_key
+from application.use_cases.archive_notifications_use_case import ArchiveNotificationsUseCase
+from application.use_cases.import_subscriptions_use_case import ImportSubscriptionsUseCase
+
+
+def rebuild_rollups(settings: Settings, args) -> int:
+    """Regenera los agregados de alertas desde el historial"""
+    archive_repository = NotificationArchiveRepositoryImpl(directory=settings.ARCHIVE_DIR)
+    repository = AlertStatsRepositoryImpl(
+        cell_size=settings.STATS_CELL_SIZE,
+        archive_repository=archive_repository,
+        databases=getattr(create_notification_repository(settings), 'databases', None)
+    )
+    total = repository.rebuild()
+    print(f"Agregados regenerados desde {total} notificaciones (celda {settings.STATS_CELL_SIZE:g}°)")
+    return 0
+
+
+def archive(settings: Settings, args) -> int:
+    """Mueve al archivo mensual las notificaciones más antiguas que la retención"""
+    archive_repository = NotificationArchiveRepositoryImpl(directory=settings.ARCHIVE_DIR)
+    notification_repository = create_notification_repository(settings, archive_repository.scan())
+    use_case = ArchiveNotificationsUseCase(
+        notification_repository=notification_repository,
+        archive_repository=archive_repository,
+        retention_days=args.days if args.days is not None else settings.RETENTION_DAYS,
+        batch_size=settings.ARCHIVE_BATCH_SIZE
+    )
+    result = use_case.execute()
+    print(
+        f"Archivadas {result['archived']} notificaciones anteriores a {result['cutoff']} "
+        f"en {result['batches']} lotes (meses: {', '.join(result['months']) or '-'})"
+    )
+    if args.vacuum:
+        # Devuelve al sistema de archivos las páginas liberadas por el borrado
+        for db in getattr(notification_repository, 'databases', [db_connection.db]):
+            db.execute_sql('VACUUM')
+    return 0
+
+
+def import_csv(settings: Settings, args) -> int:
+    """Importa suscripciones (email, latitude, longitude) desde un CSV o la entrada estándar"""
+    use_case = ImportSubscriptionsUseCase(
+        subscription_repository=SubscriptionRepositoryImpl(),
+        batch_size=args.batch_size or settings.IMPORT_BATCH_SIZE
+    )
+    if args.path == '-':
+        lines = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8-sig', newline='')
+        report = use_case.execute(lines)
+    else:
+        with open(args.path, encoding='utf-8-sig', newline='') as csv_file:
+            report = use_case.execute(csv_file)
+    
+    for rejected in report.rejected_rows:
+        print(f"línea {rejected.line}: {rejected.error}", file=sys.stderr)
+    if report.rejected > len(report.rejected_rows):
+        print(f"... y {report.rejected - len(report.rejected_rows)} rechazos más", file=sys.stderr)
+    print(
+        f"{report.rows} filas: {report.imported} importadas, {report.duplicates} repetidas, "
+        f"{report.rejected} rechazadas en {report.elapsed_seconds}s ({report.rows_per_second} filas/s)"
+    )
+    return 1 if report.rejected else 0
+
+
+def compact_observations(settings: Settings, args) -> int:
+    """Reduce las observaciones viejas a OBSERVATIONS_RESOLUTION_SECONDS y purga las vencidas"""
+    repository = ObservationRepositoryImpl()
+    now = datetime.now()
+    raw_days = args.raw_days if args.raw_days is not None else settings.OBSERVATIONS_RAW_DAYS
+    retention_days = args.retention_days if args.retention_days is not None else settings.OBSERVATIONS_RETENTION_DAYS
+    
+    purged = repository.purge_before(now - timedelta(days=retention_days))
+    reduced = repository.downsample(now - timedelta(days=raw_days), settings.OBSERVATIONS_RESOLUTION_SECONDS)
+    print(
+        f"Observaciones: {reduced} buckets reducidos a {settings.OBSERVATIONS_RESOLUTION_SECONDS}s "
+        f"(anteriores a {raw_days} días), {purged} purgados (anteriores a {retention_days} días)"
+    )
+    if args.vacuum:
+        db_connection.db.execute_sql('VACUUM')
+    return 0
+
+
+def rebalance_shards(settings: Settings, args) -> int:
+    """Mueve las notificaciones de la cantidad de shards anterior a la actual (NOTIFICATION_SHARDS)"""
+    source = replace(settings, NOTIFICATION_SHARDS=args.from_shards)
+    archive_repository = NotificationArchiveRepositoryImpl(directory=settings.ARCHIVE_DIR)
+    repository = ShardedNotificationRepository(settings.notification_shard_paths)
+    repository.initialize(settings.STATS_CELL_SIZE, archive_repository.scan())
+    
+    result = repository.rebalance(source.notification_shard_paths, batch_size=settings.ARCHIVE_BATCH_SIZE)
+    # Los agregados de cada shard deben corresponder a sus filas
+    total = AlertStatsRepositoryImpl(
+        cell_size=settings.STATS_CELL_SIZE,
+        archive_repository=archive_repository,
+        databases=repository.databases
+    ).rebuild()
+    print(
+        f"Rebalanceo de {args.from_shards} a {len(repository.shards)} shards: "
+        f"{result['moved']} de {result['scanned']} notificaciones movidas; agregados regenerados ({total})"
+    )
+    return 0
+
+
+def sweep_status(settings: Settings, args) -> int:
+    """Muestra el avance de cada partición en la ronda actual del barrido"""
+    now = time.time()
+    round_key = sweep_round_key(now, settings.SWEEP_INTERVAL_SECONDS, settings.SWEEP_PARTITIONS)
+    leases = SweepLeaseRepositoryImpl().progress(round_key)
+    if not leases:
+        print(f"Ronda {round_key}: ningún worker la ha empezado")
+        return 0
+    
+    for lease in leases:
+        if lease.done:
+            state = 'terminada'
+        elif lease.expires_at > now:
+            state = f"en curso ({lease.owner}, vence en {lease.expires_at - now:.0f}s)"
+        elif lease.owner is not None:
+            state = f"vencida ({lease.owner})"
+        else:
+            state = 'pendiente'
+        print(f"partición {lease.partition}: {state}, {lease.processed} suscripciones, {lease.takeovers} retomas")
+    done = sum(1 for lease in leases if lease.done)
+    print(f"Ronda {round_key}: {done}/{len(leases)} particiones terminadas")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Comandos de mantenimiento de Weather Alert API")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    rebuild = commands.add_parser('rebuild-rollups', help='Regenera las tablas de agregados de /stats')
+    rebuild.set_defaults(handler=rebuild_rollups)
+    
+    archive_parser = commands.add_parser('archive', help='Archiva las notificaciones más antiguas que RETENTION_DAYS')
+    archive_parser.add_argument('--days', type=int, help='Retención en días (por defecto, RETENTION_DAYS)')
+    archive_parser.add_argument('--vacuum', action='store_true', help='Compacta la base de datos al terminar')
+    archive_parser.set_defaults(handler=archive)
+    
+    import_parser = commands.add_parser('import-csv', help='Importa suscripciones desde un CSV (- para stdin)')
+    import_parser.add_argument('path', help='Ruta del CSV con columnas email, latitude, longitude')
+    import_parser.add_argument('--batch-size', type=int, help='Filas por transacción (por defecto, IMPORT_BATCH_SIZE)')
+    import_parser.set_defaults(handler=import_csv)
+    
+    compact = commands.add_parser('compact-observations', help='Reduce y purga el historial de pronósticos por celda')
+    compact.add_argument('--raw-days', type=int, help='Días que se conservan sin reducir (por defecto, OBSERVATIONS_RAW_DAYS)')
+    compact.add_argument('--retention-days', type=int, help='Días que se conservan (por defecto, OBSERVATIONS_RETENTION_DAYS)')
+    compact.add_argument('--vacuum', action='store_true', help='Compacta la base de datos al terminar')
+    compact.set_defaults(handler=compact_observations)
+    
+    rebalance = commands.add_parser('rebalance-shards', help='Reparte las notificaciones según NOTIFICATION_SHARDS')
+    rebalance.add_argument('--from-shards', type=int, required=True, help='Cantidad de shards anterior (1 = DATABASE_NAME)')
+    rebalance.set_defaults(handler=rebalance_shards)
+    
+    status = commands.add_parser('sweep-status', help='Muestra el avance de la ronda actual del barrido')
+    status.set_defaults(handler=sweep_status)
+    
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    load_dotenv()
+    settings = Settings.from_env()
+    initialize_database(
+        settings.DATABASE_NAME,
+        settings.STATS_CELL_SIZE,
+        NotificationArchiveRepositoryImpl(directory=settings.ARCHIVE_DIR).scan()
+    )
+    try:
+        return args.handler(settings, args)
+    finally:
+        db_connection.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Access Log Middleware - Capa de Presentación
+Registra cada petición con su id, la API key que la hizo, el status, la
+latencia total y el tiempo por etapa (clima, email, base de datos)
+"""
+import hashlib
+import time
+import uuid
+from functools import lru_cache
+from typing import Optional
+from flask import Flask, g, request
+from infrastructure.monitoring import request_timing
+from infrastructure.monitoring.access_log import AccessLogger
+
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+MAX_REQUEST_ID_LENGTH = 128
+STAGES = ('weather', 'email', 'db')
+
+
+@lru_cache(maxsize=256)
+def api_key_id(api_key: Optional[str]) -> Optional[str]:
+    """Identificador estable de una API key sin exponerla: prefijo de su SHA-256"""
+    if not api_key:
+        return None
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:12]
+
+
+class AccessLogMiddleware:
+    """
+    Abre la medición por etapas al inicio de cada petición y, al terminar,
+    arma el registro de acceso y lo entrega al AccessLogger. El id de la
+    petición se toma de X-Request-ID si el cliente lo envía (para correlacionar
+    con sus logs) y se devuelve en la respuesta.
+
+    Debe registrarse antes que los demás middlewares para que las peticiones
+    que ellos rechazan (p. ej. 503 del control de admisión) también se registren.
+    """
+
+    def __init__(self, access_logger: AccessLogger):
+        self.access_logger = access_logger
+
+    def init_app(self, app: Flask):
+        """Registra los hooks del log de acceso en la aplicación"""
+        app.before_request(self._begin)
+        app.after_request(self._tag_response)
+        app.teardown_request(self._finish)
+
+    def _begin(self):
+        request_id = request.headers.get(REQUEST_ID_HEADER)
+        if not request_id or len(request_id) > MAX_REQUEST_ID_LENGTH:
+            request_id = uuid.uuid4().hex
+        g.request_id = request_id
+        g.access_started = time.perf_counter()
+        g.access_timing_token = request_timing.begin()
+
+    def _tag_response(self, response):
+        response.headers[REQUEST_ID_HEADER] = g.get('request_id', '')
+        g.access_status = response.status_code
+        return response
+
+    def _finish(self, exc=None):
+        token = g.pop('access_timing_token', None)
+        if token is None:
+            return
+        duration_ms = (time.perf_counter() - g.pop('access_started')) * 1000
+        timings = request_timing.end(token)
+        status = g.pop('access_status', 500 if exc is not None else 200)
+        if not self.access_logger.should_log(status, duration_ms):
+            return
+
+        entry = {
+            'request_id': g.get('request_id'),
+            'method': request.method,
+            'path': request.path,
+            'route': request.endpoint,
+            'status': status,
+            'duration_ms': round(duration_ms, 3),
+            'api_key_id': api_key_id(request.headers.get('x-api-key'))
+        }
+        for stage in STAGES:
+            entry[f'{stage}_ms'] = round(timings.seconds.get(stage, 0.0) * 1000, 3)
+        entry['db_queries'] = timings.calls.get('db', 0)
+        if exc is not None:
+            entry['error'] = type(exc).__name__
+        self.access_logger.log(entry)
@@ -0,0 +1,76 @@
+"""
+Admission Middleware - Capa de Presentación
+Control de admisión por clase de ruta: limita la concurrencia y responde 503
+con Retry-After cuando la clase está saturada
+"""
+import time
+from typing import Any, Callable, Dict, Optional
+from flask import Flask, g, jsonify, request
+from infrastructure.monitoring.metrics import metrics
+from infrastructure.runtime.admission_controller import ConcurrencyLimiter, LoadShedException
+
+
+class AdmissionMiddleware:
+    """
+    Asigna cada petición a una clase (p. ej. 'alerts' o 'reads') según su
+    endpoint o su blueprint y la hace pasar por el limitador de esa clase.
+    Así, cuando el camino de alertas se satura esperando al upstream o al
+    SMTP, sus peticiones se descartan sin ocupar los hilos que necesitan las
+    lecturas. Las rutas sin clase (/metrics, Swagger) no se limitan.
+
+    Con `authenticate`, una petición sin credenciales válidas se rechaza antes
+    de tomar un turno: el tráfico anónimo no puede desplazar al legítimo.
+    """
+
+    def __init__(
+        self,
+        limiters: Dict[str, ConcurrencyLimiter],
+        route_classes: Dict[str, str],
+        authenticate: Optional[Callable[[], Any]] = None
+    ):
+        self.limiters = limiters
+        self.route_classes = route_classes
+        self.authenticate = authenticate
+        for name, limiter in limiters.items():
+            metrics.register_gauge(f'admission.{name}', limiter.snapshot)
+
+    def init_app(self, app: Flask):
+        """Registra los hooks de admisión en la aplicación"""
+        app.before_request(self._admit)
+        app.teardown_request(self._release)
+
+    def limiter_for(self, endpoint: Optional[str], blueprint: Optional[str]) -> Optional[ConcurrencyLimiter]:
+        """Limitador de la ruta: primero por endpoint, luego por blueprint"""
+        route_class = self.route_classes.get(endpoint) or self.route_classes.get(blueprint)
+        return self.limiters.get(route_class)
+
+    def _admit(self):
+        if request.method == 'OPTIONS':
+            return None
+        limiter = self.limiter_for(request.endpoint, request.blueprint)
+        if limiter is None:
+            return None
+
+        if self.authenticate is not None:
+            error = self.authenticate()
+            if error is not None:
+                metrics.increment(f'admission.unauthenticated.{limiter.name}')
+                return error
+
+        try:
+            limiter.acquire()
+        except LoadShedException as e:
+            metrics.increment(f'admission.shed.{limiter.name}')
+            response = jsonify({'error': str(e)})
+            response.status_code = 503
+            response.headers['Retry-After'] = str(e.retry_after)
+            return response
+
+        g.admission_limiter = limiter
+        g.admission_started = time.monotonic()
+        return None
+
+    def _release(self, exc=None):
+        limiter = g.pop('admission_limiter', None)
+        if limiter is not None:
+            limiter.release(time.monotonic() - g.pop('admission_started'))
@@ -3,7 +3,7 @@ Auth Middleware - Capa de Presentación
 Middleware para autenticación con API Key
 """
 from functools import wraps
-from flask import request, jsonify
+from flask import g, request, jsonify
 from infrastructure.config.settings import Settings
 
 
@@ -17,15 +17,64 @@ def require_api_key(f):
             ...
     """
     @wraps(f)
+    def decorated_function(*args, **kwargs):
+        error = api_key_error()
+        if error is not None:
+            return error
+        
+        return f(*args, **kwargs)
+    
+    return decorated_function
+
+
+def api_key_error():
+    """
+    Verifica la API key de la petición actual. El resultado válido queda en
+    `g`: en las rutas limitadas la admisión ya la verificó y el decorador no
+    vuelve a leer la configuración.
+    
+    Returns:
+        La respuesta de error (401 o 403) o None si la API key es válida
+    """
+    if g.get('api_key_verified'):
+        return None
+    
+    api_key = request.headers.get('x-api-key')
+    settings = Settings.from_env()
+    
+    if not api_key:
+        return jsonify({'error': 'API key requerida'}), 401
+    
+    if api_key != settings.API_KEY:
+        return jsonify({'error': 'API key inválida'}), 403
+    
+    g.api_key_verified = True
+    return None
+
+
+def require_admin_key(f):
+    """
+    Decorador para rutas de administración: la API key debe ser ADMIN_API_KEY.
+    Si ADMIN_API_KEY no está configurada, las rutas quedan deshabilitadas.
+    
+    Usage:
+        @require_admin_key
+        def my_admin_route():
+            ...
+    """
+    @wraps(f)
     def decorated_function(*args, **kwargs):
         api_key = request.headers.get('x-api-key')
         settings = Settings.from_env()
         
+        if not settings.ADMIN_API_KEY:
+            return jsonify({'error': 'Administración deshabilitada: configure ADMIN_API_KEY'}), 403
+        
         if not api_key:
             return jsonify({'error': 'API key requerida'}), 401
         
-        if api_key != settings.API_KEY:
-            return jsonify({'error': 'API key inválida'}), 403
+        if api_key != settings.ADMIN_API_KEY:
+            return jsonify({'error': 'API key de administración inválida'}), 403
         
         return f(*args, **kwargs)
     
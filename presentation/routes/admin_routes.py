@@ -0,0 +1,57 @@
+"""
+Admin Routes - Capa de Presentación
+Rutas HTTP de administración (solo con ADMIN_API_KEY)
+"""
+from flask import Blueprint, request, jsonify
+from flasgger.utils import swag_from
+from presentation.middlewares.auth_middleware import require_admin_key
+from presentation.schemas.swagger_schemas import MEMORY_SCHEMA, MEMORY_TRACING_SCHEMA
+from infrastructure.monitoring.memory_monitor import MemoryMonitor
+
+
+class AdminRoutes:
+    """Clase que define las rutas de administración"""
+    
+    MAX_TOP = 100
+    
+    def __init__(self, memory_monitor: MemoryMonitor):
+        self.memory_monitor = memory_monitor
+        self.blueprint = Blueprint('admin', __name__)
+        self._register_routes()
+    
+    def _register_routes(self):
+        """Registra todas las rutas del blueprint"""
+        
+        @self.blueprint.route('/admin/memory', methods=['GET'])
+        @swag_from(MEMORY_SCHEMA)
+        @require_admin_key
+        def get_memory():
+            """Endpoint para consultar el uso de memoria del worker"""
+            try:
+                top = int(request.args.get('top', 10))
+            except ValueError:
+                return jsonify({'error': 'top debe ser un entero'}), 400
+            if not 1 <= top <= self.MAX_TOP:
+                return jsonify({'error': f'top debe estar entre 1 y {self.MAX_TOP}'}), 400
+            
+            return jsonify(self.memory_monitor.report(top)), 200
+        
+        @self.blueprint.route('/admin/memory/tracing', methods=['POST'])
+        @swag_from(MEMORY_TRACING_SCHEMA)
+        @require_admin_key
+        def set_memory_tracing():
+            """Endpoint para activar tracemalloc (y tomar una línea base nueva) o desactivarlo"""
+            data = request.get_json(silent=True) or {}
+            enabled = data.get('enabled')
+            if not isinstance(enabled, bool):
+                return jsonify({'error': 'enabled debe ser true o false'}), 400
+            
+            if enabled:
+                self.memory_monitor.start_tracing()
+            else:
+                self.memory_monitor.stop_tracing()
+            return jsonify({'tracing': self.memory_monitor.tracing}), 200
+    
+    def get_blueprint(self) -> Blueprint:
+        """Retorna el blueprint configurado"""
+        return self.blueprint
@@ -0,0 +1,32 @@
+"""
+Metrics Routes - Capa de Presentación
+Expone las métricas operativas del proceso
+"""
+from flask import Blueprint, jsonify
+from flasgger.utils import swag_from
+from presentation.middlewares.auth_middleware import require_api_key
+from presentation.schemas.swagger_schemas import METRICS_SCHEMA
+from infrastructure.monitoring.metrics import MetricsRegistry
+
+
+class MetricsRoutes:
+    """Clase que define la ruta de métricas"""
+
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+        self.blueprint = Blueprint('metrics', __name__)
+        self._register_routes()
+
+    def _register_routes(self):
+        """Registra todas las rutas del blueprint"""
+
+        @self.blueprint.route('/metrics', methods=['GET'])
+        @swag_from(METRICS_SCHEMA)
+        @require_api_key
+        def get_metrics():
+            """Endpoint para consultar contadores y gauges del proceso"""
+            return jsonify(self.registry.snapshot()), 200
+
+    def get_blueprint(self) -> Blueprint:
+        """Retorna el blueprint configurado"""
+        return self.blueprint
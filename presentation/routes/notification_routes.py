@@ -0,0 +1,138 @@
+"""
+Notification Routes - Capa de Presentación
+Rutas HTTP de consulta de notificaciones para los tableros de operación
+"""
+import json
+from typing import Optional
+from flask import Blueprint, Response, request, jsonify
+from flasgger.utils import swag_from
+from presentation.middlewares.auth_middleware import require_api_key
+from presentation.schemas.swagger_schemas import (
+    NEARBY_NOTIFICATIONS_SCHEMA,
+    NOTIFICATION_HISTORY_SCHEMA,
+    NOTIFICATION_STREAM_SCHEMA
+)
+from application.use_cases.find_nearby_notifications_use_case import FindNearbyNotificationsUseCase
+from application.use_cases.get_notification_history_use_case import GetNotificationHistoryUseCase
+from application.use_cases.stream_notifications_use_case import NotificationStream, StreamNotificationsUseCase
+from infrastructure.streaming.notification_broker import StreamLimitException
+
+
+class NotificationRoutes:
+    """Clase que define las rutas de consulta de notificaciones"""
+    
+    # Espera sugerida al cliente para reconectarse (campo retry de SSE y Retry-After)
+    STREAM_RETRY_SECONDS = 3
+    
+    def __init__(
+        self,
+        find_nearby_notifications_use_case: FindNearbyNotificationsUseCase,
+        get_notification_history_use_case: GetNotificationHistoryUseCase,
+        stream_notifications_use_case: Optional[StreamNotificationsUseCase] = None
+    ):
+        self.find_nearby_notifications_use_case = find_nearby_notifications_use_case
+        self.get_notification_history_use_case = get_notification_history_use_case
+        self.stream_notifications_use_case = stream_notifications_use_case
+        self.blueprint = Blueprint('notifications', __name__)
+        self._register_routes()
+    
+    def _register_routes(self):
+        """Registra todas las rutas del blueprint"""
+        
+        @self.blueprint.route('/notifications/nearby', methods=['GET'])
+        @swag_from(NEARBY_NOTIFICATIONS_SCHEMA)
+        @require_api_key
+        def get_nearby_notifications():
+            """Endpoint para obtener las alertas emitidas cerca de un punto"""
+            try:
+                lat = request.args.get('latitude')
+                lon = request.args.get('longitude')
+                radius = request.args.get('radius_km', 20)
+                since_hours = request.args.get('since_hours')
+                
+                if lat is None or lon is None:
+                    return jsonify({'error': 'latitude y longitude son requeridos'}), 400
+                
+                result = self.find_nearby_notifications_use_case.execute(
+                    latitude=float(lat),
+                    longitude=float(lon),
+                    radius_km=float(radius),
+                    since_hours=float(since_hours) if since_hours else None
+                )
+                
+                response = result.to_dict()
+                response['count'] = len(result.notifications)
+                return jsonify(response), 200
+                
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            except Exception as e:
+                return jsonify({'error': f'Error interno: {str(e)}'}), 500
+        
+        @self.blueprint.route('/notifications/history', methods=['GET'])
+        @swag_from(NOTIFICATION_HISTORY_SCHEMA)
+        @require_api_key
+        def get_notification_history():
+            """Endpoint para consultar el historial de un usuario, incluidos los meses archivados"""
+            try:
+                email = request.args.get('email')
+                
+                if not email:
+                    return jsonify({'error': 'El parámetro email es requerido'}), 400
+                
+                result = self.get_notification_history_use_case.execute(
+                    email=email,
+                    start_month=request.args.get('from'),
+                    end_month=request.args.get('to')
+                )
+                
+                response = result.to_dict()
+                response['count'] = len(result.notifications)
+                return jsonify(response), 200
+                
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            except Exception as e:
+                return jsonify({'error': f'Error interno: {str(e)}'}), 500
+    
+        @self.blueprint.route('/notifications/stream', methods=['GET'])
+        @swag_from(NOTIFICATION_STREAM_SCHEMA)
+        @require_api_key
+        def stream_notifications():
+            """Endpoint SSE que empuja las alertas nuevas de un usuario"""
+            if self.stream_notifications_use_case is None:
+                return jsonify({'error': 'Stream de notificaciones deshabilitado'}), 404
+            try:
+                last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+                stream = self.stream_notifications_use_case.execute(
+                    email=request.args.get('email'),
+                    last_event_id=int(last_event_id) if last_event_id else None
+                )
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            except StreamLimitException as e:
+                response = jsonify({'error': str(e)})
+                response.status_code = 503
+                response.headers['Retry-After'] = str(self.STREAM_RETRY_SECONDS)
+                return response
+            
+            response = Response(self._events(stream), mimetype='text/event-stream')
+            response.headers['Cache-Control'] = 'no-cache'
+            # Evita que un proxy (nginx) acumule los eventos en su buffer
+            response.headers['X-Accel-Buffering'] = 'no'
+            response.call_on_close(stream.close)
+            return response
+    
+    def _events(self, stream: NotificationStream):
+        """Formatea el stream como eventos SSE; None es un heartbeat"""
+        yield f'retry: {self.STREAM_RETRY_SECONDS * 1000}\n\n'
+        for notification in stream:
+            if notification is None:
+                yield ': ping\n\n'
+                continue
+            data = json.dumps(notification.to_dict(), ensure_ascii=False)
+            yield f'id: {notification.id}\nevent: alert\ndata: {data}\n\n'
+    
+    def get_blueprint(self) -> Blueprint:
+        """Retorna el blueprint configurado"""
+        return self.blueprint
@@ -0,0 +1,82 @@
+"""
+Stats Routes - Capa de Presentación
+Rutas HTTP de estadísticas de alertas para los tableros de operación
+"""
+from typing import Optional
+from flask import Blueprint, request, jsonify
+from flasgger.utils import swag_from
+from presentation.middlewares.auth_middleware import require_api_key
+from presentation.schemas.swagger_schemas import OBSERVATIONS_SCHEMA, STATS_SCHEMA
+from application.use_cases.get_alert_stats_use_case import GetAlertStatsUseCase
+from application.use_cases.get_cell_observations_use_case import GetCellObservationsUseCase
+
+
+class StatsRoutes:
+    """Clase que define las rutas de estadísticas"""
+    
+    def __init__(
+        self,
+        get_alert_stats_use_case: GetAlertStatsUseCase,
+        get_cell_observations_use_case: Optional[GetCellObservationsUseCase] = None
+    ):
+        self.get_alert_stats_use_case = get_alert_stats_use_case
+        self.get_cell_observations_use_case = get_cell_observations_use_case
+        self.blueprint = Blueprint('stats', __name__)
+        self._register_routes()
+    
+    def _register_routes(self):
+        """Registra todas las rutas del blueprint"""
+        
+        @self.blueprint.route('/stats', methods=['GET'])
+        @swag_from(STATS_SCHEMA)
+        @require_api_key
+        def get_stats():
+            """Endpoint para obtener conteos agregados de alertas"""
+            try:
+                code = request.args.get('code')
+                lat = request.args.get('latitude')
+                lon = request.args.get('longitude')
+                
+                result = self.get_alert_stats_use_case.execute(
+                    days=int(request.args.get('days', 7)),
+                    code=int(code) if code else None,
+                    latitude=float(lat) if lat is not None else None,
+                    longitude=float(lon) if lon is not None else None,
+                    email=request.args.get('email')
+                )
+                return jsonify(result), 200
+                
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            except Exception as e:
+                return jsonify({'error': f'Error interno: {str(e)}'}), 500
+        
+        @self.blueprint.route('/stats/observations', methods=['GET'])
+        @swag_from(OBSERVATIONS_SCHEMA)
+        @require_api_key
+        def get_observations():
+            """Endpoint para obtener el historial de pronósticos de una celda"""
+            if self.get_cell_observations_use_case is None:
+                return jsonify({'error': 'Historial de observaciones deshabilitado'}), 404
+            
+            try:
+                lat = request.args.get('latitude')
+                lon = request.args.get('longitude')
+                if lat is None or lon is None:
+                    return jsonify({'error': 'Faltan parámetros: latitude, longitude'}), 400
+                
+                result = self.get_cell_observations_use_case.execute(
+                    latitude=float(lat),
+                    longitude=float(lon),
+                    days=int(request.args.get('days', 7))
+                )
+                return jsonify(result), 200
+                
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            except Exception as e:
+                return jsonify({'error': f'Error interno: {str(e)}'}), 500
+    
+    def get_blueprint(self) -> Blueprint:
+        """Retorna el blueprint configurado"""
+        return self.blueprint
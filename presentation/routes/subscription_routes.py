@@ -0,0 +1,47 @@
+"""
+Subscription Routes - Capa de Presentación
+Rutas HTTP para la carga masiva de suscripciones
+"""
+import io
+from flask import Blueprint, request, jsonify
+from flasgger.utils import swag_from
+from presentation.middlewares.auth_middleware import require_api_key
+from presentation.schemas.swagger_schemas import IMPORT_SUBSCRIPTIONS_SCHEMA
+from application.use_cases.import_subscriptions_use_case import ImportSubscriptionsUseCase
+
+
+class SubscriptionRoutes:
+    """Clase que define las rutas de suscripciones"""
+    
+    def __init__(self, import_subscriptions_use_case: ImportSubscriptionsUseCase):
+        self.import_subscriptions_use_case = import_subscriptions_use_case
+        self.blueprint = Blueprint('subscriptions', __name__)
+        self._register_routes()
+    
+    def _register_routes(self):
+        """Registra todas las rutas del blueprint"""
+        
+        @self.blueprint.route('/subscriptions/import', methods=['POST'])
+        @swag_from(IMPORT_SUBSCRIPTIONS_SCHEMA)
+        @require_api_key
+        def import_subscriptions():
+            """Endpoint para importar suscripciones desde un CSV"""
+            try:
+                # El CSV se lee como flujo: ni el cuerpo ni el archivo se cargan completos en memoria
+                if 'file' in request.files:
+                    stream = request.files['file'].stream
+                else:
+                    stream = request.stream
+                lines = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+                
+                report = self.import_subscriptions_use_case.execute(lines)
+                return jsonify(report.to_dict()), 200
+                
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            except Exception as e:
+                return jsonify({'error': f'Error interno: {str(e)}'}), 500
+    
+    def get_blueprint(self) -> Blueprint:
+        """Retorna el blueprint configurado"""
+        return self.blueprint
@@ -2,27 +2,52 @@
 Weather Routes - Capa de Presentación
 Definición de las rutas HTTP para las funcionalidades de clima
 """
+import hashlib
+import json
+from typing import Optional, Tuple, Union
 from flask import Blueprint, request, jsonify
 from flasgger.utils import swag_from
 from presentation.middlewares.auth_middleware import require_api_key
-from presentation.schemas.swagger_schemas import CHECK_WEATHER_SCHEMA, GET_NOTIFICATIONS_SCHEMA
+from presentation.schemas.swagger_schemas import CHECK_AREA_SCHEMA, CHECK_WEATHER_SCHEMA, GET_NOTIFICATIONS_SCHEMA
+from application.use_cases.check_area_weather_use_case import CheckAreaWeatherUseCase
 from application.use_cases.check_weather_use_case import CheckWeatherUseCase
 from application.use_cases.get_notifications_use_case import GetNotificationsUseCase
+from application.dto.area_request_dto import AreaRequestDTO
 from application.dto.weather_request_dto import WeatherRequestDTO
+from domain.entities.area import Area
+from domain.services.deadline import DeadlineExceededException
 from infrastructure.external_services.weather_api_service import WeatherAPIException
 from infrastructure.external_services.email_service import EmailException
+from infrastructure.external_services.resilient_weather_service import WeatherServiceUnavailableException
+from infrastructure.cache.idempotency_store import (
+    IdempotencyStore,
+    IdempotencyKeyConflictException,
+    IdempotencyKeyInProgressException
+)
+from infrastructure.cache.sqlite_idempotency_store import SQLiteIdempotencyStore
+from infrastructure.monitoring.metrics import metrics
 
 
 class WeatherRoutes:
     """Clase que define las rutas del módulo de clima"""
     
+    MAX_IDEMPOTENCY_KEY_LENGTH = 255
+    DEADLINE_HEADER = 'X-Request-Timeout'
+    
     def __init__(
         self,
         check_weather_use_case: CheckWeatherUseCase,
-        get_notifications_use_case: GetNotificationsUseCase
+        get_notifications_use_case: GetNotificationsUseCase,
+        idempotency_store: Optional[Union[IdempotencyStore, SQLiteIdempotencyStore]] = None,
+        deadline_seconds: Optional[float] = None,
+        check_area_use_case: Optional[CheckAreaWeatherUseCase] = None
     ):
         self.check_weather_use_case = check_weather_use_case
         self.get_notifications_use_case = get_notifications_use_case
+        self.check_area_use_case = check_area_use_case
+        self.idempotency_store = idempotency_store
+        # Plazo máximo de POST /check_weather; el cliente puede pedir uno menor con X-Request-Timeout
+        self.deadline_seconds = deadline_seconds
         self.blueprint = Blueprint('weather', __name__)
         self._register_routes()
     
@@ -34,38 +59,41 @@ class WeatherRoutes:
         @require_api_key
         def check_weather():
             """Endpoint para verificar el clima y enviar alertas"""
+            idempotency_key = request.headers.get('Idempotency-Key')
+            if not idempotency_key or self.idempotency_store is None:
+                body, status = self._check_weather()
+                return jsonify(body), status
+            
+            if len(idempotency_key) > self.MAX_IDEMPOTENCY_KEY_LENGTH:
+                return jsonify({'error': 'Idempotency-Key demasiado larga'}), 400
+            
             try:
-                data = request.get_json()
-                
-                # Validar datos requeridos
-                if not data:
-                    return jsonify({'error': 'Body requerido'}), 400
-                
-                lat = data.get('latitude')
-                lon = data.get('longitude')
-                email = data.get('email')
-                
-                if lat is None or lon is None or not email:
-                    return jsonify({'error': 'latitude, longitude y email son requeridos'}), 400
-                
-                # Crear DTO y ejecutar caso de uso
-                weather_request = WeatherRequestDTO(
-                    latitude=float(lat),
-                    longitude=float(lon),
-                    email=email
+                (body, status), replayed = self.idempotency_store.execute(
+                    idempotency_key,
+                    self._request_fingerprint(),
+                    self._check_weather,
+                    # Los errores del servidor o del upstream no se guardan: el reintento vuelve a ejecutar
+                    should_store=lambda result: result[1] < 500
                 )
-                
-                result = self.check_weather_use_case.execute(weather_request)
-                return jsonify(result), 200
-                
-            except ValueError as e:
-                return jsonify({'error': str(e)}), 400
-            except WeatherAPIException as e:
-                return jsonify({'error': str(e)}), 502
-            except EmailException as e:
-                return jsonify({'error': f'Error al enviar email: {str(e)}'}), 500
-            except Exception as e:
-                return jsonify({'error': f'Error interno: {str(e)}'}), 500
+            except IdempotencyKeyConflictException as e:
+                return jsonify({'error': str(e)}), 422
+            except IdempotencyKeyInProgressException as e:
+                return jsonify({'error': str(e)}), 409
+            
+            response = jsonify(body)
+            response.status_code = status
+            response.headers['Idempotent-Replayed'] = 'true' if replayed else 'false'
+            return response
+        
+        @self.blueprint.route('/check_area', methods=['POST'])
+        @swag_from(CHECK_AREA_SCHEMA)
+        @require_api_key
+        def check_area():
+            """Endpoint para verificar el clima sobre una caja o un polígono"""
+            if self.check_area_use_case is None:
+                return jsonify({'error': 'Verificación por área deshabilitada'}), 404
+            body, status = self._check_area()
+            return jsonify(body), status
         
         @self.blueprint.route('/notifications', methods=['GET'])
         @swag_from(GET_NOTIFICATIONS_SCHEMA)
@@ -92,6 +120,121 @@ class WeatherRoutes:
             except Exception as e:
                 return jsonify({'error': f'Error interno: {str(e)}'}), 500
     
+    def _check_weather(self) -> Tuple[dict, int]:
+        """Ejecuta la verificación del clima y retorna (cuerpo, código HTTP)"""
+        try:
+            data = request.get_json()
+            
+            # Validar datos requeridos
+            if not data:
+                return {'error': 'Body requerido'}, 400
+            
+            lat = data.get('latitude')
+            lon = data.get('longitude')
+            email = data.get('email')
+            
+            if lat is None or lon is None or not email:
+                return {'error': 'latitude, longitude y email son requeridos'}, 400
+            
+            channels = data.get('channels', ['email'])
+            if not isinstance(channels, list) or not all(isinstance(channel, str) for channel in channels):
+                return {'error': 'channels debe ser una lista de canales'}, 400
+            
+            deadline_seconds = self._deadline_seconds()
+            
+            # Crear DTO y ejecutar caso de uso
+            weather_request = WeatherRequestDTO(
+                latitude=float(lat),
+                longitude=float(lon),
+                email=email,
+                channels=channels,
+                webhook_url=data.get('webhook_url'),
+                deadline_seconds=deadline_seconds
+            )
+            
+            return self.check_weather_use_case.execute(weather_request), 200
+            
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        except DeadlineExceededException as e:
+            # Nadie espera ya la respuesta: se informa la etapa que agotó el plazo
+            metrics.increment(f'deadline.exceeded.{e.stage}')
+            return {'error': str(e), 'stage': e.stage, 'deadline_seconds': deadline_seconds}, 504
+        except WeatherServiceUnavailableException as e:
+            return {'error': str(e)}, 503
+        except WeatherAPIException as e:
+            return {'error': str(e)}, 502
+        except EmailException as e:
+            return {'error': f'Error al enviar email: {str(e)}'}, 500
+        except Exception as e:
+            return {'error': f'Error interno: {str(e)}'}, 500
+    
+    def _check_area(self) -> Tuple[dict, int]:
+        """Ejecuta la verificación sobre el área y retorna (cuerpo, código HTTP)"""
+        deadline_seconds = None
+        try:
+            data = request.get_json(silent=True)
+            if not data:
+                return {'error': 'Body requerido'}, 400
+            
+            bbox = data.get('bbox')
+            polygon = data.get('polygon')
+            if (bbox is None) == (polygon is None):
+                return {'error': 'Se requiere bbox o polygon (solo uno)'}, 400
+            if bbox is not None:
+                if not isinstance(bbox, list) or len(bbox) != 4:
+                    return {'error': 'bbox debe ser [min_lon, min_lat, max_lon, max_lat]'}, 400
+                area = Area.from_bbox(*bbox)
+            else:
+                area = Area.from_geojson(polygon)
+            
+            deadline_seconds = self._deadline_seconds()
+            area_request = AreaRequestDTO(
+                area=area,
+                email=data.get('email'),
+                name=data.get('name') or 'el área',
+                deadline_seconds=deadline_seconds
+            )
+            return self.check_area_use_case.execute(area_request), 200
+        
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        except DeadlineExceededException as e:
+            metrics.increment(f'deadline.exceeded.{e.stage}')
+            return {'error': str(e), 'stage': e.stage, 'deadline_seconds': deadline_seconds}, 504
+        except WeatherServiceUnavailableException as e:
+            return {'error': str(e)}, 503
+        except WeatherAPIException as e:
+            return {'error': str(e)}, 502
+        except EmailException as e:
+            return {'error': f'Error al enviar email: {str(e)}'}, 500
+        except Exception as e:
+            return {'error': f'Error interno: {str(e)}'}, 500
+    
+    def _deadline_seconds(self) -> Optional[float]:
+        """
+        Plazo de la solicitud: el configurado, o el de X-Request-Timeout si es
+        menor (el balanceador o el cliente que se rinden antes)
+        """
+        header = request.headers.get(self.DEADLINE_HEADER)
+        if header is None:
+            return self.deadline_seconds
+        try:
+            requested = float(header)
+        except ValueError:
+            raise ValueError(f"{self.DEADLINE_HEADER} debe ser un número de segundos")
+        if not requested > 0:
+            raise ValueError(f"{self.DEADLINE_HEADER} debe ser mayor que 0")
+        if self.deadline_seconds is None:
+            return requested
+        return min(requested, self.deadline_seconds)
+    
+    def _request_fingerprint(self) -> str:
+        """Huella del cuerpo de la solicitud, independiente del orden y formato del JSON"""
+        data = request.get_json(silent=True)
+        payload = json.dumps(data, sort_keys=True).encode('utf-8') if data is not None else request.get_data()
+        return hashlib.sha256(payload).hexdigest()
+    
     def get_blueprint(self) -> Blueprint:
         """Retorna el blueprint configurado"""
         return self.blueprint
@@ -19,6 +19,20 @@ CHECK_WEATHER_SCHEMA = {
             'required': True,
             'description': 'Clave API de autenticación'
         },
+        {
+            'name': 'Idempotency-Key',
+            'in': 'header',
+            'type': 'string',
+            'required': False,
+            'description': 'Clave única del intento (máx. 255 caracteres). Los reintentos con la misma clave reciben la respuesta original sin volver a consultar el clima ni enviar otra alerta'
+        },
+        {
+            'name': 'X-Request-Timeout',
+            'in': 'header',
+            'type': 'number',
+            'required': False,
+            'description': 'Segundos que el cliente esperará la respuesta. Solo puede acortar REQUEST_DEADLINE_SECONDS; cada etapa (clima, correo, base de datos) usa lo que quede del plazo'
+        },
         {
             'name': 'body',
             'in': 'body',
@@ -40,6 +54,17 @@ CHECK_WEATHER_SCHEMA = {
                         'type': 'string',
                         'example': 'correo@correo.com',
                         'description': 'Correo para recibir alertas'
+                    },
+                    'channels': {
+                        'type': 'array',
+                        'items': {'type': 'string', 'enum': ['email', 'webhook']},
+                        'example': ['email', 'webhook'],
+                        'description': 'Canales por los que se entrega la alerta (por defecto solo email)'
+                    },
+                    'webhook_url': {
+                        'type': 'string',
+                        'example': 'https://ejemplo.com/alertas',
+                        'description': 'URL que recibe los lotes de alertas firmados; requerida con el canal webhook'
                     }
                 },
                 'required': ['latitude', 'longitude', 'email']
@@ -68,6 +93,17 @@ CHECK_WEATHER_SCHEMA = {
                         'type': 'boolean',
                         'example': False
                     },
+                    'digest': {
+                        'type': 'boolean',
+                        'example': False,
+                        'description': 'La alerta quedó en el resumen periódico del destinatario'
+                    },
+                    'channels': {
+                        'type': 'array',
+                        'items': {'type': 'string'},
+                        'example': ['email', 'webhook'],
+                        'description': 'Canales por los que se entregó la alerta (solo si hubo alerta)'
+                    },
                     'message': {
                         'type': 'string',
                         'example': 'No se requiere alerta'
@@ -99,6 +135,30 @@ CHECK_WEATHER_SCHEMA = {
                 }
             }
         },
+        409: {
+            'description': 'Sigue en curso la solicitud original con la misma Idempotency-Key',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {
+                        'type': 'string',
+                        'example': 'Hay una solicitud con la misma Idempotency-Key en curso'
+                    }
+                }
+            }
+        },
+        422: {
+            'description': 'La Idempotency-Key ya se usó con otro cuerpo',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {
+                        'type': 'string',
+                        'example': 'La Idempotency-Key ya se usó con una solicitud distinta'
+                    }
+                }
+            }
+        },
         502: {
             'description': 'Error con el servicio externo',
             'schema': {
@@ -110,6 +170,163 @@ CHECK_WEATHER_SCHEMA = {
                     }
                 }
             }
+        },
+        503: {
+            'description': 'Servicio del clima no disponible (circuito abierto)',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {
+                        'type': 'string',
+                        'example': 'Servicio del clima temporalmente no disponible (circuito abierto)'
+                    }
+                }
+            }
+        },
+        504: {
+            'description': 'Se agotó el plazo de la solicitud; stage indica la etapa (weather, email o db)',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {
+                        'type': 'string',
+                        'example': "Se agotó el plazo de la solicitud en la etapa 'weather'"
+                    },
+                    'stage': {
+                        'type': 'string',
+                        'example': 'weather'
+                    },
+                    'deadline_seconds': {
+                        'type': 'number',
+                        'example': 14.0
+                    }
+                }
+            }
+        }
+    }
+}
+
+
+CHECK_AREA_SCHEMA = {
+    'tags': ['Weather'],
+    'description': """
+        Verifica el clima sobre un área: una caja (bbox) o un polígono GeoJSON (Polygon o MultiPolygon).
+        El área se muestrea con una grilla adaptativa: celdas de WEATHER_CELL_SIZE para áreas pequeñas y
+        celdas más gruesas (x2, x5, x10, ...) para áreas grandes, de modo que nunca se consultan más de
+        AREA_MAX_SAMPLES celdas. Las celdas se consultan en paralelo y las ya consultadas salen de la caché.
+        Retorna las sub-áreas con clima adverso y una sola alerta agregada; con email, la alerta se envía.
+    """,
+    'parameters': [
+        {
+            'name': 'x-api-key',
+            'in': 'header',
+            'type': 'string',
+            'required': True,
+            'description': 'Clave API de autenticación'
+        },
+        {
+            'name': 'X-Request-Timeout',
+            'in': 'header',
+            'type': 'number',
+            'required': False,
+            'description': 'Segundos que el cliente esperará la respuesta. Solo puede acortar REQUEST_DEADLINE_SECONDS'
+        },
+        {
+            'name': 'body',
+            'in': 'body',
+            'required': True,
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'bbox': {
+                        'type': 'array',
+                        'items': {'type': 'number'},
+                        'example': [-75.62, 4.98, -75.42, 5.12],
+                        'description': 'Caja [min_lon, min_lat, max_lon, max_lat] (excluyente con polygon)'
+                    },
+                    'polygon': {
+                        'type': 'object',
+                        'example': {
+                            'type': 'Polygon',
+                            'coordinates': [[[-75.6, 5.0], [-75.4, 5.0], [-75.5, 5.15], [-75.6, 5.0]]]
+                        },
+                        'description': 'Geometría GeoJSON Polygon o MultiPolygon, posiciones [lon, lat] (excluyente con bbox)'
+                    },
+                    'email': {
+                        'type': 'string',
+                        'example': 'alcaldia@correo.com',
+                        'description': 'Correo para recibir la alerta agregada (opcional)'
+                    },
+                    'name': {
+                        'type': 'string',
+                        'example': 'Comuna 1',
+                        'description': 'Nombre del área para el asunto de la alerta (opcional)'
+                    }
+                }
+            }
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Resultado de la verificación sobre el área',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'cell_size': {'type': 'number', 'example': 0.1},
+                    'sampled_cells': {'type': 'integer', 'example': 4},
+                    'failed_cells': {'type': 'integer', 'example': 0},
+                    'adverse_weather': {'type': 'boolean', 'example': True},
+                    'adverse_areas': {
+                        'type': 'array',
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'cell': {'type': 'string', 'example': '0.1:950:1044'},
+                                'bbox': {
+                                    'type': 'array',
+                                    'items': {'type': 'number'},
+                                    'example': [-75.6, 5.0, -75.5, 5.1]
+                                },
+                                'latitude': {'type': 'number', 'example': 5.05},
+                                'longitude': {'type': 'number', 'example': -75.55},
+                                'location': {'type': 'string', 'example': 'Manizales, Colombia'},
+                                'condition': {'type': 'string', 'example': 'Heavy Rain'},
+                                'condition_code': {'type': 'integer', 'example': 1195},
+                                'temperature_c': {'type': 'number', 'example': 18.0}
+                            }
+                        }
+                    },
+                    'alert': {
+                        'type': 'object',
+                        'properties': {
+                            'condition': {'type': 'string', 'example': 'Heavy Rain'},
+                            'conditions': {'type': 'object', 'example': {'Heavy Rain': 2}},
+                            'adverse_cells': {'type': 'integer', 'example': 2},
+                            'coverage': {'type': 'number', 'example': 0.5}
+                        }
+                    },
+                    'alert_sent': {'type': 'boolean', 'example': True},
+                    'message': {
+                        'type': 'string',
+                        'example': 'Alerta enviada debido a condiciones climáticas adversas en el área'
+                    }
+                }
+            }
+        },
+        400: {
+            'description': 'Área inválida (bbox o polygon ausentes, mal formados o fuera de rango)'
+        },
+        401: {
+            'description': 'API Key inválida o no proporcionada'
+        },
+        502: {
+            'description': 'Ninguna celda del área pudo consultarse en el servicio del clima'
+        },
+        503: {
+            'description': 'Servicio del clima temporalmente no disponible y sin caché para el área'
+        },
+        504: {
+            'description': 'Se agotó el plazo de la solicitud; stage indica la etapa'
         }
     }
 }
@@ -189,3 +406,633 @@ GET_NOTIFICATIONS_SCHEMA = {
         }
     }
 }
+
+
+METRICS_SCHEMA = {
+    'tags': ['Operaciones'],
+    'description': """
+        Retorna los contadores y gauges del proceso: estado del circuit breaker del
+        servicio del clima, errores del upstream, solicitudes de cobertura, etc.
+    """,
+    'parameters': [
+        {
+            'name': 'x-api-key',
+            'in': 'header',
+            'type': 'string',
+            'required': True,
+            'description': 'Clave API de autenticación'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Métricas actuales',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'counters': {'type': 'object', 'example': {'weather_breaker.rejected': 12}},
+                    'gauges': {'type': 'object', 'example': {'weather_breaker.state': 'closed'}}
+                }
+            }
+        },
+        401: {
+            'description': 'Falta la API key',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string', 'example': 'API key requerida'}
+                }
+            }
+        }
+    }
+}
+
+
+NEARBY_NOTIFICATIONS_SCHEMA = {
+    'tags': ['Notificaciones'],
+    'description': """
+        Retorna las alertas emitidas dentro de un radio (km) alrededor de un punto,
+        opcionalmente limitadas a las últimas N horas. La consulta usa un índice espacial.
+    """,
+    'parameters': [
+        {
+            'name': 'x-api-key',
+            'in': 'header',
+            'type': 'string',
+            'required': True,
+            'description': 'Clave API de autenticación'
+        },
+        {
+            'name': 'latitude',
+            'in': 'query',
+            'type': 'number',
+            'required': True,
+            'description': 'Latitud del punto'
+        },
+        {
+            'name': 'longitude',
+            'in': 'query',
+            'type': 'number',
+            'required': True,
+            'description': 'Longitud del punto'
+        },
+        {
+            'name': 'radius_km',
+            'in': 'query',
+            'type': 'number',
+            'required': False,
+            'default': 20,
+            'description': 'Radio de búsqueda en kilómetros (máximo 500)'
+        },
+        {
+            'name': 'since_hours',
+            'in': 'query',
+            'type': 'number',
+            'required': False,
+            'description': 'Solo alertas de las últimas N horas'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Alertas encontradas (lista vacía si no hay)',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'count': {'type': 'integer', 'example': 1},
+                    'notifications': {
+                        'type': 'array',
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'sent_at': {'type': 'string', 'example': '2025-04-07 10:00:00'},
+                                'latitude': {'type': 'number', 'example': 5.07},
+                                'longitude': {'type': 'number', 'example': -75.52},
+                                'condition': {'type': 'string', 'example': 'Heavy Rain'},
+                                'code': {'type': 'integer', 'example': 1195}
+                            }
+                        }
+                    }
+                }
+            }
+        },
+        400: {
+            'description': 'Parámetros inválidos',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string', 'example': 'latitude y longitude son requeridos'}
+                }
+            }
+        },
+        401: {
+            'description': 'Falta la API key',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string', 'example': 'API key requerida'}
+                }
+            }
+        }
+    }
+}
+
+STATS_SCHEMA = {
+    'tags': ['Stats'],
+    'summary': 'Estadísticas de alertas desde los agregados',
+    'description': 'Conteos por día, código de condición y celda geográfica, mantenidos incrementalmente. Opcionalmente incluye el resumen de un destinatario.',
+    'security': [{'ApiKeyAuth': []}],
+    'parameters': [
+        {
+            'name': 'days',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+            'default': 7,
+            'description': 'Días hacia atrás, incluyendo hoy (1 a 366)'
+        },
+        {
+            'name': 'code',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+            'description': 'Filtra por código de condición'
+        },
+        {
+            'name': 'latitude',
+            'in': 'query',
+            'type': 'number',
+            'required': False,
+            'description': 'Filtra por la celda que contiene el punto (requiere longitude)'
+        },
+        {
+            'name': 'longitude',
+            'in': 'query',
+            'type': 'number',
+            'required': False,
+            'description': 'Filtra por la celda que contiene el punto (requiere latitude)'
+        },
+        {
+            'name': 'email',
+            'in': 'query',
+            'type': 'string',
+            'required': False,
+            'description': 'Incluye el resumen de alertas de este destinatario'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Estadísticas del periodo',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'from': {'type': 'string', 'example': '2025-04-01'},
+                    'to': {'type': 'string', 'example': '2025-04-07'},
+                    'cell_size': {'type': 'number', 'example': 1.0},
+                    'total': {'type': 'integer', 'example': 42},
+                    'by_day': {'type': 'object', 'example': {'2025-04-07': 12}},
+                    'by_code': {'type': 'object', 'example': {'1195': 30, '1087': 12}},
+                    'top_cells': {
+                        'type': 'array',
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'cell': {'type': 'string', 'example': '1:95:104'},
+                                'center': {'type': 'array', 'items': {'type': 'number'}, 'example': [5.5, -75.5]},
+                                'count': {'type': 'integer', 'example': 18}
+                            }
+                        }
+                    },
+                    'recipient': {
+                        'type': 'object',
+                        'properties': {
+                            'email': {'type': 'string', 'example': 'usuario@example.com'},
+                            'count': {'type': 'integer', 'example': 3},
+                            'first_sent_at': {'type': 'string', 'example': '2025-04-01 08:00:00'},
+                            'last_sent_at': {'type': 'string', 'example': '2025-04-07 10:00:00'}
+                        }
+                    }
+                }
+            }
+        },
+        400: {
+            'description': 'Parámetros inválidos',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string', 'example': 'days debe estar entre 1 y 366'}
+                }
+            }
+        },
+        401: {
+            'description': 'Falta la API key',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string', 'example': 'API key requerida'}
+                }
+            }
+        }
+    }
+}
+
+OBSERVATIONS_SCHEMA = {
+    'tags': ['Stats'],
+    'summary': 'Historial de pronósticos de una celda',
+    'description': 'Pronósticos traídos del upstream para la celda que contiene el punto, en columnas. Los días anteriores a OBSERVATIONS_RAW_DAYS vienen reducidos a un punto por OBSERVATIONS_RESOLUTION_SECONDS.',
+    'security': [{'ApiKeyAuth': []}],
+    'parameters': [
+        {
+            'name': 'latitude',
+            'in': 'query',
+            'type': 'number',
+            'required': True,
+            'description': 'Latitud de un punto de la celda'
+        },
+        {
+            'name': 'longitude',
+            'in': 'query',
+            'type': 'number',
+            'required': True,
+            'description': 'Longitud de un punto de la celda'
+        },
+        {
+            'name': 'days',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+            'default': 7,
+            'description': 'Días hacia atrás desde ahora (1 a 366)'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Observaciones de la celda ordenadas por tiempo',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'cell': {'type': 'string', 'example': '0.1:950:1044'},
+                    'center': {'type': 'array', 'items': {'type': 'number'}, 'example': [5.05, -75.55]},
+                    'from': {'type': 'string', 'example': '2025-04-01T10:00:00'},
+                    'to': {'type': 'string', 'example': '2025-04-08T10:00:00'},
+                    'points': {'type': 'integer', 'example': 2},
+                    'samples': {'type': 'integer', 'example': 7},
+                    'adverse_ratio': {'type': 'number', 'example': 0.2857},
+                    'series': {
+                        'type': 'object',
+                        'example': {
+                            'timestamps': [1743483600, 1744106400],
+                            'temperature_c': [17.5, 18.2],
+                            'condition_code': [1195, 1000],
+                            'adverse': [2, 0],
+                            'samples': [6, 1],
+                            'humidity': [91, None],
+                            'wind_kph': [22.3, 8.6]
+                        }
+                    }
+                }
+            }
+        },
+        400: {
+            'description': 'Parámetros inválidos',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string', 'example': 'Coordenadas fuera de rango'}
+                }
+            }
+        },
+        401: {
+            'description': 'Falta la API key',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string', 'example': 'API key requerida'}
+                }
+            }
+        }
+    }
+}
+
+NOTIFICATION_HISTORY_SCHEMA = {
+    'tags': ['Notifications'],
+    'summary': 'Historial de notificaciones incluyendo meses archivados',
+    'description': 'Combina la tabla de notificaciones con los archivos mensuales comprimidos generados por la política de retención.',
+    'security': [{'ApiKeyAuth': []}],
+    'parameters': [
+        {
+            'name': 'email',
+            'in': 'query',
+            'type': 'string',
+            'required': True,
+            'description': 'Email del usuario'
+        },
+        {
+            'name': 'from',
+            'in': 'query',
+            'type': 'string',
+            'required': False,
+            'description': 'Primer mes (YYYY-MM); por defecto, 11 meses antes de "to"'
+        },
+        {
+            'name': 'to',
+            'in': 'query',
+            'type': 'string',
+            'required': False,
+            'description': 'Último mes incluido (YYYY-MM); por defecto, el mes actual'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Notificaciones del rango (lista vacía si no hay)',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'count': {'type': 'integer', 'example': 1},
+                    'notifications': {
+                        'type': 'array',
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'sent_at': {'type': 'string', 'example': '2025-01-07 10:00:00'},
+                                'latitude': {'type': 'number', 'example': 5.07},
+                                'longitude': {'type': 'number', 'example': -75.52},
+                                'condition': {'type': 'string', 'example': 'Heavy Rain'},
+                                'code': {'type': 'integer', 'example': 1195}
+                            }
+                        }
+                    }
+                }
+            }
+        },
+        400: {
+            'description': 'Parámetros inválidos',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string', 'example': 'Mes inválido: 2025-13 (formato YYYY-MM)'}
+                }
+            }
+        },
+        401: {
+            'description': 'Falta la API key',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string', 'example': 'API key requerida'}
+                }
+            }
+        }
+    }
+}
+
+NOTIFICATION_STREAM_SCHEMA = {
+    'tags': ['Notifications'],
+    'summary': 'Stream en vivo (Server-Sent Events) de las alertas de un usuario',
+    'description': 'Mantiene abierta la conexión y envía un evento "alert" por cada notificación nueva del usuario, con su id como id del evento. Con la cabecera Last-Event-ID (o el parámetro last_event_id) primero se envían las notificaciones posteriores a ese id. Cada 15 s sin novedades se envía un comentario de heartbeat, y el stream se cierra a los pocos minutos para que el cliente se reconecte. Requiere la cabecera x-api-key, por lo que desde el navegador se usa un cliente SSE que permita cabeceras.',
+    'security': [{'ApiKeyAuth': []}],
+    'produces': ['text/event-stream'],
+    'parameters': [
+        {
+            'name': 'email',
+            'in': 'query',
+            'type': 'string',
+            'required': True,
+            'description': 'Email del usuario'
+        },
+        {
+            'name': 'Last-Event-ID',
+            'in': 'header',
+            'type': 'integer',
+            'required': False,
+            'description': 'Último id recibido, para reanudar sin perder alertas'
+        },
+        {
+            'name': 'last_event_id',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+            'description': 'Alternativa a la cabecera Last-Event-ID'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Stream de eventos',
+            'schema': {
+                'type': 'string',
+                'example': 'id: 42\nevent: alert\ndata: {"id": 42, "email": "usuario@example.com", "code": 1195, "condition": "Heavy rain", "latitude": 5.07, "longitude": -75.52, "sent_at": "2025-01-07 10:00:00"}\n\n'
+            }
+        },
+        400: {
+            'description': 'Parámetros inválidos',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string', 'example': 'Email inválido'}
+                }
+            }
+        },
+        503: {
+            'description': 'Se alcanzó el máximo de streams; reintentar tras Retry-After',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string', 'example': 'Se alcanzó el máximo de streams de este servidor'}
+                }
+            }
+        }
+    }
+}
+
+IMPORT_SUBSCRIPTIONS_SCHEMA = {
+    'tags': ['Subscriptions'],
+    'summary': 'Importación masiva de suscripciones desde CSV',
+    'description': 'Recibe un CSV (cuerpo text/csv o campo multipart "file") con columnas email, latitude, longitude; la cabecera es opcional. Valida cada fila con las mismas reglas que /check_weather y guarda las válidas en lotes. Las suscripciones repetidas se ignoran.',
+    'security': [{'ApiKeyAuth': []}],
+    'consumes': ['text/csv', 'multipart/form-data'],
+    'parameters': [
+        {
+            'name': 'body',
+            'in': 'body',
+            'required': False,
+            'schema': {
+                'type': 'string',
+                'example': 'email,latitude,longitude\nusuario@example.com,5.07,-75.52\n'
+            }
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Resultado de la importación',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'rows': {'type': 'integer', 'example': 100000},
+                    'imported': {'type': 'integer', 'example': 99870},
+                    'duplicates': {'type': 'integer', 'example': 100},
+                    'rejected': {'type': 'integer', 'example': 30},
+                    'batches': {'type': 'integer', 'example': 20},
+                    'elapsed_seconds': {'type': 'number', 'example': 1.9},
+                    'rows_per_second': {'type': 'number', 'example': 52631.6},
+                    'rejected_rows': {
+                        'type': 'array',
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'line': {'type': 'integer', 'example': 42},
+                                'error': {'type': 'string', 'example': 'Latitud debe estar entre -90 y 90'}
+                            }
+                        }
+                    },
+                    'rejected_rows_truncated': {'type': 'boolean', 'example': False}
+                }
+            }
+        },
+        400: {
+            'description': 'CSV inválido',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string', 'example': 'Faltan columnas en la cabecera: longitude'}
+                }
+            }
+        },
+        401: {
+            'description': 'Falta la API key',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string', 'example': 'API key requerida'}
+                }
+            }
+        }
+    }
+}
+
+MEMORY_SCHEMA = {
+    'tags': ['Operaciones'],
+    'description': """
+        Uso de memoria del worker que atiende la petición: RSS actual e historial,
+        tamaño aproximado de cada caché, pool y buffer del proceso con su
+        presupuesto, y, si tracemalloc está activo, el crecimiento por módulo
+        desde la última línea base. Requiere ADMIN_API_KEY.
+    """,
+    'parameters': [
+        {
+            'name': 'x-api-key',
+            'in': 'header',
+            'type': 'string',
+            'required': True,
+            'description': 'Clave API de administración (ADMIN_API_KEY)'
+        },
+        {
+            'name': 'top',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+            'default': 10,
+            'description': 'Módulos y archivos a listar en el reporte de tracemalloc (1-100)'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Uso de memoria actual',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'rss_bytes': {'type': 'integer', 'example': 73400320},
+                    'rss_budget_bytes': {'type': 'integer', 'example': 268435456},
+                    'rss_history': {
+                        'type': 'array',
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'at': {'type': 'number', 'example': 1760000000.0},
+                                'rss_bytes': {'type': 'integer', 'example': 73400320}
+                            }
+                        }
+                    },
+                    'components': {
+                        'type': 'object',
+                        'example': {
+                            'forecast_cache.local': {
+                                'bytes': 1843200, 'entries': 2400, 'budget_bytes': 8388608, 'evictions': 0
+                            }
+                        }
+                    },
+                    'tracemalloc': {
+                        'type': 'object',
+                        'example': {
+                            'traced_bytes': 15728640,
+                            'peak_traced_bytes': 16777216,
+                            'by_module': [
+                                {'module': 'infrastructure', 'size_bytes': 2097152, 'size_diff_bytes': 1048576, 'count_diff': 5120}
+                            ],
+                            'top_files': [
+                                {'file': 'infrastructure/cache/forecast_cache.py', 'size_diff_bytes': 1048576, 'count_diff': 5120}
+                            ]
+                        }
+                    }
+                }
+            }
+        },
+        403: {
+            'description': 'API key inválida o administración deshabilitada',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string', 'example': 'API key de administración inválida'}
+                }
+            }
+        }
+    }
+}
+
+
+MEMORY_TRACING_SCHEMA = {
+    'tags': ['Operaciones'],
+    'description': """
+        Activa tracemalloc en el worker y toma una línea base nueva, o lo desactiva.
+        Mientras está activo, cada asignación tiene un costo extra de CPU y memoria.
+        Requiere ADMIN_API_KEY.
+    """,
+    'parameters': [
+        {
+            'name': 'x-api-key',
+            'in': 'header',
+            'type': 'string',
+            'required': True,
+            'description': 'Clave API de administración (ADMIN_API_KEY)'
+        },
+        {
+            'name': 'body',
+            'in': 'body',
+            'required': True,
+            'schema': {
+                'type': 'object',
+                'required': ['enabled'],
+                'properties': {
+                    'enabled': {'type': 'boolean', 'example': True}
+                }
+            }
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Estado de tracemalloc',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'tracing': {'type': 'boolean', 'example': True}
+                }
+            }
+        },
+        400: {
+            'description': 'Cuerpo inválido',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string', 'example': 'enabled debe ser true o false'}
+                }
+            }
+        }
+    }
+}
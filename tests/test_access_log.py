@@ -0,0 +1,152 @@
+"""
+Tests para el log de acceso estructurado y la medición por etapas
+"""
+import json
+import logging
+import os
+import queue
+import pytest
+from flask import Flask, jsonify
+from infrastructure.monitoring import request_timing
+from infrastructure.monitoring.access_log import AccessLogger, _DroppingQueueHandler
+from infrastructure.monitoring.metrics import metrics
+from presentation.middlewares.access_log_middleware import AccessLogMiddleware, api_key_id
+
+
+def read_entries(path):
+    with open(path, encoding='utf-8') as log_file:
+        return [json.loads(line) for line in log_file]
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return str(tmp_path / 'logs' / 'access.log')
+
+
+@pytest.fixture
+def access_logger(log_path):
+    access_logger = AccessLogger(path=log_path).start()
+    yield access_logger
+    access_logger.stop()
+
+
+@pytest.fixture
+def client(access_logger):
+    app = Flask(__name__)
+    AccessLogMiddleware(access_logger).init_app(app)
+
+    @app.route('/work')
+    def work():
+        with request_timing.stage('db'):
+            pass
+        with request_timing.stage('weather'):
+            with request_timing.stage('weather'):
+                pass
+        return jsonify({'ok': True})
+
+    @app.route('/fail')
+    def fail():
+        raise RuntimeError("falla")
+
+    return app.test_client()
+
+
+class TestRequestTiming:
+    """Tests de la medición por etapas"""
+
+    def test_outside_request_is_noop(self):
+        """Test: fuera de una petición medir no hace nada"""
+        with request_timing.stage('db'):
+            pass
+
+        assert request_timing.current() is None
+
+    def test_nested_stage_counts_once(self):
+        """Test: una etapa anidada del mismo nombre no duplica el tiempo"""
+        token = request_timing.begin()
+        with request_timing.stage('weather'):
+            with request_timing.stage('weather'):
+                pass
+        with request_timing.stage('db'):
+            pass
+        with request_timing.stage('db'):
+            pass
+        timings = request_timing.end(token)
+
+        assert timings.calls == {'weather': 1, 'db': 2}
+        assert request_timing.current() is None
+
+
+class TestAccessLog:
+    """Tests del log de acceso de extremo a extremo"""
+
+    def test_logs_request_with_stages(self, client, access_logger, log_path):
+        """Test: cada petición deja una línea JSON con sus etapas"""
+        response = client.get('/work', headers={'x-api-key': 'secret', 'X-Request-ID': 'abc-123'})
+        access_logger.stop()
+
+        entry, = read_entries(log_path)
+        assert response.headers['X-Request-ID'] == 'abc-123'
+        assert entry['request_id'] == 'abc-123'
+        assert entry['route'] == 'work'
+        assert entry['status'] == 200
+        assert entry['api_key_id'] == api_key_id('secret')
+        assert 'secret' not in json.dumps(entry)
+        assert entry['db_queries'] == 1
+        assert {'ts', 'duration_ms', 'weather_ms', 'email_ms', 'db_ms'} <= entry.keys()
+
+    def test_generates_request_id(self, client, access_logger, log_path):
+        """Test: sin X-Request-ID se genera uno"""
+        response = client.get('/work')
+        access_logger.stop()
+
+        assert len(response.headers['X-Request-ID']) == 32
+        assert read_entries(log_path)[0]['api_key_id'] is None
+
+    def test_unhandled_error_is_logged_as_500(self, client, access_logger, log_path):
+        """Test: una excepción no controlada se registra con status 500"""
+        client.application.config['PROPAGATE_EXCEPTIONS'] = False
+        client.get('/fail')
+        access_logger.stop()
+
+        entry, = read_entries(log_path)
+        assert entry['status'] == 500
+
+    def test_sampling_keeps_errors_and_slow_requests(self, tmp_path):
+        """Test: con muestreo en cero, solo se registran errores y peticiones lentas"""
+        access_logger = AccessLogger(path=str(tmp_path / 'access.log'), sample_rate=0.0, slow_ms=500)
+
+        assert not access_logger.should_log(200, 10)
+        assert access_logger.should_log(503, 10)
+        assert access_logger.should_log(200, 600)
+
+    def test_full_queue_drops_instead_of_blocking(self, tmp_path):
+        """Test: con la cola llena el registro se descarta sin bloquear"""
+        records = queue.Queue(maxsize=1)
+        handler = _DroppingQueueHandler(records)
+        dropped = metrics.snapshot()['counters'].get('access_log.dropped', 0)
+
+        for index in range(2):
+            handler.handle(logging.LogRecord('access', logging.INFO, '', 0, {'n': index}, None, None))
+
+        assert records.qsize() == 1
+        assert metrics.snapshot()['counters']['access_log.dropped'] == dropped + 1
+
+    def test_rotates_by_size(self, tmp_path):
+        """Test: el archivo rota al superar max_bytes"""
+        path = str(tmp_path / 'access.log')
+        access_logger = AccessLogger(path=path, max_bytes=1024, backup_count=2).start()
+        for index in range(100):
+            access_logger.log({'request_id': f'{index:032d}'})
+        access_logger.stop()
+
+        assert os.path.exists(path + '.1')
+        assert os.path.getsize(path) <= 1024
+
+    def test_pid_placeholder(self, tmp_path):
+        """Test: '{pid}' se reemplaza por el pid del worker"""
+        access_logger = AccessLogger(path=str(tmp_path / 'access-{pid}.log')).start()
+        access_logger.log({'ok': True})
+        access_logger.stop()
+
+        assert os.path.exists(tmp_path / f'access-{os.getpid()}.log')
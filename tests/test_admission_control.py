@@ -0,0 +1,220 @@
+"""
+Tests para el control de admisión y descarte de carga
+"""
+import threading
+import pytest
+from flask import Flask, jsonify
+from unittest.mock import patch
+from infrastructure.config.settings import Settings
+from infrastructure.runtime.admission_controller import ConcurrencyLimiter, LoadShedException
+from presentation.middlewares.admission_middleware import AdmissionMiddleware
+from presentation.middlewares.auth_middleware import api_key_error, require_api_key
+
+
+class TestConcurrencyLimiter:
+    """Tests del limitador de concurrencia"""
+
+    def test_sheds_when_queue_is_full(self):
+        """Test: sin cola, la petición que excede el límite se descarta de inmediato"""
+        limiter = ConcurrencyLimiter('alerts', max_limit=1, max_queue=0, adaptive=False)
+        limiter.acquire()
+
+        with pytest.raises(LoadShedException) as error:
+            limiter.acquire()
+
+        assert error.value.retry_after >= 1
+        assert limiter.snapshot()['shed'] == 1
+
+    def test_sheds_when_queue_wait_exceeds_target(self):
+        """Test: la petición en cola se descarta si su turno no llega a tiempo"""
+        limiter = ConcurrencyLimiter('alerts', max_limit=1, max_queue=1, queue_target=0.05, adaptive=False)
+        limiter.acquire()
+
+        with pytest.raises(LoadShedException, match="espera"):
+            limiter.acquire()
+        assert limiter.snapshot()['queued'] == 0
+
+    def test_queued_request_gets_released_slot(self):
+        """Test: al liberar un turno, la petición en cola lo toma"""
+        limiter = ConcurrencyLimiter('alerts', max_limit=1, max_queue=1, queue_target=5.0, adaptive=False)
+        limiter.acquire()
+        admitted = threading.Event()
+
+        def waiter():
+            limiter.acquire()
+            admitted.set()
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        limiter.release(0.01)
+        thread.join(timeout=5)
+
+        assert admitted.is_set()
+        assert limiter.snapshot()['in_flight'] == 1
+
+    def test_limit_drops_when_latency_rises(self):
+        """Test: con latencia varias veces la de referencia, el límite baja"""
+        limiter = ConcurrencyLimiter('alerts', max_limit=8, min_limit=1)
+        for _ in range(6):
+            limiter.acquire()
+        for _ in range(10):
+            limiter.acquire()
+            limiter.release(0.05)
+
+        for _ in range(20):
+            try:
+                limiter.acquire()
+            except LoadShedException:
+                break
+            limiter.release(1.0)
+
+        assert limiter.limit < 7
+
+    def test_limit_recovers_with_healthy_latency(self):
+        """Test: con latencia sana y el límite en uso, vuelve a subir"""
+        limiter = ConcurrencyLimiter('alerts', max_limit=8, initial_limit=2)
+        limiter.acquire()
+        limiter.acquire()
+        for _ in range(40):
+            limiter.release(0.05)
+            limiter.acquire()
+
+        assert limiter.limit > 2
+
+    def test_idle_limiter_does_not_grow(self):
+        """Test: sin carga, el límite no crece"""
+        limiter = ConcurrencyLimiter('alerts', max_limit=8, initial_limit=4)
+        for _ in range(40):
+            limiter.acquire()
+            limiter.release(0.05)
+
+        assert limiter.limit == 4
+
+
+class TestAdmissionMiddleware:
+    """Tests de la integración con Flask"""
+
+    @pytest.fixture
+    def app(self):
+        app = Flask(__name__)
+        release = threading.Event()
+        entered = threading.Event()
+
+        @app.route('/check_weather', methods=['POST'])
+        def check_weather():
+            entered.set()
+            release.wait(5)
+            return jsonify({'ok': True})
+
+        @app.route('/notifications')
+        def notifications():
+            return jsonify([])
+
+        @app.route('/metrics')
+        def get_metrics():
+            return jsonify({})
+
+        middleware = AdmissionMiddleware(
+            limiters={
+                'alerts': ConcurrencyLimiter('alerts', max_limit=1, adaptive=False),
+                'reads': ConcurrencyLimiter('reads', max_limit=4, adaptive=False)
+            },
+            route_classes={'check_weather': 'alerts', 'notifications': 'reads'}
+        )
+        middleware.init_app(app)
+        app.config.update(release=release, entered=entered, middleware=middleware)
+        return app
+
+    def test_saturated_alerts_do_not_block_reads(self, app):
+        """Test: con el camino de alertas lleno, se descarta con 503 y las lecturas responden"""
+        first = {}
+        thread = threading.Thread(
+            target=lambda: first.update(response=app.test_client().post('/check_weather'))
+        )
+        thread.start()
+        assert app.config['entered'].wait(5)
+
+        shed = app.test_client().post('/check_weather')
+        read = app.test_client().get('/notifications')
+        app.config['release'].set()
+        thread.join(timeout=5)
+
+        assert shed.status_code == 503
+        assert int(shed.headers['Retry-After']) >= 1
+        assert read.status_code == 200
+        assert first['response'].status_code == 200
+
+    def test_slot_is_released_after_request(self, app):
+        """Test: terminada la petición, el turno queda libre"""
+        app.config['release'].set()
+        client = app.test_client()
+
+        assert client.post('/check_weather').status_code == 200
+        assert client.post('/check_weather').status_code == 200
+        assert app.config['middleware'].limiters['alerts'].snapshot()['in_flight'] == 0
+
+    def test_unclassified_routes_are_not_limited(self, app):
+        """Test: las rutas sin clase no pasan por ningún limitador"""
+        assert app.config['middleware'].limiter_for('get_metrics', None) is None
+        assert app.test_client().get('/metrics').status_code == 200
+
+    def test_unauthenticated_requests_do_not_take_slots(self, monkeypatch):
+        """Test: sin API key válida se responde 401/403 antes de ocupar un turno de alertas"""
+        monkeypatch.setenv('API_KEY', 'test-key')
+        app = Flask(__name__)
+        entered = threading.Event()
+        release = threading.Event()
+
+        @app.route('/check_weather', methods=['POST'])
+        def check_weather():
+            entered.set()
+            release.wait(5)
+            return jsonify({'ok': True})
+
+        limiter = ConcurrencyLimiter('alerts', max_limit=1, max_queue=0, adaptive=False)
+        AdmissionMiddleware(
+            limiters={'alerts': limiter},
+            route_classes={'check_weather': 'alerts'},
+            authenticate=api_key_error
+        ).init_app(app)
+        client = app.test_client()
+
+        assert client.post('/check_weather').status_code == 401
+        assert client.post('/check_weather', headers={'x-api-key': 'wrong'}).status_code == 403
+        assert limiter.snapshot()['in_flight'] == 0
+        assert limiter.snapshot()['shed'] == 0
+
+        legit = {}
+        thread = threading.Thread(target=lambda: legit.update(
+            response=app.test_client().post('/check_weather', headers={'x-api-key': 'test-key'})
+        ))
+        thread.start()
+        assert entered.wait(5)
+        anonymous = client.post('/check_weather')
+        release.set()
+        thread.join(timeout=5)
+
+        assert anonymous.status_code == 401
+        assert legit['response'].status_code == 200
+
+    def test_api_key_is_checked_once_per_request(self, monkeypatch):
+        """Test: en una ruta limitada el decorador reutiliza la verificación de la admisión"""
+        monkeypatch.setenv('API_KEY', 'test-key')
+        app = Flask(__name__)
+
+        @app.route('/check_weather', methods=['POST'])
+        @require_api_key
+        def check_weather():
+            return jsonify({'ok': True})
+
+        AdmissionMiddleware(
+            limiters={'alerts': ConcurrencyLimiter('alerts', max_limit=1, max_queue=0, adaptive=False)},
+            route_classes={'check_weather': 'alerts'},
+            authenticate=api_key_error
+        ).init_app(app)
+        client = app.test_client()
+
+        with patch.object(Settings, 'from_env', wraps=Settings.from_env) as from_env:
+            assert client.post('/check_weather', headers={'x-api-key': 'test-key'}).status_code == 200
+            assert from_env.call_count == 1
+            assert client.post('/check_weather', headers={'x-api-key': 'wrong'}).status_code == 403
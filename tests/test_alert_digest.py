@@ -0,0 +1,153 @@
+"""
+Tests para el modo resumen de alertas
+"""
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+from application.services.alert_digest import AlertDigest
+from application.use_cases.check_weather_use_case import CheckWeatherUseCase
+from application.dto.weather_request_dto import WeatherRequestDTO
+from domain.entities.forecast import Forecast
+
+
+def make_forecast(condition="Heavy Rain", code=1195, location="Armenia, Colombia") -> Forecast:
+    return Forecast(
+        location=location,
+        latitude=5.07,
+        longitude=-75.52,
+        temperature_c=20.0,
+        condition=condition,
+        condition_code=code,
+        is_adverse=True,
+        forecast_date=datetime(2025, 4, 7, 10, 0, 0),
+        humidity=90,
+        wind_kph=30.0
+    )
+
+
+class FakeClock:
+    """Reloj manual para avanzar la ventana del resumen"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAlertDigest:
+    """Tests para la acumulación y envío de resúmenes"""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def mock_email_service(self):
+        return Mock()
+
+    @pytest.fixture
+    def digest(self, mock_email_service, clock):
+        return AlertDigest(mock_email_service, window_seconds=60, urgent_codes=[1273], clock=clock)
+
+    def test_alerts_are_sent_once_window_expires(self, digest, mock_email_service, clock):
+        """Test: varias alertas del mismo destinatario generan un solo correo"""
+        digest.add("test@example.com", make_forecast())
+        digest.add("test@example.com", make_forecast(location="Pereira, Colombia"))
+        digest.add("test@example.com", make_forecast())
+
+        assert digest.flush_due() == 0
+        clock.now = 60
+        assert digest.flush_due() == 1
+
+        mock_email_service.send_email.assert_called_once()
+        email, subject, body = mock_email_service.send_email.call_args[0]
+        assert email == "test@example.com"
+        assert "(3)" in subject
+        assert "Pereira, Colombia" in body
+        assert "(x2)" in body
+        assert digest.pending_count() == 0
+
+    def test_each_recipient_gets_its_own_digest(self, digest, mock_email_service):
+        """Test: los resúmenes se agrupan por destinatario"""
+        digest.add("a@example.com", make_forecast())
+        digest.add("b@example.com", make_forecast())
+
+        assert digest.flush_all() == 2
+        assert mock_email_service.send_email.call_count == 2
+
+    def test_failed_digest_is_retried(self, digest, mock_email_service, clock):
+        """Test: si el envío falla, el resumen se reintenta en la siguiente ventana"""
+        mock_email_service.send_email.side_effect = [Exception("SMTP caído"), None]
+        digest.add("test@example.com", make_forecast())
+        clock.now = 60
+        digest.flush_due()
+
+        assert digest.pending_count() == 1
+        clock.now = 120
+        assert digest.flush_due() == 1
+
+    def test_stop_flushes_pending(self, digest, mock_email_service):
+        """Test: al apagar se envía lo pendiente"""
+        digest.start(tick_seconds=10)
+        digest.add("test@example.com", make_forecast())
+
+        digest.stop()
+
+        mock_email_service.send_email.assert_called_once()
+
+
+class TestCheckWeatherUseCaseWithDigest:
+    """Tests del caso de uso con el modo resumen activo"""
+
+    @pytest.fixture
+    def mock_email_service(self):
+        return Mock()
+
+    @pytest.fixture
+    def mock_notification_repository(self):
+        return Mock()
+
+    @pytest.fixture
+    def mock_weather_service(self):
+        return Mock()
+
+    @pytest.fixture
+    def digest(self, mock_email_service):
+        return AlertDigest(mock_email_service, window_seconds=60, urgent_codes=[1273])
+
+    @pytest.fixture
+    def use_case(self, mock_notification_repository, mock_weather_service, mock_email_service, digest):
+        return CheckWeatherUseCase(
+            notification_repository=mock_notification_repository,
+            weather_service=mock_weather_service,
+            email_service=mock_email_service,
+            alert_digest=digest
+        )
+
+    def test_non_urgent_alert_goes_to_digest(
+        self, use_case, mock_weather_service, mock_email_service, mock_notification_repository, digest
+    ):
+        """Test: una alerta no urgente se acumula pero la notificación se guarda"""
+        mock_weather_service.get_forecast.return_value = make_forecast()
+
+        result = use_case.execute(WeatherRequestDTO(latitude=5.07, longitude=-75.52, email="test@example.com"))
+
+        assert result['alert_sent'] is True
+        assert result['digest'] is True
+        mock_email_service.send_email.assert_not_called()
+        mock_notification_repository.save.assert_called_once()
+        assert digest.pending_count() == 1
+
+    def test_urgent_alert_bypasses_digest(
+        self, use_case, mock_weather_service, mock_email_service, mock_notification_repository, digest
+    ):
+        """Test: una condición urgente se envía de inmediato"""
+        mock_weather_service.get_forecast.return_value = make_forecast("Thundery outbreaks", 1273)
+
+        result = use_case.execute(WeatherRequestDTO(latitude=5.07, longitude=-75.52, email="test@example.com"))
+
+        assert result['digest'] is False
+        mock_email_service.send_email.assert_called_once()
+        mock_notification_repository.save.assert_called_once()
+        assert digest.pending_count() == 0
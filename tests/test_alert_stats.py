@@ -0,0 +1,171 @@
+"""
+Tests para los agregados de alertas y GetAlertStatsUseCase
+"""
+import pytest
+from datetime import date, datetime
+from unittest.mock import Mock
+from application.use_cases.get_alert_stats_use_case import GetAlertStatsUseCase
+from domain.entities.alert_stats import AlertCount, RecipientAlertStats
+from domain.entities.geo_cell import GeoCell
+from domain.entities.notification import Notification
+from infrastructure.database.connection import db_connection
+from infrastructure.database.rollups import DAILY_TABLE, EMAIL_TABLE, ensure_rollups
+from infrastructure.database.schema import initialize_database
+from infrastructure.repositories.alert_stats_repository_impl import AlertStatsRepositoryImpl
+from infrastructure.repositories.notification_repository_impl import NotificationRepositoryImpl
+
+
+def make_notification(email="test@example.com", latitude=5.07, longitude=-75.52, code=1195, sent_at=None):
+    return Notification(
+        email=email,
+        latitude=latitude,
+        longitude=longitude,
+        condition="Heavy Rain",
+        code=code,
+        sent_at=sent_at or datetime(2025, 4, 7, 10, 0, 0)
+    )
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Base de datos temporal con el esquema completo"""
+    initialize_database(str(tmp_path / 'stats.db'), stats_cell_size=1.0)
+    yield db_connection.db
+    db_connection.close()
+
+
+def rollup_rows(db):
+    daily = db.execute_sql(f'SELECT * FROM {DAILY_TABLE} ORDER BY 1, 2, 3, 4').fetchall()
+    emails = db.execute_sql(f'SELECT * FROM {EMAIL_TABLE} ORDER BY 1').fetchall()
+    return daily, emails
+
+
+class TestAlertRollups:
+    """Tests de integración de los agregados mantenidos por trigger"""
+
+    @pytest.fixture
+    def notifications(self, database):
+        return NotificationRepositoryImpl()
+
+    @pytest.fixture
+    def stats(self, database):
+        return AlertStatsRepositoryImpl(cell_size=1.0)
+
+    def test_save_increments_rollups(self, notifications, stats):
+        """Test: cada save actualiza los conteos por día, código, celda y email"""
+        notifications.save(make_notification())
+        notifications.save(make_notification(latitude=5.9, longitude=-75.1))
+        notifications.save(make_notification(email="other@example.com", code=1087))
+
+        counts = stats.find_daily_counts(date(2025, 4, 7), date(2025, 4, 7))
+        by_code = {item.code: item.count for item in counts}
+        assert by_code == {1195: 2, 1087: 1}
+        assert {item.cell for item in counts} == {GeoCell.from_coordinates(5.07, -75.52, 1.0)}
+
+        recipient = stats.find_recipient_stats("test@example.com")
+        assert recipient.count == 2
+        assert recipient.last_sent_at == datetime(2025, 4, 7, 10, 0, 0)
+
+    def test_filters_by_code_and_cell(self, notifications, stats):
+        """Test: los filtros usan la clave de los agregados"""
+        notifications.save(make_notification())
+        notifications.save(make_notification(latitude=40.4, longitude=-3.7))
+        notifications.save(make_notification(code=1087))
+
+        cell = GeoCell.from_coordinates(40.4, -3.7, 1.0)
+        assert [item.count for item in stats.find_daily_counts(date(2025, 4, 1), date(2025, 4, 7), cell=cell)] == [1]
+        assert sum(item.count for item in stats.find_daily_counts(date(2025, 4, 1), date(2025, 4, 7), code=1195)) == 2
+        assert stats.find_daily_counts(date(2025, 4, 8), date(2025, 4, 9)) == []
+
+    def test_rebuild_matches_incremental(self, database, notifications, stats):
+        """Test: regenerar desde el historial produce los mismos agregados"""
+        for day in range(1, 4):
+            notifications.save(make_notification(sent_at=datetime(2025, 4, day, 8, 30)))
+            notifications.save(make_notification(email="other@example.com", latitude=-33.4, longitude=-70.6,
+                                                 sent_at=datetime(2025, 4, day, 9, 0)))
+        incremental = rollup_rows(database)
+
+        assert stats.rebuild() == 6
+        assert rollup_rows(database) == incremental
+
+    def test_cell_size_change_rebuilds(self, database, notifications):
+        """Test: cambiar el tamaño de celda regenera los agregados con la nueva malla"""
+        notifications.save(make_notification(latitude=5.07, longitude=-75.52))
+        notifications.save(make_notification(latitude=5.9, longitude=-75.1))
+
+        ensure_rollups(database, 0.5)
+
+        counts = AlertStatsRepositoryImpl(cell_size=0.5).find_daily_counts(date(2025, 4, 7), date(2025, 4, 7))
+        assert len(counts) == 2
+
+    def test_unknown_recipient(self, stats):
+        """Test: un destinatario sin alertas no tiene resumen"""
+        assert stats.find_recipient_stats("nobody@example.com") is None
+
+
+class TestGetAlertStatsUseCase:
+    """Tests para el caso de uso de estadísticas"""
+
+    @pytest.fixture
+    def mock_alert_stats_repository(self):
+        return Mock()
+
+    @pytest.fixture
+    def use_case(self, mock_alert_stats_repository):
+        return GetAlertStatsUseCase(alert_stats_repository=mock_alert_stats_repository, cell_size=1.0)
+
+    def test_execute_aggregates_counts(self, use_case, mock_alert_stats_repository):
+        """Test: combina los conteos por día, código y celda"""
+        bogota = GeoCell.from_coordinates(4.6, -74.1, 1.0)
+        medellin = GeoCell.from_coordinates(6.2, -75.6, 1.0)
+        mock_alert_stats_repository.find_daily_counts.return_value = [
+            AlertCount(day='2025-04-06', code=1195, cell=bogota, count=3),
+            AlertCount(day='2025-04-07', code=1195, cell=medellin, count=1),
+            AlertCount(day='2025-04-07', code=1087, cell=bogota, count=2)
+        ]
+
+        result = use_case.execute(days=7, today=date(2025, 4, 7))
+
+        assert result['from'] == '2025-04-01'
+        assert result['total'] == 6
+        assert result['by_day'] == {'2025-04-06': 3, '2025-04-07': 3}
+        assert result['by_code'] == {'1195': 4, '1087': 2}
+        assert result['top_cells'][0] == {'cell': bogota.key, 'center': list(bogota.center), 'count': 5}
+        assert 'recipient' not in result
+
+    def test_execute_with_location_filters_cell(self, use_case, mock_alert_stats_repository):
+        """Test: latitude/longitude se traducen a la celda de los agregados"""
+        mock_alert_stats_repository.find_daily_counts.return_value = []
+
+        use_case.execute(days=1, code=1195, latitude=4.6, longitude=-74.1, today=date(2025, 4, 7))
+
+        args, kwargs = mock_alert_stats_repository.find_daily_counts.call_args
+        assert args == (date(2025, 4, 7), date(2025, 4, 7))
+        assert kwargs == {'code': 1195, 'cell': GeoCell.from_coordinates(4.6, -74.1, 1.0)}
+
+    def test_execute_with_email(self, use_case, mock_alert_stats_repository):
+        """Test: incluye el resumen del destinatario"""
+        mock_alert_stats_repository.find_daily_counts.return_value = []
+        mock_alert_stats_repository.find_recipient_stats.return_value = RecipientAlertStats(
+            email="test@example.com",
+            count=3,
+            first_sent_at=datetime(2025, 4, 1, 8, 0, 0),
+            last_sent_at=datetime(2025, 4, 7, 10, 0, 0)
+        )
+
+        result = use_case.execute(email="test@example.com")
+
+        assert result['recipient']['count'] == 3
+        assert result['recipient']['last_sent_at'] == '2025-04-07 10:00:00'
+
+    @pytest.mark.parametrize('kwargs', [
+        {'days': 0},
+        {'days': 367},
+        {'latitude': 4.6},
+        {'latitude': 91, 'longitude': 0},
+        {'email': 'invalid-email'}
+    ])
+    def test_execute_with_invalid_parameters(self, use_case, kwargs):
+        """Test: parámetros inválidos lanzan ValueError"""
+        with pytest.raises(ValueError):
+            use_case.execute(**kwargs)
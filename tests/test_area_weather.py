@@ -0,0 +1,252 @@
+"""
+Tests para la verificación del clima sobre un área (caja o polígono)
+"""
+import threading
+import time
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+from flask import Flask
+from application.dto.area_request_dto import AreaRequestDTO
+from application.use_cases.check_area_weather_use_case import CheckAreaWeatherUseCase
+from domain.entities.area import Area
+from domain.entities.forecast import Forecast
+from domain.services.area_sampling import sample_area
+from domain.services.deadline import DeadlineExceededException, current_deadline
+from infrastructure.cache.forecast_cache import InMemoryForecastCache
+from infrastructure.external_services.cached_weather_service import CachedWeatherService
+from infrastructure.external_services.weather_api_service import WeatherAPIException
+from presentation.routes.weather_routes import WeatherRoutes
+
+
+def make_forecast(latitude: float, longitude: float, adverse: bool, condition: str = 'Heavy Rain') -> Forecast:
+    return Forecast(
+        location=f"{latitude:.2f},{longitude:.2f}",
+        latitude=latitude,
+        longitude=longitude,
+        temperature_c=18.0,
+        condition=condition if adverse else 'Sunny',
+        condition_code=1195 if adverse else 1000,
+        is_adverse=adverse,
+        forecast_date=datetime(2025, 4, 7)
+    )
+
+
+class StormWest:
+    """Upstream falso: lluvia fuerte al oeste de una longitud, sol al este"""
+
+    def __init__(self, boundary: float, delay: float = 0.0):
+        self.boundary = boundary
+        self.delay = delay
+        self.calls = 0
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def get_forecast(self, latitude: float, longitude: float) -> Forecast:
+        with self._lock:
+            self.calls += 1
+            self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        return make_forecast(latitude, longitude, adverse=longitude < self.boundary)
+
+
+class TestArea:
+    """Tests del área y su muestreo"""
+
+    def test_polygon_with_hole(self):
+        """Test: un hueco excluye lo que encierra"""
+        area = Area.from_geojson({'type': 'Polygon', 'coordinates': [
+            [[-76, 4], [-74, 4], [-74, 6], [-76, 6], [-76, 4]],
+            [[-75.5, 4.5], [-74.5, 4.5], [-74.5, 5.5], [-75.5, 5.5], [-75.5, 4.5]]
+        ]})
+
+        assert area.contains(4.2, -75.8)
+        assert not area.contains(5.0, -75.0)
+        assert not area.contains(7.0, -75.0)
+        assert area.bounds == (-76, 4, -74, 6)
+
+    @pytest.mark.parametrize('geometry', [
+        {'type': 'Point', 'coordinates': [-75, 5]},
+        {'type': 'Polygon', 'coordinates': [[[-75, 5], [-74, 5]]]},
+        {'type': 'Polygon', 'coordinates': [[[-75, 95], [-74, 5], [-74, 6]]]},
+        'not-a-geometry'
+    ])
+    def test_invalid_geometry(self, geometry):
+        """Test: geometrías que no son polígonos válidos se rechazan"""
+        with pytest.raises(ValueError):
+            Area.from_geojson(geometry)
+
+    def test_grid_coarsens_with_area_size(self):
+        """Test: un barrio usa las celdas de la caché y un departamento celdas más gruesas, sin superar el máximo"""
+        size, cells = sample_area(Area.from_bbox(-75.58, 5.02, -75.42, 5.08), 0.1, 64)
+        assert size == 0.1 and len(cells) == 2
+
+        size, cells = sample_area(Area.from_bbox(-76.0, 4.0, -74.0, 6.0), 0.1, 64)
+        assert size == 0.5 and len(cells) == 16
+
+        size, cells = sample_area(Area.from_bbox(-180.0, -90.0, 180.0, 90.0), 0.1, 64)
+        assert len(cells) <= 64
+
+    def test_thin_polygon_is_still_sampled(self):
+        """Test: una franja diagonal angosta recibe las celdas que cruza aunque no cubra sus centros"""
+        strip = Area.from_geojson({'type': 'Polygon', 'coordinates': [
+            [[-75.98, 4.0], [-75.97, 4.0], [-75.57, 4.4], [-75.58, 4.4], [-75.98, 4.0]]
+        ]})
+
+        size, cells = sample_area(strip, 0.1, 64)
+
+        assert size == 0.1
+        assert 4 <= len(cells) <= 12
+        assert not any(strip.contains(*cell.center) for cell in cells)
+
+
+class TestCheckAreaWeatherUseCase:
+    """Tests del caso de uso"""
+
+    @pytest.fixture
+    def upstream(self):
+        return StormWest(boundary=-75.5, delay=0.05)
+
+    def make_use_case(self, weather_service, **kwargs) -> CheckAreaWeatherUseCase:
+        options = {'cell_size': 0.1, 'max_samples': 64, 'max_workers': 8}
+        options.update(kwargs)
+        use_case = CheckAreaWeatherUseCase(weather_service, **options)
+        return use_case
+
+    def test_adverse_sub_areas_and_one_aggregated_alert(self, upstream):
+        """Test: se listan las sub-áreas adversas y se envía un solo correo y una sola notificación"""
+        email_service = Mock()
+        repository = Mock()
+        use_case = self.make_use_case(upstream, email_service=email_service, notification_repository=repository)
+
+        result = use_case.execute(AreaRequestDTO(
+            area=Area.from_bbox(-75.8, 5.0, -75.2, 5.2), email='alcaldia@example.com', name='Comuna 1'
+        ))
+        use_case.close()
+
+        assert result['sampled_cells'] == 12
+        assert result['adverse_weather'] is True
+        assert len(result['adverse_areas']) == 6
+        assert all(sub_area['bbox'][2] <= -75.5 for sub_area in result['adverse_areas'])
+        assert result['alert'] == {
+            'condition': 'Heavy Rain', 'conditions': {'Heavy Rain': 6}, 'adverse_cells': 6, 'coverage': 0.5
+        }
+        email_service.send_email.assert_called_once()
+        assert 'Comuna 1' in email_service.send_email.call_args.args[1]
+        repository.save.assert_called_once()
+
+    def test_cells_are_fetched_in_parallel(self, upstream):
+        """Test: las celdas se piden a la vez, no una tras otra"""
+        use_case = self.make_use_case(upstream)
+        started = time.monotonic()
+
+        use_case.execute(AreaRequestDTO(area=Area.from_bbox(-75.8, 5.0, -75.2, 5.2)))
+        use_case.close()
+
+        assert upstream.calls == 12
+        assert len(upstream.threads) > 1
+        assert time.monotonic() - started < 12 * upstream.delay
+
+    def test_cached_cells_are_reused(self, upstream):
+        """Test: una segunda área que se superpone solo pide al upstream las celdas nuevas"""
+        cached = CachedWeatherService(weather_service=upstream, cache=InMemoryForecastCache(), ttl=600, cell_size=0.1)
+        use_case = self.make_use_case(cached)
+
+        use_case.execute(AreaRequestDTO(area=Area.from_bbox(-75.8, 5.0, -75.5, 5.2)))
+        use_case.execute(AreaRequestDTO(area=Area.from_bbox(-75.8, 5.0, -75.4, 5.2)))
+        use_case.close()
+
+        assert upstream.calls == 6 + 2
+
+    def test_failed_cells_are_reported(self):
+        """Test: las celdas que fallan se cuentan; si fallan todas, se propaga el error"""
+        weather_service = Mock()
+        weather_service.get_forecast.side_effect = lambda lat, lon: (
+            make_forecast(lat, lon, adverse=True) if lon < -75.5 else (_ for _ in ()).throw(WeatherAPIException('caído'))
+        )
+        use_case = self.make_use_case(weather_service)
+
+        result = use_case.execute(AreaRequestDTO(area=Area.from_bbox(-75.8, 5.0, -75.2, 5.2)))
+        assert result['failed_cells'] == 6
+        assert result['alert']['coverage'] == 1.0
+
+        weather_service.get_forecast.side_effect = WeatherAPIException('caído')
+        with pytest.raises(WeatherAPIException):
+            use_case.execute(AreaRequestDTO(area=Area.from_bbox(-75.8, 5.0, -75.2, 5.2)))
+        use_case.close()
+
+    def test_deadline_reaches_every_cell_and_cuts_the_wait(self):
+        """Test: cada consulta ve el plazo de la solicitud y, agotado, no se espera al resto"""
+        seen = []
+
+        def slow(latitude, longitude):
+            seen.append(current_deadline())
+            time.sleep(0.5)
+            return make_forecast(latitude, longitude, adverse=False)
+
+        weather_service = Mock()
+        weather_service.get_forecast.side_effect = slow
+        use_case = self.make_use_case(weather_service, max_workers=2)
+        started = time.monotonic()
+
+        with pytest.raises(DeadlineExceededException):
+            use_case.execute(AreaRequestDTO(area=Area.from_bbox(-75.8, 5.0, -75.2, 5.2), deadline_seconds=0.1))
+
+        assert time.monotonic() - started < 0.45
+        assert seen and all(deadline is not None and deadline.budget == 0.1 for deadline in seen)
+        use_case.close()
+
+
+class TestCheckAreaRoute:
+    """Tests de POST /check_area"""
+
+    @pytest.fixture
+    def use_case(self):
+        use_case = Mock()
+        use_case.execute.return_value = {'adverse_weather': False}
+        return use_case
+
+    @pytest.fixture
+    def client(self, monkeypatch, use_case):
+        monkeypatch.setenv('API_KEY', 'test-key')
+        routes = WeatherRoutes(
+            check_weather_use_case=Mock(),
+            get_notifications_use_case=Mock(),
+            check_area_use_case=use_case
+        )
+        app = Flask(__name__)
+        app.register_blueprint(routes.get_blueprint())
+        return app.test_client()
+
+    def post(self, client, body):
+        return client.post('/check_area', json=body, headers={'x-api-key': 'test-key'})
+
+    def test_bbox_and_polygon_are_parsed(self, client, use_case):
+        """Test: bbox y polygon llegan al caso de uso como un Area"""
+        assert self.post(client, {'bbox': [-75.8, 5.0, -75.2, 5.2]}).status_code == 200
+        polygon = {'type': 'Polygon', 'coordinates': [[[-75.6, 5.0], [-75.4, 5.0], [-75.5, 5.15], [-75.6, 5.0]]]}
+        assert self.post(client, {'polygon': polygon, 'email': 'a@example.com'}).status_code == 200
+
+        first, second = (call.args[0] for call in use_case.execute.call_args_list)
+        assert first.area.bounds == (-75.8, 5.0, -75.2, 5.2)
+        assert second.area.contains(5.05, -75.5) and second.email == 'a@example.com'
+
+    @pytest.mark.parametrize('body', [
+        {},
+        {'bbox': [-75.2, 5.0, -75.8, 5.2]},
+        {'bbox': [-75.8, 5.0]},
+        {'bbox': [-75.8, 5.0, -75.2, 5.2], 'polygon': {'type': 'Polygon', 'coordinates': []}},
+        {'polygon': {'type': 'LineString', 'coordinates': [[-75, 5], [-74, 5]]}}
+    ])
+    def test_invalid_area_is_a_bad_request(self, client, body):
+        """Test: áreas ausentes, ambiguas o mal formadas responden 400"""
+        assert self.post(client, body).status_code == 400
+
+    def test_upstream_failure_and_deadline(self, client, use_case):
+        """Test: los errores del upstream y el plazo agotado se traducen como en /check_weather"""
+        use_case.execute.side_effect = WeatherAPIException('caído')
+        assert self.post(client, {'bbox': [-75.8, 5.0, -75.2, 5.2]}).status_code == 502
+
+        use_case.execute.side_effect = DeadlineExceededException('weather')
+        response = self.post(client, {'bbox': [-75.8, 5.0, -75.2, 5.2]})
+        assert response.status_code == 504 and response.get_json()['stage'] == 'weather'
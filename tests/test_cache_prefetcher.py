@@ -0,0 +1,203 @@
+"""
+Tests para la demanda por celda y el precalentamiento de la caché
+"""
+import pytest
+from datetime import date, datetime
+from unittest.mock import Mock
+from application.services.cache_prefetcher import CachePrefetcher
+from domain.entities.forecast import Forecast
+from domain.entities.geo_cell import GeoCell
+from domain.entities.notification import Notification
+from domain.services.request_priority import BACKGROUND, background, current_priority
+from infrastructure.cache.forecast_cache import InMemoryForecastCache
+from infrastructure.database.connection import db_connection
+from infrastructure.database.schema import initialize_database
+from infrastructure.external_services.cached_weather_service import CachedWeatherService
+from infrastructure.repositories.cell_demand_repository_impl import CellDemandRepositoryImpl
+from infrastructure.repositories.notification_repository_impl import NotificationRepositoryImpl
+
+
+def make_forecast(latitude=5.07, longitude=-75.52, temperature_c=20.0) -> Forecast:
+    return Forecast(
+        location="Armenia, Colombia",
+        latitude=latitude,
+        longitude=longitude,
+        temperature_c=temperature_c,
+        condition="Heavy Rain",
+        condition_code=1195,
+        is_adverse=True,
+        forecast_date=datetime.now(),
+        humidity=90,
+        wind_kph=30.0
+    )
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Base de datos temporal con el esquema completo"""
+    initialize_database(str(tmp_path / 'demand.db'), stats_cell_size=1.0)
+    yield db_connection.db
+    db_connection.close()
+
+
+class TestCellDemandRepositoryImpl:
+    """Tests de integración de la demanda por celda"""
+
+    @pytest.fixture
+    def repository(self, database):
+        return CellDemandRepositoryImpl(cell_size=0.1, flush_interval=3600)
+
+    def test_hottest_cells_combines_requests_and_notifications(self, repository):
+        """Test: la demanda registrada y las notificaciones suman por celda y hora"""
+        for _ in range(3):
+            repository.record('0.1:950:1044', datetime(2025, 4, 7, 7, 15))
+        repository.record('0.1:946:1059', datetime(2025, 4, 7, 7, 40))
+        repository.record('0.1:946:1059', datetime(2025, 4, 7, 12, 0))
+        NotificationRepositoryImpl().save(Notification(
+            email="test@example.com", latitude=4.65, longitude=-74.05, condition="Heavy Rain",
+            code=1195, sent_at=datetime(2025, 4, 6, 7, 5)
+        ))
+        NotificationRepositoryImpl().save(Notification(
+            email="test@example.com", latitude=4.65, longitude=-74.05, condition="Heavy Rain",
+            code=1195, sent_at=datetime(2025, 4, 6, 7, 30)
+        ))
+
+        assert repository.flush() == 3
+        hottest = repository.hottest_cells(7, since=date(2025, 4, 1), limit=10)
+
+        assert hottest == [('0.1:946:1059', 3), ('0.1:950:1044', 3)]
+        assert repository.hottest_cells(7, since=date(2025, 4, 7), limit=10)[0] == ('0.1:950:1044', 3)
+        assert GeoCell.from_coordinates(4.65, -74.05, 0.1).key == '0.1:946:1059'
+
+    def test_flush_accumulates(self, repository):
+        """Test: volcados sucesivos suman a la misma fila"""
+        repository.record('0.1:950:1044', datetime(2025, 4, 7, 7, 15))
+        repository.flush()
+        repository.record('0.1:950:1044', datetime(2025, 4, 7, 7, 20))
+        repository.flush()
+
+        assert repository.demand_by_cell(date(2025, 4, 7), 7) == {'0.1:950:1044': 2}
+
+    def test_claim_run_once(self, repository):
+        """Test: solo el primer worker obtiene la ejecución"""
+        assert repository.claim_run('2025-04-07T08') is True
+        assert repository.claim_run('2025-04-07T08') is False
+
+    def test_purge_before(self, repository):
+        """Test: la demanda antigua se elimina"""
+        repository.record('0.1:950:1044', datetime(2025, 3, 1, 7, 0))
+        repository.record('0.1:950:1044', datetime(2025, 4, 7, 7, 0))
+        repository.flush()
+
+        assert repository.purge_before(date(2025, 4, 1)) == 1
+
+
+class TestCachePrefetcher:
+    """Tests del precalentamiento"""
+
+    @pytest.fixture
+    def now(self):
+        return {'value': datetime(2025, 4, 7, 7, 52)}
+
+    @pytest.fixture
+    def demand_repository(self):
+        repository = Mock()
+        repository.hottest_cells.return_value = [('0.1:950:1044', 10), ('0.1:946:1059', 4)]
+        repository.claim_run.return_value = True
+        return repository
+
+    @pytest.fixture
+    def weather_service(self):
+        return Mock()
+
+    @pytest.fixture
+    def prefetcher(self, weather_service, demand_repository, now):
+        return CachePrefetcher(weather_service, demand_repository, cells_per_hour=2, lead_minutes=10,
+                               rate_per_second=0, clock=lambda: now['value'])
+
+    def test_tick_before_the_hour_refreshes_hottest_cells(self, prefetcher, weather_service, demand_repository):
+        """Test: dentro del margen se refrescan las celdas calientes como trabajo de fondo"""
+        priorities = []
+        weather_service.refresh.side_effect = lambda lat, lon: priorities.append(current_priority())
+
+        report = prefetcher.tick()
+
+        assert report['refreshed'] == 2
+        assert report['hour'] == '2025-04-07 08:00'
+        demand_repository.claim_run.assert_called_once_with('2025-04-07T08')
+        assert demand_repository.hottest_cells.call_args[0] == (8, date(2025, 3, 24), 2)
+        weather_service.refresh.assert_any_call(*GeoCell.from_key('0.1:950:1044').center)
+        assert priorities == [BACKGROUND, BACKGROUND]
+
+    def test_tick_outside_window_or_repeated(self, prefetcher, demand_repository, now):
+        """Test: fuera del margen o ya ejecutada, la hora no se vuelve a precalentar"""
+        now['value'] = datetime(2025, 4, 7, 7, 30)
+        assert prefetcher.tick() is None
+
+        now['value'] = datetime(2025, 4, 7, 7, 52)
+        prefetcher.tick()
+        now['value'] = datetime(2025, 4, 7, 7, 55)
+        assert prefetcher.tick() is None
+        assert demand_repository.claim_run.call_count == 1
+        assert demand_repository.flush.call_count == 3
+
+    def test_run_claimed_by_another_worker(self, prefetcher, weather_service, demand_repository):
+        """Test: si otro worker reclamó la hora no se llama al upstream"""
+        demand_repository.claim_run.return_value = False
+
+        assert prefetcher.tick() is None
+        weather_service.refresh.assert_not_called()
+
+    def test_stops_after_consecutive_errors(self, prefetcher, weather_service, demand_repository):
+        """Test: errores seguidos (p. ej. cuota reservada) interrumpen la ejecución"""
+        demand_repository.hottest_cells.return_value = [(f'0.1:950:{col}', 1) for col in range(20)]
+        prefetcher.cells_per_hour = 20
+        weather_service.refresh.side_effect = RuntimeError('cuota')
+
+        report = prefetcher.tick()
+
+        assert report['errors'] == CachePrefetcher.MAX_CONSECUTIVE_ERRORS
+        assert weather_service.refresh.call_count == CachePrefetcher.MAX_CONSECUTIVE_ERRORS
+
+    def test_report_coverage_once_hour_started(self, prefetcher, demand_repository, now):
+        """Test: el reporte indica cuánta demanda de la hora cayó en celdas precalentadas"""
+        prefetcher.tick()
+        demand_repository.demand_by_cell.return_value = {'0.1:950:1044': 30, '0.1:900:1000': 10}
+        assert 'coverage' not in prefetcher.report()
+
+        now['value'] = datetime(2025, 4, 7, 8, 30)
+        report = prefetcher.report()
+
+        assert report['requests_in_hour'] == 40
+        assert report['requests_on_prefetched_cells'] == 30
+        assert report['prefetched_cells_requested'] == 1
+        assert report['coverage'] == 0.75
+
+
+class TestCachedWeatherServiceDemand:
+    """Tests del registro de demanda y del refresco forzado"""
+
+    def test_refresh_overwrites_fresh_entry(self):
+        """Test: refresh trae el pronóstico aunque la entrada siga vigente"""
+        upstream = Mock()
+        upstream.get_forecast.side_effect = [make_forecast(temperature_c=20.0), make_forecast(temperature_c=25.0)]
+        service = CachedWeatherService(upstream, InMemoryForecastCache(), ttl=600, cell_size=0.1)
+
+        service.get_forecast(5.07, -75.52)
+        service.refresh(5.05, -75.55)
+
+        assert service.get_forecast(5.07, -75.52).temperature_c == 25.0
+
+    def test_background_requests_are_not_demand(self):
+        """Test: el trabajo de fondo no cuenta como demanda"""
+        demand = Mock()
+        upstream = Mock()
+        upstream.get_forecast.return_value = make_forecast()
+        service = CachedWeatherService(upstream, InMemoryForecastCache(), cell_size=0.1, demand_repository=demand)
+
+        service.get_forecast(5.07, -75.52)
+        with background():
+            service.get_forecast(5.07, -75.52)
+
+        assert demand.record.call_count == 1
+        assert demand.record.call_args[0][0] == '0.1:950:1044'
@@ -0,0 +1,60 @@
+"""
+Tests para FindNearbyNotificationsUseCase
+"""
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+from application.use_cases.find_nearby_notifications_use_case import FindNearbyNotificationsUseCase
+from domain.entities.notification import Notification
+
+
+class TestFindNearbyNotificationsUseCase:
+    """Tests para el caso de uso de alertas cercanas"""
+
+    @pytest.fixture
+    def mock_notification_repository(self):
+        return Mock()
+
+    @pytest.fixture
+    def use_case(self, mock_notification_repository):
+        return FindNearbyNotificationsUseCase(notification_repository=mock_notification_repository)
+
+    def test_execute_returns_dtos(self, use_case, mock_notification_repository):
+        """Test: convierte las notificaciones encontradas a DTOs"""
+        mock_notification_repository.find_near.return_value = [
+            Notification(
+                id=1,
+                email="test@example.com",
+                latitude=5.07,
+                longitude=-75.52,
+                condition="Heavy Rain",
+                code=1195,
+                sent_at=datetime(2025, 4, 7, 10, 0, 0)
+            )
+        ]
+
+        result = use_case.execute(5.07, -75.52, 20, since_hours=24)
+
+        assert result.notifications[0].sent_at == '2025-04-07 10:00:00'
+        latitude, longitude, radius, since = mock_notification_repository.find_near.call_args[0]
+        assert (latitude, longitude, radius) == (5.07, -75.52, 20)
+        assert since is not None
+
+    def test_execute_without_since(self, use_case, mock_notification_repository):
+        """Test: sin since_hours no se filtra por fecha"""
+        mock_notification_repository.find_near.return_value = []
+
+        use_case.execute(5.07, -75.52, 20)
+
+        assert mock_notification_repository.find_near.call_args[0][3] is None
+
+    @pytest.mark.parametrize('latitude,longitude,radius', [
+        (91, -75.52, 20),
+        (5.07, -181, 20),
+        (5.07, -75.52, 0),
+        (5.07, -75.52, 501)
+    ])
+    def test_execute_with_invalid_parameters(self, use_case, latitude, longitude, radius):
+        """Test: parámetros fuera de rango lanzan ValueError"""
+        with pytest.raises(ValueError):
+            use_case.execute(latitude, longitude, radius)
@@ -0,0 +1,211 @@
+"""
+Tests para la caché compartida de pronósticos
+"""
+import threading
+import time
+import pytest
+from datetime import datetime
+from domain.entities.forecast import Forecast
+from infrastructure.cache.forecast_cache import InMemoryForecastCache, TieredForecastCache
+from infrastructure.cache.sqlite_forecast_cache import SQLiteForecastCache, encode_forecast, decode_forecast
+from domain.services.deadline import DeadlineExceededException, deadline
+from infrastructure.external_services.cached_weather_service import CachedWeatherService
+from infrastructure.external_services.weather_api_service import WeatherAPIException
+
+
+def make_forecast(latitude=5.07, longitude=-75.52, humidity=90, wind_kph=30.5) -> Forecast:
+    return Forecast(
+        location="Armenia, Colombia",
+        latitude=latitude,
+        longitude=longitude,
+        temperature_c=20.5,
+        condition="Lluvia fuerte",
+        condition_code=1195,
+        is_adverse=True,
+        forecast_date=datetime(2025, 4, 7, 10, 0, 0),
+        humidity=humidity,
+        wind_kph=wind_kph
+    )
+
+
+class FakeClock:
+    """Reloj manual para probar expiraciones"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSQLiteForecastCache:
+    """Tests para la caché SQLite compartida"""
+
+    @pytest.fixture
+    def cache_path(self, tmp_path):
+        return str(tmp_path / 'forecast_cache.db')
+
+    def test_encode_decode_roundtrip(self):
+        """Test: la serialización compacta conserva los campos"""
+        forecast = make_forecast()
+
+        payload = encode_forecast(forecast)
+
+        assert decode_forecast(payload) == forecast
+        assert len(payload) < 80
+
+    def test_encode_optional_fields(self):
+        """Test: humedad y viento nulos sobreviven la serialización"""
+        forecast = make_forecast(humidity=None, wind_kph=None)
+
+        assert decode_forecast(encode_forecast(forecast)) == forecast
+
+    def test_ttl_expiration_and_stale_reads(self, cache_path):
+        """Test: las entradas expiran pero siguen disponibles como respaldo"""
+        clock = FakeClock()
+        cache = SQLiteForecastCache(cache_path, clock=clock)
+        cache.set('0.1:950:1044', make_forecast(), ttl=60)
+
+        assert cache.get('0.1:950:1044') is not None
+        clock.now += 61
+        assert cache.get('0.1:950:1044') is None
+        assert cache.get_stale('0.1:950:1044', max_stale=600) is not None
+
+    def test_shared_between_instances_and_restarts(self, cache_path):
+        """Test: otro proceso (o un reinicio) ve las entradas guardadas"""
+        SQLiteForecastCache(cache_path).set('0.1:950:1044', make_forecast(), ttl=60)
+
+        reopened = SQLiteForecastCache(cache_path)
+
+        assert reopened.get('0.1:950:1044').condition == "Lluvia fuerte"
+
+    def test_purge_expired(self, cache_path):
+        """Test: la purga elimina entradas vencidas más allá de max_stale"""
+        clock = FakeClock()
+        cache = SQLiteForecastCache(cache_path, max_stale=10, clock=clock)
+        cache.set('a', make_forecast(), ttl=1)
+        cache.set('b', make_forecast(), ttl=100)
+        clock.now += 20
+
+        assert cache.purge_expired() == 1
+        assert len(cache) == 1
+
+    def test_tiered_cache_fills_local_level(self, cache_path):
+        """Test: un acierto en la caché compartida llena la caché local"""
+        shared = SQLiteForecastCache(cache_path)
+        local = InMemoryForecastCache()
+        shared.set('k', make_forecast(), ttl=60)
+        cache = TieredForecastCache(local=local, shared=shared)
+
+        assert cache.get('k') is not None
+        assert local.get('k') is not None
+
+
+class TestCachedWeatherService:
+    """Tests para el decorador de caché del servicio de clima"""
+
+    def test_second_call_in_same_cell_is_a_hit(self):
+        """Test: una coordenada cercana reutiliza el pronóstico de la celda"""
+        calls = []
+
+        class FakeService:
+            def get_forecast(self, latitude, longitude):
+                calls.append((latitude, longitude))
+                return make_forecast(latitude, longitude)
+
+        service = CachedWeatherService(FakeService(), InMemoryForecastCache(), ttl=60, cell_size=0.1)
+
+        service.get_forecast(5.07, -75.52)
+        forecast = service.get_forecast(5.071, -75.521)
+
+        assert len(calls) == 1
+        assert forecast.latitude == 5.071
+        assert service.hit_rate() == 0.5
+
+    def test_single_flight_on_concurrent_misses(self):
+        """Test: varios hilos con la misma celda fría hacen una sola llamada"""
+        calls = []
+
+        class SlowService:
+            def get_forecast(self, latitude, longitude):
+                calls.append(1)
+                time.sleep(0.1)
+                return make_forecast(latitude, longitude)
+
+        service = CachedWeatherService(SlowService(), InMemoryForecastCache(), ttl=60)
+        threads = [threading.Thread(target=service.get_forecast, args=(5.07, -75.52)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+
+    def test_waiting_for_another_call_uses_only_the_remaining_budget(self):
+        """Test: quien espera la llamada de otro hilo corta con su plazo, y otra celda no espera"""
+        started = threading.Event()
+        release = threading.Event()
+
+        class SlowService:
+            def get_forecast(self, latitude, longitude):
+                if latitude == 5.07:
+                    started.set()
+                    release.wait(5)
+                return make_forecast(latitude, longitude)
+
+        service = CachedWeatherService(SlowService(), InMemoryForecastCache(), ttl=60)
+        leader = threading.Thread(target=service.get_forecast, args=(5.07, -75.52))
+        leader.start()
+        assert started.wait(2)
+        try:
+            began = time.monotonic()
+            with deadline(0.1):
+                with pytest.raises(DeadlineExceededException):
+                    service.get_forecast(5.071, -75.521)
+            assert time.monotonic() - began < 1
+
+            # Más de 64 celdas distintas: ninguna comparte espera con la celda ocupada
+            for row in range(100):
+                service.get_forecast(-30.0 + row, 10.0)
+        finally:
+            release.set()
+            leader.join()
+
+    def test_waiter_retries_when_the_call_it_waited_for_fails(self):
+        """Test: si la llamada en curso falla, el que esperaba intenta por su cuenta"""
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        class FlakyService:
+            def get_forecast(self, latitude, longitude):
+                calls.append(1)
+                if len(calls) == 1:
+                    started.set()
+                    release.wait(5)
+                    raise WeatherAPIException("timeout")
+                return make_forecast(latitude, longitude)
+
+        service = CachedWeatherService(FlakyService(), InMemoryForecastCache(), ttl=60)
+        errors = []
+
+        def lead():
+            try:
+                service.get_forecast(5.07, -75.52)
+            except WeatherAPIException as e:
+                errors.append(e)
+
+        leader = threading.Thread(target=lead)
+        leader.start()
+        assert started.wait(2)
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(service.get_forecast(5.071, -75.521)))
+        waiter.start()
+        time.sleep(0.05)
+        release.set()
+        leader.join()
+        waiter.join()
+
+        assert len(calls) == 2
+        assert len(errors) == 1
+        assert results[0].latitude == 5.071
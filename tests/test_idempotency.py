@@ -0,0 +1,309 @@
+"""
+Tests para IdempotencyStore y la Idempotency-Key de POST /check_weather
+"""
+import threading
+import pytest
+from unittest.mock import Mock
+from flask import Flask
+from infrastructure.cache.idempotency_store import (
+    IdempotencyStore,
+    IdempotencyKeyConflictException,
+    IdempotencyKeyInProgressException
+)
+from infrastructure.cache.sqlite_idempotency_store import SQLiteIdempotencyStore
+from presentation.routes.weather_routes import WeatherRoutes
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestIdempotencyStore:
+    """Tests del almacén de respuestas por clave"""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def store(self, clock):
+        return IdempotencyStore(ttl=60, max_entries=3, wait_timeout=1, clock=clock)
+
+    def test_duplicate_replays_stored_result(self, store):
+        """Test: el segundo intento no vuelve a ejecutar"""
+        func = Mock(return_value='ok')
+
+        assert store.execute('key', 'fp', func) == ('ok', False)
+        assert store.execute('key', 'fp', func) == ('ok', True)
+        assert func.call_count == 1
+
+    def test_different_request_with_same_key_conflicts(self, store):
+        """Test: reutilizar la clave con otro cuerpo es un error"""
+        store.execute('key', 'fp', lambda: 'ok')
+
+        with pytest.raises(IdempotencyKeyConflictException):
+            store.execute('key', 'other', lambda: 'ok')
+
+    def test_concurrent_duplicate_waits_for_in_flight(self, store):
+        """Test: un duplicado concurrente espera y recibe el resultado original"""
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            started.set()
+            release.wait(2)
+            return 'ok'
+
+        results = []
+        first = threading.Thread(target=lambda: results.append(store.execute('key', 'fp', slow)))
+        first.start()
+        started.wait(2)
+        second = threading.Thread(target=lambda: results.append(store.execute('key', 'fp', slow)))
+        second.start()
+        release.set()
+        first.join()
+        second.join()
+
+        assert len(calls) == 1
+        assert sorted(results) == [('ok', False), ('ok', True)]
+
+    def test_wait_timeout(self, store):
+        """Test: si la ejecución original no termina a tiempo el duplicado recibe un error"""
+        started = threading.Event()
+        release = threading.Event()
+        store.wait_timeout = 0.05
+
+        def slow():
+            started.set()
+            release.wait(2)
+            return 'ok'
+
+        first = threading.Thread(target=store.execute, args=('key', 'fp', slow))
+        first.start()
+        started.wait(2)
+        try:
+            with pytest.raises(IdempotencyKeyInProgressException):
+                store.execute('key', 'fp', slow)
+        finally:
+            release.set()
+            first.join()
+
+    def test_failures_and_unstored_results_release_the_key(self, store):
+        """Test: una excepción o un resultado no guardable permiten reintentar"""
+        with pytest.raises(RuntimeError):
+            store.execute('key', 'fp', Mock(side_effect=RuntimeError('boom')))
+
+        assert store.execute('key', 'fp', lambda: 503, should_store=lambda r: r < 500) == (503, False)
+        assert store.execute('key', 'fp', lambda: 200, should_store=lambda r: r < 500) == (200, False)
+        assert store.execute('key', 'fp', lambda: 500) == (200, True)
+
+    def test_entries_expire_and_are_bounded(self, store, clock):
+        """Test: las entradas expiran con el TTL y el almacén no supera max_entries"""
+        store.execute('key', 'fp', lambda: 'first')
+        clock.now += 61
+        assert store.execute('key', 'fp', lambda: 'second') == ('second', False)
+
+        for index in range(10):
+            store.execute(f'key-{index}', 'fp', lambda: 'ok')
+        assert len(store) == 3
+
+
+class TestSQLiteIdempotencyStore:
+    """Tests del almacén compartido: dos instancias sobre un archivo hacen de dos workers"""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def workers(self, tmp_path, clock):
+        path = str(tmp_path / 'idempotency.db')
+        return [
+            SQLiteIdempotencyStore(path, ttl=60, max_entries=3, wait_timeout=1, lease_seconds=30,
+                                   poll_interval=0.01, purge_every=1, clock=clock)
+            for _ in range(2)
+        ]
+
+    def test_retry_on_another_worker_replays(self, workers):
+        """Test: el reintento que llega a otro worker no vuelve a ejecutar"""
+        func = Mock(return_value=({'alert_sent': True}, 200))
+
+        body, status = workers[0].execute('key', 'fp', func)[0]
+        (replayed_body, replayed_status), replayed = workers[1].execute('key', 'fp', func)
+
+        assert (replayed_body, replayed_status, replayed) == (body, status, True)
+        assert func.call_count == 1
+
+    def test_conflict_across_workers(self, workers):
+        """Test: la misma clave con otro cuerpo en otro worker es un error"""
+        workers[0].execute('key', 'fp', lambda: 'ok')
+
+        with pytest.raises(IdempotencyKeyConflictException):
+            workers[1].execute('key', 'other', lambda: 'ok')
+
+    def test_concurrent_duplicate_on_another_worker_waits(self, workers):
+        """Test: el duplicado en otro worker espera la ejecución en curso y recibe su resultado"""
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            started.set()
+            release.wait(2)
+            return 'ok'
+
+        results = []
+        first = threading.Thread(target=lambda: results.append(workers[0].execute('key', 'fp', slow)))
+        first.start()
+        started.wait(2)
+        second = threading.Thread(target=lambda: results.append(workers[1].execute('key', 'fp', slow)))
+        second.start()
+        release.set()
+        first.join()
+        second.join()
+
+        assert len(calls) == 1
+        assert sorted(results) == [('ok', False), ('ok', True)]
+
+    def test_wait_timeout_across_workers(self, workers):
+        """Test: si la ejecución del otro worker no termina a tiempo se responde en curso"""
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(3)
+            return 'ok'
+
+        first = threading.Thread(target=workers[0].execute, args=('key', 'fp', slow))
+        first.start()
+        started.wait(2)
+        try:
+            with pytest.raises(IdempotencyKeyInProgressException):
+                workers[1].execute('key', 'fp', slow)
+        finally:
+            release.set()
+            first.join()
+
+    def test_failures_release_the_key_for_other_workers(self, workers):
+        """Test: una excepción o un resultado no guardable dejan reintentar en otro worker"""
+        with pytest.raises(RuntimeError):
+            workers[0].execute('key', 'fp', Mock(side_effect=RuntimeError('boom')))
+        assert workers[0].execute('key', 'fp', lambda: 503, should_store=lambda r: r < 500) == (503, False)
+
+        assert workers[1].execute('key', 'fp', lambda: 200) == (200, False)
+
+    def test_abandoned_claim_expires_with_the_lease(self, workers, clock):
+        """Test: la clave de un worker que murió a mitad de la ejecución se libera al vencer"""
+        workers[0]._claim('key', 'fp', 'dead-worker')
+        clock.now += 31
+
+        assert workers[1].execute('key', 'fp', lambda: 'ok') == ('ok', False)
+
+    def test_entries_expire_and_are_bounded(self, workers, clock):
+        """Test: los resultados expiran con el TTL y el archivo no supera max_entries"""
+        workers[0].execute('key', 'fp', lambda: 'first')
+        clock.now += 61
+        assert workers[1].execute('key', 'fp', lambda: 'second') == ('second', False)
+
+        for index in range(10):
+            workers[index % 2].execute(f'key-{index}', 'fp', lambda: 'ok')
+        assert len(workers[0]) == 3
+
+
+class TestCheckWeatherIdempotency:
+    """Tests de la cabecera Idempotency-Key en la ruta"""
+
+    @pytest.fixture
+    def mock_check_weather_use_case(self):
+        use_case = Mock()
+        use_case.execute.return_value = {'alert_sent': True, 'message': 'Alerta enviada'}
+        return use_case
+
+    @pytest.fixture
+    def client(self, monkeypatch, mock_check_weather_use_case):
+        monkeypatch.setenv('API_KEY', 'test-key')
+        routes = WeatherRoutes(
+            check_weather_use_case=mock_check_weather_use_case,
+            get_notifications_use_case=Mock(),
+            idempotency_store=IdempotencyStore(ttl=60)
+        )
+        app = Flask(__name__)
+        app.register_blueprint(routes.get_blueprint())
+        return app.test_client()
+
+    def post(self, client, body, key=None):
+        headers = {'x-api-key': 'test-key'}
+        if key:
+            headers['Idempotency-Key'] = key
+        return client.post('/check_weather', json=body, headers=headers)
+
+    def test_retry_replays_response(self, client, mock_check_weather_use_case):
+        """Test: el reintento con la misma clave no ejecuta el caso de uso otra vez"""
+        body = {'latitude': 5.07, 'longitude': -75.52, 'email': 'test@example.com'}
+
+        first = self.post(client, body, key='abc')
+        retry = self.post(client, dict(reversed(list(body.items()))), key='abc')
+
+        assert first.status_code == retry.status_code == 200
+        assert retry.get_json() == first.get_json()
+        assert first.headers['Idempotent-Replayed'] == 'false'
+        assert retry.headers['Idempotent-Replayed'] == 'true'
+        assert mock_check_weather_use_case.execute.call_count == 1
+
+    def test_key_reused_with_other_body(self, client):
+        """Test: la misma clave con otro cuerpo responde 422"""
+        self.post(client, {'latitude': 5.07, 'longitude': -75.52, 'email': 'test@example.com'}, key='abc')
+
+        response = self.post(client, {'latitude': 4.6, 'longitude': -74.1, 'email': 'test@example.com'}, key='abc')
+
+        assert response.status_code == 422
+
+    def test_without_key_always_executes(self, client, mock_check_weather_use_case):
+        """Test: sin cabecera cada solicitud se ejecuta"""
+        body = {'latitude': 5.07, 'longitude': -75.52, 'email': 'test@example.com'}
+
+        self.post(client, body)
+        self.post(client, body)
+
+        assert mock_check_weather_use_case.execute.call_count == 2
+
+    def test_server_errors_are_not_stored(self, client, mock_check_weather_use_case):
+        """Test: un 5xx no se guarda y el reintento vuelve a ejecutar"""
+        body = {'latitude': 5.07, 'longitude': -75.52, 'email': 'test@example.com'}
+        mock_check_weather_use_case.execute.side_effect = [RuntimeError('boom'), {'alert_sent': False}]
+
+        assert self.post(client, body, key='abc').status_code == 500
+        assert self.post(client, body, key='abc').status_code == 200
+        assert mock_check_weather_use_case.execute.call_count == 2
+
+    def test_retry_on_another_worker_is_replayed(self, monkeypatch, tmp_path, mock_check_weather_use_case):
+        """Test: con el almacén compartido, el reintento en otro worker repite la respuesta sin reenviar"""
+        monkeypatch.setenv('API_KEY', 'test-key')
+        path = str(tmp_path / 'idempotency.db')
+        clients = []
+        for _ in range(2):
+            routes = WeatherRoutes(
+                check_weather_use_case=mock_check_weather_use_case,
+                get_notifications_use_case=Mock(),
+                idempotency_store=SQLiteIdempotencyStore(path, ttl=60)
+            )
+            app = Flask(__name__)
+            app.register_blueprint(routes.get_blueprint())
+            clients.append(app.test_client())
+        body = {'latitude': 5.07, 'longitude': -75.52, 'email': 'test@example.com'}
+
+        first = self.post(clients[0], body, key='abc')
+        retry = self.post(clients[1], body, key='abc')
+
+        assert first.status_code == retry.status_code == 200
+        assert retry.get_json() == first.get_json()
+        assert retry.headers['Idempotent-Replayed'] == 'true'
+        assert mock_check_weather_use_case.execute.call_count == 1
@@ -0,0 +1,111 @@
+"""
+Tests para los ganchos de ciclo de vida y los pools reinicializables
+"""
+import os
+import threading
+from benchmarks.smtp_sink import SMTPSink
+from infrastructure.external_services.email_service import EmailService
+from infrastructure.runtime import lifecycle
+from infrastructure.runtime.lifecycle import (
+    register_after_fork, register_shutdown, run_background_starts, run_shutdown_hooks, start_background
+)
+
+
+class Ticker:
+    """Hilo de fondo mínimo, como los del barrido o el broker"""
+
+    def __init__(self):
+        self.started_in = []
+        self._stop = threading.Event()
+
+    def start(self) -> 'Ticker':
+        self.started_in.append(os.getpid())
+        threading.Thread(target=self._stop.wait, name='ticker', daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+
+class TestLifecycle:
+    """Tests para la reinicialización tras fork y el drenado al apagar"""
+
+    def test_after_fork_hooks_run_in_child(self):
+        """Test: los ganchos post-fork se ejecutan en el hijo, no en el padre"""
+        calls = []
+        register_after_fork(lambda: calls.append(os.getpid()))
+        read_end, write_end = os.pipe()
+
+        pid = os.fork()
+        if pid == 0:
+            os.write(write_end, str(len(calls)).encode())
+            os._exit(0)
+
+        os.close(write_end)
+        child_calls = os.read(read_end, 16)
+        os.waitpid(pid, 0)
+
+        assert child_calls == b'1'
+        assert calls == []
+
+    def test_shutdown_hooks_run_once_in_reverse_order(self):
+        """Test: los ganchos de apagado corren en orden inverso y una sola vez"""
+        calls = []
+        register_shutdown(lambda: calls.append('first'))
+        register_shutdown(lambda: calls.append('second'))
+
+        run_shutdown_hooks()
+        run_shutdown_hooks()
+
+        assert calls == ['second', 'first']
+
+    def test_background_starts_immediately_by_default(self):
+        """Test: sin precarga (flask run, tests) los hilos de fondo arrancan al crearse"""
+        ticker = Ticker()
+
+        start_background(ticker.start)
+
+        assert ticker.started_in == [os.getpid()]
+        ticker.stop()
+
+    def test_deferred_background_starts_only_in_workers(self, monkeypatch):
+        """Test: con la precarga de gunicorn el maestro no arranca hilos; cada worker arranca los suyos"""
+        monkeypatch.setattr(lifecycle, '_defer_background', True)
+        monkeypatch.setattr(lifecycle, '_background', [])
+        ticker = Ticker()
+        start_background(ticker.start)
+        read_end, write_end = os.pipe()
+
+        pid = os.fork()
+        if pid == 0:
+            run_background_starts()
+            running = any(thread.name == 'ticker' for thread in threading.enumerate())
+            os.write(write_end, b'1' if running and ticker.started_in == [os.getpid()] else b'0')
+            os._exit(0)
+
+        os.close(write_end)
+        child_started = os.read(read_end, 16)
+        os.waitpid(pid, 0)
+
+        assert child_started == b'1'
+        assert ticker.started_in == []
+        assert not any(thread.name == 'ticker' for thread in threading.enumerate())
+
+    def test_smtp_pool_reuses_connections(self):
+        """Test: con pool, varios envíos reutilizan una sola conexión SMTP"""
+        with SMTPSink() as sink:
+            service = EmailService(
+                server=sink.host,
+                port=sink.port,
+                username='bench@localhost',
+                password='secret',
+                use_tls=False,
+                pool_size=2
+            )
+
+            for _ in range(3):
+                service.send_email('test@example.com', 'Asunto', 'Cuerpo')
+            service.close()
+
+        assert sink.messages_received == 3
+        assert sink.connections == 1
@@ -0,0 +1,100 @@
+"""
+Tests para el harness de pruebas de carga
+"""
+import os
+import time
+import pytest
+from benchmarks.fake_weather_api import FakeWeatherAPIServer
+from benchmarks.smtp_sink import SMTPSink
+from benchmarks.load_test import LoadTestConfig, percentile, parse_mix, run_load_test
+from benchmarks.repository_bench import RepositoryBenchConfig, run_repository_bench
+from infrastructure.external_services.weather_api_service import WeatherAPIService, WeatherAPIException
+from infrastructure.external_services.email_service import EmailService
+
+
+class TestLoadHarness:
+    """Tests para los servidores falsos y el reporte de carga"""
+
+    def test_percentile_nearest_rank(self):
+        """Test: percentiles por rango más cercano"""
+        values = list(range(1, 101))
+
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile(values, 99) == 99
+        assert percentile([], 99) == 0.0
+
+    def test_parse_mix_rejects_unknown_endpoint(self):
+        """Test: el mix solo acepta endpoints conocidos"""
+        assert parse_mix('check_weather=1,notifications=3') == {'check_weather': 1.0, 'notifications': 3.0}
+
+        with pytest.raises(ValueError):
+            parse_mix('unknown=1')
+
+    def test_fake_weather_api_is_parsed_by_service(self):
+        """Test: la respuesta falsa es compatible con WeatherAPIService"""
+        with FakeWeatherAPIServer(adverse_rate=1.0, seed=7) as server:
+            service = WeatherAPIService(api_key='fake', api_url=server.url)
+
+            forecast = service.get_forecast(5.07, -75.52)
+
+        assert forecast.is_adverse is True
+        assert forecast.latitude == 5.07
+        assert server.requests_served == 1
+
+    def test_fake_weather_api_error_rate(self):
+        """Test: con error_rate=1 todas las llamadas fallan"""
+        with FakeWeatherAPIServer(error_rate=1.0) as server:
+            service = WeatherAPIService(api_key='fake', api_url=server.url)
+
+            with pytest.raises(WeatherAPIException):
+                service.get_forecast(5.07, -75.52)
+
+    def test_smtp_sink_receives_email(self):
+        """Test: EmailService entrega mensajes al sumidero SMTP"""
+        with SMTPSink(keep_messages=True) as sink:
+            service = EmailService(
+                server=sink.host,
+                port=sink.port,
+                username='bench@localhost',
+                password='secret',
+                use_tls=False
+            )
+
+            service.send_email('test@example.com', 'Asunto', 'Cuerpo')
+
+        assert sink.messages_received == 1
+        assert b'Subject: Asunto' in sink.messages[0]
+
+    def test_run_load_test_reports_percentiles(self, monkeypatch):
+        """Test: una corrida corta reporta throughput y percentiles y deja el entorno como estaba"""
+        monkeypatch.setenv('API_KEY', 'outer-key')
+        monkeypatch.delenv('DATABASE_NAME', raising=False)
+        before = dict(os.environ)
+
+        report = run_load_test(LoadTestConfig(duration=0.5, concurrency=2, weather_latency_ms=0,
+                                              weather_jitter_ms=0, adverse_rate=1.0))
+
+        assert dict(os.environ) == before
+        assert report['total_requests'] > 0
+        for summary in report['endpoints'].values():
+            assert summary['errors'] == 0
+            assert summary['p50_ms'] <= summary['p95_ms'] <= summary['p99_ms']
+
+    def test_repository_bench_runs_the_same_workload(self):
+        """Test: las dos implementaciones corren la misma carga y leen las mismas filas"""
+        report = run_repository_bench(RepositoryBenchConfig(rows=200, recipients=10, iterations=20))
+
+        peewee, prepared = report['implementations']['peewee'], report['implementations']['prepared']
+        assert peewee['find_by_email']['rows_returned'] == prepared['find_by_email']['rows_returned'] > 0
+        assert peewee['save']['operations'] == prepared['save']['operations'] == 20
+        assert set(report['speedup']) == {'find_by_email', 'save'}
+
+    def test_fake_weather_api_tolerates_clients_that_give_up(self, capsys):
+        """Test: un cliente que corta la conexión antes de la respuesta no deja trazas en el servidor falso"""
+        with FakeWeatherAPIServer(latency_ms=200, jitter_ms=0) as server:
+            with pytest.raises(WeatherAPIException):
+                WeatherAPIService(api_key='fake', api_url=server.url, timeout=0.05).get_forecast(5.07, -75.52)
+            time.sleep(0.3)
+
+        assert 'Traceback' not in capsys.readouterr().err
@@ -0,0 +1,225 @@
+"""
+Tests para la instrumentación de memoria y los presupuestos por componente
+"""
+import os
+import smtplib
+import sys
+import threading
+import pytest
+from datetime import datetime
+from flask import Flask
+from domain.entities.forecast import Forecast
+from domain.entities.notification import Notification
+from infrastructure.cache.forecast_cache import InMemoryForecastCache
+from infrastructure.cache.idempotency_store import IdempotencyStore
+from infrastructure.external_services.email_service import EmailService
+from infrastructure.monitoring.access_log import AccessLogger
+from infrastructure.monitoring.memory_monitor import MemoryMonitor, deep_sizeof, module_group, PROJECT_ROOT
+from infrastructure.streaming.notification_broker import NotificationBroker
+from presentation.routes.admin_routes import AdminRoutes
+
+
+def make_forecast(location="Manizales, Colombia"):
+    return Forecast(
+        location=location,
+        latitude=5.07,
+        longitude=-75.52,
+        temperature_c=18.0,
+        condition="Heavy rain",
+        condition_code=1195,
+        is_adverse=True,
+        forecast_date=datetime(2025, 1, 1, 8, 0)
+    )
+
+
+@pytest.fixture
+def cache():
+    cache = InMemoryForecastCache()
+    for index in range(200):
+        cache.set(f"0.1:{index}:0", make_forecast(f"Celda {index}"), ttl=600)
+    return cache
+
+
+class TestSizeAccounting:
+    """Tests de la estimación de tamaños"""
+
+    def test_deep_sizeof_counts_nested_objects(self):
+        """Test: el tamaño incluye lo que el objeto referencia"""
+        small = [b'x']
+        large = [b'x' * 10000]
+
+        assert deep_sizeof(large) - deep_sizeof(small) >= 9999
+
+    def test_cache_usage_grows_with_entries(self, cache):
+        """Test: la caché reporta más bytes con más entradas"""
+        empty = InMemoryForecastCache()
+
+        assert cache.memory_usage() > empty.memory_usage() + 200 * deep_sizeof(make_forecast()) // 2
+
+    def test_cache_shrink_evicts_least_recently_used(self, cache):
+        """Test: reducir a la mitad desaloja las entradas más viejas"""
+        cache.get("0.1:199:0")
+        evicted = cache.shrink(cache.memory_usage() // 2)
+
+        assert evicted >= 90
+        assert cache.get("0.1:0:0") is None
+        assert cache.get("0.1:199:0") is not None
+
+    def test_idempotency_shrink_keeps_in_flight_entries(self):
+        """Test: el almacén de idempotencia solo desaloja respuestas terminadas"""
+        store = IdempotencyStore(ttl=60)
+        for index in range(50):
+            store.execute(f"key-{index}", "fp", lambda: {'ok': True})
+
+        evicted = store.shrink(0)
+
+        assert evicted == 50
+        assert len(store) == 0
+
+    def test_smtp_pool_shrink_closes_only_the_oldest_idle_connections(self):
+        """Test: el pool SMTP cierra las conexiones ociosas más viejas hasta su presupuesto, no todas"""
+        service = EmailService('localhost', 25, 'user', 'secret', pool_size=4)
+        connections = [smtplib.SMTP() for _ in range(4)]
+        service._pool = [(connection, 100.0 + index) for index, connection in enumerate(connections)]
+        usage = service.memory_usage()
+        per_connection = (usage - sys.getsizeof(service._pool)) // 4
+        budget = usage - per_connection - per_connection // 2
+
+        assert service.shrink(usage) == 0
+        assert service.shrink(budget) == 2
+        assert [connection for connection, _ in service._pool] == connections[2:]
+        assert service.memory_usage() <= budget
+
+    def test_access_log_usage_follows_the_queue(self, tmp_path):
+        """Test: el log de acceso mide los registros que esperan al hilo de escritura"""
+        access_logger = AccessLogger(path=str(tmp_path / 'access.log'))
+        assert access_logger.memory_usage() == 0
+        release = threading.Event()
+        access_logger._write = lambda records: release.wait(5)
+        access_logger.start()
+        try:
+            access_logger.log({'path': '/check_weather', 'status': 200})
+            empty = access_logger.memory_usage()
+            for index in range(200):
+                access_logger.log({'path': f'/notifications/{index}', 'status': 200})
+
+            assert access_logger.memory_usage() > empty + 200 * 100
+        finally:
+            release.set()
+            access_logger.stop()
+
+    def test_notification_stream_usage_follows_subscriber_queues(self):
+        """Test: el broker mide lo encolado para los streams y lo libera al cerrarlos"""
+        broker = NotificationBroker(queue_size=500)
+        subscription = broker.subscribe('a@example.com')
+        empty = broker.memory_usage()
+        for index in range(200):
+            broker.publish(Notification(
+                id=index + 1, email='a@example.com', latitude=5.07, longitude=-75.52,
+                condition='Heavy Rain', code=1195, sent_at=datetime(2025, 4, 7, 10, 0)
+            ))
+
+        grown = broker.memory_usage()
+        assert grown > empty + 200 * 100
+
+        broker.unsubscribe(subscription)
+        assert broker.memory_usage() < grown - 200 * 100
+
+    def test_module_group(self):
+        """Test: los archivos se agrupan por capa del proyecto o por librería"""
+        assert module_group(os.path.join(PROJECT_ROOT, 'infrastructure', 'cache', 'forecast_cache.py')) == 'infrastructure'
+        assert module_group('/usr/lib/python3/site-packages/flask/app.py') == 'flask'
+        assert module_group('<frozen importlib._bootstrap>') == 'other'
+
+
+class TestMemoryMonitor:
+    """Tests de los presupuestos y el reporte"""
+
+    def test_component_over_budget_is_shrunk(self, cache):
+        """Test: un componente sobre su presupuesto se reduce hasta el presupuesto"""
+        monitor = MemoryMonitor(sample_seconds=0)
+        budget = cache.memory_usage() // 4
+        monitor.register('forecast_cache.local', cache, budget_bytes=budget)
+
+        usage = monitor.sample()
+
+        assert usage['forecast_cache.local'] <= budget * 1.2
+        assert monitor.components()['forecast_cache.local']['evictions'] > 0
+
+    def test_rss_budget_shrinks_every_component(self, cache):
+        """Test: con el RSS sobre el presupuesto, cada componente libera la mitad"""
+        monitor = MemoryMonitor(sample_seconds=0, rss_budget_bytes=1)
+        monitor.register('forecast_cache.local', cache)
+        before = len(cache)
+
+        monitor.sample()
+
+        assert len(cache) <= before // 2 + 1
+        assert len(monitor.rss_history()) == 1
+
+    def test_components_without_shrink_are_only_measured(self):
+        """Test: los componentes que no pueden reducirse solo se miden"""
+        class Buffer:
+            def memory_usage(self):
+                return 4096
+
+        monitor = MemoryMonitor(sample_seconds=0, rss_budget_bytes=1)
+        monitor.register('buffer', Buffer(), budget_bytes=1024)
+
+        assert monitor.sample() == {'buffer': 4096}
+
+    def test_tracemalloc_diff_groups_by_module(self):
+        """Test: con tracemalloc activo, el crecimiento se agrupa por módulo"""
+        monitor = MemoryMonitor(sample_seconds=0)
+        assert monitor.tracemalloc_diff() is None
+
+        monitor.start_tracing()
+        try:
+            cache = InMemoryForecastCache()
+            for index in range(500):
+                cache.set(f"0.1:{index}:0", make_forecast(f"Celda {index}"), ttl=600)
+            diff = monitor.tracemalloc_diff(top=20)
+        finally:
+            monitor.stop_tracing()
+
+        modules = {entry['module']: entry for entry in diff['by_module']}
+        assert modules['infrastructure']['size_diff_bytes'] > 0
+
+
+class TestAdminRoutes:
+    """Tests del acceso a la ruta de administración"""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        monkeypatch.setenv('API_KEY', 'test-key')
+        monkeypatch.setenv('ADMIN_API_KEY', 'admin-key')
+        app = Flask(__name__)
+        app.register_blueprint(AdminRoutes(MemoryMonitor(sample_seconds=0)).get_blueprint())
+        return app.test_client()
+
+    def test_requires_admin_key(self, client):
+        """Test: la API key normal no da acceso"""
+        assert client.get('/admin/memory', headers={'x-api-key': 'test-key'}).status_code == 403
+        assert client.get('/admin/memory').status_code == 401
+
+    def test_disabled_without_admin_key(self, client, monkeypatch):
+        """Test: sin ADMIN_API_KEY configurada, la ruta está deshabilitada"""
+        monkeypatch.setenv('ADMIN_API_KEY', '')
+
+        assert client.get('/admin/memory', headers={'x-api-key': ''}).status_code == 403
+
+    def test_memory_report(self, client):
+        """Test: el reporte incluye RSS y componentes"""
+        response = client.get('/admin/memory', headers={'x-api-key': 'admin-key'})
+
+        assert response.status_code == 200
+        assert response.json['rss_bytes'] > 0
+        assert response.json['tracemalloc'] is None
+
+    def test_toggle_tracing(self, client):
+        """Test: tracemalloc se activa y desactiva desde la ruta"""
+        headers = {'x-api-key': 'admin-key'}
+
+        assert client.post('/admin/memory/tracing', json={'enabled': True}, headers=headers).json == {'tracing': True}
+        assert client.post('/admin/memory/tracing', json={'enabled': False}, headers=headers).json == {'tracing': False}
+        assert client.post('/admin/memory/tracing', json={}, headers=headers).status_code == 400
@@ -0,0 +1,176 @@
+"""
+Tests para la retención y el archivo mensual de notificaciones
+"""
+import gzip
+import pytest
+from datetime import date, datetime
+from unittest.mock import Mock
+from application.use_cases.archive_notifications_use_case import ArchiveNotificationsUseCase
+from application.use_cases.get_notification_history_use_case import GetNotificationHistoryUseCase
+from domain.entities.notification import Notification
+from infrastructure.database.connection import db_connection
+from infrastructure.database.models.notification_model import NotificationModel
+from infrastructure.database.schema import initialize_database
+from infrastructure.repositories.alert_stats_repository_impl import AlertStatsRepositoryImpl
+from infrastructure.repositories.notification_archive_repository_impl import NotificationArchiveRepositoryImpl
+from infrastructure.repositories.notification_repository_impl import NotificationRepositoryImpl
+
+
+def make_notification(sent_at, email="test@example.com", id=None):
+    return Notification(
+        id=id,
+        email=email,
+        latitude=5.07,
+        longitude=-75.52,
+        condition="Heavy Rain",
+        code=1195,
+        sent_at=sent_at
+    )
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return NotificationArchiveRepositoryImpl(directory=str(tmp_path / 'archive'))
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Base de datos temporal con el esquema completo"""
+    initialize_database(str(tmp_path / 'notifications.db'), stats_cell_size=1.0)
+    yield db_connection.db
+    db_connection.close()
+
+
+class TestNotificationArchiveRepositoryImpl:
+    """Tests del archivo NDJSON + gzip"""
+
+    def test_append_is_readable_as_concatenated_members(self, archive):
+        """Test: cada append agrega un miembro gzip y se leen todos"""
+        archive.append('2025-01', [make_notification(datetime(2025, 1, 3), id=1)])
+        archive.append('2025-01', [make_notification(datetime(2025, 1, 9), id=2, email="other@example.com")])
+
+        assert archive.months() == ['2025-01']
+        assert [n.id for n in archive.find_by_month('2025-01')] == [2, 1]
+        assert [n.id for n in archive.find_by_month('2025-01', email="test@example.com")] == [1]
+
+        with gzip.open(archive._path('2025-01'), 'rt') as archive_file:
+            assert len(archive_file.readlines()) == 2
+
+    def test_repeated_ids_are_read_once(self, archive):
+        """Test: un lote reescrito tras una interrupción no duplica filas"""
+        batch = [make_notification(datetime(2025, 1, 3), id=1)]
+        archive.append('2025-01', batch)
+        archive.append('2025-01', batch)
+
+        assert len(archive.find_by_month('2025-01')) == 1
+        assert len(list(archive.scan())) == 1
+
+    def test_missing_month(self, archive):
+        """Test: un mes sin fichero está vacío"""
+        assert archive.months() == []
+        assert archive.find_by_month('2024-12') == []
+
+
+class TestArchiveNotificationsUseCase:
+    """Tests de integración de la política de retención"""
+
+    @pytest.fixture
+    def repository(self, database):
+        return NotificationRepositoryImpl()
+
+    def test_moves_old_rows_in_batches(self, repository, archive):
+        """Test: archiva por mes y deja en la tabla solo las filas recientes"""
+        for day in (5, 20):
+            repository.save(make_notification(datetime(2025, 1, day, 8, 0)))
+            repository.save(make_notification(datetime(2025, 2, day, 8, 0)))
+        repository.save(make_notification(datetime(2025, 4, 1, 8, 0)))
+
+        use_case = ArchiveNotificationsUseCase(repository, archive, retention_days=30, batch_size=3)
+        result = use_case.execute(now=datetime(2025, 4, 7))
+
+        assert result['archived'] == 4
+        assert result['batches'] == 2
+        assert result['months'] == ['2025-01', '2025-02']
+        assert NotificationModel.select().count() == 1
+        assert len(archive.find_by_month('2025-02')) == 2
+
+    def test_spatial_index_follows_deletes(self, repository, archive):
+        """Test: las filas archivadas salen también del índice espacial"""
+        repository.save(make_notification(datetime(2025, 1, 5)))
+
+        ArchiveNotificationsUseCase(repository, archive, retention_days=30).execute(now=datetime(2025, 4, 7))
+
+        assert repository.find_near(5.07, -75.52, 10) == []
+
+    def test_rebuild_keeps_archived_counts(self, repository, archive):
+        """Test: regenerar los agregados incluye las notificaciones archivadas"""
+        repository.save(make_notification(datetime(2025, 1, 5)))
+        repository.save(make_notification(datetime(2025, 4, 1)))
+        ArchiveNotificationsUseCase(repository, archive, retention_days=30).execute(now=datetime(2025, 4, 7))
+
+        stats = AlertStatsRepositoryImpl(cell_size=1.0, archive_repository=archive)
+        assert stats.rebuild() == 2
+        assert stats.find_recipient_stats("test@example.com").count == 2
+        assert sum(c.count for c in stats.find_daily_counts(date(2025, 1, 1), date(2025, 1, 31))) == 1
+
+    def test_invalid_retention(self):
+        """Test: la retención debe ser positiva"""
+        with pytest.raises(ValueError):
+            ArchiveNotificationsUseCase(Mock(), Mock(), retention_days=0).execute()
+
+
+class TestGetNotificationHistoryUseCase:
+    """Tests para el caso de uso de historial"""
+
+    @pytest.fixture
+    def mock_notification_repository(self):
+        return Mock()
+
+    @pytest.fixture
+    def mock_archive_repository(self):
+        return Mock()
+
+    @pytest.fixture
+    def use_case(self, mock_notification_repository, mock_archive_repository):
+        return GetNotificationHistoryUseCase(mock_notification_repository, mock_archive_repository)
+
+    def test_combines_archive_and_table(self, use_case, mock_notification_repository, mock_archive_repository):
+        """Test: mezcla meses archivados y tabla, sin duplicados y del más reciente al más antiguo"""
+        mock_archive_repository.months.return_value = ['2025-01', '2025-02']
+        mock_archive_repository.find_by_month.side_effect = lambda month, email: {
+            '2025-01': [make_notification(datetime(2025, 1, 5), id=1)],
+            '2025-02': [make_notification(datetime(2025, 2, 5), id=2)]
+        }[month]
+        mock_notification_repository.find_by_email_between.return_value = [
+            make_notification(datetime(2025, 2, 5), id=2),
+            make_notification(datetime(2025, 3, 1), id=3)
+        ]
+
+        result = use_case.execute("test@example.com", start_month='2025-01', end_month='2025-03')
+
+        assert [n.sent_at for n in result.notifications] == [
+            '2025-03-01 00:00:00', '2025-02-05 00:00:00', '2025-01-05 00:00:00'
+        ]
+        args = mock_notification_repository.find_by_email_between.call_args[0]
+        assert args == ("test@example.com", datetime(2025, 1, 1), datetime(2025, 4, 1))
+
+    def test_default_range_is_last_twelve_months(self, use_case, mock_notification_repository, mock_archive_repository):
+        """Test: sin rango se consultan los últimos 12 meses"""
+        mock_archive_repository.months.return_value = []
+        mock_notification_repository.find_by_email_between.return_value = []
+
+        use_case.execute("test@example.com", today=date(2025, 4, 7))
+
+        args = mock_notification_repository.find_by_email_between.call_args[0]
+        assert args[1:] == (datetime(2024, 5, 1), datetime(2025, 5, 1))
+
+    @pytest.mark.parametrize('kwargs', [
+        {'email': 'invalid-email'},
+        {'email': 'test@example.com', 'start_month': '2025-13'},
+        {'email': 'test@example.com', 'start_month': '2025-03', 'end_month': '2025-01'},
+        {'email': 'test@example.com', 'start_month': '2022-01', 'end_month': '2025-01'}
+    ])
+    def test_invalid_parameters(self, use_case, kwargs):
+        """Test: parámetros inválidos lanzan ValueError"""
+        with pytest.raises(ValueError):
+            use_case.execute(**kwargs)
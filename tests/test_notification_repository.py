@@ -0,0 +1,234 @@
+"""
+Tests para NotificationRepositoryImpl (y su ruta de sentencias preparadas)
+contra una base SQLite temporal
+"""
+import math
+import threading
+import pytest
+from datetime import datetime, timedelta
+from domain.entities.notification import Notification
+from domain.services.geo_distance import EARTH_RADIUS_KM, haversine_km
+from infrastructure.database.connection import db_connection
+from infrastructure.database.models.notification_model import NotificationModel
+from infrastructure.database.schema import initialize_database
+from infrastructure.database.spatial_index import ensure_spatial_index
+from infrastructure.repositories.notification_repository_impl import NotificationRepositoryImpl
+from infrastructure.repositories.prepared_notification_repository import PreparedNotificationRepository
+
+
+def make_notification(email="test@example.com", latitude=5.07, longitude=-75.52, sent_at=None, code=1195):
+    return Notification(
+        email=email,
+        latitude=latitude,
+        longitude=longitude,
+        condition="Heavy Rain",
+        code=code,
+        sent_at=sent_at or datetime(2025, 4, 7, 10, 0, 0)
+    )
+
+
+def northernmost_and_easternmost(latitude, longitude, radius_km):
+    """Puntos del círculo con la mayor latitud y con la mayor longitud (fórmulas esféricas exactas)"""
+    angular = radius_km / EARTH_RADIUS_KM
+    phi = math.radians(latitude)
+    north = (latitude + math.degrees(angular), longitude)
+    east = (
+        math.degrees(math.asin(math.sin(phi) / math.cos(angular))),
+        longitude + math.degrees(math.asin(math.sin(angular) / math.cos(phi)))
+    )
+    return north, east
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Base de datos temporal con el esquema completo"""
+    db_connection.configure(str(tmp_path / 'notifications.db'))
+    db_connection.initialize_tables([NotificationModel])
+    ensure_spatial_index(db_connection.db)
+    yield db_connection.db
+    db_connection.close()
+
+
+class TestNotificationRepositoryImpl:
+    """Tests de integración del repositorio, con Peewee y con sentencias preparadas"""
+
+    @pytest.fixture(params=[NotificationRepositoryImpl, PreparedNotificationRepository])
+    def repository(self, request, database):
+        return request.param()
+
+    def test_save_assigns_id(self, repository):
+        """Test: save asigna el id generado"""
+        saved = repository.save(make_notification())
+
+        assert saved.id is not None
+
+    def test_find_by_email_newest_first(self, repository):
+        """Test: find_by_email filtra por email y ordena por fecha descendente"""
+        repository.save(make_notification(sent_at=datetime(2025, 4, 6, 10, 0, 0)))
+        repository.save(make_notification(sent_at=datetime(2025, 4, 7, 10, 0, 0)))
+        repository.save(make_notification(email="other@example.com"))
+
+        notifications = repository.find_by_email("test@example.com")
+
+        assert [n.sent_at.day for n in notifications] == [7, 6]
+
+    def test_find_all(self, repository):
+        """Test: find_all retorna todas las notificaciones"""
+        repository.save(make_notification())
+        repository.save(make_notification(email="other@example.com"))
+
+        assert len(repository.find_all()) == 2
+
+    def test_find_near_uses_radius(self, repository):
+        """Test: find_near retorna solo lo que está dentro del radio"""
+        repository.save(make_notification(latitude=5.07, longitude=-75.52))     # Armenia
+        repository.save(make_notification(latitude=4.81, longitude=-75.69))     # Pereira, ~34 km
+        repository.save(make_notification(latitude=4.71, longitude=-74.07))     # Bogotá, ~165 km
+
+        assert len(repository.find_near(5.07, -75.52, 20)) == 1
+        assert len(repository.find_near(5.07, -75.52, 50)) == 2
+        assert len(repository.find_near(5.07, -75.52, 200)) == 3
+
+    @pytest.mark.parametrize('latitude,radius', [(10.0, 20), (60.0, 500), (-75.0, 300)])
+    def test_find_near_includes_points_at_the_edge(self, repository, latitude, radius):
+        """Test: los puntos a radio - ε (al norte y en la máxima longitud) pasan el prefiltro de la caja"""
+        for point in northernmost_and_easternmost(latitude, -75.0, radius - 0.01):
+            repository.save(make_notification(latitude=point[0], longitude=point[1]))
+        for point in northernmost_and_easternmost(latitude, -75.0, radius + 0.01):
+            repository.save(make_notification(latitude=point[0], longitude=point[1]))
+
+        found = repository.find_near(latitude, -75.0, radius)
+
+        assert len(found) == 2
+        assert all(haversine_km(latitude, -75.0, n.latitude, n.longitude) < radius for n in found)
+
+    def test_find_near_filters_by_since(self, repository):
+        """Test: find_near respeta la ventana de tiempo"""
+        now = datetime.now()
+        repository.save(make_notification(sent_at=now - timedelta(hours=2)))
+        repository.save(make_notification(sent_at=now - timedelta(days=3)))
+
+        assert len(repository.find_near(5.07, -75.52, 20, since=now - timedelta(days=1))) == 1
+
+    def test_find_near_across_antimeridian(self, repository):
+        """Test: el radio funciona al cruzar el antimeridiano"""
+        repository.save(make_notification(latitude=-17.0, longitude=179.95))
+        repository.save(make_notification(latitude=-17.0, longitude=-179.95))
+
+        assert len(repository.find_near(-17.0, 179.99, 20)) == 2
+
+    def test_spatial_index_follows_deletes(self, repository, database):
+        """Test: el índice espacial se mantiene sincronizado al borrar"""
+        saved = repository.save(make_notification())
+        NotificationModel.delete_by_id(saved.id)
+
+        count = database.execute_sql('SELECT COUNT(*) FROM notifications_rtree').fetchone()[0]
+        assert count == 0
+        assert repository.find_near(5.07, -75.52, 20) == []
+
+    def test_ids_are_not_reused_after_deleting_the_newest(self, repository):
+        """Test: borrar las filas más nuevas (archivado) no hace que se repitan sus ids"""
+        saved = [repository.save(make_notification()) for _ in range(3)]
+        repository.delete_by_ids([n.id for n in saved])
+
+        again = repository.save(make_notification())
+
+        assert again.id > saved[-1].id
+
+    def test_legacy_table_is_migrated(self, tmp_path):
+        """Test: una tabla creada sin AUTOINCREMENT se migra conservando ids, índice y agregados"""
+        path = str(tmp_path / 'legacy.db')
+        db_connection.configure(path)
+        db_connection.db.execute_sql(
+            'CREATE TABLE notifications (id INTEGER NOT NULL PRIMARY KEY, email VARCHAR(255) NOT NULL, '
+            'latitude REAL NOT NULL, longitude REAL NOT NULL, condition VARCHAR(255) NOT NULL, '
+            'code INTEGER NOT NULL, sent_at DATETIME NOT NULL)'
+        )
+        ensure_spatial_index(db_connection.db)
+        saved = [NotificationRepositoryImpl().save(make_notification()) for _ in range(3)]
+        db_connection.close()
+
+        initialize_database(path, stats_cell_size=1.0)
+        initialize_database(path, stats_cell_size=1.0)
+        repository = NotificationRepositoryImpl()
+
+        table_sql = db_connection.db.execute_sql("SELECT sql FROM sqlite_master WHERE name = 'notifications'").fetchone()[0]
+        assert 'AUTOINCREMENT' in table_sql
+        assert sorted(n.id for n in repository.find_all()) == [n.id for n in saved]
+        repository.delete_by_ids([saved[-1].id])
+        assert repository.save(make_notification()).id > saved[-1].id
+        assert len(repository.find_near(5.07, -75.52, 5)) == 3
+        count = db_connection.db.execute_sql('SELECT SUM(count) FROM alert_rollup_email').fetchone()[0]
+        assert count == 4
+        db_connection.close()
+
+    def test_existing_rows_are_indexed(self, tmp_path):
+        """Test: las filas previas al índice se indexan al crearlo"""
+        db_connection.configure(str(tmp_path / 'legacy.db'))
+        db_connection.initialize_tables([NotificationModel])
+        NotificationRepositoryImpl().save(make_notification())
+
+        ensure_spatial_index(db_connection.db)
+
+        assert len(NotificationRepositoryImpl().find_near(5.07, -75.52, 5)) == 1
+        db_connection.close()
+
+
+class TestPreparedNotificationRepository:
+    """Tests de la ruta de sentencias preparadas frente a la de Peewee"""
+
+    @pytest.fixture
+    def repository(self, database):
+        return PreparedNotificationRepository()
+
+    def test_rows_are_interchangeable_with_peewee(self, repository):
+        """Test: lo que escribe una ruta lo lee la otra con la misma fecha, microsegundos incluidos"""
+        precise = datetime(2025, 4, 7, 10, 0, 0, 123456)
+        repository.save(make_notification(sent_at=precise))
+        NotificationRepositoryImpl().save(make_notification(sent_at=datetime(2025, 4, 6, 9, 30)))
+
+        fast = repository.find_by_email("test@example.com")
+        slow = NotificationRepositoryImpl().find_by_email("test@example.com")
+
+        assert fast == slow
+        assert fast[0].sent_at == precise
+
+    def test_cursor_is_reused_until_reconnect(self, repository, database):
+        """Test: el hilo reutiliza su cursor y abre otro si cambia la conexión"""
+        repository.save(make_notification())
+        cursor = repository._cursor()
+        repository.find_by_email("test@example.com")
+        assert repository._cursor() is cursor
+
+        database.close()
+
+        assert repository._cursor() is not cursor
+        assert len(repository.find_by_email("test@example.com")) == 1
+
+    def test_each_thread_uses_its_own_connection(self, repository, database):
+        """Test: los hilos no comparten cursor (cada uno usa su conexión de Peewee)"""
+        repository.save(make_notification())
+        cursors = []
+        found = []
+
+        def lookup():
+            cursors.append(repository._cursor())
+            found.append(len(repository.find_by_email("test@example.com")))
+            database.close()
+
+        worker = threading.Thread(target=lookup)
+        worker.start()
+        worker.join()
+
+        assert found == [1]
+        assert cursors[0] is not repository._cursor()
+
+    def test_find_by_email_uses_the_email_index(self, database):
+        """Test: el plan de find_by_email usa el índice (email, sent_at), sin ordenar aparte"""
+        plan = ' '.join(row[-1] for row in database.execute_sql(
+            "EXPLAIN QUERY PLAN SELECT * FROM notifications WHERE email = ? ORDER BY sent_at DESC",
+            ("test@example.com",)
+        ).fetchall())
+
+        assert 'notifications_email_sent_at' in plan
+        assert 'TEMP B-TREE' not in plan
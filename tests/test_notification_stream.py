@@ -0,0 +1,220 @@
+"""
+Tests para el stream SSE de notificaciones y su broker en memoria
+"""
+import threading
+import pytest
+from datetime import datetime
+from flask import Flask
+from domain.entities.notification import Notification
+from infrastructure.database.connection import db_connection
+from infrastructure.database.models.notification_model import NotificationModel
+from infrastructure.database.spatial_index import ensure_spatial_index
+from infrastructure.repositories.notification_repository_impl import NotificationRepositoryImpl
+from infrastructure.streaming.notification_broker import NotificationBroker, StreamLimitException
+from application.use_cases.stream_notifications_use_case import StreamNotificationsUseCase
+from presentation.routes.notification_routes import NotificationRoutes
+
+
+def make_notification(email="test@example.com", code=1195):
+    return Notification(
+        email=email,
+        latitude=5.07,
+        longitude=-75.52,
+        condition="Heavy Rain",
+        code=code,
+        sent_at=datetime(2025, 4, 7, 10, 0, 0)
+    )
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Base de datos temporal con el esquema completo"""
+    db_connection.configure(str(tmp_path / 'notifications.db'))
+    db_connection.initialize_tables([NotificationModel])
+    ensure_spatial_index(db_connection.db)
+    yield db_connection.db
+    db_connection.close()
+
+
+@pytest.fixture
+def broker(database):
+    broker = NotificationBroker(max_connections=3, max_per_recipient=2, poll_seconds=0)
+    broker.repository = NotificationRepositoryImpl(broker=broker)
+    return broker
+
+
+@pytest.fixture
+def repository(broker):
+    return broker.repository
+
+
+@pytest.fixture
+def use_case(broker, repository):
+    return StreamNotificationsUseCase(repository, broker, heartbeat_seconds=0.05, max_stream_seconds=5)
+
+
+class TestNotificationBroker:
+    """Tests del reparto y los límites"""
+
+    def test_save_is_pushed_to_subscribers(self, broker, repository):
+        """Test: guardar una notificación la entrega solo a los streams de su destinatario"""
+        mine = broker.subscribe("test@example.com")
+        other = broker.subscribe("other@example.com")
+
+        saved = repository.save(make_notification())
+
+        assert mine.get(timeout=1).id == saved.id
+        assert other.get(timeout=0.01) is None
+
+    def test_connection_limits(self, broker):
+        """Test: se respetan el máximo por destinatario y el del worker"""
+        first = broker.subscribe("a@example.com")
+        broker.subscribe("a@example.com")
+        with pytest.raises(StreamLimitException):
+            broker.subscribe("a@example.com")
+
+        broker.subscribe("b@example.com")
+        with pytest.raises(StreamLimitException):
+            broker.subscribe("c@example.com")
+
+        broker.unsubscribe(first)
+        broker.unsubscribe(first)
+        assert broker.connection_count() == 2
+
+    def test_poll_publishes_rows_from_other_processes(self, broker):
+        """Test: las filas que guardó otro worker se descubren siguiendo la tabla, una sola vez"""
+        subscription = broker.subscribe("test@example.com")
+        other_worker = NotificationRepositoryImpl()
+        saved = other_worker.save(make_notification())
+
+        assert broker.poll() == 1
+        assert subscription.get(timeout=1).id == saved.id
+
+        broker.publish(saved)
+        assert broker.poll() == 0
+        assert subscription.get(timeout=0.01) is None
+
+    def test_poll_survives_archiving_the_newest_rows(self, broker, repository):
+        """Test: tras archivar todo, las filas nuevas de otro worker no se confunden con las ya vistas"""
+        subscription = broker.subscribe("test@example.com")
+        other_worker = NotificationRepositoryImpl()
+        archived = [other_worker.save(make_notification()) for _ in range(3)]
+        assert broker.poll() == 3
+        repository.delete_by_ids([n.id for n in archived])
+
+        saved = other_worker.save(make_notification())
+
+        assert broker.poll() == 1
+        assert [subscription.get(timeout=1).id for _ in range(4)][-1] == saved.id
+
+    def test_slow_consumer_is_disconnected(self, database):
+        """Test: si la cola del stream se llena, el stream se cierra en vez de bloquear a quien guarda"""
+        broker = NotificationBroker(queue_size=1, poll_seconds=0)
+        repository = NotificationRepositoryImpl(broker=broker)
+        subscription = broker.subscribe("test@example.com")
+
+        repository.save(make_notification())
+        repository.save(make_notification())
+
+        assert subscription.closed
+
+
+class TestNotificationStream:
+    """Tests del stream con reanudación y heartbeats"""
+
+    def test_resume_from_last_event_id(self, use_case, repository):
+        """Test: con Last-Event-ID primero llegan las notificaciones perdidas, sin duplicados"""
+        first = repository.save(make_notification())
+        missed = [repository.save(make_notification()) for _ in range(2)]
+        repository.save(make_notification(email="other@example.com"))
+
+        stream = use_case.execute("test@example.com", last_event_id=first.id)
+        events = iter(stream)
+        received = [next(events).id, next(events).id]
+        live = repository.save(make_notification())
+
+        assert received == [n.id for n in missed]
+        assert next(events).id == live.id
+        stream.close()
+
+    def test_resume_after_archiving_everything(self, use_case, repository):
+        """Test: un cliente que reconecta con un id ya archivado recibe lo guardado después"""
+        seen = repository.save(make_notification())
+        repository.delete_by_ids([seen.id])
+        missed = repository.save(make_notification())
+
+        stream = use_case.execute("test@example.com", last_event_id=seen.id)
+
+        assert next(iter(stream)).id == missed.id
+        stream.close()
+
+    def test_heartbeat_when_idle(self, use_case):
+        """Test: sin novedades el stream produce heartbeats"""
+        stream = use_case.execute("test@example.com")
+
+        assert next(iter(stream)) is None
+        stream.close()
+
+    def test_invalid_email(self, use_case):
+        """Test: email inválido"""
+        with pytest.raises(ValueError):
+            use_case.execute("sin-arroba")
+
+
+class TestStreamRoute:
+    """Tests del endpoint SSE"""
+
+    @pytest.fixture
+    def client(self, monkeypatch, use_case):
+        monkeypatch.setenv('API_KEY', 'test-key')
+        app = Flask(__name__)
+        routes = NotificationRoutes(None, None, stream_notifications_use_case=use_case)
+        app.register_blueprint(routes.get_blueprint())
+        return app.test_client()
+
+    def test_streams_events(self, client, repository, broker):
+        """Test: el endpoint emite los eventos en formato SSE y libera el stream al cerrarse"""
+        first = repository.save(make_notification())
+        missed = repository.save(make_notification())
+
+        response = client.get(
+            '/notifications/stream?email=test@example.com',
+            headers={'x-api-key': 'test-key', 'Last-Event-ID': str(first.id)},
+            buffered=False
+        )
+        chunks = response.response
+        opening = next(chunks)
+        event = next(chunks)
+        response.close()
+
+        assert response.mimetype == 'text/event-stream'
+        assert opening.startswith(b'retry: ')
+        assert event.startswith(f'id: {missed.id}\nevent: alert\ndata: '.encode())
+        assert broker.connection_count() == 0
+
+    def test_limit_returns_503(self, client, broker):
+        """Test: sin cupo, 503 con Retry-After"""
+        for _ in range(2):
+            broker.subscribe("test@example.com")
+
+        response = client.get('/notifications/stream?email=test@example.com', headers={'x-api-key': 'test-key'})
+
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '3'
+
+    def test_concurrent_saves_reach_stream(self, use_case, repository):
+        """Test: las notificaciones guardadas desde otro hilo llegan al stream abierto"""
+        stream = use_case.execute("test@example.com")
+        events = iter(stream)
+        saver = threading.Thread(target=lambda: [repository.save(make_notification()) for _ in range(3)])
+        saver.start()
+
+        received = []
+        while len(received) < 3:
+            event = next(events)
+            if event is not None:
+                received.append(event.id)
+        saver.join()
+        stream.close()
+
+        assert received == sorted(received)
@@ -115,3 +115,25 @@ class TestGetNotificationsUseCase:
         assert result_dict['notifications'][0]['sent_at'] == '2025-04-07 10:00:00'
         assert result_dict['notifications'][0]['condition'] == 'Heavy Rain'
         assert result_dict['notifications'][0]['code'] == 1195
+    
+    def test_definite_miss_skips_the_repository(self, mock_notification_repository):
+        """Test: si el filtro descarta el email no se consulta el repositorio"""
+        recipient_filter = Mock()
+        recipient_filter.might_contain.return_value = False
+        use_case = GetNotificationsUseCase(mock_notification_repository, recipient_filter=recipient_filter)
+        
+        result = use_case.execute("never@example.com")
+        
+        assert result.notifications == []
+        mock_notification_repository.find_by_email.assert_not_called()
+    
+    def test_empty_result_after_maybe_is_a_false_positive(self, mock_notification_repository):
+        """Test: un "quizás" del filtro sin notificaciones se reporta como falso positivo"""
+        recipient_filter = Mock()
+        recipient_filter.might_contain.return_value = True
+        mock_notification_repository.find_by_email.return_value = []
+        use_case = GetNotificationsUseCase(mock_notification_repository, recipient_filter=recipient_filter)
+        
+        use_case.execute("maybe@example.com")
+        
+        recipient_filter.report_false_positive.assert_called_once_with("maybe@example.com")
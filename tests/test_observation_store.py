@@ -0,0 +1,170 @@
+"""
+Tests para el historial de pronósticos por celda
+"""
+import math
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+from application.use_cases.get_cell_observations_use_case import GetCellObservationsUseCase
+from domain.entities.forecast import Forecast
+from infrastructure.database.connection import db_connection
+from infrastructure.database.observations import RECORD
+from infrastructure.database.schema import initialize_database
+from infrastructure.external_services.circuit_breaker import CircuitBreaker
+from infrastructure.external_services.resilient_weather_service import ResilientWeatherService
+from infrastructure.external_services.weather_api_service import WeatherAPIException
+from infrastructure.cache.forecast_cache import InMemoryForecastCache
+from infrastructure.repositories.observation_repository_impl import ObservationRepositoryImpl
+
+
+CELL = '0.1:950:1044'
+DAY = datetime(2025, 4, 7, tzinfo=timezone.utc)
+
+
+def make_forecast(temperature_c=20.0, code=1195, adverse=True, humidity=90, wind_kph=30.0) -> Forecast:
+    return Forecast(
+        location="Manizales, Colombia",
+        latitude=5.07,
+        longitude=-75.52,
+        temperature_c=temperature_c,
+        condition="Heavy Rain" if adverse else "Sunny",
+        condition_code=code,
+        is_adverse=adverse,
+        forecast_date=datetime(2025, 4, 7),
+        humidity=humidity,
+        wind_kph=wind_kph
+    )
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Base de datos temporal con el esquema completo"""
+    initialize_database(str(tmp_path / 'observations.db'), stats_cell_size=1.0)
+    yield db_connection.db
+    db_connection.close()
+
+
+@pytest.fixture
+def repository(database):
+    return ObservationRepositoryImpl(flush_interval=3600)
+
+
+class TestObservationRepositoryImpl:
+    """Tests de integración del almacén de observaciones"""
+
+    def test_records_are_buffered_and_appended(self, repository, database):
+        """Test: cada flush agrega registros de ancho fijo al blob del bucket"""
+        repository.record(CELL, make_forecast(), DAY + timedelta(hours=1))
+        assert len(repository.find_range(CELL, DAY, DAY + timedelta(days=1))) == 0
+
+        assert repository.flush() == 1
+        repository.record(CELL, make_forecast(temperature_c=18.0), DAY + timedelta(hours=2))
+        repository.flush()
+
+        (payload,) = database.execute_sql('SELECT payload FROM observations').fetchone()
+        assert isinstance(payload, bytes)
+        assert len(payload) == 2 * RECORD.size
+
+    def test_find_range_returns_sorted_columns(self, repository):
+        """Test: la consulta filtra por rango y celda y retorna columnas ordenadas por tiempo"""
+        repository.record(CELL, make_forecast(temperature_c=18.0), DAY + timedelta(hours=5))
+        repository.record(CELL, make_forecast(temperature_c=21.0, humidity=None, wind_kph=None), DAY + timedelta(hours=2))
+        repository.record(CELL, make_forecast(), DAY + timedelta(days=1, hours=3))
+        repository.record('0.1:1:1', make_forecast(), DAY + timedelta(hours=2))
+        repository.flush()
+
+        series = repository.find_range(CELL, DAY, DAY + timedelta(days=1))
+
+        assert series.timestamps.tolist() == [
+            int((DAY + timedelta(hours=2)).timestamp()), int((DAY + timedelta(hours=5)).timestamp())
+        ]
+        assert series.temperature_c.typecode == 'f'
+        assert series.temperature_c.tolist() == [21.0, 18.0]
+        assert series.humidity.tolist() == [-1, 90]
+        assert math.isnan(series.wind_kph[0])
+        assert series.to_dict()['wind_kph'] == [None, 30.0]
+
+    def test_downsample_old_buckets(self, repository):
+        """Test: lo viejo queda en un punto por hora ponderado por muestras; lo reciente sigue crudo"""
+        for minute, temperature, adverse in ((0, 20.0, True), (20, 22.0, False), (40, 24.0, True)):
+            repository.record(
+                CELL, make_forecast(temperature_c=temperature, adverse=adverse, code=1195 if adverse else 1000),
+                DAY + timedelta(minutes=minute)
+            )
+        repository.record(CELL, make_forecast(), DAY + timedelta(days=3))
+        repository.flush()
+
+        assert repository.downsample(DAY + timedelta(days=2), 3600) == 1
+
+        series = repository.find_range(CELL, DAY, DAY + timedelta(days=4))
+        assert series.samples.tolist() == [3, 1]
+        assert series.adverse.tolist() == [2, 1]
+        assert series.temperature_c[0] == pytest.approx(22.0)
+        assert series.condition_code[0] == 1195
+        assert series.adverse_ratio() == 0.75
+
+        # Reducir otra vez a un punto por día combina los puntos ponderando por muestras
+        repository.record(CELL, make_forecast(temperature_c=30.0), DAY + timedelta(hours=5))
+        repository.flush()
+        assert repository.downsample(DAY + timedelta(days=2), 86400) == 1
+        series = repository.find_range(CELL, DAY, DAY + timedelta(days=1))
+        assert series.samples.tolist() == [4]
+        assert series.temperature_c[0] == pytest.approx(24.0)
+
+    def test_purge_before(self, repository):
+        """Test: se borran los buckets completos anteriores a la fecha"""
+        repository.record(CELL, make_forecast(), DAY)
+        repository.record(CELL, make_forecast(), DAY + timedelta(days=5))
+        repository.flush()
+
+        assert repository.purge_before(DAY + timedelta(days=2)) == 1
+        assert len(repository.find_range(CELL, DAY, DAY + timedelta(days=10))) == 1
+
+    def test_flushes_when_buffer_is_full(self, database):
+        """Test: el búfer se vuelca antes de tiempo al llegar a max_pending"""
+        repository = ObservationRepositoryImpl(flush_interval=3600, max_pending=2)
+        repository.record(CELL, make_forecast(), DAY)
+        repository.record(CELL, make_forecast(), DAY + timedelta(minutes=1))
+
+        assert len(repository.find_range(CELL, DAY, DAY + timedelta(days=1))) == 2
+
+
+class TestObservationRecording:
+    """Tests del registro desde el servicio del clima y de la consulta"""
+
+    def test_only_upstream_forecasts_are_recorded(self):
+        """Test: se registra lo traído del upstream, no los respaldos desde caché"""
+        upstream = Mock()
+        upstream.get_forecast.side_effect = [make_forecast(), WeatherAPIException("caído")]
+        observations = Mock()
+        service = ResilientWeatherService(
+            weather_service=upstream,
+            breaker=CircuitBreaker(min_calls=100),
+            fallback_cache=InMemoryForecastCache(),
+            observation_repository=observations
+        )
+
+        service.get_forecast(5.07, -75.52)
+        service.get_forecast(5.07, -75.52)
+
+        observations.record.assert_called_once()
+        assert observations.record.call_args[0][0] == CELL
+
+    def test_use_case_returns_columns(self, repository):
+        """Test: el caso de uso consulta la celda del punto y resume la serie"""
+        now = datetime(2025, 4, 8, 12, 0)
+        repository.record(CELL, make_forecast(), now - timedelta(hours=3))
+        repository.record(CELL, make_forecast(adverse=False), now - timedelta(hours=2))
+        repository.flush()
+
+        result = GetCellObservationsUseCase(repository, cell_size=0.1).execute(5.07, -75.52, days=1, now=now)
+
+        assert result['cell'] == CELL
+        assert result['points'] == 2
+        assert result['adverse_ratio'] == 0.5
+        assert result['series']['condition_code'] == [1195, 1195]
+
+    def test_use_case_validates_days(self):
+        """Test: days fuera de rango"""
+        with pytest.raises(ValueError):
+            GetCellObservationsUseCase(Mock(), cell_size=0.1).execute(5.07, -75.52, days=0)
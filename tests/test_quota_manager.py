@@ -0,0 +1,222 @@
+"""
+Tests para QuotaManager y la degradación por cuota del upstream del clima
+"""
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import Mock
+from domain.entities.forecast import Forecast
+from domain.services.request_priority import BACKGROUND, INTERACTIVE, background, current_priority
+from infrastructure.cache.forecast_cache import InMemoryForecastCache
+from infrastructure.external_services.cached_weather_service import CachedWeatherService
+from infrastructure.external_services.circuit_breaker import CircuitBreaker
+from infrastructure.external_services.quota_manager import (
+    MeteredWeatherService,
+    QuotaExceededException,
+    QuotaManager
+)
+from infrastructure.external_services.resilient_weather_service import (
+    ResilientWeatherService,
+    WeatherServiceUnavailableException
+)
+
+
+def make_forecast(latitude=5.07, longitude=-75.52) -> Forecast:
+    return Forecast(
+        location="Armenia, Colombia",
+        latitude=latitude,
+        longitude=longitude,
+        temperature_c=20.0,
+        condition="Heavy Rain",
+        condition_code=1195,
+        is_adverse=True,
+        forecast_date=datetime.now(),
+        humidity=90,
+        wind_kph=30.0
+    )
+
+
+class FakeClock:
+    """Reloj manual; empieza a mitad de mes para no depender del ritmo mensual"""
+
+    def __init__(self):
+        self.now = datetime(2025, 4, 15, 12, 0, 0, tzinfo=timezone.utc).timestamp()
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def quota_path(tmp_path):
+    return str(tmp_path / 'quota.db')
+
+
+class TestQuotaManager:
+    """Tests de la contabilidad y los niveles de la cuota"""
+
+    def test_unlimited_only_counts(self, quota_path, clock):
+        """Test: sin presupuestos solo se contabiliza"""
+        quota = QuotaManager(quota_path, clock=clock)
+        for _ in range(5):
+            quota.acquire()
+
+        snapshot = quota.snapshot()
+        assert snapshot['level'] == QuotaManager.NORMAL
+        assert snapshot['minute_used'] == snapshot['month_used'] == 5
+        assert snapshot['minute_remaining'] is None
+
+    def test_minute_budget_prioritizes_interactive(self, quota_path, clock):
+        """Test: con la cuota presionada se rechaza el fondo y se agota para todos al final"""
+        quota = QuotaManager(quota_path, per_minute=10, tight_ratio=0.8, clock=clock)
+        for _ in range(8):
+            quota.acquire(INTERACTIVE)
+        assert quota.level() == QuotaManager.TIGHT
+
+        with pytest.raises(QuotaExceededException):
+            quota.acquire(BACKGROUND)
+        quota.acquire(INTERACTIVE)
+        quota.acquire(INTERACTIVE)
+
+        assert quota.level() == QuotaManager.EXHAUSTED
+        with pytest.raises(QuotaExceededException):
+            quota.acquire(INTERACTIVE)
+        assert quota.snapshot()['minute_remaining'] == 0
+
+        clock.now += 60
+        assert quota.level() == QuotaManager.NORMAL
+
+    def test_month_pace(self, quota_path, clock):
+        """Test: ir por delante del ritmo mensual activa el nivel presionado"""
+        clock.now = datetime(2025, 4, 1, 0, 0, 0, tzinfo=timezone.utc).timestamp()
+        quota = QuotaManager(quota_path, per_month=100, pace_slack=0.05, clock=clock)
+        for _ in range(5):
+            quota.acquire()
+
+        assert quota.level() == QuotaManager.TIGHT
+        clock.now += 15 * 86400
+        assert quota.level() == QuotaManager.NORMAL
+
+    def test_budget_is_shared_between_processes(self, quota_path, clock):
+        """Test: dos instancias sobre el mismo archivo comparten el consumo"""
+        worker_a = QuotaManager(quota_path, per_minute=2, clock=clock)
+        worker_b = QuotaManager(quota_path, per_minute=2, clock=clock)
+
+        worker_a.acquire()
+        worker_b.acquire()
+
+        with pytest.raises(QuotaExceededException):
+            worker_a.acquire()
+
+    def test_priority_comes_from_context(self, quota_path, clock):
+        """Test: el bloque background() marca las llamadas como de fondo"""
+        quota = QuotaManager(quota_path, per_minute=10, tight_ratio=0.1, clock=clock)
+        quota.acquire()
+
+        with background():
+            assert current_priority() == BACKGROUND
+            with pytest.raises(QuotaExceededException):
+                quota.acquire()
+        assert current_priority() == INTERACTIVE
+
+    def test_purge_old_windows(self, quota_path, clock):
+        """Test: los contadores de minutos pasados se eliminan"""
+        quota = QuotaManager(quota_path, clock=clock)
+        quota.acquire()
+        clock.now += 120
+        quota.acquire()
+
+        assert quota.purge_old_windows() == 1
+        assert quota.snapshot()['month_used'] == 2
+
+
+class TestQuotaAwareWeatherServices:
+    """Tests de la integración de la cuota con los decoradores del servicio"""
+
+    def test_metered_service_does_not_call_upstream_without_budget(self, quota_path, clock):
+        """Test: sin cuota no sale la llamada"""
+        upstream = Mock()
+        upstream.get_forecast.return_value = make_forecast()
+        service = MeteredWeatherService(upstream, QuotaManager(quota_path, per_minute=1, clock=clock))
+
+        service.get_forecast(5.07, -75.52)
+        with pytest.raises(QuotaExceededException):
+            service.get_forecast(5.07, -75.52)
+
+        assert upstream.get_forecast.call_count == 1
+
+    def test_quota_rejection_does_not_trip_breaker(self):
+        """Test: la cuota agotada sirve el respaldo y no cuenta como falla del upstream"""
+        upstream = Mock()
+        upstream.get_forecast.side_effect = QuotaExceededException("Cuota de WeatherAPI agotada")
+        breaker = CircuitBreaker(window_size=2, min_calls=2)
+        cache = InMemoryForecastCache()
+        service = ResilientWeatherService(upstream, breaker, fallback_cache=cache, cell_size=0.1)
+
+        with pytest.raises(WeatherServiceUnavailableException):
+            service.get_forecast(5.07, -75.52)
+        cache.set('0.1:950:1044', make_forecast(), 0.0)
+        for _ in range(3):
+            assert service.get_forecast(5.07, -75.52).condition == "Heavy Rain"
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_hedged_calls_keep_request_priority(self):
+        """Test: las llamadas enviadas al pool de cobertura conservan la prioridad"""
+        seen = []
+
+        class Upstream:
+            def get_forecast(self, latitude, longitude):
+                seen.append(current_priority())
+                return make_forecast(latitude, longitude)
+
+        service = ResilientWeatherService(Upstream(), CircuitBreaker(), hedge_enabled=True, hedge_min_delay=1.0)
+        try:
+            with background():
+                service.get_forecast(5.07, -75.52)
+        finally:
+            service.close()
+
+        assert seen == [BACKGROUND]
+
+    def test_cache_degrades_to_coarse_cells_when_tight(self):
+        """Test: con la cuota presionada se reutiliza el pronóstico de la celda gruesa"""
+        upstream = Mock()
+        upstream.get_forecast.side_effect = lambda lat, lon: make_forecast(lat, lon)
+        quota = Mock(limited=True)
+        quota.level.return_value = QuotaManager.NORMAL
+        service = CachedWeatherService(upstream, InMemoryForecastCache(), ttl=600, cell_size=0.1,
+                                       quota=quota, degraded_cell_size=0.5)
+
+        service.get_forecast(5.07, -75.52)
+        quota.level.return_value = QuotaManager.TIGHT
+        forecast = service.get_forecast(5.31, -75.68)
+
+        assert upstream.get_forecast.call_count == 1
+        assert (forecast.latitude, forecast.longitude) == (5.31, -75.68)
+
+        quota.level.return_value = QuotaManager.NORMAL
+        service.get_forecast(5.31, -75.68)
+        assert upstream.get_forecast.call_count == 2
+
+    def test_cache_accepts_older_entries_when_tight(self):
+        """Test: con la cuota presionada el TTL efectivo se alarga"""
+        upstream = Mock()
+        upstream.get_forecast.side_effect = lambda lat, lon: make_forecast(lat, lon)
+        cache = InMemoryForecastCache(clock=FakeClock())
+        quota = Mock(limited=True)
+        quota.level.return_value = QuotaManager.TIGHT
+        service = CachedWeatherService(upstream, cache, ttl=600, cell_size=0.1,
+                                       quota=quota, degraded_ttl_factor=4.0)
+
+        service.get_forecast(5.07, -75.52)
+        cache._clock.now += 1200
+        service.get_forecast(5.07, -75.52)
+        assert upstream.get_forecast.call_count == 1
+
+        cache._clock.now += 1200
+        service.get_forecast(5.07, -75.52)
+        assert upstream.get_forecast.call_count == 2
@@ -0,0 +1,172 @@
+"""
+Tests para el filtro de Bloom de destinatarios con notificaciones
+"""
+import time
+import pytest
+from unittest.mock import patch
+from datetime import datetime
+from domain.entities.notification import Notification
+from infrastructure.cache.recipient_filter import BloomFilter, RecipientBloomFilter
+from infrastructure.database.connection import db_connection
+from infrastructure.database.schema import initialize_database
+from infrastructure.repositories.notification_repository_impl import NotificationRepositoryImpl
+from infrastructure.repositories.sharded_notification_repository import ShardedNotificationRepository
+
+
+def make_notification(email: str) -> Notification:
+    return Notification(
+        email=email, latitude=5.07, longitude=-75.52,
+        condition='Heavy Rain', code=1195, sent_at=datetime(2025, 4, 7, 10, 0)
+    )
+
+
+class TestBloomFilter:
+    """Tests del filtro en sí"""
+
+    def test_no_false_negatives_and_rate_near_target(self):
+        """Test: todo lo agregado se encuentra y la tasa medida queda cerca de la configurada"""
+        bloom = BloomFilter(capacity=5000, false_positive_rate=0.01)
+        present = [f"user{n}@example.com" for n in range(5000)]
+        for email in present:
+            bloom.add(email)
+
+        assert all(email in bloom for email in present)
+        false_positives = sum(f"absent{n}@example.com" in bloom for n in range(20000))
+        assert false_positives / 20000 < 0.02
+        assert bloom.estimated_false_positive_rate() == pytest.approx(0.01, rel=0.2)
+
+    def test_size_follows_capacity_and_rate(self):
+        """Test: ~9.6 bits y 7 hashes por clave al 1 %; repetir una clave no la cuenta dos veces"""
+        bloom = BloomFilter(capacity=1000000, false_positive_rate=0.01)
+
+        assert bloom.hashes == 7
+        assert bloom.memory_bytes == pytest.approx(1198133, rel=0.001)
+        assert bloom.add('a@example.com') is True
+        assert bloom.add('a@example.com') is False
+        assert bloom.count == 1
+
+        with pytest.raises(ValueError):
+            BloomFilter(capacity=100, false_positive_rate=1.5)
+
+
+class TestRecipientBloomFilter:
+    """Tests del filtro armado desde la tabla de notificaciones"""
+
+    @pytest.fixture
+    def database(self, tmp_path):
+        initialize_database(str(tmp_path / 'recipients.db'), stats_cell_size=1.0)
+        yield
+        db_connection.close()
+
+    def make_filter(self, **kwargs) -> RecipientBloomFilter:
+        options = {'capacity': 1000, 'false_positive_rate': 0.01, 'refresh_seconds': 0, 'batch_size': 2}
+        options.update(kwargs)
+        return RecipientBloomFilter(repository=NotificationRepositoryImpl(), **options)
+
+    def test_load_reads_existing_rows_and_save_updates(self, database):
+        """Test: el arranque lee la tabla y cada save de este proceso entra al filtro al instante"""
+        other_worker = NotificationRepositoryImpl()
+        for n in range(5):
+            other_worker.save(make_notification(f"user{n}@example.com"))
+        recipients = self.make_filter().load()
+        repository = NotificationRepositoryImpl(recipient_filter=recipients)
+
+        repository.save(make_notification('new@example.com'))
+
+        assert all(recipients.might_contain(f"user{n}@example.com") for n in range(5))
+        assert recipients.might_contain('new@example.com')
+        assert not recipients.might_contain('never@example.com')
+
+    def test_misses_do_not_touch_the_database(self, database):
+        """Test: un "no" sale de los bits; lo de otro worker entra con el refresco, también tras archivar todo"""
+        recipients = self.make_filter().load()
+        other_worker = NotificationRepositoryImpl()
+        archived = other_worker.save(make_notification('old@example.com'))
+        recipients.refresh()
+        assert recipients.might_contain('old@example.com')
+        other_worker.delete_by_ids([archived.id])
+        other_worker.save(make_notification('elsewhere@example.com'))
+
+        with patch.object(NotificationRepositoryImpl, 'find_after') as find_after:
+            assert not recipients.might_contain('elsewhere@example.com')
+            assert not recipients.might_contain('never@example.com')
+        assert find_after.call_count == 0
+
+        assert recipients.refresh() == 1
+        assert recipients.might_contain('elsewhere@example.com')
+        assert recipients.memory_usage() == recipients.snapshot()['memory_bytes']
+
+    def test_background_refresh_picks_up_other_workers_rows(self, database):
+        """Test: el hilo lee lo de otros workers dentro de la ventana de refresh_seconds"""
+        recipients = self.make_filter(refresh_seconds=0.05).load().start()
+        try:
+            NotificationRepositoryImpl().save(make_notification('elsewhere@example.com'))
+
+            deadline = time.monotonic() + 2
+            while not recipients.might_contain('elsewhere@example.com') and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            assert recipients.might_contain('elsewhere@example.com')
+        finally:
+            recipients.stop()
+
+    def test_persisted_filter_only_reads_new_rows(self, database, tmp_path):
+        """Test: con el archivo persistido, el arranque solo lee lo guardado después"""
+        path = str(tmp_path / 'recipients.bloom')
+        repository = NotificationRepositoryImpl()
+        for n in range(4):
+            repository.save(make_notification(f"user{n}@example.com"))
+        self.make_filter(path=path).load().save()
+        repository.save(make_notification('late@example.com'))
+
+        restored = self.make_filter(path=path)
+        restored.load()
+
+        assert restored.snapshot()['items'] == 5
+        assert restored.might_contain('user0@example.com') and restored.might_contain('late@example.com')
+        assert restored.refresh() == 0
+
+    def test_incompatible_file_is_rebuilt(self, database, tmp_path):
+        """Test: otra capacidad, u otra base con menos filas, rearman el filtro desde la tabla"""
+        path = str(tmp_path / 'recipients.bloom')
+        NotificationRepositoryImpl().save(make_notification('a@example.com'))
+        self.make_filter(path=path).load().save()
+
+        resized = self.make_filter(path=path, capacity=5000).load()
+        assert resized.snapshot()['capacity'] == 5000
+        assert resized.might_contain('a@example.com')
+
+        initialize_database(str(tmp_path / 'fresh.db'), stats_cell_size=1.0)
+        fresh = self.make_filter(path=path).load()
+        assert not fresh.might_contain('a@example.com')
+
+    def test_measured_false_positive_rate(self):
+        """Test: la tasa medida es la fracción de emails ausentes que igual llegaron a la base"""
+        recipients = RecipientBloomFilter(capacity=100)
+        recipients.add('a@example.com')
+
+        for n in range(3):
+            recipients.might_contain(f"absent{n}@example.com")
+        recipients.report_false_positive('b@example.com')
+
+        snapshot = recipients.snapshot()
+        assert snapshot['negatives'] == 3
+        assert snapshot['measured_false_positive_rate'] == 0.25
+
+    def test_follows_each_shard(self, tmp_path):
+        """Test: con shards, cada uno se lee desde su propio último id"""
+        paths = [str(tmp_path / f'notifications-{index}.db') for index in range(3)]
+        writer = ShardedNotificationRepository(paths)
+        writer.initialize(stats_cell_size=1.0)
+        reader = ShardedNotificationRepository(paths)
+        recipients = RecipientBloomFilter(repository=reader, capacity=1000, refresh_seconds=0).load()
+
+        emails = [f"user{n}@example.com" for n in range(12)]
+        for email in emails:
+            writer.save(make_notification(email))
+
+        assert recipients.refresh() == 12
+
+        assert all(recipients.might_contain(email) for email in emails)
+        writer.close()
+        reader.close()
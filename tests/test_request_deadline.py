@@ -0,0 +1,252 @@
+"""
+Tests para el plazo de POST /check_weather propagado a cada etapa
+"""
+import sqlite3
+import time
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+from flask import Flask
+from benchmarks.fake_weather_api import FakeWeatherAPIServer
+from benchmarks.smtp_sink import SMTPSink
+from application.dto.weather_request_dto import WeatherRequestDTO
+from application.use_cases.check_weather_use_case import CheckWeatherUseCase
+from domain.entities.forecast import Forecast
+from domain.entities.notification import Notification
+from domain.services.deadline import DeadlineExceededException, current_deadline, deadline, time_budget
+from infrastructure.database.connection import db_connection
+from infrastructure.database.schema import initialize_database
+from infrastructure.external_services.circuit_breaker import CircuitBreaker
+from infrastructure.external_services.email_service import EmailService
+from infrastructure.external_services.resilient_weather_service import ResilientWeatherService
+from infrastructure.external_services.weather_api_service import WeatherAPIService
+from infrastructure.cache.forecast_cache import InMemoryForecastCache
+from infrastructure.repositories.notification_repository_impl import NotificationRepositoryImpl
+from presentation.routes.weather_routes import WeatherRoutes
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_forecast(adverse=True) -> Forecast:
+    return Forecast(
+        location="Manizales, Colombia",
+        latitude=5.07,
+        longitude=-75.52,
+        temperature_c=18.0,
+        condition="Heavy Rain" if adverse else "Sunny",
+        condition_code=1195 if adverse else 1000,
+        is_adverse=adverse,
+        forecast_date=datetime(2025, 4, 7)
+    )
+
+
+class TestDeadline:
+    """Tests del plazo en el contexto"""
+
+    def test_budget_is_capped_by_remaining_time(self):
+        """Test: cada etapa usa su timeout o lo que queda del plazo, lo menor"""
+        clock = FakeClock()
+        assert time_budget('weather', 10.0) == 10.0
+
+        with deadline(3.0, clock=clock):
+            assert time_budget('weather', 10.0) == 3.0
+            clock.now += 2.5
+            assert time_budget('weather', 10.0) == pytest.approx(0.5)
+            assert time_budget('weather', 0.2) == 0.2
+            clock.now += 1.0
+            with pytest.raises(DeadlineExceededException) as error:
+                time_budget('email', 20.0)
+
+        assert error.value.stage == 'email'
+        assert current_deadline() is None
+
+    def test_nested_deadline_never_extends(self):
+        """Test: un plazo interior más largo no extiende el exterior"""
+        with deadline(1.0) as outer:
+            with deadline(60.0) as inner:
+                assert inner is outer
+            with deadline(0.5) as shorter:
+                assert shorter.expires_at < outer.expires_at
+
+
+class TestStageBudgets:
+    """Tests de cada etapa contra servidores locales lentos"""
+
+    def test_slow_upstream_is_cut_at_the_deadline(self):
+        """Test: la llamada al upstream no espera su timeout completo"""
+        with FakeWeatherAPIServer(latency_ms=1000) as server:
+            service = WeatherAPIService(api_key='fake', api_url=server.url, timeout=10.0)
+            started = time.monotonic()
+            with deadline(0.2), pytest.raises(DeadlineExceededException) as error:
+                service.get_forecast(5.07, -75.52)
+
+        assert error.value.stage == 'weather'
+        assert time.monotonic() - started < 0.9
+
+    def test_deadline_is_not_an_upstream_failure(self):
+        """Test: el breaker no cuenta el plazo agotado ni se sirve el respaldo"""
+        upstream = Mock()
+        upstream.get_forecast.side_effect = DeadlineExceededException('weather')
+        fallback = InMemoryForecastCache()
+        fallback.set('0.1:950:1044', make_forecast(), 0.0)
+        breaker = CircuitBreaker(min_calls=1)
+        service = ResilientWeatherService(weather_service=upstream, breaker=breaker, fallback_cache=fallback)
+
+        with pytest.raises(DeadlineExceededException):
+            service.get_forecast(5.07, -75.52)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_slow_smtp_is_cut_and_connection_discarded(self):
+        """Test: el envío se corta al vencer el plazo y la conexión no vuelve al pool"""
+        with SMTPSink(latency_ms=1000) as sink:
+            service = EmailService(
+                server=sink.host, port=sink.port, username='bench@localhost', password='secret',
+                use_tls=False, pool_size=2
+            )
+            started = time.monotonic()
+            with deadline(0.3), pytest.raises(DeadlineExceededException) as error:
+                service.send_email('test@example.com', 'Asunto', 'Cuerpo')
+            elapsed = time.monotonic() - started
+
+            assert error.value.stage == 'email'
+            assert elapsed < 0.9
+            assert service._pool == []
+            service.close()
+
+    def test_pooled_connection_gets_default_timeout_back(self):
+        """Test: la conexión devuelta al pool no conserva el timeout acotado"""
+        with SMTPSink() as sink:
+            service = EmailService(
+                server=sink.host, port=sink.port, username='bench@localhost', password='secret',
+                use_tls=False, pool_size=1, timeout=20.0
+            )
+            with deadline(5.0):
+                service.send_email('test@example.com', 'Asunto', 'Cuerpo')
+
+            (connection, _), = service._pool
+            assert connection.sock.gettimeout() == 20.0
+            service.close()
+
+
+class TestRepositoryBudget:
+    """Tests de la espera por el lock de escritura"""
+
+    @pytest.fixture
+    def database(self, tmp_path):
+        """Base de datos temporal con el esquema completo"""
+        path = str(tmp_path / 'deadline.db')
+        initialize_database(path, stats_cell_size=1.0)
+        yield path
+        db_connection.close()
+
+    def notification(self) -> Notification:
+        return Notification(
+            email='test@example.com', latitude=5.07, longitude=-75.52,
+            condition='Heavy Rain', code=1195, sent_at=datetime(2025, 4, 7, 10, 0)
+        )
+
+    def test_locked_database_waits_only_the_remaining_budget(self, database):
+        """Test: con otro escritor, la escritura se rinde al vencer el plazo y no a los 5 s"""
+        other = sqlite3.connect(database, isolation_level=None)
+        other.execute('BEGIN IMMEDIATE')
+        try:
+            started = time.monotonic()
+            with deadline(0.2), pytest.raises(DeadlineExceededException) as error:
+                NotificationRepositoryImpl().save(self.notification())
+            assert time.monotonic() - started < 2.0
+            assert error.value.stage == 'db'
+        finally:
+            other.execute('ROLLBACK')
+            other.close()
+
+        (busy_timeout,) = db_connection.db.execute_sql('PRAGMA busy_timeout').fetchone()
+        assert busy_timeout == 5000
+
+    def test_sent_alert_is_recorded_after_the_deadline(self, database):
+        """Test: con la base libre, la alerta ya enviada se registra aunque el plazo haya vencido"""
+        clock = FakeClock()
+        with deadline(1.0, clock=clock):
+            clock.now += 5
+            saved = NotificationRepositoryImpl().save(self.notification())
+
+        assert saved.id is not None
+
+
+class TestCheckWeatherDeadline:
+    """Tests del caso de uso y de la ruta"""
+
+    def test_use_case_runs_inside_the_deadline(self):
+        """Test: el servicio del clima ve el plazo de la solicitud"""
+        seen = []
+        weather_service = Mock()
+        weather_service.get_forecast.side_effect = lambda lat, lon: seen.append(current_deadline()) or make_forecast(adverse=False)
+        use_case = CheckWeatherUseCase(Mock(), weather_service, Mock())
+
+        use_case.execute(WeatherRequestDTO(latitude=5.07, longitude=-75.52, email='a@example.com', deadline_seconds=2.0))
+
+        assert seen[0].budget == 2.0
+        assert current_deadline() is None
+
+    def test_email_stage_exhaustion_skips_the_record(self):
+        """Test: si el correo agota el plazo no se registra una alerta que no salió"""
+        weather_service = Mock()
+        weather_service.get_forecast.return_value = make_forecast()
+        email_service = Mock()
+        email_service.send_email.side_effect = DeadlineExceededException('email')
+        repository = Mock()
+        use_case = CheckWeatherUseCase(repository, weather_service, email_service)
+
+        with pytest.raises(DeadlineExceededException):
+            use_case.execute(WeatherRequestDTO(latitude=5.07, longitude=-75.52, email='a@example.com', deadline_seconds=1.0))
+        repository.save.assert_not_called()
+
+    @pytest.fixture
+    def use_case(self):
+        return Mock()
+
+    @pytest.fixture
+    def client(self, monkeypatch, use_case):
+        monkeypatch.setenv('API_KEY', 'test-key')
+        routes = WeatherRoutes(
+            check_weather_use_case=use_case,
+            get_notifications_use_case=Mock(),
+            deadline_seconds=14.0
+        )
+        app = Flask(__name__)
+        app.register_blueprint(routes.get_blueprint())
+        return app.test_client()
+
+    def post(self, client, timeout=None):
+        headers = {'x-api-key': 'test-key'}
+        if timeout is not None:
+            headers['X-Request-Timeout'] = timeout
+        body = {'latitude': 5.07, 'longitude': -75.52, 'email': 'a@example.com'}
+        return client.post('/check_weather', json=body, headers=headers)
+
+    def test_route_reports_the_exhausted_stage(self, client, use_case):
+        """Test: 504 con la etapa que se quedó sin tiempo"""
+        use_case.execute.side_effect = DeadlineExceededException('email')
+
+        response = self.post(client)
+
+        assert response.status_code == 504
+        assert response.get_json()['stage'] == 'email'
+        assert response.get_json()['deadline_seconds'] == 14.0
+
+    def test_header_can_only_shorten_the_deadline(self, client, use_case):
+        """Test: X-Request-Timeout acorta el plazo configurado pero no lo extiende"""
+        use_case.execute.return_value = {'alert_sent': False}
+
+        self.post(client, '3.5')
+        self.post(client, '60')
+
+        budgets = [call.args[0].deadline_seconds for call in use_case.execute.call_args_list]
+        assert budgets == [3.5, 14.0]
+        assert self.post(client, 'soon').status_code == 400
+        assert self.post(client, '0').status_code == 400
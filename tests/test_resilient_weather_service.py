@@ -0,0 +1,216 @@
+"""
+Tests para CircuitBreaker y ResilientWeatherService
+"""
+import time
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+from domain.entities.forecast import Forecast
+from infrastructure.cache.forecast_cache import InMemoryForecastCache
+from infrastructure.external_services.cached_weather_service import CachedWeatherService
+from infrastructure.external_services.circuit_breaker import CircuitBreaker
+from infrastructure.external_services.quota_manager import QuotaExceededException
+from infrastructure.external_services.weather_api_service import WeatherAPIException
+from infrastructure.external_services.resilient_weather_service import (
+    ResilientWeatherService,
+    WeatherServiceUnavailableException
+)
+
+
+def make_forecast(latitude=5.07, longitude=-75.52) -> Forecast:
+    return Forecast(
+        location="Armenia, Colombia",
+        latitude=latitude,
+        longitude=longitude,
+        temperature_c=20.0,
+        condition="Heavy Rain",
+        condition_code=1195,
+        is_adverse=True,
+        forecast_date=datetime.now(),
+        humidity=90,
+        wind_kph=30.0
+    )
+
+
+class FakeClock:
+    """Reloj manual para avanzar el tiempo sin dormir"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker:
+    """Tests para las transiciones de estado del circuit breaker"""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def breaker(self, clock):
+        return CircuitBreaker(
+            failure_rate_threshold=0.5,
+            slow_call_seconds=1.0,
+            slow_call_rate_threshold=0.5,
+            window_size=4,
+            min_calls=4,
+            open_seconds=10,
+            half_open_calls=2,
+            clock=clock
+        )
+
+    def test_opens_on_error_rate(self, breaker):
+        """Test: se abre al superar la tasa de errores"""
+        breaker.record_success(0.1)
+        breaker.record_success(0.1)
+        breaker.record_failure()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow_request() is False
+
+    def test_opens_on_slow_calls(self, breaker):
+        """Test: las llamadas lentas también abren el circuito"""
+        for _ in range(4):
+            breaker.record_success(2.0)
+
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_half_open_probes_close_circuit(self, breaker, clock):
+        """Test: tras open_seconds las sondas exitosas cierran el circuito"""
+        for _ in range(4):
+            breaker.record_failure()
+        clock.now = 10
+
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False
+        breaker.record_success(0.1)
+        breaker.record_success(0.1)
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_failure_reopens(self, breaker, clock):
+        """Test: una sonda fallida vuelve a abrir el circuito"""
+        for _ in range(4):
+            breaker.record_failure()
+        clock.now = 10
+        breaker.allow_request()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.times_opened == 2
+
+
+class TestResilientWeatherService:
+    """Tests para el decorador resiliente del servicio de clima"""
+
+    @pytest.fixture
+    def inner_service(self):
+        return Mock()
+
+    @pytest.fixture
+    def breaker(self):
+        return CircuitBreaker(window_size=2, min_calls=2, open_seconds=60)
+
+    def test_fails_fast_when_open(self, inner_service, breaker):
+        """Test: con el circuito abierto no se llama al upstream"""
+        inner_service.get_forecast.side_effect = WeatherAPIException("timeout")
+        service = ResilientWeatherService(inner_service, breaker)
+
+        for _ in range(2):
+            with pytest.raises(WeatherAPIException):
+                service.get_forecast(5.07, -75.52)
+
+        with pytest.raises(WeatherServiceUnavailableException):
+            service.get_forecast(5.07, -75.52)
+        assert inner_service.get_forecast.call_count == 2
+
+    def test_serves_cached_forecast_when_open(self, inner_service, breaker):
+        """Test: con el circuito abierto se sirve el último pronóstico de la celda"""
+        service = ResilientWeatherService(inner_service, breaker, fallback_cache=InMemoryForecastCache())
+        inner_service.get_forecast.return_value = make_forecast()
+        service.get_forecast(5.07, -75.52)
+
+        inner_service.get_forecast.side_effect = WeatherAPIException("timeout")
+        service.get_forecast(5.07, -75.52)
+        service.get_forecast(5.07, -75.52)
+        forecast = service.get_forecast(5.071, -75.521)
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert forecast.condition == "Heavy Rain"
+        assert forecast.latitude == 5.071
+
+    @pytest.mark.parametrize('error', [QuotaExceededException("sin cuota"), RuntimeError("inesperado")])
+    def test_half_open_probe_is_released_when_the_call_does_not_count(self, inner_service, error):
+        """Test: una sonda HALF_OPEN rechazada por cuota (o por un error ajeno al upstream) se libera"""
+        clock = FakeClock()
+        breaker = CircuitBreaker(window_size=2, min_calls=2, open_seconds=10, half_open_calls=2, clock=clock)
+        service = ResilientWeatherService(inner_service, breaker)
+        inner_service.get_forecast.side_effect = WeatherAPIException("timeout")
+        for _ in range(2):
+            with pytest.raises(WeatherAPIException):
+                service.get_forecast(5.07, -75.52)
+        clock.now = 10
+
+        inner_service.get_forecast.side_effect = error
+        for _ in range(2):
+            with pytest.raises(Exception):
+                service.get_forecast(5.07, -75.52)
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker._probes_in_flight == 0
+        inner_service.get_forecast.side_effect = None
+        inner_service.get_forecast.return_value = make_forecast()
+        service.get_forecast(5.07, -75.52)
+        service.get_forecast(5.07, -75.52)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_stale_fallback_expires_behind_a_cache(self, inner_service):
+        """Test: con la caché delante, el respaldo no se renueva y deja de servirse tras stale_ttl"""
+        clock = FakeClock()
+        cache = InMemoryForecastCache(clock=clock)
+        breaker = CircuitBreaker(window_size=2, min_calls=2, open_seconds=3600)
+        resilient = ResilientWeatherService(inner_service, breaker, fallback_cache=cache, stale_ttl=100)
+        cached = CachedWeatherService(resilient, cache, ttl=10)
+        inner_service.get_forecast.return_value = make_forecast()
+        cached.get_forecast(5.07, -75.52)
+
+        inner_service.get_forecast.side_effect = WeatherAPIException("timeout")
+        served = []
+        for now in range(20, 110, 15):
+            clock.now = now
+            served.append(cached.get_forecast(5.07, -75.52))
+        assert breaker.state == CircuitBreaker.OPEN
+        assert all(forecast.is_stale for forecast in served)
+        with pytest.raises(WeatherAPIException):
+            cached.refresh(5.07, -75.52)
+
+        clock.now = 111
+        with pytest.raises(WeatherServiceUnavailableException):
+            cached.get_forecast(5.07, -75.52)
+
+    def test_hedged_request_wins_over_slow_primary(self, breaker):
+        """Test: si la primera llamada se demora, la de cobertura responde"""
+        calls = []
+
+        class SlowThenFastService:
+            def get_forecast(self, latitude, longitude):
+                calls.append(time.monotonic())
+                if len(calls) == 1:
+                    time.sleep(0.5)
+                return make_forecast(latitude, longitude)
+
+        service = ResilientWeatherService(
+            SlowThenFastService(), breaker, hedge_enabled=True, hedge_min_delay=0.05
+        )
+
+        started = time.monotonic()
+        forecast = service.get_forecast(5.07, -75.52)
+
+        assert forecast.condition == "Heavy Rain"
+        assert len(calls) == 2
+        assert time.monotonic() - started < 0.4
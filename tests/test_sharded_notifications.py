@@ -0,0 +1,195 @@
+"""
+Tests para las notificaciones repartidas en shards y su rebalanceo
+"""
+import pytest
+from datetime import date, datetime, timedelta
+from domain.entities.notification import Notification
+from infrastructure.database.connection import db_connection
+from infrastructure.database.schema import initialize_database
+from infrastructure.repositories.alert_stats_repository_impl import AlertStatsRepositoryImpl
+from infrastructure.repositories.cell_demand_repository_impl import CellDemandRepositoryImpl
+from infrastructure.repositories.notification_repository_impl import NotificationRepositoryImpl
+from infrastructure.repositories.sharded_notification_repository import ShardedNotificationRepository, shard_index
+from infrastructure.streaming.notification_broker import NotificationBroker
+
+
+def email_in_shard(shard: int, shard_count: int, skip: int = 0) -> str:
+    """Un email que cae en el shard indicado"""
+    candidates = (f"user{n}@example.com" for n in range(10000))
+    matching = (email for email in candidates if shard_index(email, shard_count) == shard)
+    for _ in range(skip):
+        next(matching)
+    return next(matching)
+
+
+def make_notification(email, sent_at=datetime(2025, 4, 7, 10, 0), latitude=5.07, longitude=-75.52):
+    return Notification(
+        email=email,
+        latitude=latitude,
+        longitude=longitude,
+        condition="Heavy Rain",
+        code=1195,
+        sent_at=sent_at
+    )
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return [str(tmp_path / f'notifications-{index}.db') for index in range(3)]
+
+
+@pytest.fixture
+def repository(paths):
+    repository = ShardedNotificationRepository(paths)
+    repository.initialize(stats_cell_size=1.0)
+    yield repository
+    repository.close()
+
+
+def count_rows(shard) -> int:
+    return shard.db.execute_sql('SELECT COUNT(*) FROM notifications').fetchone()[0]
+
+
+class TestShardedNotificationRepository:
+    """Tests del reparto, las consultas y los ids"""
+
+    def test_rows_are_routed_by_email(self, repository):
+        """Test: cada destinatario vive en un solo shard y su consulta solo lee ese shard"""
+        emails = [email_in_shard(index, 3) for index in range(3)]
+        for email in emails:
+            repository.save(make_notification(email))
+        repository.save(make_notification(emails[1]))
+
+        assert [count_rows(shard) for shard in repository.shards] == [1, 2, 1]
+        assert len(repository.find_by_email(emails[1])) == 2
+
+    def test_ids_are_unique_and_encode_the_shard(self, repository):
+        """Test: los ids no se repiten entre shards y se borran en el shard que corresponde"""
+        saved = [repository.save(make_notification(email_in_shard(index % 3, 3))) for index in range(6)]
+
+        ids = [n.id for n in saved]
+        assert len(set(ids)) == 6
+        assert [notification_id % 3 for notification_id in ids] == [0, 1, 2, 0, 1, 2]
+
+        assert repository.delete_by_ids(ids[:2]) == 2
+        assert {n.id for n in repository.find_all()} == set(ids[2:])
+
+    def test_find_all_merges_in_sent_at_order(self, repository):
+        """Test: la mezcla de todos los shards queda de la más reciente a la más antigua"""
+        start = datetime(2025, 4, 1, 8, 0)
+        for hour in range(9):
+            repository.save(make_notification(email_in_shard(hour % 3, 3), sent_at=start + timedelta(hours=hour)))
+
+        sent = [n.sent_at for n in repository.find_all()]
+
+        assert sent == sorted(sent, reverse=True)
+        assert len(sent) == 9
+
+    def test_find_sent_before_takes_oldest_across_shards(self, repository):
+        """Test: la exportación toma las más antiguas del conjunto, no de cada shard"""
+        start = datetime(2025, 1, 1)
+        for day in range(6):
+            repository.save(make_notification(email_in_shard(day % 2, 3), sent_at=start + timedelta(days=day)))
+
+        batch = repository.find_sent_before(datetime(2025, 2, 1), limit=3)
+
+        assert [n.sent_at.day for n in batch] == [1, 2, 3]
+
+    def test_find_near_and_replay_by_email(self, repository):
+        """Test: la búsqueda por radio mezcla shards y la reanudación usa el shard del email"""
+        mine = email_in_shard(2, 3)
+        first = repository.save(make_notification(mine))
+        repository.save(make_notification(email_in_shard(0, 3)))
+        second = repository.save(make_notification(mine, latitude=40.0, longitude=3.0))
+
+        assert len(repository.find_near(5.07, -75.52, radius_km=5)) == 2
+        assert [n.id for n in repository.find_after(first.id, 10, email=mine)] == [second.id]
+
+    def test_alert_stats_add_up_across_shards(self, repository):
+        """Test: los agregados de /stats suman los de cada shard"""
+        for index in range(3):
+            repository.save(make_notification(email_in_shard(index, 3)))
+        stats = AlertStatsRepositoryImpl(cell_size=1.0, databases=repository.databases)
+
+        counts = stats.find_daily_counts(date(2025, 4, 7), date(2025, 4, 7))
+
+        assert sum(item.count for item in counts) == 3
+        assert stats.find_recipient_stats(email_in_shard(1, 3)).count == 1
+
+    def test_prefetch_demand_counts_every_shard(self, tmp_path, repository):
+        """Test: el ranking del precalentamiento suma el historial de todos los shards"""
+        initialize_database(str(tmp_path / 'main.db'), stats_cell_size=1.0)
+        for index in range(3):
+            repository.save(make_notification(email_in_shard(index, 3), sent_at=datetime(2025, 4, 6, 7, 5)))
+        repository.save(make_notification(email_in_shard(2, 3), sent_at=datetime(2025, 4, 6, 7, 30),
+                                          latitude=4.65, longitude=-74.05))
+        demand = CellDemandRepositoryImpl(cell_size=0.1, databases=repository.databases)
+        demand.record('0.1:946:1059', datetime(2025, 4, 7, 7, 15))
+        demand.flush()
+
+        hottest = demand.hottest_cells(7, since=date(2025, 4, 1), limit=10)
+
+        assert hottest == [('0.1:950:1044', 3), ('0.1:946:1059', 2)]
+        db_connection.close()
+
+
+class TestShardedStreaming:
+    """Tests del broker sobre shards"""
+
+    def test_poll_follows_each_shard(self, repository, paths):
+        """Test: una fila nueva en un shard atrasado también se publica"""
+        broker = NotificationBroker(repository=repository, poll_seconds=0)
+        lagging = email_in_shard(1, 3)
+        busy = email_in_shard(0, 3)
+        for _ in range(5):
+            repository.save(make_notification(busy))
+        subscription = broker.subscribe(lagging)
+
+        other_worker = ShardedNotificationRepository(paths)
+        saved = other_worker.save(make_notification(lagging))
+        other_worker.close()
+
+        assert saved.id < repository.last_id()
+        assert broker.poll() == 1
+        assert subscription.get(timeout=1).id == saved.id
+
+
+class TestRebalance:
+    """Tests de la herramienta de rebalanceo"""
+
+    def test_from_single_database(self, tmp_path, paths):
+        """Test: las filas de la base única pasan a su shard y se borran del origen"""
+        initialize_database(str(tmp_path / 'single.db'), stats_cell_size=1.0)
+        emails = [email_in_shard(index % 3, 3, skip=index // 3) for index in range(7)]
+        for email in emails:
+            NotificationRepositoryImpl().save(make_notification(email))
+        db_connection.close()
+
+        repository = ShardedNotificationRepository(paths)
+        repository.initialize(stats_cell_size=1.0)
+        result = repository.rebalance([str(tmp_path / 'single.db')], batch_size=3)
+
+        assert result == {'scanned': 7, 'moved': 7}
+        assert sorted(n.email for n in repository.find_all()) == sorted(emails)
+        for email in emails:
+            assert repository.find_by_email(email)
+        repository.close()
+
+    def test_between_shard_counts(self, tmp_path, repository, paths):
+        """Test: de 3 a 2 shards solo se mueven las filas cuyo shard cambia"""
+        emails = [f"user{n}@example.com" for n in range(30)]
+        for email in emails:
+            repository.save(make_notification(email))
+        repository.close()
+
+        resized = ShardedNotificationRepository(paths[:2])
+        resized.initialize(stats_cell_size=1.0)
+        result = resized.rebalance(paths)
+
+        stayed = sum(1 for email in emails if shard_index(email, 3) == shard_index(email, 2))
+        assert result['moved'] == 30 - stayed
+        assert [count_rows(shard) for shard in resized.shards] == [
+            sum(1 for email in emails if shard_index(email, 2) == index) for index in range(2)
+        ]
+        assert count_rows(repository.shards[2]) == 0
+        resized.close()
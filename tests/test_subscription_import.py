@@ -0,0 +1,148 @@
+"""
+Tests para la importación masiva de suscripciones desde CSV
+"""
+import io
+import pytest
+from unittest.mock import Mock
+from flask import Flask
+from application.use_cases.import_subscriptions_use_case import ImportSubscriptionsUseCase
+from infrastructure.database.connection import db_connection
+from infrastructure.database.schema import initialize_database
+from infrastructure.repositories.subscription_repository_impl import SubscriptionRepositoryImpl
+from presentation.routes.subscription_routes import SubscriptionRoutes
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Base de datos temporal con el esquema completo"""
+    initialize_database(str(tmp_path / 'subscriptions.db'), stats_cell_size=1.0)
+    yield db_connection.db
+    db_connection.close()
+
+
+@pytest.fixture
+def repository(database):
+    return SubscriptionRepositoryImpl()
+
+
+class TestImportSubscriptionsUseCase:
+    """Tests de integración de la importación"""
+
+    def test_imports_in_batches(self, repository):
+        """Test: guarda las filas válidas en lotes de batch_size"""
+        lines = ["email,latitude,longitude\n"] + [
+            f"user{i}@example.com,5.{i},-75.52\n" for i in range(7)
+        ]
+
+        report = ImportSubscriptionsUseCase(repository, batch_size=3).execute(lines)
+
+        assert report.rows == 7
+        assert report.imported == 7
+        assert report.batches == 3
+        assert repository.count() == 7
+
+    def test_duplicates_are_ignored(self, repository):
+        """Test: una suscripción repetida, en el archivo o ya guardada, no se inserta"""
+        use_case = ImportSubscriptionsUseCase(repository)
+        row = "test@example.com,5.07,-75.52\n"
+
+        first = use_case.execute([row, row])
+        second = use_case.execute([row])
+
+        assert (first.imported, first.duplicates) == (1, 1)
+        assert (second.imported, second.duplicates) == (0, 1)
+        assert len(repository.find_by_email("test@example.com")) == 1
+
+    def test_rejects_report_line_numbers(self, repository):
+        """Test: las filas inválidas se reportan con su línea y no detienen la carga"""
+        csv_text = (
+            "email,latitude,longitude\n"
+            "ok@example.com,5.07,-75.52\n"
+            "invalido,5.07,-75.52\n"
+            "ok@example.com,95,-75.52\n"
+            "ok@example.com,abc,-75.52\n"
+            "ok@example.com,5.07\n"
+            "otro@example.com,6.25,-75.56\n"
+        )
+
+        report = ImportSubscriptionsUseCase(repository).execute(io.StringIO(csv_text, newline=''))
+
+        assert report.imported == 2
+        assert [(r.line, r.error) for r in report.rejected_rows] == [
+            (3, "Email inválido"),
+            (4, "Latitud debe estar entre -90 y 90"),
+            (5, "Latitud y longitud deben ser números"),
+            (6, "Faltan columnas"),
+        ]
+
+    def test_header_columns_in_any_order(self, repository):
+        """Test: con cabecera, las columnas se ubican por nombre"""
+        lines = ["Longitude,Email,Latitude\n", "-75.52,test@example.com,5.07\n"]
+
+        report = ImportSubscriptionsUseCase(repository).execute(lines)
+
+        assert report.imported == 1
+        subscription = repository.find_by_email("test@example.com")[0]
+        assert (subscription.latitude, subscription.longitude) == (5.07, -75.52)
+
+    def test_header_missing_column(self, repository):
+        """Test: una cabecera incompleta invalida todo el archivo"""
+        with pytest.raises(ValueError, match="longitude"):
+            ImportSubscriptionsUseCase(repository).execute(["email,latitude\n", "a@b.co,1\n"])
+
+    def test_reported_rejects_are_capped(self):
+        """Test: se cuentan todos los rechazos pero solo se guardan los primeros"""
+        lines = ["invalido,1,1\n"] * 5
+
+        report = ImportSubscriptionsUseCase(Mock(), max_reported_rejects=2).execute(lines)
+
+        assert report.rejected == 5
+        assert len(report.rejected_rows) == 2
+        assert report.to_dict()['rejected_rows_truncated'] is True
+
+
+class TestSubscriptionRoutes:
+    """Tests del endpoint POST /subscriptions/import"""
+
+    @pytest.fixture
+    def client(self, monkeypatch, repository):
+        monkeypatch.setenv('API_KEY', 'test-key')
+        routes = SubscriptionRoutes(import_subscriptions_use_case=ImportSubscriptionsUseCase(repository))
+        app = Flask(__name__)
+        app.register_blueprint(routes.get_blueprint())
+        return app.test_client()
+
+    def test_import_raw_body(self, client):
+        """Test: acepta el CSV como cuerpo de la petición"""
+        response = client.post(
+            '/subscriptions/import',
+            data="email,latitude,longitude\ntest@example.com,5.07,-75.52\ninvalido,1,1\n",
+            content_type='text/csv',
+            headers={'x-api-key': 'test-key'}
+        )
+
+        assert response.status_code == 200
+        assert response.json['imported'] == 1
+        assert response.json['rejected_rows'] == [{'line': 3, 'error': 'Email inválido'}]
+
+    def test_import_multipart_file(self, client):
+        """Test: acepta el CSV como archivo multipart"""
+        response = client.post(
+            '/subscriptions/import',
+            data={'file': (io.BytesIO(b"test@example.com,5.07,-75.52\n"), 'subs.csv')},
+            headers={'x-api-key': 'test-key'}
+        )
+
+        assert response.status_code == 200
+        assert response.json['imported'] == 1
+
+    def test_invalid_header(self, client):
+        """Test: una cabecera incompleta responde 400"""
+        response = client.post(
+            '/subscriptions/import',
+            data="email\ntest@example.com\n",
+            content_type='text/csv',
+            headers={'x-api-key': 'test-key'}
+        )
+
+        assert response.status_code == 400
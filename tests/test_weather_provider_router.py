@@ -0,0 +1,163 @@
+"""
+Tests para el enrutamiento entre proveedores del clima
+"""
+import pytest
+from datetime import datetime
+from benchmarks.fake_weather_api import FakeWeatherAPIServer
+from domain.entities.forecast import Forecast
+from domain.services.weather_provider import WeatherProvider
+from infrastructure.external_services.open_meteo_service import OpenMeteoService
+from infrastructure.external_services.quota_manager import QuotaExceededException
+from infrastructure.external_services.weather_api_service import WeatherAPIException, WeatherAPIService
+from infrastructure.external_services.weather_provider_router import WeatherProviderRouter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeProvider(WeatherProvider):
+    """Proveedor local con latencia simulada sobre el reloj falso"""
+
+    def __init__(self, name, clock, latency=0.1, error=None):
+        self.name = name
+        self.clock = clock
+        self.latency = latency
+        self.error = error
+        self.calls = 0
+
+    def get_forecast(self, latitude, longitude):
+        self.calls += 1
+        self.clock.now += self.latency
+        if self.error is not None:
+            raise self.error
+        return Forecast(
+            location=self.name,
+            latitude=latitude,
+            longitude=longitude,
+            temperature_c=20.0,
+            condition="Sunny",
+            condition_code=1000,
+            is_adverse=False,
+            forecast_date=datetime.now()
+        )
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestWeatherProviderRouter:
+    """Tests del router con proveedores locales"""
+
+    def test_prefers_fastest_provider(self, clock):
+        """Test: tras medir a todos, las consultas van al más rápido"""
+        slow = FakeProvider('slow', clock, latency=0.5)
+        fast = FakeProvider('fast', clock, latency=0.05)
+        router = WeatherProviderRouter([slow, fast], clock=clock)
+
+        for _ in range(10):
+            router.get_forecast(5.07, -75.52)
+
+        assert slow.calls == 1
+        assert fast.calls == 9
+        assert router.ranked() == [fast, slow]
+
+    def test_fails_over_to_next_provider(self, clock):
+        """Test: si el elegido falla, responde el siguiente en la misma consulta"""
+        broken = FakeProvider('broken', clock, latency=0.01, error=WeatherAPIException("caído"))
+        backup = FakeProvider('backup', clock, latency=0.2)
+        router = WeatherProviderRouter([broken, backup], clock=clock)
+
+        forecast = router.get_forecast(5.07, -75.52)
+
+        assert forecast.location == 'backup'
+        assert router.snapshot()['broken']['failures'] == 1
+
+    def test_unhealthy_provider_is_set_aside_until_cooldown(self, clock):
+        """Test: con la tasa de errores sobre el umbral, el proveedor se aparta y luego se reintenta"""
+        flaky = FakeProvider('flaky', clock, latency=0.01, error=WeatherAPIException("caído"))
+        backup = FakeProvider('backup', clock, latency=0.2)
+        router = WeatherProviderRouter(
+            [flaky, backup], smoothing=0.5, error_threshold=0.5, cooldown_seconds=30, clock=clock
+        )
+
+        router.get_forecast(5.07, -75.52)
+        assert router.snapshot()['flaky']['healthy'] is False
+        assert router.ranked() == [backup, flaky]
+
+        router.get_forecast(5.07, -75.52)
+        assert flaky.calls == 1
+
+        clock.now += 31
+        flaky.error = None
+        router.get_forecast(5.07, -75.52)
+        assert flaky.calls == 2
+        assert router.snapshot()['flaky']['healthy'] is True
+
+    def test_idle_provider_is_probed(self, clock):
+        """Test: un proveedor sin tráfico en probe_seconds vuelve a medirse"""
+        slow = FakeProvider('slow', clock, latency=0.5)
+        fast = FakeProvider('fast', clock, latency=0.05)
+        router = WeatherProviderRouter([slow, fast], probe_seconds=60, clock=clock)
+        router.get_forecast(5.07, -75.52)
+        router.get_forecast(5.07, -75.52)
+
+        clock.now += 61
+        slow.latency = 0.01
+        router.get_forecast(5.07, -75.52)
+        router.get_forecast(5.07, -75.52)
+
+        assert router.ranked()[0] is slow
+
+    def test_quota_exhaustion_is_not_an_error(self, clock):
+        """Test: sin cuota se pasa al siguiente sin penalizar al proveedor"""
+        metered = FakeProvider('metered', clock, error=QuotaExceededException("sin cuota"))
+        backup = FakeProvider('backup', clock)
+        router = WeatherProviderRouter([metered, backup], clock=clock)
+
+        assert router.get_forecast(5.07, -75.52).location == 'backup'
+        assert router.snapshot()['metered'] == {
+            'healthy': True, 'latency_ms': None, 'error_rate': 0.0, 'calls': 0, 'failures': 0
+        }
+
+    def test_all_providers_failing_raises_last_error(self, clock):
+        """Test: si fallan todos, se propaga el error para el circuit breaker"""
+        router = WeatherProviderRouter([
+            FakeProvider('a', clock, error=WeatherAPIException("a")),
+            FakeProvider('b', clock, error=WeatherAPIException("b"))
+        ], clock=clock)
+
+        with pytest.raises(WeatherAPIException, match="b"):
+            router.get_forecast(5.07, -75.52)
+
+
+class TestProvidersOverHTTP:
+    """Tests con los proveedores reales contra el servidor falso local"""
+
+    def test_open_meteo_maps_wmo_codes(self):
+        """Test: Open-Meteo se traduce a códigos de WeatherAPI"""
+        with FakeWeatherAPIServer(adverse_rate=1.0, seed=1) as fake:
+            forecast = OpenMeteoService(api_url=fake.openmeteo_url).get_forecast(5.07, -75.52)
+
+        assert forecast.is_adverse
+        assert forecast.condition_code in WeatherAPIService.ADVERSE_CODES
+        assert forecast.location == "5.07, -75.52"
+
+    def test_router_fails_over_between_real_providers(self):
+        """Test: con WeatherAPI caído, el router responde con Open-Meteo"""
+        with FakeWeatherAPIServer(error_rate=1.0) as down, FakeWeatherAPIServer() as up:
+            router = WeatherProviderRouter([
+                WeatherAPIService(api_key='fake', api_url=down.url),
+                OpenMeteoService(api_url=up.openmeteo_url)
+            ])
+            forecast = router.get_forecast(5.07, -75.52)
+
+        assert forecast.latitude == 5.07
+        assert router.snapshot()['weatherapi']['failures'] == 1
+        assert router.snapshot()['openmeteo']['calls'] == 1
@@ -0,0 +1,259 @@
+"""
+Tests para el barrido periódico repartido por particiones con concesiones
+"""
+import multiprocessing
+import time
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+from application.services.weather_sweeper import WeatherSweeper, sweep_round_key
+from domain.entities.geo_cell import GeoCell
+from domain.entities.subscription import Subscription
+from infrastructure.database.connection import db_connection
+from infrastructure.database.schema import initialize_database
+from infrastructure.repositories.subscription_repository_impl import SubscriptionRepositoryImpl
+from infrastructure.repositories.sweep_lease_repository_impl import SweepLeaseRepositoryImpl
+
+
+ROUND = '2025-04-07T10:00:00/4'
+# Una sola ronda durante todo el test, aunque cruce el cambio de hora
+INTERVAL = 10.0 ** 9
+
+
+def make_subscriptions(count: int = 40) -> list:
+    """Suscripciones en celdas distintas, algunas compartidas"""
+    return [
+        Subscription(
+            email=f"user{n}@example.com",
+            latitude=4.0 + (n % 20) * 0.5,
+            longitude=-75.0 + (n % 20) * 0.3,
+            created_at=datetime(2025, 4, 7, 8, 0)
+        )
+        for n in range(count)
+    ]
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Base de datos temporal con el esquema completo"""
+    initialize_database(str(tmp_path / 'sweep.db'), stats_cell_size=1.0)
+    yield db_connection.db
+    db_connection.close()
+
+
+@pytest.fixture
+def subscriptions(database):
+    SubscriptionRepositoryImpl().save_batch(make_subscriptions())
+    return SubscriptionRepositoryImpl()
+
+
+@pytest.fixture
+def leases(database):
+    return SweepLeaseRepositoryImpl()
+
+
+def make_sweeper(check, subscriptions, leases, clock=time.time, **kwargs) -> WeatherSweeper:
+    options = dict(cell_size=0.1, partitions=4, interval_seconds=INTERVAL, lease_seconds=30.0, rate_per_second=0)
+    options.update(kwargs)
+    return WeatherSweeper(check, subscriptions, leases, clock=clock, **options)
+
+
+class TestPartitions:
+    """Tests del reparto de celdas en particiones"""
+
+    def test_sql_partition_matches_geo_cell(self, subscriptions):
+        """Test: cada suscripción cae en una sola partición, la misma que calcula GeoCell"""
+        found = {}
+        for partition in range(4):
+            rows = subscriptions.find_in_partition(0.1, partition, 4)
+            indexes = [GeoCell.from_coordinates(s.latitude, s.longitude, 0.1).index for s in rows]
+            assert indexes == sorted(indexes)
+            for subscription in rows:
+                assert GeoCell.from_coordinates(subscription.latitude, subscription.longitude, 0.1).partition(4) == partition
+                found[subscription.email] = partition
+
+        assert len(found) == 40
+
+
+class TestSweepLeaseRepository:
+    """Tests de integración de las concesiones"""
+
+    def test_claims_are_disjoint_until_exhausted(self, leases):
+        """Test: cada reclamo obtiene una partición distinta y luego ninguna"""
+        claimed = [leases.claim(ROUND, 4, f"worker-{n}", 30.0, now=100.0) for n in range(5)]
+
+        assert [lease.partition for lease in claimed[:4]] == [0, 1, 2, 3]
+        assert claimed[4] is None
+
+    def test_expired_lease_is_taken_over_with_its_cursor(self, leases):
+        """Test: una concesión vencida pasa a otro worker, que hereda el avance"""
+        lease = leases.claim(ROUND, 1, 'worker-a', 30.0, now=100.0)
+        lease.cursor, lease.processed = 12, 5
+        assert leases.renew(lease, 30.0, now=110.0)
+
+        assert leases.claim(ROUND, 1, 'worker-b', 30.0, now=130.0) is None
+        taken = leases.claim(ROUND, 1, 'worker-b', 30.0, now=141.0)
+
+        assert (taken.owner, taken.cursor, taken.processed, taken.takeovers) == ('worker-b', 12, 5, 1)
+        # El worker anterior ya no puede renovar ni terminar
+        assert not leases.renew(lease, 30.0, now=142.0)
+        assert not leases.complete(lease, now=142.0)
+        assert leases.complete(taken, now=150.0)
+        assert leases.claim(ROUND, 1, 'worker-c', 30.0, now=1000.0) is None
+
+    def test_progress_and_purge(self, leases):
+        """Test: el avance lista las particiones y se purgan las rondas anteriores"""
+        leases.claim('2025-04-07T09:00:00/4', 4, 'worker', 30.0, now=100.0)
+        leases.claim(ROUND, 4, 'worker', 30.0, now=100.0)
+
+        assert [lease.partition for lease in leases.progress(ROUND)] == [0, 1, 2, 3]
+        assert leases.purge_before(ROUND) == 4
+        assert leases.progress('2025-04-07T09:00:00/4') == []
+
+
+class TestWeatherSweeper:
+    """Tests del barrido"""
+
+    def test_tick_checks_every_subscription_once(self, subscriptions, leases):
+        """Test: un worker solo barre todas las particiones y las marca terminadas"""
+        check = Mock()
+        sweeper = make_sweeper(check, subscriptions, leases, owner='worker')
+
+        assert sweeper.tick() == 4
+
+        emails = sorted(call.args[0].email for call in check.execute.call_args_list)
+        assert emails == sorted(s.email for s in make_subscriptions())
+        report = sweeper.report()
+        assert (report['done'], report['pending'], report['processed']) == (4, 0, 40)
+        assert sweeper.tick() == 0
+
+    def test_takeover_resumes_after_cursor(self, subscriptions, leases):
+        """Test: quien retoma una partición vencida no repite las celdas ya terminadas"""
+        now = [100.0]
+        first = leases.claim(sweep_round_key(now[0], INTERVAL, 4), 4, 'dead-worker', 30.0, now=now[0])
+        rows = subscriptions.find_in_partition(0.1, first.partition, 4)
+        cells = sorted({GeoCell.from_coordinates(s.latitude, s.longitude, 0.1).index for s in rows})
+        skipped = sum(1 for s in rows if GeoCell.from_coordinates(s.latitude, s.longitude, 0.1).index == cells[0])
+        first.cursor, first.processed = cells[0], skipped
+        leases.renew(first, 30.0, now=now[0])
+
+        check = Mock()
+        now[0] = 200.0
+        sweeper = make_sweeper(check, subscriptions, leases, clock=lambda: now[0], owner='worker')
+        lease = leases.claim(sweeper.round_key(now[0]), 4, 'worker', 30.0, now=now[0])
+        result = sweeper.sweep_partition(lease)
+
+        assert result['resumed'] is True
+        assert check.execute.call_count == len(rows) - skipped
+        assert result['processed'] == len(rows)
+
+    def test_failing_partition_is_left_to_expire(self, subscriptions, leases):
+        """Test: con el upstream caído la partición se suelta con su avance y se reintenta al vencer"""
+        now = [100.0]
+        check = Mock()
+        check.execute.side_effect = Exception("upstream caído")
+        sweeper = make_sweeper(check, subscriptions, leases, clock=lambda: now[0], owner='worker', partitions=1)
+        sweeper.MAX_CONSECUTIVE_ERRORS = 2
+
+        assert sweeper.tick() == 1
+        assert sweeper.report()['last_partition']['status'] == 'failed'
+        (lease,) = leases.progress(sweeper.round_key(now[0]))
+        assert not lease.done and lease.cursor >= 0
+
+        check.execute.side_effect = None
+        now[0] = 131.0
+        assert sweeper.tick() == 1
+        assert leases.progress(sweeper.round_key(now[0]))[0].done
+
+    def test_dense_cell_keeps_its_lease(self, database, leases):
+        """Test: una celda con muchas verificaciones lentas renueva la concesión sin esperar a terminarla"""
+        SubscriptionRepositoryImpl().save_batch([
+            Subscription(email=f"vecino{n}@example.com", latitude=5.07, longitude=-75.52, created_at=datetime(2025, 4, 7))
+            for n in range(10)
+        ])
+        now = [100.0]
+        stolen = []
+        sweeper = None
+
+        def slow_check(request):
+            now[0] += 8.0
+            stolen.append(leases.claim(sweeper.round_key(now[0]), 1, 'other-worker', 30.0, now=now[0]))
+
+        check = Mock()
+        check.execute.side_effect = slow_check
+        sweeper = make_sweeper(check, SubscriptionRepositoryImpl(), leases, clock=lambda: now[0], owner='worker', partitions=1)
+
+        assert sweeper.tick() == 1
+
+        assert stolen == [None] * 10
+        assert sweeper.report()['last_partition']['status'] == 'done'
+        assert {call.args[0].deadline_seconds for call in check.execute.call_args_list} == {10.0}
+
+    def test_lost_lease_stops_mid_cell(self, database, leases):
+        """Test: si otro worker tomó la partición, no se envía el resto de la celda"""
+        SubscriptionRepositoryImpl().save_batch([
+            Subscription(email=f"vecino{n}@example.com", latitude=5.07, longitude=-75.52, created_at=datetime(2025, 4, 7))
+            for n in range(10)
+        ])
+        now = [100.0]
+
+        def stalled_check(request):
+            # Un worker detenido más que la concesión: otro la retoma
+            now[0] += 31.0
+            leases.claim(sweeper.round_key(now[0]), 1, 'other-worker', 30.0, now=now[0])
+
+        check = Mock()
+        check.execute.side_effect = stalled_check
+        sweeper = make_sweeper(check, SubscriptionRepositoryImpl(), leases, clock=lambda: now[0], owner='worker', partitions=1)
+
+        assert sweeper.tick() == 1
+
+        assert check.execute.call_count == 1
+        assert sweeper.report()['last_partition']['status'] == 'lost'
+
+
+class RecordingCheck:
+    """Registra en la base compartida qué proceso verificó cada suscripción"""
+
+    def __init__(self, worker: str):
+        self.worker = worker
+
+    def execute(self, request):
+        time.sleep(0.01)
+        db_connection.db.execute_sql(
+            'INSERT INTO swept (email, worker) VALUES (?, ?)', (request.email, self.worker)
+        )
+
+
+def run_worker(path: str, worker: str):
+    """Proceso independiente: su propia conexión a la misma base SQLite"""
+    # El esquema ya lo creó el padre; inicializarlo a la vez en cada hijo compite por el lock
+    db_connection.configure(path)
+    sweeper = make_sweeper(
+        RecordingCheck(worker), SubscriptionRepositoryImpl(), SweepLeaseRepositoryImpl(), owner=worker, partitions=8
+    )
+    sweeper.tick()
+    db_connection.close()
+
+
+class TestMultiprocessSweep:
+    """Varios procesos locales contra un mismo archivo SQLite"""
+
+    def test_processes_sweep_disjoint_partitions(self, tmp_path, database, subscriptions):
+        """Test: entre todos barren cada suscripción exactamente una vez"""
+        database.execute_sql('CREATE TABLE swept (email TEXT NOT NULL, worker TEXT NOT NULL)')
+        db_connection.close()
+        path = str(tmp_path / 'sweep.db')
+
+        context = multiprocessing.get_context('spawn')
+        workers = [context.Process(target=run_worker, args=(path, f"worker-{n}")) for n in range(3)]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join(timeout=60)
+            assert process.exitcode == 0
+
+        rows = database.execute_sql('SELECT email, worker FROM swept').fetchall()
+        assert sorted(email for email, _ in rows) == sorted(s.email for s in make_subscriptions())
+        leases = SweepLeaseRepositoryImpl().progress(sweep_round_key(time.time(), INTERVAL, 8))
+        assert len(leases) == 8 and all(lease.done for lease in leases)
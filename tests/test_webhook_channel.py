@@ -0,0 +1,271 @@
+"""
+Tests para el canal de alertas por webhook contra un receptor HTTP local
+"""
+import hashlib
+import hmac
+import pytest
+import socket
+import threading
+import time
+from datetime import datetime
+from unittest.mock import Mock
+from benchmarks.webhook_sink import WebhookSink
+from domain.entities.forecast import Forecast
+from domain.services.deadline import DeadlineExceededException, deadline
+from application.dto.weather_request_dto import WeatherRequestDTO
+from application.use_cases.check_weather_use_case import CheckWeatherUseCase
+from infrastructure.external_services.webhook_service import WebhookService
+
+
+SECRET = 'secreto-de-prueba'
+
+
+def resolve_to(*addresses):
+    """Resolver falso: el host resuelve a las direcciones dadas"""
+    def resolver(host, port, **kwargs):
+        return [(socket.AF_INET6 if ':' in address else socket.AF_INET, socket.SOCK_STREAM, 6, '', (address, port))
+                for address in addresses]
+    return resolver
+
+
+def make_forecast(location="Manizales, Colombia"):
+    return Forecast(
+        location=location,
+        latitude=5.07,
+        longitude=-75.52,
+        temperature_c=18.0,
+        condition="Heavy rain",
+        condition_code=1195,
+        is_adverse=True,
+        forecast_date=datetime(2025, 1, 1, 8, 0)
+    )
+
+
+@pytest.fixture
+def sink():
+    with WebhookSink() as sink:
+        yield sink
+
+
+@pytest.fixture
+def service():
+    service = WebhookService(
+        secret=SECRET, batch_size=10, batch_wait_seconds=0.05, backoff_seconds=0.01, allow_private_networks=True
+    ).start(0.01)
+    yield service
+    service.stop()
+
+
+class TestWebhookService:
+    """Tests de entrega, firma, lotes y reintentos"""
+
+    def test_batches_are_signed(self, sink, service):
+        """Test: el receptor puede verificar la firma HMAC de cada lote"""
+        service.send_alert(sink.url, make_forecast())
+
+        assert sink.wait_for_alerts(1)
+        batch, = sink.batches
+        headers = batch['headers']
+        expected = hmac.new(
+            SECRET.encode(), headers['X-Webhook-Timestamp'].encode() + b'.' + batch['body'], hashlib.sha256
+        ).hexdigest()
+        assert headers['X-Webhook-Signature'] == f'sha256={expected}'
+        assert batch['alerts'][0]['condition_code'] == 1195
+
+    def test_alerts_are_batched_per_endpoint(self, service):
+        """Test: muchas alertas a un endpoint viajan en pocos lotes por una conexión keep-alive"""
+        with WebhookSink() as first, WebhookSink() as second:
+            for index in range(25):
+                service.send_alert(first.url, make_forecast(f"Celda {index}"))
+            service.send_alert(second.url, make_forecast())
+
+            assert first.wait_for_alerts(25)
+            assert second.wait_for_alerts(1)
+
+        assert [len(batch['alerts']) for batch in first.batches] == [10, 10, 5]
+        assert [alert['location'] for batch in first.batches for alert in batch['alerts']][:3] == [
+            "Celda 0", "Celda 1", "Celda 2"
+        ]
+        assert first.connections == 1
+
+    def test_server_errors_are_retried(self, service):
+        """Test: los 5xx se reintentan con backoff hasta entregar el lote"""
+        with WebhookSink(statuses=[503, 500]) as sink:
+            service.send_alert(sink.url, make_forecast())
+
+            assert sink.wait_for_alerts(1)
+
+        assert sink.requests_received == 3
+        assert service.pending_count() == 0
+
+    def test_client_errors_are_dropped(self):
+        """Test: un 4xx no reintentable descarta el lote"""
+        service = WebhookService(secret=SECRET, batch_wait_seconds=0, allow_private_networks=True)
+        with WebhookSink(statuses=[400]) as sink:
+            service.send_alert(sink.url, make_forecast())
+            service.stop()
+
+        assert sink.requests_received == 1
+        assert sink.alerts_received == 0
+
+    def test_gives_up_after_max_attempts(self):
+        """Test: tras max_attempts el lote se descarta"""
+        service = WebhookService(
+            secret=SECRET, batch_wait_seconds=0, max_attempts=2, backoff_seconds=0.01, allow_private_networks=True
+        ).start(0.01)
+        with WebhookSink(statuses=[500] * 5) as sink:
+            service.send_alert(sink.url, make_forecast())
+            deadline = time.monotonic() + 5
+            while sink.requests_received < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            service.stop()
+
+        assert sink.requests_received == 2
+        assert service.pending_count() == 0
+
+    def test_stop_delivers_pending(self, sink):
+        """Test: al apagar se envían los lotes que aún esperaban su ventana"""
+        service = WebhookService(secret=SECRET, batch_wait_seconds=3600, allow_private_networks=True)
+        service.send_alert(sink.url, make_forecast())
+
+        service.stop()
+
+        assert sink.alerts_received == 1
+
+    def test_validates_url_and_allowed_hosts(self):
+        """Test: solo URLs http(s) hacia los hosts permitidos"""
+        service = WebhookService(
+            secret=SECRET, allowed_hosts=['hooks.example.com'], resolver=resolve_to('93.184.216.34')
+        )
+
+        service.validate_address('https://hooks.example.com/alertas')
+        with pytest.raises(ValueError):
+            service.validate_address('ftp://hooks.example.com/alertas')
+        with pytest.raises(ValueError):
+            service.validate_address('http://127.0.0.1/alertas')
+
+    @pytest.mark.parametrize('url', [
+        'http://127.0.0.1/',
+        'http://169.254.169.254/latest/meta-data/',
+        'http://10.0.0.5:8080/hook',
+        'http://[::1]/',
+        'http://[::ffff:127.0.0.1]/',
+        'http://0.0.0.0/'
+    ])
+    def test_non_public_addresses_are_rejected(self, url):
+        """Test: sin lista de hosts, loopback, redes privadas y metadatos siguen prohibidos"""
+        service = WebhookService(secret=SECRET)
+
+        with pytest.raises(ValueError):
+            service.validate_address(url)
+
+    def test_hostnames_resolving_to_private_addresses_are_rejected(self):
+        """Test: un nombre que resuelve (aunque sea en parte) a una red interna se rechaza"""
+        service = WebhookService(secret=SECRET, resolver=resolve_to('93.184.216.34', '192.168.1.10'))
+
+        with pytest.raises(ValueError):
+            service.validate_address('https://hooks.example.com/alertas')
+
+    def test_connection_to_a_rebound_address_is_refused(self, sink):
+        """Test: si el nombre pasó la validación y al conectar resuelve a loopback (DNS rebinding), no se envía"""
+        service = WebhookService(secret=SECRET, batch_wait_seconds=3600, resolver=resolve_to('93.184.216.34'))
+        service.validate_address(sink.url)
+        service.send_alert(sink.url, make_forecast())
+
+        service.stop()
+
+        assert sink.requests_received == 0
+        assert service.pending_count() == 0
+
+    def test_dns_lookup_is_bounded_by_the_request_deadline(self):
+        """Test: un DNS que no responde corta con el plazo de la solicitud"""
+        release = threading.Event()
+
+        def hanging_resolver(host, port, **kwargs):
+            release.wait(5)
+            return resolve_to('93.184.216.34')(host, port)
+
+        service = WebhookService(secret=SECRET, resolver=hanging_resolver)
+        began = time.monotonic()
+        try:
+            with deadline(0.1):
+                with pytest.raises(DeadlineExceededException):
+                    service.validate_address('https://hooks.example.com/alertas')
+        finally:
+            release.set()
+            service.stop()
+
+        assert time.monotonic() - began < 1
+
+    def test_redirects_are_not_followed(self):
+        """Test: un 3xx no lleva el lote a otro destino; se descarta"""
+        service = WebhookService(secret=SECRET, batch_wait_seconds=0, resolver=resolve_to('93.184.216.34'))
+        service._session = Mock()
+        service._session.post.return_value = Mock(status_code=302, headers={'Location': 'http://169.254.169.254/'})
+        service.send_alert('https://hooks.example.com/alertas', make_forecast())
+
+        service.stop()
+
+        service._session.post.assert_called_once()
+        assert service._session.post.call_args.kwargs['allow_redirects'] is False
+        assert service.pending_count() == 0
+
+
+class TestChannelSelection:
+    """Tests de la elección de canales en el caso de uso"""
+
+    @pytest.fixture
+    def email_service(self):
+        return Mock()
+
+    @pytest.fixture
+    def webhook(self):
+        webhook = Mock()
+        webhook.send_alert.return_value = True
+        return webhook
+
+    @pytest.fixture
+    def use_case(self, email_service, webhook):
+        weather_service = Mock()
+        weather_service.get_forecast.return_value = make_forecast()
+        return CheckWeatherUseCase(
+            notification_repository=Mock(),
+            weather_service=weather_service,
+            email_service=email_service,
+            channels={'webhook': webhook}
+        )
+
+    def test_webhook_only(self, use_case, email_service, webhook):
+        """Test: con solo webhook no se envía correo"""
+        result = use_case.execute(WeatherRequestDTO(
+            latitude=5.07, longitude=-75.52, email="a@b.co", channels=['webhook'], webhook_url='https://h.co/x'
+        ))
+
+        assert result['channels'] == ['webhook']
+        email_service.send_email.assert_not_called()
+        webhook.send_alert.assert_called_once()
+        assert webhook.send_alert.call_args[0][0] == 'https://h.co/x'
+        webhook.validate_address.assert_called_once_with('https://h.co/x')
+
+    def test_both_channels(self, use_case, email_service, webhook):
+        """Test: con ambos canales se entrega por los dos"""
+        use_case.execute(WeatherRequestDTO(
+            latitude=5.07, longitude=-75.52, email="a@b.co", channels=['email', 'webhook'], webhook_url='https://h.co/x'
+        ))
+
+        email_service.send_email.assert_called_once()
+        webhook.send_alert.assert_called_once()
+
+    def test_webhook_requires_url(self, use_case):
+        """Test: el canal webhook requiere webhook_url"""
+        with pytest.raises(ValueError, match="webhook_url"):
+            use_case.execute(WeatherRequestDTO(latitude=5.07, longitude=-75.52, email="a@b.co", channels=['webhook']))
+
+    def test_disabled_channel_is_rejected(self, email_service):
+        """Test: pedir un canal que no está habilitado es un error de la solicitud"""
+        use_case = CheckWeatherUseCase(notification_repository=Mock(), weather_service=Mock(), email_service=email_service)
+
+        with pytest.raises(ValueError, match="no habilitado"):
+            use_case.execute(WeatherRequestDTO(
+                latitude=5.07, longitude=-75.52, email="a@b.co", channels=['webhook'], webhook_url='https://h.co/x'
+            ))
@@ -0,0 +1,14 @@
+"""
+WSGI - Punto de entrada de producción
+La app se crea una sola vez en el proceso maestro (preload) y los workers la
+heredan por copy-on-write. Las conexiones a la base de datos, las sesiones
+HTTP y los pools SMTP se reinicializan en cada worker después del fork
+(ver infrastructure/runtime/lifecycle.py).
+
+Uso:
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+from app import create_app
+
+
+app = create_app()